@@ -3,15 +3,26 @@ from flask_restx import Api
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
-from app.api.v1.users import api as users_ns
-from app.api.v1.amenities import api as amenities_ns
-from app.api.v1.places import api as places_ns
-from app.api.v1.reviews import api as reviews_ns
 
+# Extensions créées avant d'importer l'application : les modèles importent db
 bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
 
+from app.services.hashing import PasswordHasher, PasswordHasherBusy  # noqa: E402
+from app.persistence.durable import open_durable_repositories  # noqa: E402
+from app.services.instrumentation import RequestInstrumentation  # noqa: E402
+from app.api.v1.conditional import NotModified  # noqa: E402
+from app.api.v1.encoding import ResponseEncoder  # noqa: E402
+from app.api.v1.users import api as users_ns  # noqa: E402
+from app.api.v1.amenities import api as amenities_ns  # noqa: E402
+from app.api.v1.places import api as places_ns  # noqa: E402
+from app.api.v1.reviews import api as reviews_ns  # noqa: E402
+
+password_hasher = PasswordHasher()
+response_encoder = ResponseEncoder()
+request_instrumentation = RequestInstrumentation()
+
 def create_app(repositories=None, config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
     app.config.from_object(config_class)
@@ -21,18 +32,43 @@ def create_app(repositories=None, config_class="config.DevelopmentConfig"):
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    password_hasher.init_app(app)
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API', doc='/api/v1/')
+    # Enregistrée avant l'encodeur : ses mesures incluent la compression
+    request_instrumentation.init_app(app)
+    response_encoder.init_app(app, api)
+
+    @api.errorhandler(PasswordHasherBusy)
+    def handle_hasher_busy(error):
+        """Répond 503 lorsque la file de hachage des mots de passe est pleine."""
+        return {'error': str(error)}, 503, {'Retry-After': '1'}
+
+    @api.errorhandler(NotModified)
+    def handle_not_modified(error):
+        """Répond 304, sans corps, lorsque la représentation du client est à jour."""
+        return {}, 304, error.headers
 
     # Enregistrement des namespaces
     from app.api.v1.auth import api as auth_ns
+    from app.api.v1.search import api as search_ns
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(search_ns, path='/api/v1/search')
 
-    # Stocker les repositories dans l'application
+    # Stocker les repositories dans l'application ; sans repositories
+    # fournis, les modèles sont servis en mémoire de façon durable si
+    # DURABLE_STORE_DIR est défini, sinon par SQLAlchemy : création des tables
     if repositories:
         app.config['repositories'] = repositories
+    elif app.config.get('DURABLE_STORE_DIR'):
+        app.config['repositories'] = open_durable_repositories(
+            app.config['DURABLE_STORE_DIR'], snapshot_every=app.config.get('DURABLE_SNAPSHOT_EVERY')
+        )
+    else:
+        with app.app_context():
+            db.create_all()
 
     return app
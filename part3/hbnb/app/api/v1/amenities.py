@@ -1,9 +1,21 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
 from flask_jwt_extended import jwt_required, get_jwt
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_pagination_args, pagination_headers
+from app.api.v1.conditional import conditional_headers, collection_etag, resource_etag, last_modified
+from app.api.v1.fieldsets import add_fieldset_arguments, get_fieldset, select_fields
+from app.api.v1.bulk import parse_bulk_payload, bulk_batch_size, bulk_response
+from app.api.v1.export import export_parser, get_export_format, export_batch_size, ndjson_response
 
 api = Namespace('amenities', description="Amenities operations")
 
+# Champs d'un équipement pouvant être demandés (fields=) et champs par défaut
+AMENITY_FIELDS = ('id', 'name', 'created_at', 'updated_at')
+DEFAULT_FIELDS = {'id', 'name'}
+
+list_parser = add_fieldset_arguments(pagination_parser.copy())
+detail_parser = add_fieldset_arguments(reqparse.RequestParser())
+
 amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description="Name of the amenity")
 })
@@ -35,26 +47,33 @@ class AmenityList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(list_parser)
     @api.response(200, "List of amenities retrieved successfully")
+    @api.response(400, "Invalid pagination or fields parameters")
     def get(self):
         """
-        Récupère tous les équipements.
+        Récupère une page d'équipements.
 
         Returns:
-            list: Liste des équipements.
+            tuple: Liste des équipements, code HTTP et en-têtes de pagination.
         """
-        amenities = facade.get_all_amenities()
+        try:
+            cursor, limit = get_pagination_args()
+            fields, _ = get_fieldset(AMENITY_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        headers = conditional_headers(api.name, collection_etag(*facade.collection_version('amenity')))
+        amenities, next_cursor = facade.get_amenities_page(cursor, limit)
 
         return [
-            {
-                'id': amenity.id,
-                'name': amenity.name
-            } for amenity in amenities
-        ], 200
+            select_fields(_amenity_row(amenity), fields or DEFAULT_FIELDS) for amenity in amenities
+        ], 200, {**pagination_headers(next_cursor), **headers}
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
+    @api.expect(detail_parser)
     @api.response(200, "Amenity details retrieved successfully")
+    @api.response(400, "Invalid fields parameter")
     @api.response(404, "Amenity not found")
     def get(self, amenity_id):
         """
@@ -71,10 +90,12 @@ class AmenityResource(Resource):
         if not amenity:
             return {'error': "Amenity not found"}, 404
 
-        return {
-            'id': amenity.id,
-            'name': amenity.name
-        }, 200
+        try:
+            fields, _ = get_fieldset(AMENITY_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        headers = conditional_headers(api.name, resource_etag(amenity), last_modified(amenity))
+        return select_fields(_amenity_row(amenity), fields or DEFAULT_FIELDS), 200, headers
     
     @jwt_required()
     @api.expect(amenity_model, validate=True)
@@ -114,3 +135,61 @@ class AmenityResource(Resource):
 
         except ValueError as e:
             return {'error': str(e)}, 400
+
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @jwt_required()
+    @api.response(201, "Amenities successfully created")
+    @api.response(207, "Some amenities could not be created")
+    @api.response(400, "Invalid payload")
+    @api.response(401, "Unauthorized")
+    @api.response(403, "Admin privileges required")
+    def post(self):
+        """
+        Importe des équipements en masse.
+
+        Accepte un tableau JSON ou un flux NDJSON (application/x-ndjson).
+
+        Returns:
+            tuple: Identifiants créés, erreurs par élément et code HTTP.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': "Admin privileges required"}, 403
+
+        try:
+            items = parse_bulk_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return bulk_response(facade.bulk_create_amenities(items, batch_size=bulk_batch_size()))
+
+
+def _amenity_row(amenity):
+    """Représentation complète d'un équipement (export et paramètre fields)."""
+    return {
+        'id': amenity.id,
+        'name': amenity.name,
+        'created_at': amenity.created_at.isoformat(),
+        'updated_at': amenity.updated_at.isoformat()
+    }
+
+
+@api.route('/export')
+class AmenityExport(Resource):
+    @api.expect(export_parser)
+    @api.response(200, "Amenities exported as NDJSON")
+    @api.response(400, "Unsupported export format")
+    def get(self):
+        """
+        Exporte tous les équipements en NDJSON (streaming).
+
+        Returns:
+            Response: Flux application/x-ndjson, un équipement par ligne.
+        """
+        try:
+            get_export_format()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return ndjson_response(facade.iter_amenities(export_batch_size()), _amenity_row)
@@ -0,0 +1,69 @@
+import json
+from flask import current_app, request
+
+# Types de contenu acceptés pour un flux NDJSON (un objet JSON par ligne)
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+def parse_bulk_payload():
+    """
+    Lit le corps d'une requête d'import en masse.
+
+    Accepte un tableau JSON, ou un flux NDJSON lu ligne par ligne sans
+    charger tout le corps en mémoire. Une ligne NDJSON invalide est
+    transmise telle quelle pour être signalée comme erreur de cet élément.
+
+    Returns:
+        iterable: Éléments à importer.
+
+    Raises:
+        ValueError: Si le corps n'est ni un tableau JSON ni du NDJSON.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        return _iter_ndjson(request.stream)
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        raise ValueError("Payload must be a JSON array or an NDJSON stream")
+    return payload
+
+
+def _iter_ndjson(stream):
+    """
+    Décode un flux NDJSON en ignorant les lignes vides.
+
+    Args:
+        stream: Flux binaire de la requête.
+
+    Yields:
+        L'objet décodé, ou la ligne brute si elle n'est pas du JSON valide.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line.decode('utf-8', errors='replace')
+
+
+def bulk_batch_size():
+    """Taille des lots d'import configurée pour l'application."""
+    return current_app.config['BULK_BATCH_SIZE']
+
+
+def bulk_response(result):
+    """
+    Construit la réponse d'un import en masse.
+
+    Args:
+        result (dict): Résultat renvoyé par HBnBFacade.bulk_create_*.
+
+    Returns:
+        tuple: Corps et code HTTP (201 si tout a été créé, 207 sinon).
+    """
+    body = {
+        'created': [{'index': position, 'id': obj.id} for position, obj in result['created']],
+        'errors': result['errors']
+    }
+    return body, 201 if not result['errors'] else 207
@@ -0,0 +1,124 @@
+import hashlib
+from datetime import timezone
+from flask import current_app, request
+from werkzeug.http import http_date, quote_etag
+from app.api.v1.encoding import CODINGS
+
+
+class NotModified(Exception):
+    """
+    Levée lorsque la représentation détenue par le client est à jour.
+
+    Elle interrompt l'endpoint avant la construction du corps : le
+    gestionnaire d'erreurs de l'API répond 304 avec les en-têtes de cache.
+    """
+    def __init__(self, headers):
+        super().__init__("Not Modified")
+        self.headers = headers
+
+
+def resource_etag(*objects):
+    """
+    ETag fort d'une ressource.
+
+    Il est dérivé de l'identifiant et de updated_at de chaque objet
+    représenté (ex: un lieu, son propriétaire et ses équipements), et des
+    paramètres de la requête.
+
+    Args:
+        *objects: Objets composant la représentation.
+
+    Returns:
+        str: ETag (non entre guillemets).
+    """
+    return _digest(f"{obj.id}:{obj.updated_at.isoformat()}" for obj in objects)
+
+
+def collection_etag(*versions):
+    """
+    ETag fort d'une liste, dérivé des versions des collections lues et des
+    paramètres de la requête (pagination, tri, filtres).
+
+    Args:
+        *versions: Versions des repositories (voir HBnBFacade.collection_version).
+
+    Returns:
+        str: ETag (non entre guillemets).
+    """
+    return _digest(str(version) for version in versions)
+
+
+def last_modified(*objects):
+    """
+    Date de dernière modification d'une représentation.
+
+    Args:
+        *objects: Objets composant la représentation.
+
+    Returns:
+        datetime: Plus récente date updated_at, en UTC et à la seconde.
+    """
+    # updated_at est une date locale sans fuseau (datetime.now())
+    return max(obj.updated_at.astimezone(timezone.utc) for obj in objects).replace(microsecond=0)
+
+
+def cache_control(namespace):
+    """
+    Politique Cache-Control configurée pour un namespace.
+
+    Args:
+        namespace (str): Nom du namespace ('places', 'users'...).
+
+    Returns:
+        str: Valeur de l'en-tête Cache-Control.
+    """
+    policies = current_app.config.get('CACHE_CONTROL', {})
+    return policies.get(namespace, current_app.config.get('CACHE_CONTROL_DEFAULT', 'no-cache'))
+
+
+def conditional_headers(namespace, etag, modified=None):
+    """
+    Évalue les en-têtes If-None-Match / If-Modified-Since de la requête.
+
+    À appeler avant de construire le corps de la réponse : si le client
+    détient déjà cette version, NotModified est levée et le corps n'est
+    jamais sérialisé. If-Modified-Since n'est pris en compte qu'en
+    l'absence d'If-None-Match. Les ETags des représentations compressées
+    ('<etag>-gzip'...) désignent la même version.
+
+    Args:
+        namespace (str): Namespace de la ressource (politique Cache-Control).
+        etag (str): ETag de la représentation.
+        modified (datetime): Date de dernière modification, ou None.
+
+    Returns:
+        dict: En-têtes ETag, Last-Modified et Cache-Control à ajouter à la réponse.
+
+    Raises:
+        NotModified: Si la représentation du client est à jour.
+    """
+    headers = {'ETag': quote_etag(etag), 'Cache-Control': cache_control(namespace)}
+    if modified is not None:
+        headers['Last-Modified'] = http_date(modified)
+    if request.if_none_match:
+        fresh = False
+        for candidate in (etag, *(f"{etag}-{coding}" for coding in CODINGS)):
+            if request.if_none_match.contains_weak(candidate):
+                headers['ETag'] = quote_etag(candidate)
+                fresh = True
+                break
+    else:
+        fresh = (modified is not None and request.if_modified_since is not None
+                 and modified <= request.if_modified_since)
+    if fresh:
+        raise NotModified(headers)
+    return headers
+
+
+def _digest(parts):
+    """Condensé des parties de la représentation et des paramètres de la requête."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (*parts, request.full_path):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
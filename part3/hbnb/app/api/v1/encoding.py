@@ -0,0 +1,208 @@
+import json
+import zlib
+from flask import make_response, request
+
+# Encodages de contenu supportés, par ordre de préférence du serveur
+CODINGS = ('br', 'gzip', 'deflate')
+
+
+def _orjson_dumps():
+    """Sérialiseur orjson (renvoie des octets)."""
+    import orjson
+    return lambda data: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _ujson_dumps():
+    """Sérialiseur ujson."""
+    import ujson
+    return lambda data: ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _stdlib_dumps():
+    """Sérialiseur de la bibliothèque standard."""
+    return lambda data: json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# Bibliothèques JSON, de la plus rapide à la plus lente
+JSON_BACKENDS = {
+    'orjson': _orjson_dumps,
+    'ujson': _ujson_dumps,
+    'json': _stdlib_dumps
+}
+
+
+def select_json_backend(name=None):
+    """
+    Choisit la bibliothèque de sérialisation JSON.
+
+    Args:
+        name (str): Bibliothèque imposée ('orjson', 'ujson', 'json'), ou
+            None pour la plus rapide installée.
+
+    Returns:
+        tuple: Nom de la bibliothèque et fonction data -> octets.
+
+    Raises:
+        ValueError: Si la bibliothèque demandée est inconnue ou absente.
+    """
+    if name is not None:
+        if name not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{name}'")
+        try:
+            return name, JSON_BACKENDS[name]()
+        except ImportError:
+            raise ValueError(f"JSON backend '{name}' is not installed")
+    for candidate, factory in JSON_BACKENDS.items():
+        try:
+            return candidate, factory()
+        except ImportError:
+            continue
+
+
+def _brotli():
+    """Module brotli, ou None s'il n'est pas installé."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+class _ZlibCompressor:
+    """Compresseur gzip ou deflate (format zlib) au fil de l'eau."""
+    def __init__(self, coding, level):
+        wbits = 16 + zlib.MAX_WBITS if coding == 'gzip' else zlib.MAX_WBITS
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    """Compresseur brotli au fil de l'eau."""
+    def __init__(self, quality):
+        self._compressor = _brotli().Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class ResponseEncoder:
+    """
+    Sérialisation JSON et compression des réponses de l'API.
+
+    Les réponses JSON sont produites par la bibliothèque la plus rapide
+    installée (orjson, ujson, sinon json), puis compressées selon
+    l'en-tête Accept-Encoding (brotli s'il est installé, gzip ou deflate)
+    lorsque leur taille dépasse COMPRESSION_MIN_SIZE. Les réponses en
+    streaming (exports NDJSON) sont compressées morceau par morceau.
+    """
+    def __init__(self):
+        """Initialise l'encodeur avec la bibliothèque JSON par défaut."""
+        self.backend, self.dumps = select_json_backend()
+        self.enabled = True
+        self.min_size = 1024
+        self.level = 6
+        self.brotli_quality = 4
+        self.mimetypes = ('application/json',)
+
+    def init_app(self, app, api):
+        """
+        Configure l'encodeur et l'enregistre sur l'application.
+
+        Args:
+            app (Flask): Application (JSON_BACKEND, COMPRESSION_*).
+            api (Api): API Flask-RESTX dont les réponses JSON sont sérialisées.
+        """
+        self.backend, self.dumps = select_json_backend(app.config.get('JSON_BACKEND'))
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.level = app.config.get('COMPRESSION_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+        self.mimetypes = tuple(app.config.get('COMPRESSION_MIMETYPES', ('application/json',)))
+        api.representation('application/json')(self.output_json)
+        app.after_request(self.compress)
+
+    def output_json(self, data, code, headers=None):
+        """
+        Représentation JSON des réponses Flask-RESTX.
+
+        Args:
+            data: Données à sérialiser.
+            code (int): Code HTTP.
+            headers (dict): En-têtes supplémentaires.
+
+        Returns:
+            Response: Réponse application/json.
+        """
+        response = make_response(self.dumps(data), code)
+        response.headers.extend(headers or {})
+        response.mimetype = 'application/json'
+        return response
+
+    def negotiate(self):
+        """
+        Choisit l'encodage de contenu accepté par le client.
+
+        Returns:
+            str: 'br', 'gzip' ou 'deflate', ou None pour aucune compression.
+        """
+        available = [coding for coding in CODINGS if coding != 'br' or _brotli() is not None]
+        return request.accept_encodings.best_match(available)
+
+    def compress(self, response):
+        """
+        Compresse une réponse si le client l'accepte (hook after_request).
+
+        Args:
+            response (Response): Réponse produite par l'endpoint.
+
+        Returns:
+            Response: Réponse éventuellement compressée.
+        """
+        if not self.enabled or response.mimetype not in self.mimetypes:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (not 200 <= response.status_code < 300 or response.status_code == 204
+                or 'Content-Encoding' in response.headers or response.direct_passthrough):
+            return response
+        coding = self.negotiate()
+        if coding is None:
+            return response
+        compressor = self._compressor(coding)
+        if response.is_streamed:
+            chunks = response.iter_encoded()
+            response.response = self._stream(chunks, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compressor.compress(data) + compressor.flush())
+        response.headers['Content-Encoding'] = coding
+        # Un ETag fort identifie une représentation : il dépend de l'encodage
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{coding}")
+        return response
+
+    def _compressor(self, coding):
+        """Crée un compresseur pour l'encodage choisi."""
+        if coding == 'br':
+            return _BrotliCompressor(self.brotli_quality)
+        return _ZlibCompressor(coding, self.level)
+
+    @staticmethod
+    def _stream(chunks, compressor):
+        """Compresse une réponse en streaming morceau par morceau."""
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
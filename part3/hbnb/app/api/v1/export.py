@@ -0,0 +1,63 @@
+from flask import Response, current_app, request, stream_with_context
+from flask_restx import reqparse
+
+# Taille approximative des morceaux envoyés au client
+CHUNK_SIZE = 64 * 1024
+
+# Paramètres communs aux endpoints d'export
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', type=str, location='args', choices=('ndjson',),
+                           default='ndjson', help='Export format (only ndjson is supported)')
+
+
+def get_export_format():
+    """
+    Lit et valide le format d'export demandé.
+
+    Returns:
+        str: Format d'export.
+
+    Raises:
+        ValueError: Si le format n'est pas supporté.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format != 'ndjson':
+        raise ValueError("Unsupported export format, only 'ndjson' is available")
+    return export_format
+
+
+def export_batch_size():
+    """Nombre d'objets lus par lot lors d'un export."""
+    return current_app.config['EXPORT_BATCH_SIZE']
+
+
+def ndjson_response(objects, serialize):
+    """
+    Construit une réponse NDJSON produite au fil de l'eau.
+
+    Les lignes sont écrites au fur et à mesure que les objets sont lus,
+    regroupées en morceaux d'environ CHUNK_SIZE octets : la mémoire
+    utilisée ne dépend pas de la taille de la collection.
+
+    Args:
+        objects (iterable): Objets à exporter (générateur du repository).
+        serialize (callable): Transforme un objet en dictionnaire.
+
+    Returns:
+        Response: Réponse en streaming (application/x-ndjson).
+    """
+    from app import response_encoder
+
+    def generate():
+        chunk, size = [], 0
+        for obj in objects:
+            line = response_encoder.dumps(serialize(obj)) + b'\n'
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield b''.join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield b''.join(chunk)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -0,0 +1,66 @@
+from flask import request
+
+
+def add_fieldset_arguments(parser, includes=()):
+    """
+    Ajoute les paramètres fields (et include) à un parser de requête.
+
+    Args:
+        parser (RequestParser): Parser à compléter.
+        includes (iterable): Relations pouvant être incluses.
+
+    Returns:
+        RequestParser: Le parser complété.
+    """
+    parser.add_argument('fields', type=str, location='args',
+                        help='Comma-separated fields to return (id is always returned)')
+    if includes:
+        parser.add_argument('include', type=str, location='args',
+                            help=f"Comma-separated relations to embed: {', '.join(includes)}")
+    return parser
+
+
+def _split_arg(name):
+    """Valeurs d'un paramètre de requête séparées par des virgules."""
+    return {value.strip() for value in request.args.get(name, '').split(',') if value.strip()}
+
+
+def get_fieldset(fields, includes=()):
+    """
+    Lit et valide les paramètres fields et include de la requête.
+
+    Args:
+        fields (iterable): Champs pouvant être demandés.
+        includes (iterable): Relations pouvant être incluses.
+
+    Returns:
+        tuple: Champs demandés (None si fields est absent) et relations à inclure.
+
+    Raises:
+        ValueError: Si un champ ou une relation est inconnu.
+    """
+    selected = _split_arg('fields')
+    unknown = selected - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    included = _split_arg('include')
+    unknown = included - set(includes)
+    if unknown:
+        raise ValueError(f"Unknown relation(s): {', '.join(sorted(unknown))}")
+    return (selected or None), included
+
+
+def select_fields(row, fields):
+    """
+    Restreint une représentation aux champs demandés.
+
+    Args:
+        row (dict): Représentation complète.
+        fields (set): Champs demandés, ou None pour tous.
+
+    Returns:
+        dict: Représentation restreinte (l'identifiant est toujours conservé).
+    """
+    if fields is None:
+        return row
+    return {key: value for key, value in row.items() if key in fields or key == 'id'}
@@ -0,0 +1,73 @@
+from urllib.parse import urlencode
+from flask import current_app, request
+from flask_restx import reqparse
+from app.persistence.pagination import decode_ordering_cursor
+
+# Paramètres de pagination communs aux endpoints de liste
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=int, location='args',
+                               help='Maximum number of items to return')
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Cursor returned in the X-Next-Cursor header of the previous page')
+
+
+def get_pagination_args(cursor_decoder=decode_ordering_cursor, paginate_by_default=False):
+    """
+    Lit et valide les paramètres limit et cursor de la requête.
+
+    Sans limit ni cursor, les endpoints de liste renvoient toute la
+    collection, comme avant l'ajout de la pagination ; la limite par
+    défaut ne s'applique qu'aux requêtes paginées, ou à toutes si
+    paginate_by_default est vrai (endpoints de recherche).
+
+    Args:
+        cursor_decoder (callable): Décodeur validant le curseur (par défaut
+            un curseur (created_at, id)).
+        paginate_by_default (bool): Applique la limite par défaut même sans
+            paramètre de pagination.
+
+    Returns:
+        tuple: Curseur (ou None) et limite bornée par la configuration
+        (None pour toute la collection).
+
+    Raises:
+        ValueError: Si la limite ou le curseur sont invalides.
+    """
+    cursor = request.args.get('cursor') or None
+    if 'limit' not in request.args and cursor is None and not paginate_by_default:
+        return None, None
+    limit = request.args.get('limit', current_app.config['PAGINATION_DEFAULT_LIMIT'])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, current_app.config['PAGINATION_MAX_LIMIT'])
+    if cursor:
+        cursor_decoder(cursor)
+    return cursor, limit
+
+
+def pagination_headers(next_cursor):
+    """
+    Construit les en-têtes annonçant la page suivante.
+
+    Le corps des réponses de liste reste un tableau JSON : le curseur de
+    la page suivante est renvoyé dans X-Next-Cursor et dans un en-tête Link.
+
+    Args:
+        next_cursor (str): Curseur de la page suivante, ou None.
+
+    Returns:
+        dict: En-têtes à ajouter à la réponse.
+    """
+    if not next_cursor:
+        return {}
+    args = request.args.to_dict()
+    args['cursor'] = next_cursor
+    next_url = f"{request.base_url}?{urlencode(args)}"
+    return {
+        'X-Next-Cursor': next_cursor,
+        'Link': f'<{next_url}>; rel="next"'
+    }
@@ -1,7 +1,15 @@
-from flask_restx import Namespace, Resource, fields
+import math
+from flask import request
+from flask_restx import Namespace, Resource, fields, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
-
+from app.services.facade import HBnBFacade
+from app.api.v1.pagination import pagination_parser, get_pagination_args, pagination_headers
+from app.api.v1.conditional import conditional_headers, collection_etag, resource_etag, last_modified
+from app.api.v1.fieldsets import add_fieldset_arguments, get_fieldset, select_fields
+from app.api.v1.bulk import parse_bulk_payload, bulk_batch_size, bulk_response
+from app.api.v1.export import export_parser, get_export_format, export_batch_size, ndjson_response
+from app.persistence.pagination import decode_value_cursor, decode_ordering_cursor, decode_sort_cursor
 
 
 api = Namespace('places', description='Place operations')
@@ -32,6 +40,86 @@ place_model = api.model('Place', {
 })
 
 
+# Champs d'un lieu pouvant être demandés (fields=) et relations incluables
+# (include=), avec la collection qui porte chaque relation
+PLACE_FIELDS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+                'amenities', 'review_count', 'average_rating', 'rating_histogram',
+                'created_at', 'updated_at')
+PLACE_INCLUDES = {'owner': 'user', 'amenities': 'amenity', 'reviews': 'review'}
+# Champs renvoyés par la liste des lieux sans paramètre fields
+LIST_FIELDS = {'id', 'title', 'latitude', 'longitude', 'review_count', 'average_rating'}
+
+# Paramètres de la liste des lieux
+list_parser = add_fieldset_arguments(pagination_parser.copy(), PLACE_INCLUDES)
+list_parser.add_argument('sort', type=str, location='args', choices=tuple(HBnBFacade.PLACE_SORTS),
+                         help='Sort by average rating or review count (descending)')
+
+# Paramètres du détail d'un lieu
+detail_parser = add_fieldset_arguments(reqparse.RequestParser(), PLACE_INCLUDES)
+
+
+def _rating_row(place):
+    """Agrégats de notes d'un lieu."""
+    return {
+        'review_count': place.review_count,
+        'average_rating': place.average_rating,
+        'rating_histogram': {
+            str(rating): count for rating, count in enumerate(place.rating_histogram, 1)
+        }
+    }
+
+
+def _place_representation(place, fields, include, relations):
+    """
+    Représentation d'un lieu restreinte aux champs demandés, avec les
+    relations incluses.
+
+    Args:
+        place (Place): Lieu à représenter.
+        fields (set): Champs demandés, ou None pour tous.
+        include (set): Relations à inclure ('owner', 'amenities', 'reviews').
+        relations (dict): Relations chargées par facade.get_place_relations.
+
+    Returns:
+        dict: Représentation JSON du lieu.
+    """
+    row = select_fields({**_place_row(place), **_rating_row(place)}, fields)
+    if 'owner' in include:
+        row['owner'] = {
+            'id': place.owner.id,
+            'first_name': place.owner.first_name,
+            'last_name': place.owner.last_name,
+            'email': place.owner.email
+        }
+    if 'amenities' in include:
+        row['amenities'] = [
+            {
+                'id': amenity.id,
+                'name': amenity.name
+            } for amenity in place.amenities
+        ]
+    if 'reviews' in include:
+        row['reviews'] = [
+            {
+                'id': review.id,
+                'text': review.text,
+                'rating': review.rating,
+                'user_id': review.user.id
+            } for review in relations['reviews'].get(place.id, [])
+        ]
+    return row
+
+
+def _related_objects(places, include, relations):
+    """Objets inclus dans la représentation de lieux (pour l'ETag)."""
+    objects = [place.owner for place in places] if 'owner' in include else []
+    if 'amenities' in include:
+        objects.extend(amenity for place in places for amenity in place.amenities)
+    for reviews in relations.get('reviews', {}).values():
+        objects.extend(reviews)
+    return objects
+
+
 @api.route('/')
 class PlaceList(Resource):
     @jwt_required()
@@ -59,54 +147,149 @@ class PlaceList(Resource):
             return {'error': str(e)}, 400
 
 
+    @api.expect(list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination or sort parameters')
     def get(self):
-        """Récupération de la liste de tous les lieux."""
-        places = facade.get_all_places()
+        """Récupération d'une page de lieux, éventuellement triés par note."""
+        sort = request.args.get('sort') or None
+        try:
+            cursor, limit = get_pagination_args(decode_sort_cursor if sort else decode_ordering_cursor)
+            fields, include = get_fieldset(PLACE_FIELDS, PLACE_INCLUDES)
+            versions = facade.collection_version('place', *(PLACE_INCLUDES[name] for name in sorted(include)))
+            headers = conditional_headers(api.name, collection_etag(*versions))
+            places, next_cursor = facade.get_places_page(cursor, limit, sort)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        # Relations chargées en une requête par relation pour toute la page
+        relations = facade.get_place_relations(places, include)
         return [
-            {
+            _place_representation(place, fields or LIST_FIELDS, include, relations)
+            for place in places
+        ], 200, {**pagination_headers(next_cursor), **headers}
+
+
+# Paramètres de la recherche de lieux
+search_parser = pagination_parser.copy()
+search_parser.add_argument('lat', type=float, location='args', help='Latitude of the search center')
+search_parser.add_argument('lon', type=float, location='args', help='Longitude of the search center')
+search_parser.add_argument('radius_km', type=float, location='args', help='Search radius in kilometers')
+search_parser.add_argument('bbox', type=str, location='args',
+                           help='Bounding box: min_lon,min_lat,max_lon,max_lat')
+search_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+search_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+search_parser.add_argument('amenities', type=str, location='args',
+                           help="Comma-separated amenity ID's, all required")
+
+
+def _float_arg(name):
+    """
+    Lit un paramètre numérique optionnel de la requête.
+
+    Raises:
+        ValueError: Si le paramètre n'est pas un nombre.
+    """
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a number")
+    return number
+
+
+def _search_places():
+    """
+    Exécute la recherche décrite par les paramètres de la requête.
+
+    Sans lat/lon ni bbox, les lieux sont filtrés par prix et équipements
+    et triés par prix ; sinon ils sont triés par distance.
+
+    Returns:
+        tuple: Liste de (lieu, distance ou None) et curseur de la page suivante.
+
+    Raises:
+        ValueError: Si les paramètres sont absents ou invalides.
+    """
+    cursor, limit = get_pagination_args(decode_value_cursor, paginate_by_default=True)
+    lat, lon, radius_km = _float_arg('lat'), _float_arg('lon'), _float_arg('radius_km')
+    bbox = request.args.get('bbox')
+    filters = {
+        'min_price': _float_arg('min_price'),
+        'max_price': _float_arg('max_price'),
+        'amenities': [amenity_id for amenity_id in request.args.get('amenities', '').split(',') if amenity_id]
+    }
+    if (lat is None) != (lon is None):
+        raise ValueError("lat and lon must be provided together")
+    if bbox:
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(','))
+        except ValueError:
+            raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+        return facade.search_places_in_bbox(min_lon, min_lat, max_lon, max_lat,
+                                            lat, lon, filters, cursor, limit)
+    if lat is not None:
+        if radius_km is None:
+            raise ValueError("radius_km (or bbox) is required with lat and lon")
+        return facade.search_places_nearby(lat, lon, radius_km, filters, cursor, limit)
+    places, next_cursor = facade.search_places(filters, cursor, limit)
+    return [(place, None) for place in places], next_cursor
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Places sorted by distance, or by price without lat/lon or bbox')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Recherche des lieux par position, prix et équipements."""
+        try:
+            headers = conditional_headers(api.name, collection_etag(
+                *facade.collection_version('place', 'amenity')))
+            results, next_cursor = _search_places()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        rows = []
+        for place, distance in results:
+            row = {
                 'id': place.id,
                 'title': place.title,
+                'price': place.price,
                 'latitude': place.latitude,
-                'longitude': place.longitude,
-            } for place in places
-        ], 200
+                'longitude': place.longitude
+            }
+            if distance is not None:
+                row['distance_km'] = round(distance, 3)
+            rows.append(row)
+        return rows, 200, {**pagination_headers(next_cursor), **headers}
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.expect(detail_parser)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid fields or include parameters')
     @api.response(404, 'Place not found')
     def get(self, place_id):
-        """Récupération des détails d'un lieu."""
+        """Récupération des détails d'un lieu (propriétaire et amenities inclus par défaut)."""
         place = facade.get_place(place_id)
         if not place:
             return {'message': 'Place not found'}, 404
+        try:
+            fields, include = get_fieldset(PLACE_FIELDS, PLACE_INCLUDES)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        if 'include' not in request.args:
+            include = {'owner', 'amenities'}
 
-        # Récupérer les détails des amenities via la façade
-        amenities_details = []
-        for amenity_id in place.amenities:
-            amenity = facade.get_amenity(amenity_id)
-            if amenity:
-                amenities_details.append({
-                    'id': amenity.id,
-                    'name': amenity.name
-                })
-        # Récupérer les détails du propriétaire via la façade
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner': {
-                'id': place.owner.id,
-                'first_name': place.owner.first_name,
-                'last_name': place.owner.last_name,
-                'email': place.owner.email
-            },
-            'amenities': amenities_details
-        }, 200
+        # Le lieu et les objets inclus composent l'ETag
+        relations = facade.get_place_relations([place], include)
+        represented = (place, *_related_objects([place], include, relations))
+        headers = conditional_headers(api.name, resource_etag(*represented), last_modified(*represented))
+        return _place_representation(place, fields, include, relations), 200, headers
 
 
     @jwt_required()
@@ -134,3 +317,55 @@ class PlaceResource(Resource):
             return {'message': 'Place updated successfully'}, 200
         except (ValueError, TypeError) as e:
             return {'error': str(e)}, 400
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @jwt_required()
+    @api.response(201, "Places successfully created")
+    @api.response(207, "Some places could not be created")
+    @api.response(400, "Invalid payload")
+    @api.response(401, "Unauthorized")
+    @api.response(403, "Admin privileges required")
+    def post(self):
+        """Import en masse de lieux (tableau JSON ou flux NDJSON)."""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': "Admin privileges required"}, 403
+
+        try:
+            items = parse_bulk_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return bulk_response(facade.bulk_create_places(items, batch_size=bulk_batch_size()))
+
+
+def _place_row(place):
+    """Représentation complète d'un lieu (export et paramètre fields)."""
+    return {
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner_id': place.owner.id,
+        'amenities': [amenity.id for amenity in place.amenities],
+        'created_at': place.created_at.isoformat(),
+        'updated_at': place.updated_at.isoformat()
+    }
+
+
+@api.route('/export')
+class PlaceExport(Resource):
+    @api.expect(export_parser)
+    @api.response(200, "Places exported as NDJSON")
+    @api.response(400, "Unsupported export format")
+    def get(self):
+        """Export de tous les lieux en NDJSON (streaming)."""
+        try:
+            get_export_format()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return ndjson_response(facade.iter_places(export_batch_size()), _place_row)
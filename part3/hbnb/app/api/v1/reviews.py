@@ -1,6 +1,11 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_pagination_args, pagination_headers
+from app.api.v1.conditional import conditional_headers, collection_etag, resource_etag, last_modified
+from app.api.v1.fieldsets import add_fieldset_arguments, get_fieldset, select_fields
+from app.api.v1.bulk import parse_bulk_payload, bulk_batch_size, bulk_response
+from app.api.v1.export import export_parser, get_export_format, export_batch_size, ndjson_response
 
 api = Namespace('reviews', description='Review operations')
 
@@ -20,6 +25,46 @@ review_response = api.model('ReviewResponse', {
     'place_id': fields.String(description='ID of the place')
 })
 
+# Champs d'une review pouvant être demandés (fields=), champs par défaut et
+# relations incluables (include=) avec la collection qui les porte
+REVIEW_FIELDS = ('id', 'text', 'rating', 'user_id', 'place_id', 'created_at', 'updated_at')
+DEFAULT_FIELDS = {'id', 'text', 'rating', 'user_id', 'place_id'}
+REVIEW_INCLUDES = {'user': 'user', 'place': 'place'}
+
+list_parser = add_fieldset_arguments(pagination_parser.copy(), REVIEW_INCLUDES)
+detail_parser = add_fieldset_arguments(reqparse.RequestParser(), REVIEW_INCLUDES)
+
+
+def _review_representation(review, fields, include):
+    """Review restricted to the requested fields, with its embedded relations"""
+    row = select_fields(_review_row(review), fields or DEFAULT_FIELDS)
+    if 'user' in include:
+        row['user'] = {
+            'id': review.user.id,
+            'first_name': review.user.first_name,
+            'last_name': review.user.last_name
+        }
+    if 'place' in include:
+        row['place'] = {
+            'id': review.place.id,
+            'title': review.place.title
+        }
+    return row
+
+
+def _review_list_args():
+    """
+    Read the pagination and fieldset parameters of a review list.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    cursor, limit = get_pagination_args()
+    fields, include = get_fieldset(REVIEW_FIELDS, REVIEW_INCLUDES)
+    versions = facade.collection_version('review', *(REVIEW_INCLUDES[name] for name in sorted(include)))
+    return cursor, limit, fields, include, versions
+
+
 # Route pour la liste des reviews
 @api.route('/')
 class ReviewList(Resource):
@@ -41,10 +86,8 @@ class ReviewList(Resource):
             if place.owner.id == current_user:
                 return {'error': 'You cannot review your own place'}, 400
             
-            existing_reviews = facade.get_reviews_by_place(review_data.get('place_id'))
-            for review in existing_reviews:
-                if review.user.id == current_user:
-                    return {'error': 'You have already reviewed this place'}, 400
+            if facade.has_user_reviewed_place(place.id, current_user):
+                return {'error': 'You have already reviewed this place'}, 400
 
             review_data['user_id'] = current_user
             review = facade.create_review(review_data)
@@ -58,37 +101,39 @@ class ReviewList(Resource):
         except (ValueError, TypeError) as e:
             api.abort(400, str(e))
 
-    @api.response(200, 'List of reviews retrieved successfully')
-    @api.marshal_list_with(review_response)
+    @api.expect(list_parser)
+    @api.response(200, 'List of reviews retrieved successfully', [review_response])
+    @api.response(400, 'Invalid pagination or fieldset parameters')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        } for review in reviews]
+        """Retrieve a page of reviews"""
+        try:
+            cursor, limit, fields, include, versions = _review_list_args()
+        except ValueError as e:
+            api.abort(400, str(e))
+        headers = conditional_headers(api.name, collection_etag(*versions))
+        reviews, next_cursor = facade.get_reviews_page(cursor, limit)
+        return [_review_representation(review, fields, include) for review in reviews], \
+            200, {**pagination_headers(next_cursor), **headers}
 
 # Route pour une review spécifique
 @api.route('/<review_id>')
 class ReviewResource(Resource):
-    @api.response(200, 'Review details retrieved successfully')
+    @api.expect(detail_parser)
+    @api.response(200, 'Review details retrieved successfully', review_response)
+    @api.response(400, 'Invalid fieldset parameters')
     @api.response(404, 'Review not found')
-    @api.marshal_with(review_response)
     def get(self, review_id):
         """Get review details by ID"""
         review = facade.get_review(review_id)
         if not review:
             api.abort(404, "Review not found")
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        }
+        try:
+            fields, include = get_fieldset(REVIEW_FIELDS, REVIEW_INCLUDES)
+        except ValueError as e:
+            api.abort(400, str(e))
+        represented = [review] + [getattr(review, name) for name in sorted(include)]
+        headers = conditional_headers(api.name, resource_etag(*represented), last_modified(*represented))
+        return _review_representation(review, fields, include), 200, headers
 
     @jwt_required()
     @api.expect(review_model)
@@ -151,19 +196,69 @@ class ReviewResource(Resource):
 # Route pour la liste des reviews d'un lieu
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
-    @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.expect(list_parser)
+    @api.response(200, 'List of reviews for the place retrieved successfully', [review_response])
+    @api.response(400, 'Invalid pagination or fieldset parameters')
     @api.response(404, 'Place not found')
-    @api.marshal_list_with(review_response)
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get a page of reviews for a specific place"""
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            return [{
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user_id': review.user.id,
-                'place_id': review.place.id
-            } for review in reviews]
+            cursor, limit, fields, include, versions = _review_list_args()
+        except ValueError as e:
+            api.abort(400, str(e))
+        headers = conditional_headers(api.name, collection_etag(*versions))
+        try:
+            reviews, next_cursor = facade.get_reviews_page_by_place(place_id, cursor, limit)
+            return [_review_representation(review, fields, include) for review in reviews], \
+                200, {**pagination_headers(next_cursor), **headers}
         except ValueError as e:
             api.abort(404, str(e))
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @jwt_required()
+    @api.response(201, "Reviews successfully created")
+    @api.response(207, "Some reviews could not be created")
+    @api.response(400, "Invalid payload")
+    @api.response(401, "Unauthorized")
+    @api.response(403, "Admin privileges required")
+    def post(self):
+        """Bulk import reviews (JSON array or NDJSON stream)"""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': "Admin privileges required"}, 403
+
+        try:
+            items = parse_bulk_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return bulk_response(facade.bulk_create_reviews(items, batch_size=bulk_batch_size()))
+
+
+def _review_row(review):
+    """Full representation of a review (export and fields parameter)"""
+    return {
+        'id': review.id,
+        'text': review.text,
+        'rating': review.rating,
+        'user_id': review.user.id,
+        'place_id': review.place.id,
+        'created_at': review.created_at.isoformat(),
+        'updated_at': review.updated_at.isoformat()
+    }
+
+
+@api.route('/export')
+class ReviewExport(Resource):
+    @api.expect(export_parser)
+    @api.response(200, "Reviews exported as NDJSON")
+    @api.response(400, "Unsupported export format")
+    def get(self):
+        """Export all reviews as NDJSON (streamed)"""
+        try:
+            get_export_format()
+        except ValueError as e:
+            api.abort(400, str(e))
+        return ndjson_response(facade.iter_reviews(export_batch_size()), _review_row)
@@ -0,0 +1,46 @@
+from flask import request
+from flask_restx import Namespace, Resource
+from app.services import facade
+from app.services.search import decode_search_cursor
+from app.api.v1.pagination import pagination_parser, get_pagination_args, pagination_headers
+from app.api.v1.conditional import conditional_headers, collection_etag
+
+api = Namespace('search', description='Full-text search operations')
+
+# Paramètres de la recherche plein texte
+search_parser = pagination_parser.copy()
+search_parser.add_argument('q', type=str, location='args', required=True,
+                           help='Words to search for (each word matches as a prefix)')
+search_parser.add_argument('type', type=str, location='args',
+                           help="Comma-separated document types: 'place', 'review'")
+
+
+def _hit_row(doc_type, obj, score):
+    """Représentation JSON d'un résultat de recherche."""
+    row = {'type': doc_type, 'id': obj.id, 'score': round(score, 4)}
+    if doc_type == 'place':
+        row.update({'title': obj.title, 'description': obj.description})
+    else:
+        row.update({'text': obj.text, 'rating': obj.rating, 'place_id': obj.place.id})
+    return row
+
+
+@api.route('/')
+class Search(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Ranked search results')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Recherche plein texte dans les lieux et les reviews."""
+        try:
+            cursor, limit = get_pagination_args(decode_search_cursor, paginate_by_default=True)
+            doc_types = request.args.get('type')
+            if doc_types:
+                doc_types = [doc_type.strip() for doc_type in doc_types.split(',') if doc_type.strip()]
+            headers = conditional_headers(api.name, collection_etag(
+                *facade.collection_version('place', 'review')))
+            results, next_cursor = facade.search(request.args.get('q', ''), doc_types or None,
+                                                 cursor, limit)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [_hit_row(*result) for result in results], 200, {**pagination_headers(next_cursor), **headers}
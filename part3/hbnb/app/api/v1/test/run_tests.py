@@ -12,6 +12,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 
 from test_users_endpoints import TestUsersEndpoints
 from test_amenities_endpoints import TestAmenitiesEndpoints
+from test_search_endpoints import TestSearchEndpoints
+from test_conditional_requests import TestConditionalRequests
+from test_encoding import TestResponseEncoding
+from test_fieldsets import TestFieldsets
+from test_query_counts import TestListQueryCounts
+from test_instrumentation import TestInstrumentation
 
 
 def run_api_v1_tests():
@@ -24,7 +30,13 @@ def run_api_v1_tests():
     # Classes de tests disponibles
     test_classes = [
         TestUsersEndpoints,
-        TestAmenitiesEndpoints
+        TestAmenitiesEndpoints,
+        TestSearchEndpoints,
+        TestConditionalRequests,
+        TestResponseEncoding,
+        TestFieldsets,
+        TestListQueryCounts,
+        TestInstrumentation
     ]
     
     # Créer une suite avec tous les tests
@@ -53,7 +65,18 @@ def run_specific_test(test_name):
         'users': TestUsersEndpoints,
         'users_endpoints': TestUsersEndpoints,
         'amenities': TestAmenitiesEndpoints,
-        'amenities_endpoints': TestAmenitiesEndpoints
+        'amenities_endpoints': TestAmenitiesEndpoints,
+        'search': TestSearchEndpoints,
+        'search_endpoints': TestSearchEndpoints,
+        'conditional': TestConditionalRequests,
+        'conditional_requests': TestConditionalRequests,
+        'encoding': TestResponseEncoding,
+        'response_encoding': TestResponseEncoding,
+        'fieldsets': TestFieldsets,
+        'sparse_fieldsets': TestFieldsets,
+        'query_counts': TestListQueryCounts,
+        'list_query_counts': TestListQueryCounts,
+        'instrumentation': TestInstrumentation
     }
     
     if test_name.lower() not in test_classes:
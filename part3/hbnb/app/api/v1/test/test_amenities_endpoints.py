@@ -28,7 +28,7 @@ class TestAmenitiesEndpoints(unittest.TestCase):
             'amenity_repo': amenity_repo
         }
         
-        self.app = create_app(repositories)
+        self.app = create_app(repositories, "config.TestingConfig")
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
@@ -171,6 +171,129 @@ class TestAmenitiesEndpoints(unittest.TestCase):
         self.assertIsInstance(data, list)
         self.assertEqual(len(data), 0)
 
+    def test_get_amenities_paginated(self):
+        """Test la pagination par curseur de la liste des amenities"""
+        for name in ['Wi-Fi', 'Air Conditioning', 'Swimming Pool']:
+            self.client.post('/api/v1/amenities/',
+                             data=json.dumps({'name': name}),
+                             content_type='application/json',
+                             headers={'Authorization': f'Bearer {self.admin_token}'})
+
+        response = self.client.get('/api/v1/amenities/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        first_page = json.loads(response.data)
+        self.assertEqual([a['name'] for a in first_page], ['Wi-Fi', 'Air Conditioning'])
+        next_cursor = response.headers.get('X-Next-Cursor')
+        self.assertIsNotNone(next_cursor)
+        self.assertIn('rel="next"', response.headers.get('Link'))
+
+        response = self.client.get(f'/api/v1/amenities/?limit=2&cursor={next_cursor}')
+        self.assertEqual(response.status_code, 200)
+        second_page = json.loads(response.data)
+        self.assertEqual([a['name'] for a in second_page], ['Swimming Pool'])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_get_amenities_unpaginated_by_default(self):
+        """Test que la liste complète est renvoyée sans limit ni cursor"""
+        self.app.config['PAGINATION_DEFAULT_LIMIT'] = 2
+        for name in ['Wi-Fi', 'Air Conditioning', 'Swimming Pool']:
+            self.client.post('/api/v1/amenities/',
+                             data=json.dumps({'name': name}),
+                             content_type='application/json',
+                             headers={'Authorization': f'Bearer {self.admin_token}'})
+
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 3)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        # Un curseur sans limit applique la limite par défaut
+        response = self.client.get('/api/v1/amenities/?limit=1')
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/amenities/?cursor={cursor}')
+        self.assertEqual(len(json.loads(response.data)), 2)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_get_amenities_invalid_pagination(self):
+        """Test des paramètres de pagination invalides"""
+        response = self.client.get('/api/v1/amenities/?limit=0')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/amenities/?limit=abc')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/amenities/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create_amenities_json(self):
+        """Test import en masse d'amenities depuis un tableau JSON"""
+        response = self.client.post('/api/v1/amenities/bulk',
+                                    data=json.dumps([{'name': 'Wi-Fi'}, {'name': ''}, {'name': 'Pool'}]),
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Bearer {self.admin_token}'})
+
+        self.assertEqual(response.status_code, 207)
+        data = json.loads(response.data)
+        self.assertEqual([item['index'] for item in data['created']], [0, 2])
+        self.assertEqual([error['index'] for error in data['errors']], [1])
+        self.assertEqual(len(json.loads(self.client.get('/api/v1/amenities/').data)), 2)
+
+    def test_bulk_create_amenities_ndjson(self):
+        """Test import en masse d'amenities depuis un flux NDJSON"""
+        payload = '{"name": "Wi-Fi"}\n\n{"name": "Pool"}\n'
+        response = self.client.post('/api/v1/amenities/bulk',
+                                    data=payload,
+                                    content_type='application/x-ndjson',
+                                    headers={'Authorization': f'Bearer {self.admin_token}'})
+
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(len(data['created']), 2)
+        self.assertEqual(data['errors'], [])
+
+    def test_bulk_create_amenities_invalid_payload(self):
+        """Test import en masse avec un corps qui n'est pas un tableau"""
+        response = self.client.post('/api/v1/amenities/bulk',
+                                    data=json.dumps({'name': 'Wi-Fi'}),
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Bearer {self.admin_token}'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create_amenities_requires_admin(self):
+        """Test que l'import en masse est réservé aux administrateurs"""
+        from app.services import facade
+        facade.create_user({
+            'first_name': 'Regular',
+            'last_name': 'User',
+            'email': 'regular@example.com',
+            'password': 'password123'
+        })
+        token = self.get_auth_token('regular@example.com', 'password123')
+        response = self.client.post('/api/v1/amenities/bulk',
+                                    data=json.dumps([{'name': 'Wi-Fi'}]),
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_amenities_ndjson(self):
+        """Test export NDJSON en streaming de toutes les amenities"""
+        for name in ['Wi-Fi', 'Pool', 'Parking']:
+            self.client.post('/api/v1/amenities/',
+                             data=json.dumps({'name': name}),
+                             content_type='application/json',
+                             headers={'Authorization': f'Bearer {self.admin_token}'})
+
+        response = self.client.get('/api/v1/amenities/export?format=ndjson')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertTrue(response.is_streamed)
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Wi-Fi', 'Pool', 'Parking'])
+
+    def test_export_amenities_unsupported_format(self):
+        """Test export avec un format non supporté"""
+        response = self.client.get('/api/v1/amenities/export?format=csv')
+        self.assertEqual(response.status_code, 400)
+
     def test_update_amenity_success(self):
         """Test mise à jour d'amenity avec succès"""
         # Créer une amenity d'abord
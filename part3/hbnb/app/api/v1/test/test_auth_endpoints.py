@@ -6,6 +6,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
 from app import create_app
 from app.services import facade
+from app import password_hasher
 from app.persistence.repository import InMemoryRepository
 
 
@@ -27,7 +28,7 @@ class TestAuthEndpoints(unittest.TestCase):
             'amenity_repo': amenity_repo
         }
         
-        self.app = create_app(repositories)
+        self.app = create_app(repositories, "config.TestingConfig")
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
@@ -61,6 +62,24 @@ class TestAuthEndpoints(unittest.TestCase):
         self.assertIsInstance(data['access_token'], str)
         self.assertGreater(len(data['access_token']), 0)
 
+    def test_login_hashing_queue_full(self):
+        """Test login lorsque la file de hachage des mots de passe est pleine"""
+        # Configuration de l'application rétablie même si une assertion échoue
+        self.addCleanup(password_hasher.init_app, self.app)
+        password_hasher.configure(4, max_pending=1, queue_timeout=0)
+        password_hasher._slots.acquire()
+        login_data = {
+            'email': 'john.doe@example.com',
+            'password': 'password123'
+        }
+
+        response = self.client.post('/api/v1/auth/login',
+                                    data=json.dumps(login_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
     def test_login_invalid_email(self):
         """Test login avec un email inexistant"""
         login_data = {
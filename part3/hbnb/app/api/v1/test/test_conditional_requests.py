@@ -0,0 +1,137 @@
+import sys
+import os
+import time
+import unittest
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from app import create_app
+from app.services import facade
+from app.persistence.repository import InMemoryRepository
+
+
+class TestConditionalRequests(unittest.TestCase):
+    """Tests des GET conditionnels (ETag, Last-Modified, Cache-Control)"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        repositories = {
+            'user_repo': InMemoryRepository(),
+            'place_repo': InMemoryRepository(),
+            'review_repo': InMemoryRepository(),
+            'amenity_repo': InMemoryRepository()
+        }
+        self.app = create_app(repositories, "config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.owner = facade.create_user({
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': 'john.doe@example.com',
+            'password': 'password123'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'email': 'jane.doe@example.com',
+            'password': 'password123'
+        })
+        self.wifi = facade.create_amenity({'name': 'Wi-Fi'})
+        self.place = facade.create_place({
+            'title': 'Loft',
+            'description': 'Central',
+            'price': 100.0,
+            'latitude': 45.0,
+            'longitude': 5.0,
+            'owner_id': self.owner.id,
+            'amenities': [self.wifi.id]
+        })
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.app_context.pop()
+
+    def _revalidate(self, url, response, header='If-None-Match', validator='ETag'):
+        """Helper pour rejouer une requête avec le validateur d'une réponse"""
+        return self.client.get(url, headers={header: response.headers[validator]})
+
+    def test_resource_not_modified(self):
+        """Test qu'une ressource inchangée est servie en 304 sans corps"""
+        url = f'/api/v1/places/{self.place.id}'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response.headers)
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=60')
+
+        revalidated = self._revalidate(url, response)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.data, b'')
+        self.assertEqual(revalidated.headers['ETag'], response.headers['ETag'])
+
+        since = self._revalidate(url, response, 'If-Modified-Since', 'Last-Modified')
+        self.assertEqual(since.status_code, 304)
+
+    def test_resource_etag_follows_related_objects(self):
+        """Test que l'ETag d'un lieu change avec son propriétaire et ses équipements"""
+        url = f'/api/v1/places/{self.place.id}'
+        first = self.client.get(url)
+        facade.update_amenity(self.wifi.id, {'name': 'Fiber'})
+        second = self._revalidate(url, first)
+        facade.update_user(self.owner.id, {'first_name': 'Johnny'})
+        third = self._revalidate(url, second)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(json.loads(second.data)['amenities'][0]['name'], 'Fiber')
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(json.loads(third.data)['owner']['first_name'], 'Johnny')
+
+    def test_if_modified_since_after_update(self):
+        """Test qu'une mise à jour postérieure invalide If-Modified-Since"""
+        url = f'/api/v1/amenities/{self.wifi.id}'
+        response = self.client.get(url)
+        time.sleep(1)
+        facade.update_amenity(self.wifi.id, {'name': 'Fiber'})
+
+        revalidated = self._revalidate(url, response, 'If-Modified-Since', 'Last-Modified')
+        self.assertEqual(revalidated.status_code, 200)
+
+    def test_collection_not_modified(self):
+        """Test qu'une liste inchangée est servie en 304 et change après une écriture"""
+        url = '/api/v1/places/?limit=10'
+        response = self.client.get(url)
+        self.assertEqual(self._revalidate(url, response).status_code, 304)
+
+        other_page = self.client.get('/api/v1/places/?limit=5',
+                                     headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(other_page.status_code, 200)
+
+        facade.update_place(self.place.id, {'price': 120.0})
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+    def test_marshalled_endpoints(self):
+        """Test les GET conditionnels des reviews et de la recherche"""
+        review = facade.create_review({'text': 'Great loft', 'rating': 5,
+                                       'place_id': self.place.id, 'user_id': self.guest.id})
+        for url in (f'/api/v1/reviews/{review.id}', '/api/v1/reviews/',
+                    f'/api/v1/reviews/places/{self.place.id}/reviews', '/api/v1/search/?q=loft'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(self._revalidate(url, response).status_code, 304, url)
+
+    def test_cache_control_per_namespace(self):
+        """Test la politique Cache-Control configurée par namespace"""
+        users = self.client.get(f'/api/v1/users/{self.owner.id}')
+        amenities = self.client.get('/api/v1/amenities/')
+
+        self.assertEqual(users.headers['Cache-Control'], 'private, no-cache')
+        self.assertEqual(amenities.headers['Cache-Control'], 'public, max-age=300')
+        self.assertEqual(self.client.get(f'/api/v1/users/{self.owner.id}',
+                                         headers={'If-None-Match': '*'}).status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import gzip
+import zlib
+import unittest
+import json
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from app import create_app
+from app.services import facade
+from app.persistence.repository import InMemoryRepository
+from app.api.v1.encoding import select_json_backend
+
+
+class TestResponseEncoding(unittest.TestCase):
+    """Tests de la sérialisation JSON et de la compression des réponses"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        repositories = {
+            'user_repo': InMemoryRepository(),
+            'place_repo': InMemoryRepository(),
+            'review_repo': InMemoryRepository(),
+            'amenity_repo': InMemoryRepository()
+        }
+        self.app = create_app(repositories, "config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Assez d'équipements pour dépasser le seuil de compression
+        for index in range(50):
+            facade.create_amenity({'name': f'Amenity {index}'})
+        self.amenity = facade.create_amenity({'name': 'Wi-Fi'})
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.app_context.pop()
+
+    def test_gzip_large_response(self):
+        """Test qu'une réponse volumineuse est compressée en gzip"""
+        response = self.client.get('/api/v1/amenities/', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        data = json.loads(gzip.decompress(response.data))
+        self.assertEqual(len(data), 51)
+        self.assertTrue(response.headers['ETag'].endswith('-gzip"'))
+
+    def test_deflate_and_preferences(self):
+        """Test la négociation deflate et le refus de compression"""
+        deflate = self.client.get('/api/v1/amenities/', headers={'Accept-Encoding': 'gzip;q=0.5, deflate'})
+        identity = self.client.get('/api/v1/amenities/', headers={'Accept-Encoding': 'gzip;q=0'})
+
+        self.assertEqual(deflate.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(len(json.loads(zlib.decompress(deflate.data))), 51)
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertEqual(len(json.loads(identity.data)), 51)
+
+    def test_small_response_not_compressed(self):
+        """Test qu'une réponse sous le seuil n'est pas compressée"""
+        response = self.client.get(f'/api/v1/amenities/{self.amenity.id}',
+                                   headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(json.loads(response.data)['name'], 'Wi-Fi')
+
+    def test_compressed_etag_revalidation(self):
+        """Test que l'ETag d'une représentation compressée permet un 304"""
+        response = self.client.get('/api/v1/amenities/', headers={'Accept-Encoding': 'gzip'})
+        revalidated = self.client.get('/api/v1/amenities/', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag']
+        })
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers['ETag'], response.headers['ETag'])
+
+    def test_streamed_export_compressed(self):
+        """Test la compression de l'export NDJSON en streaming"""
+        response = self.client.get('/api/v1/amenities/export', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 51)
+        self.assertEqual(json.loads(lines[-1])['name'], 'Wi-Fi')
+
+    def test_select_json_backend(self):
+        """Test le choix de la bibliothèque JSON et le repli sur json"""
+        name, dumps = select_json_backend('json')
+        self.assertEqual(name, 'json')
+        self.assertEqual(json.loads(dumps({'name': 'Café'})), {'name': 'Café'})
+
+        with mock.patch.dict('sys.modules', {'orjson': None, 'ujson': None}):
+            self.assertEqual(select_json_backend()[0], 'json')
+            with self.assertRaises(ValueError):
+                select_json_backend('orjson')
+        with self.assertRaises(ValueError):
+            select_json_backend('yaml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import sys
+import os
+import unittest
+import json
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from app import create_app
+from app.services import facade
+from app.persistence.repository import InMemoryRepository
+
+
+class TestFieldsets(unittest.TestCase):
+    """Tests des paramètres fields et include"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        repositories = {
+            'user_repo': InMemoryRepository(),
+            'place_repo': InMemoryRepository(),
+            'review_repo': InMemoryRepository(),
+            'amenity_repo': InMemoryRepository()
+        }
+        self.app = create_app(repositories, "config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.owner = facade.create_user({
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': 'john.doe@example.com',
+            'password': 'password123'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'email': 'jane.doe@example.com',
+            'password': 'password123'
+        })
+        self.wifi = facade.create_amenity({'name': 'Wi-Fi'})
+        self.places = [facade.create_place({
+            'title': f'Place {index}',
+            'description': 'Nice',
+            'price': 100.0 + index,
+            'latitude': 45.0,
+            'longitude': 5.0,
+            'owner_id': self.owner.id,
+            'amenities': [self.wifi.id]
+        }) for index in range(3)]
+        self.review = facade.create_review({'text': 'Great', 'rating': 5,
+                                            'place_id': self.places[0].id, 'user_id': self.guest.id})
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.app_context.pop()
+
+    def _get(self, url):
+        """Helper pour un GET renvoyant (code, données)"""
+        response = self.client.get(url)
+        return response.status_code, json.loads(response.data)
+
+    def test_place_list_fields_and_include(self):
+        """Test la liste des lieux avec fields et include"""
+        status, data = self._get('/api/v1/places/?fields=title,price&include=owner,amenities,reviews')
+
+        self.assertEqual(status, 200)
+        first = data[0]
+        self.assertEqual(set(first), {'id', 'title', 'price', 'owner', 'amenities', 'reviews'})
+        self.assertEqual(first['owner']['first_name'], 'John')
+        self.assertEqual(first['amenities'], [{'id': self.wifi.id, 'name': 'Wi-Fi'}])
+        self.assertEqual([review['id'] for review in first['reviews']], [self.review.id])
+        self.assertEqual(data[1]['reviews'], [])
+
+    def test_place_list_loads_relations_in_bulk(self):
+        """Test que les reviews d'une page sont chargées en une seule requête"""
+        with mock.patch.object(facade.review_repo, 'get_all_by_attribute_in',
+                               wraps=facade.review_repo.get_all_by_attribute_in) as reviews:
+            status, _ = self._get('/api/v1/places/?include=amenities,reviews')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(reviews.call_count, 1)
+
+    def test_place_list_default_fields(self):
+        """Test que la liste des lieux garde ses champs par défaut"""
+        _, data = self._get('/api/v1/places/')
+        self.assertEqual(set(data[0]), {'id', 'title', 'latitude', 'longitude',
+                                        'review_count', 'average_rating'})
+
+    def test_place_details_fields_and_include(self):
+        """Test le détail d'un lieu avec fields et include"""
+        url = f'/api/v1/places/{self.places[0].id}'
+        _, default = self._get(url)
+        _, sparse = self._get(f'{url}?fields=title&include=reviews')
+
+        self.assertIn('owner', default)
+        self.assertEqual(default['amenities'][0]['name'], 'Wi-Fi')
+        self.assertEqual(set(sparse), {'id', 'title', 'reviews'})
+        self.assertEqual(sparse['reviews'][0]['text'], 'Great')
+
+    def test_review_fields_and_include(self):
+        """Test les reviews avec fields et include"""
+        _, single = self._get(f'/api/v1/reviews/{self.review.id}?fields=rating&include=user,place')
+        _, listed = self._get(f'/api/v1/reviews/places/{self.places[0].id}/reviews?include=user')
+
+        self.assertEqual(set(single), {'id', 'rating', 'user', 'place'})
+        self.assertEqual(single['user']['first_name'], 'Jane')
+        self.assertEqual(single['place']['title'], 'Place 0')
+        self.assertEqual(listed[0]['text'], 'Great')
+        self.assertEqual(listed[0]['user']['id'], self.guest.id)
+
+    def test_user_and_amenity_fields(self):
+        """Test le paramètre fields des utilisateurs et équipements"""
+        _, user = self._get(f'/api/v1/users/{self.owner.id}?fields=email')
+        _, amenities = self._get('/api/v1/amenities/?fields=created_at')
+
+        self.assertEqual(user, {'id': self.owner.id, 'email': 'john.doe@example.com'})
+        self.assertEqual(set(amenities[0]), {'id', 'created_at'})
+
+    def test_invalid_fieldsets(self):
+        """Test les paramètres fields et include invalides"""
+        for url in ('/api/v1/places/?fields=password', '/api/v1/places/?include=owners',
+                    f'/api/v1/places/{self.places[0].id}?include=user',
+                    '/api/v1/reviews/?include=amenities', f'/api/v1/users/{self.owner.id}?fields=password',
+                    '/api/v1/users/?fields=is_admin', '/api/v1/amenities/?include=places'):
+            status, _ = self._get(url)
+            self.assertEqual(status, 400, url)
+
+
+if __name__ == '__main__':
+    unittest.main()
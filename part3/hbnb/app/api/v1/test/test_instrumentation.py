@@ -0,0 +1,173 @@
+import sys
+import os
+import unittest
+import json
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from config import TestingConfig
+from app import create_app, db
+from app.services import facade
+from app.services.instrumentation import InstrumentedRepository, RequestMetrics
+from app.persistence.cache import CachingRepository
+from app.persistence.repository import InMemoryRepository
+
+
+class InstrumentedConfig(TestingConfig):
+    """Configuration de test avec l'instrumentation des requêtes"""
+    INSTRUMENTATION_ENABLED = True
+
+
+class CachedInstrumentedConfig(InstrumentedConfig):
+    """Configuration instrumentée avec le cache de lecture des lieux"""
+    REPOSITORY_CACHE = {'place_repo': {'max_size': 100, 'ttl': 60}}
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests de l'instrumentation des requêtes (Server-Timing et journal)"""
+
+    def _create_app(self, config_class=InstrumentedConfig, repositories=None):
+        """Crée l'application de test et ses données"""
+        self.app = create_app(repositories, config_class)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        owner = facade.create_user({
+            'first_name': 'John', 'last_name': 'Doe',
+            'email': 'john.doe@example.com', 'password': 'password123'
+        })
+        self.place_id = facade.create_place({
+            'title': 'Loft', 'price': 100.0, 'latitude': 45.0, 'longitude': 5.0,
+            'owner_id': owner.id
+        }).id
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+
+    def _get_logged(self, url):
+        """Helper pour un GET renvoyant la réponse et la ligne de journal"""
+        with self.assertLogs('app.services.instrumentation', level='INFO') as logs:
+            response = self.client.get(url)
+        self.assertEqual(len(logs.records), 1)
+        return response, logs.records[0]
+
+    @staticmethod
+    def _server_timing(response):
+        """Métriques de l'en-tête Server-Timing, par nom"""
+        metrics = {}
+        for metric in response.headers['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_server_timing_header(self):
+        """Test de l'en-tête Server-Timing d'une liste"""
+        self._create_app()
+        response, _ = self._get_logged('/api/v1/places/')
+
+        self.assertEqual(response.status_code, 200)
+        metrics = self._server_timing(response)
+        self.assertEqual(list(metrics), ['facade', 'repo', 'db', 'hash', 'hash-queue', 'serialize', 'total'])
+        self.assertEqual(metrics['facade']['desc'], '"3 calls"')
+        self.assertGreaterEqual(float(metrics['total']['dur']), float(metrics['facade']['dur']))
+
+    def test_log_counts_repository_calls_and_sql(self):
+        """Test du journal structuré : appels des repositories et requêtes SQL"""
+        self._create_app()
+        db.session.expunge_all()
+        _, record = self._get_logged(f'/api/v1/places/{self.place_id}')
+        line = json.loads(record.getMessage())
+
+        self.assertEqual(record.levelname, 'INFO')
+        self.assertEqual((line['method'], line['path'], line['status']),
+                         ('GET', f'/api/v1/places/{self.place_id}', 200))
+        self.assertFalse(line['slow'])
+        self.assertEqual(line['repository_methods']['place_repo.get'], 1)
+        self.assertEqual(line['repository_calls'], sum(line['repository_methods'].values()))
+        self.assertGreater(line['sql_statements'], 0)
+
+    def test_password_hasher_metrics(self):
+        """Test que la latence et la file du hacheur sont exposées dans l'en-tête et le journal"""
+        self._create_app()
+        with self.assertLogs('app.services.instrumentation', level='INFO') as logs:
+            response = self.client.post('/api/v1/auth/login', json={
+                'email': 'john.doe@example.com', 'password': 'password123'
+            })
+        self.assertEqual(response.status_code, 200)
+
+        metrics = self._server_timing(response)
+        self.assertEqual(metrics['hash']['desc'], '"1 calls"')
+        self.assertGreater(float(metrics['hash']['dur']), 0)
+        self.assertEqual(metrics['hash-queue'], {'desc': '"0 pending"'})
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['password_hash_calls'], 1)
+        self.assertEqual(line['password_hash_ms'], float(metrics['hash']['dur']))
+        hasher = line['password_hasher']
+        self.assertEqual((hasher['pending'], hasher['max_pending_seen'], hasher['rejected']), (0, 1, 0))
+        self.assertGreater(hasher['verify_avg_ms'], 0)
+        self.assertGreater(hasher['hash_max_ms'], 0)
+
+        response, _ = self._get_logged('/api/v1/places/')
+        self.assertEqual(self._server_timing(response)['hash']['desc'], '"0 calls"')
+
+    def test_failed_statement_leaves_connection_clean(self):
+        """Test qu'une requête SQL en erreur ne laisse pas de mesure sur la connexion"""
+        self._create_app()
+        with self.app.test_request_context():
+            g._request_metrics = RequestMetrics()
+            connection = db.session.connection()
+            with self.assertRaises(OperationalError):
+                connection.execute(text('SELECT * FROM missing_table'))
+            db.session.rollback()
+            connection = db.session.connection()
+            connection.execute(text('SELECT 1'))
+            self.assertEqual(g._request_metrics.sql_statements, 1)
+            self.assertFalse(any(key.startswith('_instrumentation') for key in connection.info))
+
+    def test_slow_request_threshold(self):
+        """Test qu'une requête au-delà du seuil est journalisée en WARNING"""
+        class SlowConfig(InstrumentedConfig):
+            INSTRUMENTATION_SLOW_REQUEST_MS = 0
+
+        self._create_app(SlowConfig)
+        _, record = self._get_logged('/api/v1/places/')
+        self.assertEqual(record.levelname, 'WARNING')
+        self.assertTrue(json.loads(record.getMessage())['slow'])
+
+    def test_server_timing_can_be_disabled(self):
+        """Test de la journalisation sans en-tête Server-Timing"""
+        class LogOnlyConfig(InstrumentedConfig):
+            INSTRUMENTATION_SERVER_TIMING = False
+
+        self._create_app(LogOnlyConfig)
+        response, _ = self._get_logged('/api/v1/places/')
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_disabled_by_default(self):
+        """Test que l'instrumentation est inactive sans configuration"""
+        repositories = {
+            'user_repo': InMemoryRepository(),
+            'place_repo': InMemoryRepository(),
+            'review_repo': InMemoryRepository(),
+            'amenity_repo': InMemoryRepository()
+        }
+        self._create_app(TestingConfig, repositories)
+        response = self.client.get('/api/v1/places/')
+        self.assertNotIn('Server-Timing', response.headers)
+        self.assertNotIsInstance(facade.place_repo, InstrumentedRepository)
+
+    def test_instrumented_repositories_keep_cache_stats(self):
+        """Test que les repositories instrumentés gardent leurs statistiques de cache"""
+        self._create_app(CachedInstrumentedConfig)
+        self.assertIsInstance(facade.place_repo, InstrumentedRepository)
+        self.assertIsInstance(facade.place_repo.repository, CachingRepository)
+        self.assertIn('place_repo', facade.cache_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,7 +28,7 @@ class TestPlacesEndpoints(unittest.TestCase):
             'amenity_repo': amenity_repo
         }
         
-        self.app = create_app(repositories)
+        self.app = create_app(repositories, "config.TestingConfig")
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
@@ -518,6 +518,32 @@ class TestPlacesEndpoints(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(data['error'], 'Unauthorized action')
 
+    def test_update_place_owner_not_writable(self):
+        """Test qu'un PUT ne peut pas transférer une place à un autre utilisateur"""
+        place_id = self._create_place_at('My Place', 48.85, 2.35)
+        other_user_response = self.client.post('/api/v1/users/',
+                                               data=json.dumps({
+                                                   'first_name': 'Other',
+                                                   'last_name': 'User',
+                                                   'email': 'other@example.com',
+                                                   'password': 'password123'
+                                               }),
+                                               content_type='application/json',
+                                               headers={'Authorization': f'Bearer {self.admin_token}'})
+        other_user = json.loads(other_user_response.data)
+
+        for update_data in ({'owner_id': other_user['id']}, {'title': 'Moved', 'owner_id': other_user['id']},
+                            {'id': 'other-id'}, {'created_at': '2020-01-01T00:00:00'}):
+            response = self.client.put(f'/api/v1/places/{place_id}',
+                                       data=json.dumps(update_data),
+                                       content_type='application/json',
+                                       headers={'Authorization': f'Bearer {self.token}'})
+            self.assertEqual(response.status_code, 400)
+
+        data = json.loads(self.client.get(f'/api/v1/places/{place_id}').data)
+        self.assertEqual(data['owner']['id'], self.user['id'])
+        self.assertEqual(data['title'], 'My Place')
+
     def test_update_place_without_token(self):
         """Test qu'on ne peut pas modifier une place sans token JWT"""
         # Créer une place d'abord
@@ -582,6 +608,213 @@ class TestPlacesEndpoints(unittest.TestCase):
         data = json.loads(get_response.data)
         self.assertEqual(data['title'], 'Modified by Admin')
 
+    def _create_place_at(self, title, latitude, longitude, price=100.0, amenities=()):
+        """Helper pour créer une place à des coordonnées données"""
+        place_data = {
+            'title': title,
+            'description': '',
+            'price': price,
+            'latitude': latitude,
+            'longitude': longitude,
+            'amenities': list(amenities)
+        }
+        response = self.client.post('/api/v1/places/',
+                                    data=json.dumps(place_data),
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Bearer {self.token}'})
+        return json.loads(response.data)['id']
+
+    def test_search_places_by_radius(self):
+        """Test la recherche de places dans un rayon, triées par distance"""
+        self._create_place_at('Louvre', 48.8606, 2.3376)
+        self._create_place_at('Eiffel', 48.8584, 2.2945)
+        self._create_place_at('Lyon', 45.7640, 4.8357)
+
+        response = self.client.get('/api/v1/places/search?lat=48.8566&lon=2.3522&radius_km=10')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['title'] for place in data], ['Louvre', 'Eiffel'])
+        self.assertLess(data[0]['distance_km'], data[1]['distance_km'])
+
+    def test_search_places_pagination(self):
+        """Test la pagination des résultats de recherche"""
+        for index in range(3):
+            self._create_place_at(f'Place {index}', 48.85 + index * 0.01, 2.35)
+
+        response = self.client.get('/api/v1/places/search?lat=48.85&lon=2.35&radius_km=50&limit=2')
+        first_page = json.loads(response.data)
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/places/search?lat=48.85&lon=2.35&radius_km=50&limit=2&cursor={cursor}')
+
+        self.assertEqual([place['title'] for place in first_page], ['Place 0', 'Place 1'])
+        self.assertEqual([place['title'] for place in json.loads(response.data)], ['Place 2'])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_search_places_by_bbox_across_antimeridian(self):
+        """Test la recherche dans une boîte englobante traversant l'antiméridien"""
+        self._create_place_at('Fiji', -17.7134, 178.0650)
+        self._create_place_at('Samoa', -13.7590, -172.1046)
+        self._create_place_at('Sydney', -33.8688, 151.2093)
+
+        response = self.client.get('/api/v1/places/search?bbox=170,-20,-170,-10')
+
+        self.assertEqual(response.status_code, 200)
+        titles = {place['title'] for place in json.loads(response.data)}
+        self.assertEqual(titles, {'Fiji', 'Samoa'})
+
+    def test_search_places_invalid_parameters(self):
+        """Test la recherche avec des paramètres invalides"""
+        for query in ('lat=48.8&lon=2.3', 'lat=abc&lon=2.3&radius_km=5', 'lat=95&lon=2.3&radius_km=5',
+                      'lat=48.8&lon=2.3&radius_km=-1', 'bbox=1,2,3', 'lat=48.8&radius_km=5',
+                      'lat=48.8&lon=2.3&radius_km=5&cursor=invalid'):
+            response = self.client.get(f'/api/v1/places/search?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_search_places_by_price_and_amenities(self):
+        """Test la recherche par prix et équipements, triée par prix"""
+        wifi, air, pool = (amenity['id'] for amenity in self.amenities)
+        self._create_place_at('Cheap', 48.85, 2.35, 40.0, [wifi])
+        self._create_place_at('Middle', 48.85, 2.35, 80.0, [wifi, pool])
+        self._create_place_at('Fancy', 48.85, 2.35, 300.0, [wifi, pool, air])
+        self._create_place_at('No wifi', 48.85, 2.35, 90.0, [pool])
+
+        response = self.client.get(f'/api/v1/places/search?min_price=50&max_price=400&amenities={wifi},{pool}')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['title'] for place in data], ['Middle', 'Fancy'])
+        self.assertNotIn('distance_km', data[0])
+
+        response = self.client.get('/api/v1/places/search?max_price=100&limit=2')
+        self.assertEqual([place['title'] for place in json.loads(response.data)], ['Cheap', 'Middle'])
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/places/search?max_price=100&limit=2&cursor={cursor}')
+        self.assertEqual([place['title'] for place in json.loads(response.data)], ['No wifi'])
+
+    def test_search_places_combines_distance_and_filters(self):
+        """Test la recherche géographique filtrée par prix et équipements"""
+        wifi = self.amenities[0]['id']
+        self._create_place_at('Near cheap', 48.8566, 2.3522, 50.0, [wifi])
+        self._create_place_at('Near expensive', 48.8570, 2.3530, 500.0, [wifi])
+        self._create_place_at('Far cheap', 45.7640, 4.8357, 50.0, [wifi])
+
+        response = self.client.get(f'/api/v1/places/search?lat=48.8566&lon=2.3522&radius_km=5&max_price=100&amenities={wifi}')
+
+        self.assertEqual([place['title'] for place in json.loads(response.data)], ['Near cheap'])
+
+    def test_search_places_filters_follow_updates(self):
+        """Test que les index de prix et d'équipements suivent les mises à jour"""
+        wifi, air = self.amenities[0]['id'], self.amenities[1]['id']
+        place_id = self._create_place_at('Updated', 48.85, 2.35, 40.0, [wifi])
+        self.client.put(f'/api/v1/places/{place_id}',
+                        data=json.dumps({'price': 150.0, 'amenities': [air]}),
+                        content_type='application/json',
+                        headers={'Authorization': f'Bearer {self.token}'})
+
+        by_wifi = json.loads(self.client.get(f'/api/v1/places/search?amenities={wifi}').data)
+        by_price = json.loads(self.client.get('/api/v1/places/search?min_price=100&max_price=200').data)
+        by_air = json.loads(self.client.get(f'/api/v1/places/search?amenities={air}').data)
+
+        self.assertEqual(by_wifi, [])
+        self.assertEqual([place['id'] for place in by_price], [place_id])
+        self.assertEqual([place['id'] for place in by_air], [place_id])
+
+    def test_search_places_invalid_filters(self):
+        """Test la recherche avec des filtres invalides"""
+        for query in ('min_price=abc', 'min_price=200&max_price=100', 'min_price=-1', 'amenities=unknown'):
+            response = self.client.get(f'/api/v1/places/search?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_search_places_after_update(self):
+        """Test que la recherche suit les changements de coordonnées"""
+        place_id = self._create_place_at('Moving', 48.8566, 2.3522)
+        self.client.put(f'/api/v1/places/{place_id}',
+                        data=json.dumps({'latitude': 45.7640, 'longitude': 4.8357}),
+                        content_type='application/json',
+                        headers={'Authorization': f'Bearer {self.token}'})
+
+        paris = json.loads(self.client.get('/api/v1/places/search?lat=48.8566&lon=2.3522&radius_km=10').data)
+        lyon = json.loads(self.client.get('/api/v1/places/search?lat=45.7640&lon=4.8357&radius_km=10').data)
+
+        self.assertEqual(paris, [])
+        self.assertEqual([place['id'] for place in lyon], [place_id])
+
+
+    def _review(self, place_id, rating, email):
+        """Helper pour créer une review (et son auteur) via la façade"""
+        from app.services import facade
+        user = facade.create_user({
+            'first_name': 'Reviewer',
+            'last_name': 'Test',
+            'email': email,
+            'password': 'password123'
+        })
+        return facade.create_review({'text': 'Review', 'rating': rating,
+                                     'place_id': place_id, 'user_id': user.id})
+
+    def test_place_rating_aggregates(self):
+        """Test que les agrégats de notes suivent les reviews"""
+        from app.services import facade
+        place_id = self._create_place_at('Rated', 48.85, 2.35)
+        first = self._review(place_id, 5, 'r1@example.com')
+        second = self._review(place_id, 2, 'r2@example.com')
+
+        data = json.loads(self.client.get(f'/api/v1/places/{place_id}').data)
+        self.assertEqual(data['review_count'], 2)
+        self.assertEqual(data['average_rating'], 3.5)
+        self.assertEqual(data['rating_histogram'], {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1})
+
+        facade.update_review(second.id, {'rating': '4'})
+        facade.delete_review(first.id)
+
+        data = json.loads(self.client.get(f'/api/v1/places/{place_id}').data)
+        self.assertEqual(data['review_count'], 1)
+        self.assertEqual(data['average_rating'], 4.0)
+        self.assertEqual(data['rating_histogram'], {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0})
+
+    def test_place_rating_not_writable(self):
+        """Test que les agrégats ne peuvent pas être modifiés par un PUT"""
+        place_id = self._create_place_at('Rated', 48.85, 2.35)
+        response = self.client.put(f'/api/v1/places/{place_id}',
+                                   data=json.dumps({'review_count': 10, 'average_rating': 5.0}),
+                                   content_type='application/json',
+                                   headers={'Authorization': f'Bearer {self.token}'})
+
+        self.assertEqual(response.status_code, 400)
+        data = json.loads(self.client.get(f'/api/v1/places/{place_id}').data)
+        self.assertEqual(data['review_count'], 0)
+        self.assertIsNone(data['average_rating'])
+
+    def test_get_places_sorted_by_rating(self):
+        """Test le tri des lieux par note moyenne et nombre de reviews"""
+        good = self._create_place_at('Good', 48.85, 2.35)
+        best = self._create_place_at('Best', 48.85, 2.35)
+        popular = self._create_place_at('Popular', 48.85, 2.35)
+        self._create_place_at('Unrated', 48.85, 2.35)
+        self._review(good, 4, 'r1@example.com')
+        self._review(best, 5, 'r2@example.com')
+        self._review(popular, 3, 'r3@example.com')
+        self._review(popular, 2, 'r4@example.com')
+
+        response = self.client.get('/api/v1/places/?sort=rating&limit=2')
+        first_page = json.loads(response.data)
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/places/?sort=rating&limit=2&cursor={cursor}')
+
+        self.assertEqual([place['title'] for place in first_page], ['Best', 'Good'])
+        self.assertEqual([place['title'] for place in json.loads(response.data)], ['Popular', 'Unrated'])
+        self.assertEqual(first_page[0]['average_rating'], 5.0)
+
+        data = json.loads(self.client.get('/api/v1/places/?sort=reviews').data)
+        self.assertEqual(data[0]['title'], 'Popular')
+        self.assertEqual(data[0]['review_count'], 2)
+
+    def test_get_places_invalid_sort(self):
+        """Test la liste des lieux avec un tri invalide"""
+        for query in ('sort=price', 'sort=rating&cursor=invalid'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+import unittest
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+
+
+class TestListQueryCounts(unittest.TestCase):
+    """Tests du nombre de requêtes SQL des listes (relations préchargées)"""
+
+    def setUp(self):
+        """Configuration avant chaque test : base SQLite en mémoire"""
+        self.app = create_app(config_class="config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        # Identifiants seulement : les objets sont détachés avant chaque comptage
+        self.owner_id = facade.create_user({
+            'first_name': 'John', 'last_name': 'Doe',
+            'email': 'john.doe@example.com', 'password': 'password123'
+        }).id
+        self.amenity_ids = [facade.create_amenity({'name': name}).id for name in ('Wi-Fi', 'Pool')]
+        self.reviewer_ids = []
+        self.place_ids = []
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+
+    def _add_places(self, count):
+        """Ajoute des lieux ayant chacun des amenities et une review"""
+        for _ in range(count):
+            index = len(self.place_ids)
+            reviewer_id = facade.create_user({
+                'first_name': 'Jane', 'last_name': 'Doe',
+                'email': f'jane{index}@example.com', 'password': 'password123'
+            }).id
+            place_id = facade.create_place({
+                'title': f'Place {index}', 'price': 100.0 + index,
+                'latitude': 45.0, 'longitude': 5.0, 'owner_id': self.owner_id,
+                'amenities': self.amenity_ids
+            }).id
+            facade.create_review({'text': 'Great', 'rating': 4,
+                                  'place_id': place_id, 'user_id': reviewer_id})
+            self.reviewer_ids.append(reviewer_id)
+            self.place_ids.append(place_id)
+
+    def _count_queries(self, url):
+        """Exécute un GET sur une session vide et compte les requêtes SQL"""
+        db.session.expunge_all()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 200)
+        if response.mimetype == 'application/x-ndjson':
+            return len(statements), [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        return len(statements), json.loads(response.data)
+
+    def _assert_fixed_count(self, url, expected):
+        """Vérifie que le nombre de requêtes ne dépend pas de la taille de la page"""
+        self._add_places(2)
+        small, rows = self._count_queries(url)
+        self.assertEqual(len(rows), 2)
+        self._add_places(4)
+        large, rows = self._count_queries(url)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(small, large)
+        self.assertEqual(large, expected)
+        return rows
+
+    def test_place_list(self):
+        """Test de la liste des lieux avec tous les champs"""
+        rows = self._assert_fixed_count('/api/v1/places/?fields=owner_id,amenities', 3)
+        self.assertEqual(rows[0]['owner_id'], self.owner_id)
+        self.assertEqual(len(rows[0]['amenities']), 2)
+
+    def test_place_list_with_relations(self):
+        """Test de la liste des lieux avec propriétaire, amenities et reviews inclus"""
+        rows = self._assert_fixed_count('/api/v1/places/?include=owner,amenities,reviews', 7)
+        self.assertEqual(rows[0]['reviews'][0]['user_id'], self.reviewer_ids[0])
+
+    def test_place_list_sorted(self):
+        """Test de la liste des lieux triée par note"""
+        # Lieux notés puis lieux sans note (deux requêtes indexées), amenities
+        self._assert_fixed_count('/api/v1/places/?sort=rating', 4)
+
+    def test_review_list(self):
+        """Test de la liste des reviews avec auteur et lieu inclus"""
+        rows = self._assert_fixed_count('/api/v1/reviews/?include=user,place', 4)
+        self.assertEqual(rows[0]['place']['id'], self.place_ids[0])
+
+    def test_place_review_list(self):
+        """Test de la liste des reviews d'un lieu"""
+        self._add_places(1)
+        count, rows = self._count_queries(f'/api/v1/reviews/places/{self.place_ids[0]}/reviews')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['user_id'], self.reviewer_ids[0])
+        self.assertEqual(count, 3)
+
+    def test_place_export(self):
+        """Test de l'export des lieux (préchargement par lot)"""
+        rows = self._assert_fixed_count('/api/v1/places/export', 2)
+        self.assertCountEqual(rows[0]['amenities'], self.amenity_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,7 +36,7 @@ class TestReviewsEndpoints(unittest.TestCase):
         }
         
         # Créer l'application avec les repositories
-        self.app = create_app(repositories)
+        self.app = create_app(repositories, "config.TestingConfig")
         # S'assurer que les repositories sont bien stockés dans app.config
         self.app.config['repositories'] = repositories
         self.client = self.app.test_client()
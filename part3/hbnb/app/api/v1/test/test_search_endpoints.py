@@ -0,0 +1,123 @@
+import sys
+import os
+import unittest
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+from app import create_app
+from app.services import facade
+from app.persistence.repository import InMemoryRepository
+
+
+class TestSearchEndpoints(unittest.TestCase):
+    """Tests pour l'endpoint de recherche plein texte"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        repositories = {
+            'user_repo': InMemoryRepository(),
+            'place_repo': InMemoryRepository(),
+            'review_repo': InMemoryRepository(),
+            'amenity_repo': InMemoryRepository()
+        }
+        self.app = create_app(repositories, "config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.owner = facade.create_user({
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': 'john.doe@example.com',
+            'password': 'password123'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'email': 'jane.doe@example.com',
+            'password': 'password123'
+        })
+        self.beach = self._create_place('Beach house', 'Right on the beach')
+        self.chalet = self._create_place('Mountain chalet', 'Skiing and fondue')
+        self.review = facade.create_review({
+            'text': 'Lovely beach, great chalet-style decoration',
+            'rating': 5,
+            'place_id': self.beach.id,
+            'user_id': self.guest.id
+        })
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.app_context.pop()
+
+    def _create_place(self, title, description):
+        """Helper pour créer une place"""
+        return facade.create_place({
+            'title': title,
+            'description': description,
+            'price': 100.0,
+            'latitude': 45.0,
+            'longitude': 5.0,
+            'owner_id': self.owner.id
+        })
+
+    def _search(self, query):
+        """Helper pour appeler l'endpoint de recherche"""
+        response = self.client.get(f'/api/v1/search/?{query}')
+        return response, json.loads(response.data)
+
+    def test_search_places_and_reviews(self):
+        """Test la recherche dans les lieux et les reviews"""
+        response, data = self._search('q=beach')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({(hit['type'], hit['id']) for hit in data},
+                         {('place', self.beach.id), ('review', self.review.id)})
+        review_hit = next(hit for hit in data if hit['type'] == 'review')
+        self.assertEqual(review_hit['place_id'], self.beach.id)
+
+    def test_search_by_prefix_and_type(self):
+        """Test la recherche par préfixe filtrée par type"""
+        response, data = self._search('q=chal&type=place')
+        self.assertEqual([hit['id'] for hit in data], [self.chalet.id])
+
+    def test_search_follows_updates_and_deletes(self):
+        """Test que l'index suit les mises à jour et suppressions"""
+        facade.update_place(self.chalet.id, {'title': 'Lake cabin', 'description': 'Quiet lake'})
+        facade.delete_review(self.review.id)
+
+        _, chalet = self._search('q=fondue')
+        _, lake = self._search('q=lake')
+        _, beach = self._search('q=beach')
+
+        self.assertEqual(chalet, [])
+        self.assertEqual([hit['id'] for hit in lake], [self.chalet.id])
+        self.assertEqual([hit['id'] for hit in beach], [self.beach.id])
+
+    def test_search_ignores_rolled_back_writes(self):
+        """Test qu'une écriture annulée n'est pas indexée"""
+        with self.assertRaises(ValueError):
+            with facade.transaction():
+                self._create_place('Desert tent', 'Sand everywhere')
+                raise ValueError("rollback")
+
+        _, data = self._search('q=desert')
+        self.assertEqual(data, [])
+
+    def test_search_pagination(self):
+        """Test la pagination des résultats"""
+        response, first = self._search('q=beach&limit=1')
+        cursor = response.headers['X-Next-Cursor']
+        response, second = self._search(f'q=beach&limit=1&cursor={cursor}')
+        self.assertEqual(len(first + second), 2)
+        self.assertNotEqual(first[0]['id'], second[0]['id'])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_search_invalid_parameters(self):
+        """Test la recherche avec des paramètres invalides"""
+        for query in ('q=', 'q=beach&type=user', 'q=beach&cursor=invalid'):
+            response, _ = self._search(query)
+            self.assertEqual(response.status_code, 400, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
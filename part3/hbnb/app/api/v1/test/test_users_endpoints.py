@@ -27,7 +27,7 @@ class TestUsersEndpoints(unittest.TestCase):
             'amenity_repo': amenity_repo
         }
         
-        self.app = create_app(repositories)
+        self.app = create_app(repositories, "config.TestingConfig")
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
@@ -737,5 +737,30 @@ class TestUsersEndpoints(unittest.TestCase):
         self.assertEqual(data['last_name'], 'ByAdmin')
 
 
+    def test_export_users_requires_admin(self):
+        """Test que l'export des utilisateurs est réservé aux administrateurs"""
+        response = self.client.get('/api/v1/users/export')
+        self.assertEqual(response.status_code, 401)
+
+        token = self.get_auth_token('regular@example.com', 'password123')
+        response = self.client.get('/api/v1/users/export',
+                                   headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get('/api/v1/users/export',
+                                   headers={'Authorization': f'Bearer {self.admin_token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = {row['email']: row for row in map(json.loads, response.get_data(as_text=True).splitlines())}
+        self.assertEqual(set(rows), {'admin@example.com', 'regular@example.com'})
+        self.assertTrue(rows['admin@example.com']['is_admin'])
+        self.assertNotIn('password', rows['regular@example.com'])
+
+    def test_user_fields_do_not_expose_role(self):
+        """Test que le rôle n'est pas exposé par le paramètre fields"""
+        response = self.client.get(f'/api/v1/users/{self.admin_user.id}?fields=email,is_admin')
+        self.assertEqual(response.status_code, 400)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,21 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.pagination import pagination_parser, get_pagination_args, pagination_headers
+from app.api.v1.conditional import conditional_headers, collection_etag, resource_etag, last_modified
+from app.api.v1.fieldsets import add_fieldset_arguments, get_fieldset, select_fields
+from app.api.v1.bulk import parse_bulk_payload, bulk_batch_size, bulk_response
+from app.api.v1.export import export_parser, get_export_format, export_batch_size, ndjson_response
 
 api = Namespace('users', description="Users operations")
 
+# Champs d'un utilisateur pouvant être demandés (fields=) et champs par défaut
+USER_FIELDS = ('id', 'first_name', 'last_name', 'email', 'created_at', 'updated_at')
+DEFAULT_FIELDS = {'id', 'first_name', 'last_name', 'email'}
+
+list_parser = add_fieldset_arguments(pagination_parser.copy())
+detail_parser = add_fieldset_arguments(reqparse.RequestParser())
+
 user_model = api.model('User', {
     'first_name': fields.String(required=True, description="First name of the user"),
     'last_name': fields.String(required=True, description="Last name of the user"),
@@ -66,28 +78,33 @@ class UserList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
         
+    @api.expect(list_parser)
     @api.response(200, "List of users retrieved successfully")
+    @api.response(400, "Invalid pagination or fields parameters")
     def get(self):
         """
-        Récupère tous les utilisateurs.
+        Récupère une page d'utilisateurs.
 
         Returns:
-            list: Liste des utilisateurs.
+            tuple: Liste des utilisateurs, code HTTP et en-têtes de pagination.
         """
-        users = facade.get_all_users()
+        try:
+            cursor, limit = get_pagination_args()
+            fields, _ = get_fieldset(USER_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        headers = conditional_headers(api.name, collection_etag(*facade.collection_version('user')))
+        users, next_cursor = facade.get_users_page(cursor, limit)
         return [
-            {
-                'id': user.id,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'email': user.email
-            } for user in users
-        ], 200
+            select_fields(_user_row(user), fields or DEFAULT_FIELDS) for user in users
+        ], 200, {**pagination_headers(next_cursor), **headers}
 
 
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @api.expect(detail_parser)
     @api.response(200, "User details retrieved successfully")
+    @api.response(400, "Invalid fields parameter")
     @api.response(404, "User not found")
     def get(self, user_id):
         """
@@ -102,12 +119,12 @@ class UserResource(Resource):
         user = facade.get_user(user_id)
         if not user:
             return {'error': "User not found"}, 404
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        try:
+            fields, _ = get_fieldset(USER_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        headers = conditional_headers(api.name, resource_etag(user), last_modified(user))
+        return select_fields(_user_row(user), fields or DEFAULT_FIELDS), 200, headers
 
     @jwt_required()
     @api.expect(user_update_model, validate=False)
@@ -171,3 +188,83 @@ class UserResource(Resource):
 
         except ValueError as e:
             return {'error': str(e)}, 400
+
+
+@api.route('/bulk')
+class UserBulk(Resource):
+    @jwt_required()
+    @api.response(201, "Users successfully created")
+    @api.response(207, "Some users could not be created")
+    @api.response(400, "Invalid payload")
+    @api.response(401, "Unauthorized")
+    @api.response(403, "Admin privileges required")
+    def post(self):
+        """
+        Importe des utilisateurs en masse.
+
+        Accepte un tableau JSON ou un flux NDJSON (application/x-ndjson).
+
+        Returns:
+            tuple: Identifiants créés, erreurs par élément et code HTTP.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': "Admin privileges required"}, 403
+
+        try:
+            items = parse_bulk_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return bulk_response(facade.bulk_create_users(items, batch_size=bulk_batch_size()))
+
+
+def _user_row(user, include_role=False):
+    """
+    Représentation complète d'un utilisateur, sans mot de passe (export et paramètre fields).
+
+    Args:
+        user (User): Utilisateur à représenter.
+        include_role (bool): Ajoute is_admin (réservé aux administrateurs).
+
+    Returns:
+        dict: Champs de l'utilisateur.
+    """
+    row = {
+        'id': user.id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'email': user.email,
+        'created_at': user.created_at.isoformat(),
+        'updated_at': user.updated_at.isoformat()
+    }
+    if include_role:
+        row['is_admin'] = user.is_admin
+    return row
+
+
+@api.route('/export')
+class UserExport(Resource):
+    @jwt_required()
+    @api.expect(export_parser)
+    @api.response(200, "Users exported as NDJSON")
+    @api.response(400, "Unsupported export format")
+    @api.response(401, "Unauthorized")
+    @api.response(403, "Admin privileges required")
+    def get(self):
+        """
+        Exporte tous les utilisateurs en NDJSON (streaming), réservé aux administrateurs.
+
+        Returns:
+            Response: Flux application/x-ndjson, un utilisateur par ligne.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': "Admin privileges required"}, 403
+
+        try:
+            get_export_format()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return ndjson_response(facade.iter_users(export_batch_size()),
+                               lambda user: _user_row(user, include_role=True))
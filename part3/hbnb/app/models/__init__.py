@@ -1 +1,7 @@
- 
\ No newline at end of file
+# Import de tous les modèles : les relations entre tables sont résolues par nom
+from .user import User
+from .amenity import Amenity
+from .place import Place, place_amenity
+from .review import Review
+
+__all__ = ['User', 'Amenity', 'Place', 'Review', 'place_amenity']
@@ -1,8 +1,14 @@
+from app import db
 from .base_model import BaseModel
 
 
 class Amenity(BaseModel):
     """Classe pour la gestion des équipements"""
+    __tablename__ = 'amenities'
+    UPDATABLE_FIELDS = ('name',)
+
+    name = db.Column(db.String(50), nullable=False)
+
     def __init__(self, name):
         super().__init__()
 
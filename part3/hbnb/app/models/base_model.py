@@ -1,9 +1,21 @@
 import uuid
 from datetime import datetime
+from app import db
 
 
-class BaseModel:
+class BaseModel(db.Model):
     """Classe de base pour tous les modèles"""
+    __abstract__ = True
+
+    # Colonnes communes : created_at est indexé pour la pagination par clé
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    # Attributs modifiables par update() : l'identifiant, les dates et les
+    # rattachements (propriétaire, lieu, auteur) ne le sont jamais
+    UPDATABLE_FIELDS = ()
+
     def __init__(self):
         """Initialisation des attributs de l'objet"""
         self.id = str(uuid.uuid4())
@@ -15,8 +27,16 @@ class BaseModel:
         self.updated_at = datetime.now()
 
     def update(self, data):
-        """Met à jour les attributs passés dans le dictionnaire data"""
+        """
+        Met à jour les attributs passés dans le dictionnaire data.
+
+        Raises:
+            ValueError: Si un attribut ne fait pas partie de UPDATABLE_FIELDS
+                (rien n'est alors modifié).
+        """
+        rejected = sorted(set(data) - set(self.UPDATABLE_FIELDS))
+        if rejected:
+            raise ValueError(f"Cannot update field(s): {', '.join(rejected)}")
         for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            setattr(self, key, value)
         self.save()
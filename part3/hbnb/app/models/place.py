@@ -1,9 +1,43 @@
+from app import db
 from .base_model import BaseModel
 from .user import User
 
+# Table d'association entre les lieux et leurs équipements
+place_amenity = db.Table(
+    'place_amenity',
+    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
+    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id')
+)
+
 
 class Place(BaseModel):
     """Classe pour la gestion des lieux"""
+    __tablename__ = 'places'
+    # Index composite utilisé par le préfiltre des recherches par boîte englobante
+    __table_args__ = (db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),)
+
+    # Agrégats de notes maintenus par la façade à chaque écriture de review
+    RATING_FIELDS = ('review_count', 'average_rating', 'rating_histogram')
+    # Attributs modifiables par les clients ; les agrégats ne sont écrits
+    # que par la façade
+    EDITABLE_FIELDS = ('title', 'description', 'price', 'latitude', 'longitude', 'amenities')
+    UPDATABLE_FIELDS = EDITABLE_FIELDS + RATING_FIELDS
+
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False, default='')
+    price = db.Column(db.Float, nullable=False, index=True)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    average_rating = db.Column(db.Float, index=True)
+    rating_histogram = db.Column(db.JSON, nullable=False, default=lambda: [0] * 5)
+
+    owner = db.relationship('User')
+    amenities = db.relationship('Amenity', secondary=place_amenity)
+    reviews = db.relationship('Review', back_populates='place')
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         """Initialisation des attributs de l'objet"""
         super().__init__()
@@ -31,13 +65,69 @@ class Place(BaseModel):
         # Initialisation des listes vides
         self.reviews = []
         self.amenities = []
+
+        # Agrégats des notes : nombre de reviews par note (1 à 5)
+        self.review_count = 0
+        self.average_rating = None
+        self.rating_histogram = [0] * 5
     
 
     def add_review(self, review):
-        """Ajoute une review à la liste des reviews"""
-        self.reviews.append(review)
+        """Ajoute une review à la liste des reviews (déjà présente si review.place est ce lieu)"""
+        if review not in self.reviews:
+            self.reviews.append(review)
+    
+
+    def remove_review(self, review):
+        """Retire une review supprimée de la liste des reviews, si elle est chargée
+        (une liste SQLAlchemy non chargée sera relue sans elle)"""
+        reviews = self.__dict__.get('reviews')
+        if reviews is not None and review in reviews:
+            reviews.remove(review)
     
 
     def add_amenity(self, amenity):
         """Ajoute une amenity à la liste des amenities"""
-        self.amenities.append(amenity.id)
+        self.amenities.append(amenity)
+
+
+    def rating_summary(self, added=None, removed=None):
+        """
+        Calcule les agrégats de notes après l'ajout et/ou le retrait d'une note.
+
+        Le lieu n'est pas modifié : les valeurs renvoyées sont destinées au
+        repository, pour que la mise à jour reste annulable.
+
+        Args:
+            added (int): Note ajoutée (1 à 5), ou None.
+            removed (int): Note retirée (1 à 5), ou None.
+
+        Returns:
+            dict: Nouvelles valeurs de review_count, average_rating et
+            rating_histogram.
+        """
+        histogram = list(self.rating_histogram)
+        if removed is not None:
+            histogram[removed - 1] = max(0, histogram[removed - 1] - 1)
+        if added is not None:
+            histogram[added - 1] += 1
+        return self.summarize_ratings(histogram)
+
+    @staticmethod
+    def summarize_ratings(histogram):
+        """
+        Calcule les agrégats de notes à partir d'un histogramme.
+
+        Args:
+            histogram (list): Nombre de reviews pour chaque note de 1 à 5.
+
+        Returns:
+            dict: Valeurs de review_count, average_rating et rating_histogram.
+        """
+        count = sum(histogram)
+        total = sum(rating * number for rating, number in enumerate(histogram, 1))
+        return {
+            'review_count': count,
+            'average_rating': round(total / count, 2) if count else None,
+            'rating_histogram': list(histogram)
+        }
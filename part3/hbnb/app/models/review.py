@@ -1,3 +1,4 @@
+from app import db
 from .base_model import BaseModel
 from .user import User
 from .place import Place
@@ -5,6 +6,19 @@ from .place import Place
 
 class Review(BaseModel):
     """Classe pour la gestion des reviews"""
+    __tablename__ = 'reviews'
+    # Un utilisateur ne laisse qu'une review par lieu
+    __table_args__ = (db.UniqueConstraint('place_id', 'user_id', name='uq_reviews_place_user'),)
+    UPDATABLE_FIELDS = ('text', 'rating')
+
+    text = db.Column(db.Text, nullable=False)
+    rating = db.Column(db.Integer, nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False, index=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+
+    place = db.relationship('Place', back_populates='reviews')
+    user = db.relationship('User')
+
     def __init__(self, text, rating, place, user):
         super().__init__()
 
@@ -90,7 +90,43 @@ class TestPlace(unittest.TestCase):
         place.add_amenity(amenity)
 
         self.assertEqual(len(place.amenities), 1)
-        self.assertEqual(place.amenities[0], amenity.id)  # Vérifier l'ID au lieu de l'objet
+        self.assertEqual(place.amenities[0], amenity)
+
+    def test_update_protected_fields(self):
+        """Test que le propriétaire, l'identifiant, les dates et les reviews
+        ne sont pas modifiables"""
+        place = Place("Loft", "Description", 100.0, 45.0, 2.0, self.user)
+        other = User("Bob", "Martin", "bob@example.com", "password123")
+        created_at = place.created_at
+        for data in ({'owner': other}, {'owner_id': other.id}, {'id': 'other-id'},
+                     {'created_at': None}, {'reviews': []}, {'title': 'Renamed', 'owner': other}):
+            with self.assertRaises(ValueError):
+                place.update(data)
+        self.assertEqual((place.owner, place.title, place.created_at), (self.user, "Loft", created_at))
+
+        place.update({'title': 'Renamed', 'price': 120.0})
+        self.assertEqual((place.title, place.price), ('Renamed', 120.0))
+
+    def test_rating_summary(self):
+        """Test du calcul des agrégats de notes"""
+        place = Place("Seaside House", "Ocean view", 150.0, 43.0, -1.0, self.user)
+        self.assertEqual(place.review_count, 0)
+        self.assertIsNone(place.average_rating)
+
+        place.update(place.rating_summary(added=5))
+        place.update(place.rating_summary(added=2))
+        self.assertEqual(place.review_count, 2)
+        self.assertEqual(place.average_rating, 3.5)
+        self.assertEqual(place.rating_histogram, [0, 1, 0, 0, 1])
+
+        summary = place.rating_summary(added=4, removed=2)
+        self.assertEqual(summary['average_rating'], 4.5)
+        self.assertEqual(place.rating_histogram, [0, 1, 0, 0, 1])  # Le lieu n'est pas modifié
+
+        place.update(place.rating_summary(removed=5))
+        place.update(place.rating_summary(removed=2))
+        self.assertEqual(place.review_count, 0)
+        self.assertIsNone(place.average_rating)
 
 
 if __name__ == "__main__":
@@ -26,6 +26,18 @@ class TestReview(unittest.TestCase):
         self.assertEqual(review.place, self.place)
         self.assertEqual(review.user, self.user)
 
+    def test_update_protected_fields(self):
+        """Test qu'une review ne peut pas changer de lieu ni d'auteur"""
+        review = Review("Great stay!", 5, self.place, self.user)
+        other_place = Place("Dark Basement", "Quiet", 30.0, 45.0, 4.0, self.user)
+        for data in ({'place': other_place}, {'place_id': other_place.id}, {'user_id': 'other-id'}):
+            with self.assertRaises(ValueError):
+                review.update(data)
+        self.assertEqual(review.place, self.place)
+
+        review.update({'text': 'Still great', 'rating': 4})
+        self.assertEqual((review.text, review.rating), ('Still great', 4))
+
     def test_invalid_rating(self):
         """Test de la création d'un avis avec une note invalide"""
         with self.assertRaises(ValueError):
@@ -2,6 +2,7 @@ import sys
 import os
 import unittest
 import time
+from unittest import mock
 
 # Ajout du chemin du projet à sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
@@ -85,6 +86,21 @@ class TestUser(unittest.TestCase):
         self.assertEqual(user.first_name, "Alicia")
         self.assertGreater(user.updated_at, old_updated_at)
 
+    def test_user_update_protected_fields(self):
+        """Test que les droits et l'identifiant ne sont pas modifiables et
+        qu'un nouveau mot de passe est haché"""
+        user = User("Alice", "Dupont", "alice@example.com", "example_password")
+        user_id = user.id
+        with self.assertRaises(ValueError):
+            user.update({"first_name": "Alicia", "is_admin": True})
+        with self.assertRaises(ValueError):
+            user.update({"id": "other-id"})
+        self.assertEqual((user.id, user.first_name, user.is_admin), (user_id, "Alice", False))
+
+        user.update({"password": "new_password"})
+        self.assertNotEqual(user.password, "new_password")
+        self.assertTrue(user.verify_password("new_password"))
+
     def test_max_length_valid(self):
         """Test longueurs maximales valides (50 caractères)"""
         user = User(
@@ -207,6 +223,38 @@ class TestUser(unittest.TestCase):
         self.assertTrue(user1.verify_password(password))
         self.assertTrue(user2.verify_password(password))
 
+    def test_from_password_hash_does_not_rehash(self):
+        """Test de la création d'un utilisateur à partir d'une empreinte existante, sans hachage"""
+        existing = User(first_name="Test", last_name="User", email="test@example.com",
+                        password="my_secure_password")
+        with mock.patch.object(User, 'hash_password', side_effect=AssertionError("rehashed")):
+            user = User.from_password_hash("Copy", "User", "copy@example.com", existing.password,
+                                           is_admin=True)
+        self.assertEqual(user.password, existing.password)
+        self.assertEqual((user.first_name, user.last_name, user.email), ("Copy", "User", "copy@example.com"))
+        self.assertTrue(user.is_admin)
+        self.assertNotEqual(user.id, existing.id)
+        self.assertIsNotNone(user.created_at)
+        self.assertTrue(user.verify_password("my_secure_password"))
+
+    def test_from_password_hash_rejects_malformed_hashes(self):
+        """Test que seules les empreintes bcrypt bien formées sont acceptées"""
+        valid = "$2b$12$" + "a" * 53
+        self.assertTrue(User.is_password_hash(valid))
+        for password_hash in [None, "", "my_secure_password", "$2b$12$" + "a" * 52,
+                              "$2b$99$" + "a" * 53, "$1$12$" + "a" * 53, "$2b$12$" + "!" * 53]:
+            with self.subTest(password_hash=password_hash):
+                with self.assertRaises(ValueError) as context:
+                    User.from_password_hash("Test", "User", "test@example.com", password_hash)
+                self.assertEqual(str(context.exception), "password_hash must be a valid bcrypt hash")
+
+    def test_from_password_hash_validates_profile(self):
+        """Test que from_password_hash applique les validations du constructeur"""
+        with self.assertRaises(ValueError):
+            User.from_password_hash("Test", "User", "invalid-email", "$2b$12$" + "a" * 53)
+        with self.assertRaises(ValueError):
+            User.from_password_hash("", "User", "test@example.com", "$2b$12$" + "a" * 53)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,18 +1,30 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import configure_mappers
+from app import db
 from .base_model import BaseModel
 import re
 
 
 class User(BaseModel):
     """Classe pour la gestion des utilisateurs"""
+    __tablename__ = 'users'
+
+    first_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False)
+    email = db.Column(db.String(120), nullable=False, unique=True, index=True)
+    password = db.Column(db.String(128), nullable=False)
+    is_admin = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Les droits d'administration ne sont pas modifiables par update()
+    UPDATABLE_FIELDS = ('first_name', 'last_name', 'email', 'password')
+
+    # Empreinte bcrypt : $2b$<coût>$ puis 22 caractères de sel et 31 d'empreinte
+    PASSWORD_HASH_PATTERN = re.compile(r"^\$2[abxy]?\$(0[4-9]|[12][0-9]|3[01])\$[./A-Za-z0-9]{53}$")
+
     def __init__(self, first_name, last_name, email, password, is_admin=False):
         """Initialisation des attributs de l'objet"""
         super().__init__()
-        if not first_name or len(first_name) > 50:
-            raise ValueError("first_name is required and must be at most 50 characters")
-        if not last_name or len(last_name) > 50:
-            raise ValueError("last_name is required and must be at most 50 characters")
-        if not self.validate_email(email):
-            raise ValueError("email must be a valid email address")
+        self._validate_profile(first_name, last_name, email)
         if not password:
             raise ValueError("password is required")
         self.hash_password(password)
@@ -23,18 +35,65 @@ class User(BaseModel):
         self.email = email
         self.is_admin = is_admin
 
+    @classmethod
+    def from_password_hash(cls, first_name, last_name, email, password_hash, is_admin=False):
+        """
+        Crée un utilisateur à partir d'une empreinte bcrypt déjà calculée.
+
+        Mêmes validations que le constructeur, mais sans hachage : utilisé
+        par les imports et les chargements de comptes existants.
+
+        Raises:
+            ValueError: Si un attribut est invalide ou si password_hash
+                n'est pas une empreinte bcrypt bien formée.
+        """
+        if not cls.is_password_hash(password_hash):
+            raise ValueError("password_hash must be a valid bcrypt hash")
+        # Instance créée sans appeler __init__ (qui hacherait le mot de passe) ;
+        # les mappers doivent être configurés, ce que fait sinon le constructeur
+        configure_mappers()
+        user = inspect(cls).class_manager.new_instance()
+        BaseModel.__init__(user)
+        user._validate_profile(first_name, last_name, email)
+        user.password = password_hash
+        user.first_name = first_name
+        user.last_name = last_name
+        user.email = email
+        user.is_admin = is_admin
+        return user
+
+    @classmethod
+    def is_password_hash(cls, value):
+        """Indique si une valeur est une empreinte bcrypt bien formée."""
+        return isinstance(value, str) and cls.PASSWORD_HASH_PATTERN.match(value) is not None
+
+    def _validate_profile(self, first_name, last_name, email):
+        """Validation du nom, du prénom et de l'email"""
+        if not first_name or len(first_name) > 50:
+            raise ValueError("first_name is required and must be at most 50 characters")
+        if not last_name or len(last_name) > 50:
+            raise ValueError("last_name is required and must be at most 50 characters")
+        if not self.validate_email(email):
+            raise ValueError("email must be a valid email address")
 
     def validate_email(self, email):
         """Validation de l'email"""
         regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
         return re.match(regex, email) is not None
 
+    def update(self, data):
+        """Met à jour le profil ; un nouveau mot de passe est haché."""
+        if 'password' in data:
+            from app import password_hasher
+            data = {**data, 'password': password_hasher.hash(data['password'])}
+        super().update(data)
+
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        from app import bcrypt
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        from app import password_hasher
+        self.password = password_hasher.hash(password)
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        from app import bcrypt
-        return bcrypt.check_password_hash(self.password, password)
+        from app import password_hasher
+        return password_hasher.verify(self.password, password)
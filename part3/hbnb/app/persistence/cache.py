@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import OrderedDict
+from app.persistence.repository import Repository
+
+
+class CachingRepository(Repository):
+    """
+    Décorateur de Repository ajoutant un cache de lecture par identifiant.
+
+    Les objets lus par get et get_many sont conservés dans un cache LRU
+    borné (max_size) dont les entrées expirent après ttl secondes. Les
+    écritures passent par le repository décoré et invalident les entrées
+    concernées ; un rollback vide le cache.
+    """
+    def __init__(self, repository, max_size=1024, ttl=300, clock=time.monotonic):
+        """
+        Initialise le cache.
+
+        Args:
+            repository (Repository): Repository décoré.
+            max_size (int): Nombre maximum d'objets en cache.
+            ttl (float): Durée de vie d'une entrée, en secondes.
+            clock (callable): Horloge monotone (remplaçable pour les tests).
+        """
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def add(self, obj):
+        """Ajoute un objet via le repository décoré."""
+        self.repository.add(obj)
+        self.invalidate(obj.id)
+
+    def add_many(self, objs):
+        """Ajoute plusieurs objets via le repository décoré."""
+        objs = list(objs)
+        self.repository.add_many(objs)
+        for obj in objs:
+            self.invalidate(obj.id)
+
+    def get(self, obj_id):
+        """
+        Récupère un objet, depuis le cache si possible.
+
+        Args:
+            obj_id: Identifiant de l'objet.
+
+        Returns:
+            Objet trouvé ou None si inexistant.
+        """
+        obj = self._lookup(obj_id)
+        if obj is not None:
+            return obj
+        obj = self.repository.get(obj_id)
+        if obj is not None:
+            self._store(obj)
+        return obj
+
+    def get_for_update(self, obj_id):
+        """Récupère un objet à modifier, toujours depuis le repository décoré."""
+        return self.repository.get_for_update(obj_id)
+
+    def get_many(self, obj_ids):
+        """
+        Récupère plusieurs objets ; seuls les absents du cache sont lus.
+
+        Args:
+            obj_ids (iterable): Identifiants des objets.
+
+        Returns:
+            list: Objets trouvés, dans l'ordre des identifiants (sans doublon).
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        found = {}
+        for obj_id in obj_ids:
+            obj = self._lookup(obj_id)
+            if obj is not None:
+                found[obj_id] = obj
+        missing = [obj_id for obj_id in obj_ids if obj_id not in found]
+        if missing:
+            for obj in self.repository.get_many(missing):
+                self._store(obj)
+                found[obj.id] = obj
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    def get_all(self, load=()):
+        """Récupère tous les objets (non mis en cache)."""
+        return self.repository.get_all(load)
+
+    def get_page(self, cursor=None, limit=None, filters=None, load=()):
+        """Récupère une page d'objets (non mise en cache)."""
+        return self.repository.get_page(cursor, limit, filters, load)
+
+    def iter_all(self, batch_size=1000, load=()):
+        """Parcourt tous les objets (non mis en cache)."""
+        return self.repository.iter_all(batch_size, load)
+
+    def update(self, obj_id, data):
+        """Met à jour un objet et invalide son entrée."""
+        try:
+            return self.repository.update(obj_id, data)
+        finally:
+            self.invalidate(obj_id)
+
+    def delete(self, obj_id):
+        """Supprime un objet et invalide son entrée."""
+        try:
+            return self.repository.delete(obj_id)
+        finally:
+            self.invalidate(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """Récupère un objet par attribut (délégué)."""
+        return self.repository.get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value, load=()):
+        """Récupère les objets ayant une valeur d'attribut (délégué)."""
+        return self.repository.get_all_by_attribute(attr_name, attr_value, load)
+
+    def get_all_by_attribute_in(self, attr_name, attr_values, load=()):
+        """Récupère les objets ayant une des valeurs d'attribut (délégué)."""
+        return self.repository.get_all_by_attribute_in(attr_name, attr_values, load)
+
+    def get_by_attributes(self, criteria):
+        """Récupère un objet par plusieurs attributs (délégué)."""
+        return self.repository.get_by_attributes(criteria)
+
+    def get_all_by_ranges(self, ranges, contains=None, load=()):
+        """Récupère les objets compris dans des intervalles (délégué)."""
+        return self.repository.get_all_by_ranges(ranges, contains, load)
+
+    def get_page_by_value(self, attr_name, cursor=None, limit=None, descending=False,
+                          ranges=None, contains=None, load=()):
+        """Récupère une page ordonnée par valeur (délégué)."""
+        return self.repository.get_page_by_value(attr_name, cursor, limit, descending,
+                                                 ranges, contains, load)
+
+    def create_index(self, attr_name, unique=False, kind='hash', **options):
+        """Déclare un index sur le repository décoré."""
+        return self.repository.create_index(attr_name, unique=unique, kind=kind, **options)
+
+    def list_indexes(self):
+        """Liste les index du repository décoré."""
+        return self.repository.list_indexes()
+
+    def version(self):
+        """Version de la collection (non mise en cache)."""
+        return self.repository.version()
+
+    def begin(self):
+        """Démarre une transaction sur le repository décoré."""
+        self.repository.begin()
+
+    def commit(self):
+        """Valide la transaction du repository décoré."""
+        self.repository.commit()
+
+    def rollback(self):
+        """Annule la transaction et vide le cache, qui a pu voir des écritures annulées."""
+        self.repository.rollback()
+        self.clear()
+
+    def invalidate(self, obj_id):
+        """
+        Retire un objet du cache.
+
+        Args:
+            obj_id: Identifiant de l'objet.
+        """
+        with self._lock:
+            self._entries.pop(obj_id, None)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Statistiques du cache.
+
+        Returns:
+            dict: Succès, échecs, évictions, taille et configuration.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl
+            }
+
+    def __getattr__(self, name):
+        """Donne accès aux attributs propres au repository décoré."""
+        return getattr(self.repository, name)
+
+    def _lookup(self, obj_id):
+        """
+        Cherche un objet valide dans le cache et met à jour les compteurs.
+
+        Returns:
+            Objet en cache (rattaché au repository décoré) ou None.
+        """
+        with self._lock:
+            entry = self._entries.get(obj_id)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(obj_id)
+                self.hits += 1
+                obj = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[obj_id]
+                self.misses += 1
+                return None
+        attach = getattr(self.repository, 'attach', None)
+        return attach(obj) if attach else obj
+
+    def _store(self, obj):
+        """Ajoute un objet au cache en évinçant le moins récemment utilisé."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[obj.id] = (self._clock() + self.ttl, obj)
+            self._entries.move_to_end(obj.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
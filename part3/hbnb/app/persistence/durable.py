@@ -0,0 +1,683 @@
+"""
+Persistance durable des repositories en mémoire : journal d'écritures
+(write-ahead log) avec validation groupée, et instantanés compactés au
+format binaire de app.persistence.snapshot.
+"""
+import itertools
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from app.persistence.repository import ConcurrentInMemoryRepository
+from app.persistence.snapshot import LazyStorage, MappedSnapshot, write_snapshot
+
+JOURNAL_FILE = 'journal.log'
+SNAPSHOT_FILE = 'snapshot.bin'
+
+
+class ModelCodec:
+    """
+    Conversion d'un modèle SQLAlchemy en valeurs typées, et inversement.
+
+    Les colonnes sont copiées telles quelles ; les relations vers un objet
+    (owner, place...) sont enregistrées par identifiant et les relations
+    plusieurs-à-plusieurs (amenities) par liste d'identifiants. Les
+    collections inverses (place.reviews) sont reconstruites par SQLAlchemy
+    à partir de l'autre côté.
+    """
+    def __init__(self, model):
+        """
+        Initialise le codec.
+
+        Args:
+            model (type): Classe du modèle.
+        """
+        from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, String, inspect
+        from sqlalchemy.orm import MANYTOMANY, MANYTOONE
+
+        def field_type(column):
+            """Type de champ d'une colonne (voir app.persistence.snapshot)."""
+            for sql_type, code in ((Boolean, 'b'), (Float, 'f'), (Integer, 'i'),
+                                   (DateTime, 't'), (String, 's'), (JSON, 'j')):
+                if isinstance(column.type, sql_type):
+                    return code
+            return 'j'
+
+        self.model = model
+        self._mapper = inspect(model)
+        self._references = [(rel.key, rel.mapper.class_) for rel in self._mapper.relationships
+                            if rel.direction is MANYTOONE]
+        self._collections = [(rel.key, rel.mapper.class_) for rel in self._mapper.relationships
+                             if rel.direction is MANYTOMANY]
+        self.fields = ([(attr.key, field_type(attr.columns[0])) for attr in self._mapper.column_attrs]
+                       + [(key, 'r') for key, _ in self._references]
+                       + [(key, 'c') for key, _ in self._collections])
+        self._columns = [(key, code == 't') for key, code in self.fields if code not in 'rc']
+
+    def row(self, obj):
+        """
+        Valeurs d'un objet, dans l'ordre de fields.
+
+        Args:
+            obj: Instance du modèle.
+
+        Returns:
+            tuple: Colonnes puis identifiants des objets liés.
+        """
+        values = [getattr(obj, key) for key, _ in self._columns]
+        for key, _ in self._references:
+            related = getattr(obj, key)
+            values.append(related.id if related is not None else None)
+        for key, _ in self._collections:
+            values.append([related.id for related in getattr(obj, key)])
+        return tuple(values)
+
+    def encode(self, obj):
+        """
+        État JSON d'un objet (dates au format ISO).
+
+        Args:
+            obj: Instance du modèle.
+
+        Returns:
+            dict: Valeurs par nom de champ.
+        """
+        return {key: value.isoformat() if code == 't' and value is not None else value
+                for (key, code), value in zip(self.fields, self.row(obj))}
+
+    def decode(self, state, resolve, obj=None):
+        """
+        Reconstruit un objet (sans passer par son constructeur ni ses validations).
+
+        Args:
+            state (dict): État produit par encode (ou lu dans un instantané).
+            resolve (callable): resolve(model, obj_id) renvoie l'objet lié
+                ou None ; si resolve est None, les relations ne sont pas
+                liées (voir link).
+            obj: Instance existante à mettre à jour (None pour en créer une).
+
+        Returns:
+            L'objet reconstruit.
+        """
+        if obj is None:
+            obj = self._mapper.class_manager.new_instance()
+        for key, is_date in self._columns:
+            value = state.get(key)
+            setattr(obj, key, datetime.fromisoformat(value) if is_date and isinstance(value, str) else value)
+        if resolve is not None:
+            self.link(obj, state, resolve)
+        return obj
+
+    def link(self, obj, state, resolve):
+        """
+        Lie un objet reconstruit aux objets qu'il référence.
+
+        Args:
+            obj: Instance du modèle.
+            state (dict): État de l'objet.
+            resolve (callable): resolve(model, obj_id) renvoie l'objet lié ou None.
+        """
+        for key, model in self._references:
+            related_id = state.get(key)
+            setattr(obj, key, resolve(model, related_id) if related_id is not None else None)
+        for key, model in self._collections:
+            related = (resolve(model, related_id) for related_id in state.get(key) or [])
+            setattr(obj, key, [item for item in related if item is not None])
+
+    def unlink(self, obj):
+        """
+        Détache un objet supprimé des objets qu'il référence ; il quitte
+        ainsi leurs collections inverses (place.reviews).
+
+        Args:
+            obj: Instance du modèle.
+        """
+        for key, _ in self._references:
+            setattr(obj, key, None)
+
+
+class DurableInMemoryRepository(ConcurrentInMemoryRepository):
+    """
+    Repository en mémoire dont les écritures sont journalisées par un DurableStore.
+
+    Les lectures sont servies par la mémoire. Chaque écriture validée
+    (hors transaction, ou au commit de la transaction la plus externe) est
+    ajoutée au journal ; l'appel ne rend la main qu'une fois le journal
+    écrit sur disque. Une transaction annulée n'est jamais journalisée.
+    Les transactions ouvertes ensemble sur plusieurs repositories du même
+    stockage (façade) forment un seul enregistrement (voir DurableStore).
+    """
+    def __init__(self, store, name, codec):
+        """
+        Initialise le dépôt.
+
+        Args:
+            store (DurableStore): Stockage du journal et des instantanés.
+            name (str): Nom de la collection dans le stockage.
+            codec (ModelCodec): Conversion des objets en états JSON.
+        """
+        super().__init__()
+        self.store = store
+        self.name = name
+        self.codec = codec
+        self._pending = []
+        self._pending_marks = []
+
+    def add(self, obj):
+        """Ajoute un objet et journalise son état."""
+        def apply():
+            super(DurableInMemoryRepository, self).add(obj)
+            self._log('put', self.codec.encode(obj))
+        self._write(apply)
+
+    def add_many(self, objs):
+        """Ajoute plusieurs objets, journalisés en un seul enregistrement."""
+        self._write(lambda: super(DurableInMemoryRepository, self).add_many(objs))
+
+    def update(self, obj_id, data):
+        """Met à jour un objet et journalise son nouvel état."""
+        def apply():
+            super(DurableInMemoryRepository, self).update(obj_id, data)
+            obj = self._storage.get(obj_id)
+            if obj is not None:
+                self._log('put', self.codec.encode(obj))
+        self._write(apply)
+
+    def delete(self, obj_id):
+        """Supprime un objet et journalise sa suppression."""
+        def apply():
+            deleted = super(DurableInMemoryRepository, self).delete(obj_id)
+            if deleted:
+                self._log('delete', obj_id)
+            return deleted
+        return self._write(apply)
+
+    def begin(self):
+        """
+        Démarre une transaction (ou un point de sauvegarde) ; ses écritures
+        sont journalisées à la fin du groupe de transactions du thread.
+        """
+        super().begin()
+        self._pending_marks.append(len(self._pending))
+        self.store.begin_group()
+
+    def commit(self):
+        """
+        Valide la transaction courante ; la plus externe confie ses écritures
+        au groupe du thread, journalisé quand il se termine.
+        """
+        lsn = None
+        with self._lock.write():
+            if self._tx_depth == 0:
+                return
+            self._pending_marks.pop()
+            super().commit()
+            if self._tx_depth == 0 and self._pending:
+                pending, self._pending = self._pending, []
+                self.store.defer(self, pending)
+            lsn = self.store.end_group()
+        self.store.sync(lsn)
+
+    def rollback(self):
+        """
+        Annule la transaction (ou le point de sauvegarde) en cours ; ses
+        écritures ne sont pas journalisées.
+        """
+        lsn = None
+        with self._lock.write():
+            if self._tx_depth == 0:
+                return
+            del self._pending[self._pending_marks.pop():]
+            super().rollback()
+            # Les repositories du groupe déjà validés sont journalisés
+            lsn = self.store.end_group()
+        self.store.sync(lsn)
+
+    def _log(self, operation, value):
+        """
+        Ajoute une opération aux écritures à journaliser, avec son numéro
+        d'ordre dans le stockage (ordre des écritures entre collections).
+
+        Args:
+            operation (str): 'put' ou 'delete'.
+            value: État de l'objet, ou identifiant supprimé.
+        """
+        self._pending.append((self.store.next_sequence(), operation, value))
+
+    def _write(self, apply):
+        """
+        Applique une écriture sous le verrou exclusif puis la journalise.
+
+        Les écritures imbriquées (add dans add_many) et celles d'une
+        transaction restent en attente jusqu'à l'écriture externe ou au
+        commit. L'attente du disque se fait hors du verrou : les écritures
+        concurrentes partagent la même synchronisation.
+
+        Args:
+            apply (callable): Écriture à appliquer.
+
+        Returns:
+            Le résultat de apply.
+        """
+        lsn = None
+        try:
+            with self._lock.write():
+                try:
+                    return apply()
+                finally:
+                    # Les écritures appliquées avant une erreur sont journalisées
+                    if self._tx_depth == 0 and self._lock.write_depth == 1 and self._pending:
+                        pending, self._pending = self._pending, []
+                        lsn = self.store.append([(self.name, operation, value)
+                                                 for _, operation, value in pending])
+        finally:
+            self.store.sync(lsn)
+
+    def _restore(self, state):
+        """Applique un état lu sur disque, sans le journaliser."""
+        obj = self._storage.get(state['id'])
+        if obj is None:
+            obj = self.codec.decode(state, self.store.resolve)
+            super(ConcurrentInMemoryRepository, self).add(obj)
+        else:
+            self._unindex(obj)
+            self.codec.decode(state, self.store.resolve, obj)
+            self._index(obj)
+
+    def _forget(self, obj_id):
+        """Applique une suppression lue sur disque, sans la journaliser."""
+        obj = self._storage.get(obj_id)
+        super(ConcurrentInMemoryRepository, self).delete(obj_id)
+        if obj is not None:
+            self.codec.unlink(obj)
+
+    def _attach(self, collection):
+        """
+        Sert les enregistrements d'un instantané sans construire les objets.
+
+        L'ordre de pagination est celui du fichier ; les index déjà
+        déclarés sont remplis depuis des vues des enregistrements.
+
+        Args:
+            collection (MappedCollection): Enregistrements de la collection.
+        """
+        self._order = collection.ordering_keys()
+        self._storage = LazyStorage(collection, self.codec, self.store.resolve,
+                                    self.store.materialise_lock, self._order)
+        self._version += collection.count
+        for index in self._indexes.values():
+            for view in self._storage.views():
+                index.add(view)
+
+    def _indexing_view(self):
+        """Objets construits et vues des enregistrements non construits."""
+        if isinstance(self._storage, LazyStorage):
+            return self._storage.views()
+        return super()._indexing_view()
+
+    def _snapshot_rows(self):
+        """Valeurs des objets pour un instantané, dans l'ordre de pagination."""
+        if isinstance(self._storage, LazyStorage):
+            return (self._storage.row(obj_id) for _, obj_id in self._order)
+        return (self.codec.row(self._storage[obj_id]) for _, obj_id in self._order)
+
+
+class DurableStore:
+    """
+    Journal et instantanés partagés par les repositories durables d'un répertoire.
+
+    Les écritures validées sont ajoutées au journal (une ligne par écriture
+    ou transaction, avec numéro de séquence et somme de contrôle CRC32).
+    Les transactions d'un thread sur plusieurs repositories (celles de la
+    façade) forment un groupe : chaque repository validé garde son verrou
+    et confie ses écritures au groupe, qui est journalisé en une seule
+    ligne, dans l'ordre des écritures, quand sa dernière transaction se
+    termine. Un arrêt brutal conserve donc la transaction entière ou rien.
+    Les écrivains concurrents sont synchronisés par lots : un seul d'entre
+    eux écrit et synchronise (fsync) le tampon accumulé pendant que les
+    autres attendent (validation groupée). Après snapshot_every
+    enregistrements, un instantané binaire de toutes les collections
+    remplace le journal. Au démarrage, load projette l'instantané en
+    mémoire (les objets sont construits au premier accès) puis rejoue la
+    fin du journal ; une dernière ligne incomplète (arrêt brutal) est ignorée.
+    """
+    def __init__(self, directory, snapshot_every=10000, fsync=True):
+        """
+        Initialise le stockage (rien n'est lu avant load).
+
+        Args:
+            directory (str): Répertoire du journal et de l'instantané (créé si besoin).
+            snapshot_every (int): Enregistrements journalisés entre deux
+                instantanés (None pour ne jamais compacter automatiquement).
+            fsync (bool): Synchronise le journal sur disque à chaque validation.
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.repositories = {}
+        self._models = {}
+        self._file = None
+        self._condition = threading.Condition()
+        self._buffer = []
+        self._lsn = 0
+        self._durable_lsn = 0
+        self._flushing = False
+        self._since_snapshot = 0
+        self._snapshot_lock = threading.Lock()
+        self.materialise_lock = threading.RLock()
+        self._sequence = itertools.count()
+        self._groups = threading.local()
+        self.flushes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def repository(self, name, codec):
+        """
+        Crée le repository durable d'une collection.
+
+        Les instantanés verrouillent les collections dans leur ordre de
+        création : il doit être celui des transactions de la façade
+        (utilisateurs, lieux, reviews, équipements).
+
+        Args:
+            name (str): Nom de la collection.
+            codec (ModelCodec): Conversion des objets en états JSON.
+
+        Returns:
+            DurableInMemoryRepository: Repository de la collection.
+
+        Raises:
+            ValueError: Si la collection existe déjà.
+        """
+        if name in self.repositories:
+            raise ValueError(f"Collection '{name}' already exists")
+        repo = DurableInMemoryRepository(self, name, codec)
+        self.repositories[name] = repo
+        self._models[codec.model] = repo
+        return repo
+
+    def resolve(self, model, obj_id):
+        """
+        Objet lié d'une autre collection.
+
+        Args:
+            model (type): Classe de l'objet.
+            obj_id (str): Identifiant de l'objet.
+
+        Returns:
+            L'objet, ou None s'il n'existe pas (ou plus).
+        """
+        repo = self._models.get(model)
+        return repo._storage.get(obj_id) if repo is not None else None
+
+    def load(self):
+        """
+        Charge l'instantané puis rejoue le journal, et ouvre le journal en écriture.
+
+        Raises:
+            ValueError: Si l'instantané est illisible.
+        """
+        snapshot_lsn = 0
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(path):
+            # Objets construits au premier accès : relations résolues à ce moment
+            snapshot = MappedSnapshot(path)
+            snapshot_lsn = snapshot.lsn
+            for name, repo in self.repositories.items():
+                if name in snapshot.collections:
+                    repo._attach(snapshot.collections[name])
+        self._lsn = self._durable_lsn = snapshot_lsn
+
+        path = os.path.join(self.directory, JOURNAL_FILE)
+        valid_size = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                for line in file:
+                    record = self._decode_line(line)
+                    if record is None:
+                        break
+                    valid_size += len(line)
+                    if record['lsn'] <= snapshot_lsn:
+                        continue
+                    self._replay(record)
+                    self._lsn = self._durable_lsn = record['lsn']
+                    self._since_snapshot += len(record['ops'])
+        self._file = open(path, 'ab')
+        # Fin de journal incomplète : tronquée avant d'y ajouter des lignes
+        if self._file.tell() != valid_size:
+            self._file.truncate(valid_size)
+            self._sync_file()
+
+    def next_sequence(self):
+        """Numéro d'ordre d'une écriture, croissant entre toutes les collections."""
+        return next(self._sequence)
+
+    def begin_group(self):
+        """
+        Ouvre (ou rejoint) le groupe de transactions du thread courant.
+
+        Appelé à chaque begin d'un repository : le groupe se termine quand
+        autant de commit ou de rollback ont été reçus (end_group).
+        """
+        group = self._groups
+        group.depth = getattr(group, 'depth', 0) + 1
+        if group.depth == 1:
+            group.operations, group.locked = [], []
+
+    def defer(self, repo, operations):
+        """
+        Confie au groupe du thread les écritures validées d'un repository.
+
+        Le repository reste verrouillé jusqu'à la fin du groupe : aucune
+        écriture d'un autre thread sur cette collection ne peut être
+        journalisée avant celles du groupe.
+
+        Args:
+            repo (DurableInMemoryRepository): Repository validé (verrou tenu).
+            operations (list): Opérations (numéro d'ordre, opération, valeur).
+        """
+        repo._lock.acquire_write()
+        self._groups.locked.append(repo)
+        self._groups.operations.extend((sequence, repo.name, operation, value)
+                                       for sequence, operation, value in operations)
+
+    def end_group(self):
+        """
+        Termine un niveau du groupe du thread ; le dernier journalise toutes
+        ses écritures en un seul enregistrement et rend les verrous.
+
+        Returns:
+            int: Numéro de séquence de l'enregistrement (à passer à sync),
+            ou None.
+        """
+        group = self._groups
+        group.depth -= 1
+        if group.depth:
+            return None
+        operations, locked = sorted(group.operations, key=lambda entry: entry[0]), group.locked
+        group.operations, group.locked = [], []
+        try:
+            if operations:
+                return self.append([(name, operation, value) for _, name, operation, value in operations])
+            return None
+        finally:
+            for repo in reversed(locked):
+                repo._lock.release_write()
+
+    def append(self, operations):
+        """
+        Ajoute des écritures validées au tampon du journal, en un enregistrement.
+
+        Appelé sous le verrou exclusif des repositories concernés : l'ordre
+        du journal est celui des écritures.
+
+        Args:
+            operations (list): Opérations (collection, 'put', état) ou
+                (collection, 'delete', identifiant).
+
+        Returns:
+            int: Numéro de séquence de l'enregistrement, à passer à sync.
+        """
+        with self._condition:
+            self._lsn += 1
+            payload = json.dumps({'lsn': self._lsn, 'ops': operations},
+                                 separators=(',', ':')).encode()
+            self._buffer.append(b'%08x %s\n' % (zlib.crc32(payload), payload))
+            self._since_snapshot += len(operations)
+            return self._lsn
+
+    def sync(self, lsn):
+        """
+        Attend que le journal soit écrit sur disque jusqu'au numéro lsn.
+
+        Le premier thread en attente écrit tout le tampon accumulé ; les
+        écritures arrivées pendant ce temps partent au lot suivant.
+        Déclenche ensuite un instantané si snapshot_every est atteint.
+
+        Args:
+            lsn (int): Numéro renvoyé par append (None : rien à attendre).
+        """
+        if lsn is None:
+            return
+        with self._condition:
+            while self._durable_lsn < lsn:
+                if self._flushing:
+                    self._condition.wait()
+                    continue
+                self._flushing = True
+                data, upto, self._buffer = b''.join(self._buffer), self._lsn, []
+                self._condition.release()
+                try:
+                    self._file.write(data)
+                    self._file.flush()
+                    self._sync_file()
+                    self.flushes += 1
+                finally:
+                    self._condition.acquire()
+                    self._flushing = False
+                    self._condition.notify_all()
+                self._durable_lsn = upto
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            # Un thread tenant encore un verrou (commit d'une transaction sur
+            # plusieurs repositories) ne compacte pas : risque d'interblocage
+            if not any(repo._lock.write_depth for repo in self.repositories.values()):
+                self.snapshot()
+
+    def snapshot(self):
+        """
+        Écrit un instantané de toutes les collections et vide le journal.
+
+        Les écritures sont suspendues pendant l'instantané. L'instantané est
+        écrit dans un fichier temporaire puis renommé : un arrêt à tout
+        moment laisse un instantané complet, et les lignes du journal déjà
+        couvertes sont ignorées au chargement.
+
+        Raises:
+            RuntimeError: Si le thread courant tient le verrou d'un
+                repository (transaction ouverte).
+        """
+        if any(repo._lock.write_depth for repo in self.repositories.values()):
+            raise RuntimeError("Cannot snapshot while holding a repository lock")
+        if not self._snapshot_lock.acquire(blocking=False):
+            return
+        locked = []
+        try:
+            for repo in self.repositories.values():
+                repo._lock.acquire_write()
+                locked.append(repo)
+            self.sync(self._lsn)
+            # Les objets non construits sont recopiés sans être construits
+            collections = [(name, repo.codec.fields, len(repo._order), repo._snapshot_rows())
+                           for name, repo in self.repositories.items()]
+            path = os.path.join(self.directory, SNAPSHOT_FILE)
+            with open(path + '.tmp', 'wb') as file:
+                write_snapshot(file, self._lsn, collections)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            os.replace(path + '.tmp', path)
+            self._file.truncate(0)
+            self._sync_file()
+            self._since_snapshot = 0
+        finally:
+            for repo in reversed(locked):
+                repo._lock.release_write()
+            self._snapshot_lock.release()
+
+    def close(self):
+        """
+        Écrit le tampon restant et ferme le journal.
+        """
+        if self._file is not None:
+            self.sync(self._lsn)
+            self._file.close()
+            self._file = None
+
+    def _sync_file(self):
+        """Synchronise le journal sur disque (si fsync est activé)."""
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _replay(self, record):
+        """
+        Applique un enregistrement complet du journal, dans l'ordre de ses
+        écritures (les enregistrements d'une seule collection portent son
+        nom à part).
+        """
+        operations = record['ops']
+        if 'collection' in record:
+            operations = [(record['collection'], operation, value) for operation, value in operations]
+        for name, operation, value in operations:
+            repo = self.repositories.get(name)
+            if repo is None:
+                continue
+            if operation == 'put':
+                repo._restore(value)
+            else:
+                repo._forget(value)
+
+    @staticmethod
+    def _decode_line(line):
+        """
+        Décode une ligne du journal.
+
+        Returns:
+            dict: Enregistrement, ou None si la ligne est incomplète ou corrompue.
+        """
+        if not line.endswith(b'\n') or len(line) < 10:
+            return None
+        checksum, payload = line[:8], line[9:-1]
+        try:
+            if int(checksum, 16) != zlib.crc32(payload):
+                return None
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+
+def open_durable_repositories(directory, **options):
+    """
+    Repositories durables des modèles de l'application, prêts pour la façade.
+
+    Args:
+        directory (str): Répertoire du journal et de l'instantané.
+        **options: Options de DurableStore (snapshot_every, fsync).
+
+    Returns:
+        dict: user_repo, amenity_repo, place_repo et review_repo, chargés.
+    """
+    from app.models.user import User
+    from app.models.amenity import Amenity
+    from app.models.place import Place
+    from app.models.review import Review
+
+    store = DurableStore(directory, **options)
+    # Ordre des transactions de la façade (verrouillage des instantanés)
+    repositories = {
+        'user_repo': store.repository('users', ModelCodec(User)),
+        'place_repo': store.repository('places', ModelCodec(Place)),
+        'review_repo': store.repository('reviews', ModelCodec(Review)),
+        'amenity_repo': store.repository('amenities', ModelCodec(Amenity))
+    }
+    store.load()
+    return repositories
@@ -0,0 +1,542 @@
+"""
+Index secondaires utilisés par InMemoryRepository.
+"""
+import math
+from bisect import bisect_left, bisect_right, insort
+
+
+class DuplicateEntryError(ValueError):
+    """Levée lorsqu'une écriture viole un index ou une contrainte unique."""
+
+
+def resolve_attribute(obj, attr_path, data=None):
+    """
+    Résout un chemin d'attribut (ex: 'email' ou 'place.id') sur un objet.
+
+    Args:
+        obj: Objet sur lequel résoudre le chemin.
+        attr_path (str): Chemin d'attribut, segments séparés par des points.
+        data (dict): Données de mise à jour à superposer au premier segment.
+
+    Returns:
+        La valeur trouvée, ou None si un segment est absent.
+    """
+    first, _, rest = attr_path.partition('.')
+    if data is not None and first in data:
+        value = data[first]
+    else:
+        value = getattr(obj, first, None)
+    for segment in rest.split('.') if rest else []:
+        if value is None:
+            return None
+        value = getattr(value, segment, None)
+    return value
+
+
+def in_range(value, bounds):
+    """
+    Indique si une valeur est comprise dans un intervalle.
+
+    Args:
+        value: Valeur à tester (None n'est jamais comprise).
+        bounds (tuple): Bornes incluses (min, max) ; None pour non bornée.
+
+    Returns:
+        bool: True si la valeur est dans l'intervalle.
+    """
+    low, high = bounds
+    return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+
+class HashIndex:
+    """
+    Index par valeur d'un ou plusieurs attributs (index composite).
+
+    Les objets dont une des valeurs indexées vaut None ne sont pas indexés.
+    """
+    kind = 'hash'
+
+    def __init__(self, attr_names, unique=False):
+        """
+        Initialise l'index.
+
+        Args:
+            attr_names (str | tuple): Attribut ou tuple d'attributs indexés.
+            unique (bool): Si True, une même clé ne peut désigner qu'un objet.
+        """
+        if isinstance(attr_names, str):
+            attr_names = (attr_names,)
+        self.attr_names = tuple(attr_names)
+        self.unique = unique
+        self._entries = {}
+
+    @property
+    def name(self):
+        """Nom de l'index, utilisé comme clé dans le repository."""
+        return index_name(self.attr_names)
+
+    def key_for(self, obj, data=None):
+        """
+        Calcule la clé d'index d'un objet.
+
+        Args:
+            obj: Objet indexé.
+            data (dict): Données de mise à jour à prendre en compte.
+
+        Returns:
+            La clé (valeur ou tuple de valeurs), ou None si non indexable.
+        """
+        values = tuple(resolve_attribute(obj, attr, data) for attr in self.attr_names)
+        if any(value is None for value in values):
+            return None
+        return values[0] if len(values) == 1 else values
+
+    def covers(self, attr_names):
+        """
+        Indique si l'index porte exactement sur ces attributs.
+
+        Args:
+            attr_names (iterable): Attributs recherchés, dans n'importe quel ordre.
+        """
+        return set(self.attr_names) == set(attr_names)
+
+    def lookup(self, key):
+        """
+        Récupère les identifiants associés à une clé.
+
+        Returns:
+            list: Identifiants dans l'ordre d'insertion.
+        """
+        return list(self._entries.get(key, ()))
+
+    def check(self, obj, data=None):
+        """
+        Vérifie qu'un ajout ou une mise à jour respecte l'unicité.
+
+        Raises:
+            DuplicateEntryError: Si la clé est déjà utilisée par un autre objet.
+        """
+        if not self.unique:
+            return
+        key = self.key_for(obj, data)
+        if key is None:
+            return
+        if any(obj_id != obj.id for obj_id in self._entries.get(key, ())):
+            raise DuplicateEntryError(f"Duplicate value for unique index '{self.name}'")
+
+    def add(self, obj):
+        """Ajoute un objet à l'index."""
+        key = self.key_for(obj)
+        if key is not None:
+            self._entries.setdefault(key, {})[obj.id] = None
+
+    def remove(self, obj):
+        """Retire un objet de l'index."""
+        key = self.key_for(obj)
+        ids = self._entries.get(key)
+        if ids is not None:
+            ids.pop(obj.id, None)
+            if not ids:
+                del self._entries[key]
+
+    def describe(self):
+        """Décrit l'index pour list_indexes()."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'attributes': list(self.attr_names),
+            'unique': self.unique
+        }
+
+
+class GridIndex:
+    """
+    Index spatial par grille : les objets sont rangés dans des cellules de
+    cell_size degrés selon leurs coordonnées (latitude, longitude).
+
+    Une recherche par intervalle ne parcourt que les cellules qui
+    recoupent la zone demandée.
+    """
+    kind = 'grid'
+    unique = False
+
+    def __init__(self, attr_names, cell_size=0.5):
+        """
+        Initialise l'index.
+
+        Args:
+            attr_names (tuple): Attributs de latitude et de longitude.
+            cell_size (float): Taille d'une cellule, en degrés.
+
+        Raises:
+            ValueError: Si l'index ne porte pas sur deux attributs.
+        """
+        if isinstance(attr_names, str) or len(attr_names) != 2:
+            raise ValueError("A grid index needs a latitude and a longitude attribute")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be a positive number")
+        self.attr_names = tuple(attr_names)
+        self.cell_size = cell_size
+        self._cells = {}
+
+    @property
+    def name(self):
+        """Nom de l'index, utilisé comme clé dans le repository."""
+        return index_name(self.attr_names, self.kind)
+
+    def key_for(self, obj, data=None):
+        """
+        Calcule la cellule d'un objet.
+
+        Returns:
+            tuple: Ligne et colonne de la cellule, ou None si non localisé.
+        """
+        lat, lon = (resolve_attribute(obj, attr, data) for attr in self.attr_names)
+        if lat is None or lon is None:
+            return None
+        return self._cell(lat), self._cell(lon)
+
+    def covers(self, attr_names):
+        """
+        Indique si l'index porte exactement sur ces attributs.
+
+        Args:
+            attr_names (iterable): Attributs recherchés, dans n'importe quel ordre.
+        """
+        return set(self.attr_names) == set(attr_names)
+
+    def lookup_ranges(self, ranges):
+        """
+        Récupère les identifiants des objets des cellules recoupant les intervalles.
+
+        Le résultat est un sur-ensemble : les valeurs exactes doivent être
+        vérifiées par l'appelant.
+
+        Args:
+            ranges (dict): Bornes (min, max) par attribut ; None pour non bornée.
+
+        Returns:
+            list: Identifiants candidats.
+        """
+        (min_lat, max_lat), (min_lon, max_lon) = (ranges.get(attr, (None, None))
+                                                  for attr in self.attr_names)
+        rows = self._span(min_lat, max_lat, 90.0)
+        cols = self._span(min_lon, max_lon, 180.0)
+        if len(rows) * len(cols) > len(self._cells):
+            # Zone plus large que les cellules occupées : parcours des cellules
+            cells = (ids for (row, col), ids in self._cells.items() if row in rows and col in cols)
+        else:
+            cells = (self._cells[cell] for cell in
+                     ((row, col) for row in rows for col in cols) if cell in self._cells)
+        return [obj_id for ids in cells for obj_id in ids]
+
+    def check(self, obj, data=None):
+        """Un index spatial n'impose aucune contrainte d'unicité."""
+
+    def add(self, obj):
+        """Ajoute un objet à l'index."""
+        key = self.key_for(obj)
+        if key is not None:
+            self._cells.setdefault(key, {})[obj.id] = None
+
+    def remove(self, obj):
+        """Retire un objet de l'index."""
+        key = self.key_for(obj)
+        ids = self._cells.get(key)
+        if ids is not None:
+            ids.pop(obj.id, None)
+            if not ids:
+                del self._cells[key]
+
+    def describe(self):
+        """Décrit l'index pour list_indexes()."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'attributes': list(self.attr_names),
+            'unique': False,
+            'cell_size': self.cell_size
+        }
+
+    def _cell(self, value):
+        """Numéro de la cellule contenant une coordonnée."""
+        return math.floor(value / self.cell_size)
+
+    def _span(self, low, high, limit):
+        """Numéros des cellules couvrant l'intervalle [low, high]."""
+        low = -limit if low is None else max(low, -limit)
+        high = limit if high is None else min(high, limit)
+        if low > high:
+            return range(0)
+        return range(self._cell(low), self._cell(high) + 1)
+
+
+class SortedIndex:
+    """
+    Index trié sur la valeur d'un attribut (ex: prix).
+
+    Les entrées (valeur, id) sont conservées triées : une recherche par
+    intervalle se fait par dichotomie et ne lit que les objets de
+    l'intervalle, et un parcours ordonné peut reprendre à une clé donnée.
+    Les objets sans valeur sont conservés à part, par identifiant.
+    """
+    kind = 'sorted'
+    unique = False
+
+    def __init__(self, attr_names):
+        """
+        Initialise l'index.
+
+        Args:
+            attr_names (str | tuple): Attribut indexé.
+
+        Raises:
+            ValueError: Si l'index porte sur plusieurs attributs.
+        """
+        if isinstance(attr_names, str):
+            attr_names = (attr_names,)
+        if len(attr_names) != 1:
+            raise ValueError("A sorted index covers a single attribute")
+        self.attr_names = tuple(attr_names)
+        self._keys = []
+        self._ids = []
+        self._missing = []
+
+    @property
+    def name(self):
+        """Nom de l'index, utilisé comme clé dans le repository."""
+        return index_name(self.attr_names, self.kind)
+
+    def key_for(self, obj, data=None):
+        """
+        Calcule la clé de tri d'un objet.
+
+        Returns:
+            tuple: Valeur et identifiant (texte), ou None si non indexable.
+        """
+        value = resolve_attribute(obj, self.attr_names[0], data)
+        return None if value is None else (value, str(obj.id))
+
+    def covers(self, attr_names):
+        """Indique si l'index porte exactement sur ces attributs."""
+        return set(self.attr_names) == set(attr_names)
+
+    def lookup_ranges(self, ranges):
+        """
+        Récupère les identifiants dont la valeur est dans l'intervalle.
+
+        Args:
+            ranges (dict): Bornes incluses (min, max) par attribut.
+
+        Returns:
+            list: Identifiants, par valeur croissante.
+        """
+        low, high = ranges.get(self.attr_names[0], (None, None))
+        start = 0 if low is None else bisect_left(self._keys, low, key=_first)
+        end = len(self._keys) if high is None else bisect_right(self._keys, high, key=_first)
+        return self._ids[start:end]
+
+    def iter_ordered(self, after=None, descending=False, bounds=(None, None)):
+        """
+        Parcourt les entrées dans l'ordre de tri, strictement après une clé.
+
+        L'ordre est (valeur, id) croissant, ou valeur décroissante puis id
+        croissant ; les objets sans valeur viennent ensuite, par id, sauf
+        si des bornes sont données. Seules les entrées parcourues sont lues.
+
+        Args:
+            after (tuple): Clé (valeur ou None, id) de départ, exclue.
+            descending (bool): Valeurs décroissantes.
+            bounds (tuple): Bornes incluses (min, max) des valeurs.
+
+        Yields:
+            tuple: Valeur (ou None) et identifiant.
+        """
+        low, high = bounds
+        keys, ids = self._keys, self._ids
+        start = 0 if low is None else bisect_left(keys, low, key=_first)
+        end = len(keys) if high is None else bisect_right(keys, high, key=_first)
+        if after is None or after[0] is not None:
+            if not descending:
+                if after is not None:
+                    start = max(start, bisect_right(keys, tuple(after)))
+                for position in range(start, end):
+                    yield keys[position][0], ids[position]
+            else:
+                if after is not None:
+                    # Fin du groupe de la valeur du curseur, puis valeurs inférieures
+                    value = after[0]
+                    group_end = min(end, bisect_right(keys, value, key=_first))
+                    for position in range(max(start, bisect_right(keys, tuple(after))), group_end):
+                        yield keys[position][0], ids[position]
+                    end = min(end, bisect_left(keys, value, key=_first))
+                while end > start:
+                    group_start = max(start, bisect_left(keys, keys[end - 1][0], 0, end, key=_first))
+                    for position in range(group_start, end):
+                        yield keys[position][0], ids[position]
+                    end = group_start
+        if low is None and high is None:
+            position = 0 if after is None or after[0] is not None else \
+                bisect_right(self._missing, after[1], key=_first)
+            for _, obj_id in self._missing[position:]:
+                yield None, obj_id
+
+    def check(self, obj, data=None):
+        """Un index trié n'impose aucune contrainte d'unicité."""
+
+    def add(self, obj):
+        """Ajoute un objet à l'index."""
+        key = self.key_for(obj)
+        if key is None:
+            insort(self._missing, (str(obj.id), obj.id))
+            return
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._ids.insert(position, obj.id)
+
+    def remove(self, obj):
+        """Retire un objet de l'index."""
+        key = self.key_for(obj)
+        if key is None:
+            entries, key = self._missing, (str(obj.id), obj.id)
+            position = bisect_left(entries, key)
+            if position < len(entries) and entries[position] == key:
+                del entries[position]
+            return
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._ids[position]
+
+    def describe(self):
+        """Décrit l'index pour list_indexes()."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'attributes': list(self.attr_names),
+            'unique': False
+        }
+
+
+class InvertedIndex:
+    """
+    Index inversé d'un attribut collection (ex: équipements d'un lieu).
+
+    Chaque élément de la collection (ou son id) désigne l'ensemble des
+    objets qui le contiennent ; une recherche « contient tous » intersecte
+    ces ensembles en commençant par le plus petit.
+    """
+    kind = 'inverted'
+    unique = False
+
+    def __init__(self, attr_names):
+        """
+        Initialise l'index.
+
+        Args:
+            attr_names (str | tuple): Attribut collection indexé.
+
+        Raises:
+            ValueError: Si l'index porte sur plusieurs attributs.
+        """
+        if isinstance(attr_names, str):
+            attr_names = (attr_names,)
+        if len(attr_names) != 1:
+            raise ValueError("An inverted index covers a single attribute")
+        self.attr_names = tuple(attr_names)
+        self._postings = {}
+
+    @property
+    def name(self):
+        """Nom de l'index, utilisé comme clé dans le repository."""
+        return index_name(self.attr_names, self.kind)
+
+    def key_for(self, obj, data=None):
+        """
+        Calcule les termes d'un objet.
+
+        Returns:
+            set: Éléments de la collection (leur id s'ils en ont un).
+        """
+        values = resolve_attribute(obj, self.attr_names[0], data) or ()
+        return {getattr(value, 'id', value) for value in values}
+
+    def covers(self, attr_names):
+        """Indique si l'index porte exactement sur ces attributs."""
+        return set(self.attr_names) == set(attr_names)
+
+    def lookup_all(self, values):
+        """
+        Récupère les identifiants des objets contenant toutes les valeurs.
+
+        Args:
+            values (iterable): Valeurs requises.
+
+        Returns:
+            set: Identifiants trouvés.
+        """
+        postings = sorted((self._postings.get(value, {}) for value in set(values)), key=len)
+        if not postings:
+            return set()
+        found = set(postings[0])
+        for ids in postings[1:]:
+            if not found:
+                break
+            found.intersection_update(ids)
+        return found
+
+    def check(self, obj, data=None):
+        """Un index inversé n'impose aucune contrainte d'unicité."""
+
+    def add(self, obj):
+        """Ajoute un objet à l'index."""
+        for value in self.key_for(obj):
+            self._postings.setdefault(value, {})[obj.id] = None
+
+    def remove(self, obj):
+        """Retire un objet de l'index."""
+        for value in self.key_for(obj):
+            ids = self._postings.get(value)
+            if ids is not None:
+                ids.pop(obj.id, None)
+                if not ids:
+                    del self._postings[value]
+
+    def describe(self):
+        """Décrit l'index pour list_indexes()."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'attributes': list(self.attr_names),
+            'unique': False
+        }
+
+
+def _first(key):
+    """Valeur d'une clé (valeur, id) d'un index trié."""
+    return key[0]
+
+
+# Types d'index disponibles pour create_index(kind=...)
+INDEX_KINDS = {
+    'hash': HashIndex,
+    'grid': GridIndex,
+    'sorted': SortedIndex,
+    'inverted': InvertedIndex
+}
+
+
+def index_name(attr_names, kind='hash'):
+    """
+    Calcule le nom d'un index à partir de ses attributs.
+
+    Args:
+        attr_names (str | tuple): Attribut ou tuple d'attributs.
+        kind (str): Type d'index ; le nom des index autres que 'hash' est
+            suffixé par leur type (ex: 'latitude,longitude:grid').
+
+    Returns:
+        str: Nom de l'index (attributs joints par une virgule).
+    """
+    name = attr_names if isinstance(attr_names, str) else ','.join(attr_names)
+    return name if kind == 'hash' else f"{name}:{kind}"
@@ -0,0 +1,117 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Verrou lecteurs-rédacteur.
+
+    Plusieurs threads peuvent lire en même temps ; un rédacteur a l'accès
+    exclusif. Les rédacteurs en attente sont prioritaires sur les nouveaux
+    lecteurs (pas de famine des écritures). Le verrou est réentrant : un
+    lecteur peut relire, et le rédacteur peut relire ou réécrire. Passer
+    d'une lecture à une écriture est refusé, car deux lecteurs qui le
+    tenteraient ensemble s'attendraient mutuellement.
+    """
+    def __init__(self):
+        """
+        Initialise le verrou (libre).
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = {}
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """
+        Prend le verrou en lecture (partagé).
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers[me] = 1
+
+    def release_read(self):
+        """
+        Relâche une prise en lecture.
+
+        Raises:
+            RuntimeError: Si le thread ne tient pas le verrou en lecture.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            depth = self._readers.get(me)
+            if not depth:
+                raise RuntimeError("Read lock released by a thread that does not hold it")
+            if depth == 1:
+                del self._readers[me]
+                if not self._readers:
+                    self._condition.notify_all()
+            else:
+                self._readers[me] = depth - 1
+
+    def acquire_write(self):
+        """
+        Prend le verrou en écriture (exclusif).
+
+        Raises:
+            RuntimeError: Si le thread tient déjà le verrou en lecture seule.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """
+        Relâche une prise en écriture.
+
+        Raises:
+            RuntimeError: Si le thread ne tient pas le verrou en écriture.
+        """
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Write lock released by a thread that does not hold it")
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+    @property
+    def write_depth(self):
+        """Nombre de prises en écriture du thread courant (0 s'il n'écrit pas)."""
+        return self._write_depth if self._writer == threading.get_ident() else 0
+
+    @contextmanager
+    def read(self):
+        """Contexte tenant le verrou en lecture."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Contexte tenant le verrou en écriture."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,118 @@
+"""
+Curseurs opaques pour la pagination par clé (keyset pagination).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+def ordering_key(obj):
+    """
+    Clé de tri des objets paginés : (created_at, id).
+
+    Args:
+        obj: Objet à ordonner.
+
+    Returns:
+        tuple: Date de création (datetime.min si absente) et identifiant.
+    """
+    return (getattr(obj, 'created_at', None) or datetime.min, str(obj.id))
+
+
+def encode_cursor(*values):
+    """
+    Encode des valeurs de clé en curseur opaque.
+
+    Args:
+        *values: Valeurs de la clé (les datetime sont encodées en ISO 8601).
+
+    Returns:
+        str: Curseur utilisable dans une URL.
+    """
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value
+                          for value in values])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, size):
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Args:
+        cursor (str): Curseur reçu du client.
+        size (int): Nombre de valeurs attendues.
+
+    Returns:
+        list: Valeurs de la clé.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_ordering_cursor(obj):
+    """Encode la clé (created_at, id) d'un objet en curseur."""
+    return encode_cursor(*ordering_key(obj))
+
+
+def decode_ordering_cursor(cursor):
+    """
+    Décode un curseur (created_at, id).
+
+    Returns:
+        tuple: Date de création et identifiant.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    created_at, obj_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), str(obj_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def encode_value_cursor(value, obj_id):
+    """Encode une clé (valeur numérique, id) en curseur (ex: distance, prix)."""
+    return encode_cursor(value, obj_id)
+
+
+def decode_value_cursor(cursor, nullable=False):
+    """
+    Décode un curseur (valeur numérique, id).
+
+    Args:
+        cursor (str): Curseur reçu du client.
+        nullable (bool): Accepte une valeur None (objets sans valeur,
+            placés en fin d'ordre par les pages triées par valeur).
+
+    Returns:
+        tuple: Valeur et identifiant.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    value, obj_id = decode_cursor(cursor, 2)
+    if value is None and nullable:
+        return None, str(obj_id)
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return float(value), str(obj_id)
+
+
+def decode_sort_cursor(cursor):
+    """
+    Décode un curseur (valeur ou None, id) des pages triées par valeur.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    return decode_value_cursor(cursor, nullable=True)
@@ -1,4 +1,11 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from itertools import islice
+from app.persistence.indexes import (DuplicateEntryError, HashIndex, INDEX_KINDS, in_range,
+                                     index_name, resolve_attribute)
+from app.persistence.locks import ReadWriteLock
+from app.persistence.pagination import (ordering_key, encode_ordering_cursor, decode_ordering_cursor,
+                                        encode_value_cursor, decode_value_cursor)
 
 
 class Repository(ABC):
@@ -9,12 +16,32 @@ class Repository(ABC):
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
     @abstractmethod
-    def get_all(self):
+    def get_for_update(self, obj_id):
+        pass
+
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
+    @abstractmethod
+    def get_all(self, load=()):
+        pass
+
+    @abstractmethod
+    def get_page(self, cursor=None, limit=None, filters=None, load=()):
+        pass
+
+    @abstractmethod
+    def iter_all(self, batch_size=1000, load=()):
         pass
 
     @abstractmethod
@@ -29,10 +56,58 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_all_by_attribute(self, attr_name, attr_value, load=()):
+        pass
+
+    @abstractmethod
+    def get_all_by_attribute_in(self, attr_name, attr_values, load=()):
+        pass
+
+    @abstractmethod
+    def get_by_attributes(self, criteria):
+        pass
+
+    @abstractmethod
+    def get_all_by_ranges(self, ranges, contains=None, load=()):
+        pass
+
+    @abstractmethod
+    def get_page_by_value(self, attr_name, cursor=None, limit=None, descending=False,
+                          ranges=None, contains=None, load=()):
+        pass
+
+    @abstractmethod
+    def create_index(self, attr_name, unique=False, kind='hash', **options):
+        pass
+
+    @abstractmethod
+    def list_indexes(self):
+        pass
+
+    @abstractmethod
+    def version(self):
+        pass
+
+    @abstractmethod
+    def begin(self):
+        pass
+
+    @abstractmethod
+    def commit(self):
+        pass
+
+    @abstractmethod
+    def rollback(self):
+        pass
+
 
 class InMemoryRepository(Repository):
     """
     Implémentation de la classe Repository en mémoire.
+
+    Les relations des objets sont déjà en mémoire : le paramètre load des
+    lectures (relations à précharger) est ignoré.
     """
     def __init__(self):
         """
@@ -40,58 +115,686 @@ class InMemoryRepository(Repository):
         """
         self._storage = {}
         self._id_counter = 0
+        self._indexes = {}
+        self._order = []
+        self._tx_depth = 0
+        self._journal = None
+        self._savepoints = []
+        self._version = 0
 
     def add(self, obj):
         """
         Ajoute un objet à la base de données.
+
+        Raises:
+            DuplicateEntryError: Si l'objet viole un index unique.
         """
+        for index in self._indexes.values():
+            index.check(obj)
+        previous = self._storage.get(obj.id)
+        if previous is not None:
+            self._unindex(previous)
+        self._journal_entry('add', obj.id, previous)
         self._storage[obj.id] = obj
+        self._index(obj)
         self._id_counter += 1
 
+    def add_many(self, objs):
+        """
+        Ajoute plusieurs objets.
+
+        Args:
+            objs (iterable): Objets à ajouter.
+
+        Raises:
+            DuplicateEntryError: Si un objet viole un index unique (les
+                objets précédents restent ajoutés hors transaction).
+        """
+        for obj in objs:
+            self.add(obj)
+
     def get(self, obj_id):
         """
         Récupère un objet par son identifiant.
         """
         return self._storage.get(obj_id)
 
-    def get_all(self):
+    def get_for_update(self, obj_id):
+        """
+        Récupère un objet avant une lecture-modification-écriture.
+
+        En mémoire, les écritures concurrentes sont sérialisées par
+        l'appelant (verrou de la facade, verrou exclusif d'une unité de
+        travail) : l'objet est simplement lu.
+
+        Args:
+            obj_id: Identifiant de l'objet.
+
+        Returns:
+            Objet trouvé ou None si inexistant.
+        """
+        return self.get(obj_id)
+
+    def get_many(self, obj_ids):
+        """
+        Récupère plusieurs objets par leurs identifiants en une passe.
+
+        Args:
+            obj_ids (iterable): Identifiants des objets.
+
+        Returns:
+            list: Objets trouvés, dans l'ordre des identifiants (sans doublon).
+        """
+        storage = self._storage
+        return [storage[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in storage]
+
+    def get_all(self, load=()):
         """
         Récupère tous les objets de la base de données.
         """
         return list(self._storage.values())
 
+    def get_page(self, cursor=None, limit=None, filters=None, load=()):
+        """
+        Récupère une page d'objets ordonnés par (created_at, id).
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'objets (None pour tout récupérer).
+            filters (dict): Valeurs d'attributs à respecter (servies par
+                un index si possible).
+            load (iterable): Relations à précharger (ignoré).
+
+        Returns:
+            tuple: Liste des objets et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si le curseur est invalide.
+        """
+        if filters:
+            keys = sorted(ordering_key(obj) for obj in self._find(filters))
+        else:
+            keys = self._order
+        start = bisect_right(keys, decode_ordering_cursor(cursor)) if cursor else 0
+        end = len(keys) if limit is None else start + limit
+        items = [self._storage[obj_id] for _, obj_id in keys[start:end]]
+        next_cursor = encode_ordering_cursor(items[-1]) if items and end < len(keys) else None
+        return items, next_cursor
+
+    def iter_all(self, batch_size=1000, load=()):
+        """
+        Parcourt tous les objets par lots, dans l'ordre (created_at, id).
+
+        Chaque lot est une page : la mémoire utilisée ne dépend que de
+        batch_size, et le parcours tolère les écritures concurrentes.
+
+        Args:
+            batch_size (int): Nombre d'objets lus par lot.
+            load (iterable): Relations à précharger (ignoré).
+
+        Yields:
+            Les objets, un par un.
+        """
+        cursor = None
+        while True:
+            items, cursor = self.get_page(cursor, batch_size)
+            yield from items
+            if cursor is None:
+                return
+
     def update(self, obj_id, data):
         """
         Met à jour un objet existant dans la base de données.
+
+        Raises:
+            DuplicateEntryError: Si la mise à jour viole un index unique.
         """
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            for index in self._indexes.values():
+                index.check(obj, data)
+            self._journal_entry('update', obj_id, dict(vars(obj)))
+            self._unindex(obj)
+            try:
+                obj.update(data)
+            finally:
+                self._index(obj)
 
     def delete(self, obj_id):
         """
         Supprime un objet de la base de données.
         """
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            obj = self._storage.pop(obj_id)
+            self._journal_entry('delete', obj_id, obj)
+            self._unindex(obj)
             return True
         return False
 
     def get_by_attribute(self, attr_name, attr_value):
         """
         Récupère un objet par une attribut spécifique.
+
+        Utilise l'index déclaré sur l'attribut s'il existe (O(1)),
+        sinon parcourt tous les objets.
         """
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            obj_ids = index.lookup(attr_value)
+            return self._storage[obj_ids[0]] if obj_ids else None
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
+    def get_all_by_attribute(self, attr_name, attr_value, load=()):
+        """
+        Récupère tous les objets ayant une valeur d'attribut donnée.
+
+        Utilise l'index déclaré sur l'attribut s'il existe, sinon
+        parcourt tous les objets.
+
+        Args:
+            attr_name (str): Nom (ou chemin, ex: 'place.id') de l'attribut.
+            attr_value (any): Valeur recherchée.
+            load (iterable): Relations à précharger (ignoré).
+
+        Returns:
+            list: Objets trouvés.
+        """
+        return self._find({attr_name: attr_value})
+
+    def get_all_by_attribute_in(self, attr_name, attr_values, load=()):
+        """
+        Récupère tous les objets dont l'attribut prend une des valeurs données.
+
+        Args:
+            attr_name (str): Nom (ou chemin) de l'attribut.
+            attr_values (iterable): Valeurs recherchées.
+            load (iterable): Relations à précharger (ignoré).
+
+        Returns:
+            list: Objets trouvés (une lookup d'index par valeur si possible).
+        """
+        attr_values = list(dict.fromkeys(attr_values))
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return [self._storage[obj_id] for value in attr_values for obj_id in index.lookup(value)]
+        wanted = set(attr_values)
+        return [obj for obj in self._storage.values() if resolve_attribute(obj, attr_name) in wanted]
+
+    def get_by_attributes(self, criteria):
+        """
+        Récupère un objet correspondant à plusieurs attributs à la fois.
+
+        Utilise l'index composite portant sur ces attributs s'il existe
+        (O(1)), sinon parcourt tous les objets.
+
+        Args:
+            criteria (dict): Valeurs recherchées par nom d'attribut
+                (ex: {'place.id': ..., 'user.id': ...}).
+
+        Returns:
+            Objet trouvé ou None si inexistant.
+        """
+        found = self._find(criteria)
+        return found[0] if found else None
+
+    def get_all_by_ranges(self, ranges, contains=None, load=()):
+        """
+        Récupère les objets dont les attributs sont compris dans des intervalles.
+
+        Les candidats sont fournis par les index portant sur ces critères
+        (grille spatiale, index trié, index inversé), en intersectant leurs
+        résultats ; sans index applicable, tous les objets sont parcourus.
+        Les critères exacts sont ensuite vérifiés sur chaque candidat.
+
+        Args:
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut ;
+                une borne None n'est pas appliquée.
+            contains (dict): Valeurs que doit contenir un attribut
+                collection, par nom d'attribut (ex: {'amenities': [...]}).
+            load (iterable): Relations à précharger (ignoré).
+
+        Returns:
+            list: Objets trouvés.
+        """
+        contains = {attr: set(values) for attr, values in (contains or {}).items()}
+        candidate_ids = None
+        for index in self._indexes.values():
+            if index.kind == 'inverted' and index.attr_names[0] in contains:
+                found = index.lookup_all(contains[index.attr_names[0]])
+            elif hasattr(index, 'lookup_ranges') and set(index.attr_names) <= set(ranges):
+                found = index.lookup_ranges(ranges)
+            else:
+                continue
+            candidate_ids = set(found) if candidate_ids is None else candidate_ids.intersection(found)
+            if not candidate_ids:
+                return []
+        if candidate_ids is None:
+            candidates = self._storage.values()
+        else:
+            candidates = [self._storage[obj_id] for obj_id in candidate_ids]
+        return [obj for obj in candidates if self._matches(obj, ranges, contains)]
+
+    def get_page_by_value(self, attr_name, cursor=None, limit=None, descending=False,
+                          ranges=None, contains=None, load=()):
+        """
+        Récupère une page d'objets ordonnés par la valeur d'un attribut.
+
+        L'ordre est (valeur, id) croissant, ou valeur décroissante puis id
+        croissant ; les objets sans valeur viennent en dernier. Avec un
+        index trié sur l'attribut, la page est lue en parcourant l'index à
+        partir du curseur : seuls les objets parcourus sont lus. Lorsque
+        les valeurs requises (contains) sont rares, les candidats de
+        l'index inversé sont triés à la place.
+
+        Args:
+            attr_name (str): Attribut de tri (numérique).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'objets (None pour tout récupérer).
+            descending (bool): Valeurs décroissantes.
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut.
+            contains (dict): Valeurs que doit contenir un attribut
+                collection, par nom d'attribut.
+            load (iterable): Relations à précharger (ignoré).
+
+        Returns:
+            tuple: Liste des objets et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si le curseur est invalide.
+        """
+        ranges = ranges or {}
+        contains = {attr: set(values) for attr, values in (contains or {}).items()}
+        after = decode_value_cursor(cursor, nullable=True) if cursor else None
+        index = self._indexes.get(index_name(attr_name, 'sorted'))
+        candidate_ids = None
+        for inverted in self._indexes.values():
+            if inverted.kind == 'inverted' and inverted.attr_names[0] in contains:
+                found = inverted.lookup_all(contains[inverted.attr_names[0]])
+                candidate_ids = found if candidate_ids is None else candidate_ids & found
+        # Parcours attendu de l'index : limit * N / c objets ; tri des candidats : c objets
+        if index is None or (candidate_ids is not None and (
+                limit is None or len(candidate_ids) ** 2 <= limit * len(self._storage))):
+            if candidate_ids is None:
+                candidates = self._storage.values()
+            else:
+                candidates = [self._storage[obj_id] for obj_id in candidate_ids]
+            entries = sorted(((resolve_attribute(obj, attr_name), obj) for obj in candidates
+                              if self._matches(obj, ranges, contains)),
+                             key=lambda entry: _value_order(entry[0], entry[1].id, descending))
+            if after is not None:
+                start = _value_order(after[0], after[1], descending)
+                entries = (entry for entry in entries
+                           if _value_order(entry[0], entry[1].id, descending) > start)
+        else:
+            entries = ((value, self._storage[obj_id]) for value, obj_id in
+                       index.iter_ordered(after, descending, ranges.get(attr_name, (None, None)))
+                       if candidate_ids is None or obj_id in candidate_ids)
+            entries = (entry for entry in entries if self._matches(entry[1], ranges, contains))
+        page = list(islice(entries, None if limit is None else limit + 1))
+        if limit is None or len(page) <= limit:
+            return [obj for _, obj in page], None
+        value, last = page[limit - 1]
+        return [obj for _, obj in page[:limit]], encode_value_cursor(value, str(last.id))
+
+    def create_index(self, attr_name, unique=False, kind='hash', **options):
+        """
+        Déclare un index secondaire, maintenu par add, update et delete.
+
+        Args:
+            attr_name (str | tuple): Attribut indexé ('email', 'place.id')
+                ou tuple d'attributs pour un index composite.
+            unique (bool): Si True, refuse deux objets ayant la même valeur.
+            kind (str): Type d'index : 'hash', 'grid' (index spatial sur
+                (latitude, longitude)), 'sorted' (intervalles de valeurs)
+                ou 'inverted' (éléments d'un attribut collection).
+            **options: Options propres au type d'index (ex: cell_size).
+
+        Raises:
+            DuplicateEntryError: Si les objets déjà stockés violent l'unicité.
+            ValueError: Si le type d'index est inconnu.
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind '{kind}'")
+        name = index_name(attr_name, kind)
+        if name in self._indexes:
+            return
+        if kind == 'hash':
+            index = HashIndex(attr_name, unique=unique)
+        elif unique:
+            raise ValueError(f"A {kind} index cannot be unique")
+        else:
+            index = INDEX_KINDS[kind](attr_name, **options)
+        for obj in self._indexing_view():
+            index.check(obj)
+            index.add(obj)
+        self._indexes[name] = index
+
+    def list_indexes(self):
+        """
+        Liste les index secondaires déclarés.
+
+        Returns:
+            list: Description de chaque index.
+        """
+        return [index.describe() for index in self._indexes.values()]
+
+    def version(self):
+        """
+        Version de la collection, modifiée par chaque écriture.
+
+        Returns:
+            int: Compteur d'écritures (ajouts, mises à jour, suppressions
+            et annulations).
+        """
+        return self._version
+
+    def begin(self):
+        """
+        Démarre une transaction, ou un point de sauvegarde dans la
+        transaction en cours.
+
+        Les écritures suivantes sont journalisées afin de pouvoir être
+        annulées par rollback. Une transaction imbriquée marque la position
+        courante du journal : son rollback n'annule que ses propres écritures.
+        """
+        self._tx_depth += 1
+        if self._tx_depth == 1:
+            self._journal = []
+        self._savepoints.append(len(self._journal))
+
+    def commit(self):
+        """
+        Valide la transaction (ou le point de sauvegarde) courante.
+
+        Les écritures en mémoire sont déjà visibles : les écritures d'une
+        transaction imbriquée rejoignent la transaction englobante, et le
+        journal est abandonné lorsque la plus externe se termine.
+        """
+        if self._tx_depth == 0:
+            return
+        self._tx_depth -= 1
+        self._savepoints.pop()
+        if self._tx_depth == 0:
+            self._journal = None
+
+    def rollback(self):
+        """
+        Annule les écritures de la transaction (ou du point de sauvegarde)
+        courante ; la transaction englobante reste ouverte.
+        """
+        if self._tx_depth == 0:
+            return
+        mark = self._savepoints.pop()
+        journal = self._journal[mark:]
+        del self._journal[mark:]
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self._journal = None
+        self._version += 1
+        for operation, obj_id, previous in reversed(journal):
+            current = self._storage.pop(obj_id, None)
+            if current is not None:
+                self._unindex(current)
+            if operation == 'update':
+                current.__dict__.clear()
+                current.__dict__.update(previous)
+                previous = current
+            if previous is not None:
+                self._storage[obj_id] = previous
+                self._index(previous)
+
+    def _indexing_view(self):
+        """Objets parcourus pour remplir un nouvel index."""
+        return self._storage.values()
+
+    @staticmethod
+    def _matches(obj, ranges, contains):
+        """
+        Vérifie les critères exacts de get_all_by_ranges sur un objet.
+
+        Args:
+            obj: Objet candidat.
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut.
+            contains (dict): Ensembles de valeurs requises par nom d'attribut.
+
+        Returns:
+            bool: True si l'objet respecte tous les critères.
+        """
+        return (all(in_range(resolve_attribute(obj, attr), bounds) for attr, bounds in ranges.items())
+                and all(values <= {getattr(value, 'id', value)
+                                   for value in resolve_attribute(obj, attr) or ()}
+                        for attr, values in contains.items()))
+
+    def _journal_entry(self, operation, obj_id, previous):
+        """
+        Enregistre l'état précédent d'un objet dans le journal de transaction.
+
+        Args:
+            operation (str): 'add', 'update' ou 'delete'.
+            obj_id (str): Identifiant de l'objet modifié.
+            previous: Objet remplacé ou supprimé, ou attributs avant mise à jour.
+        """
+        # Toute écriture passe par le journal : la collection change de version
+        self._version += 1
+        if self._journal is not None:
+            self._journal.append((operation, obj_id, previous))
+
+    def _find(self, criteria):
+        """
+        Récupère les objets correspondant à des valeurs d'attributs.
+
+        Utilise l'index portant exactement sur ces attributs s'il existe,
+        sinon parcourt tous les objets.
+
+        Args:
+            criteria (dict): Valeurs recherchées par nom d'attribut.
+
+        Returns:
+            list: Objets trouvés.
+        """
+        for index in self._indexes.values():
+            if index.kind == 'hash' and index.covers(criteria):
+                key = tuple(criteria[attr] for attr in index.attr_names)
+                obj_ids = index.lookup(key[0] if len(key) == 1 else key)
+                return [self._storage[obj_id] for obj_id in obj_ids]
+        return [obj for obj in self._storage.values()
+                if all(resolve_attribute(obj, attr) == value
+                       for attr, value in criteria.items())]
+
+    def _index(self, obj):
+        """Ajoute un objet à tous les index et à l'ordre de pagination."""
+        insort(self._order, ordering_key(obj))
+        for index in self._indexes.values():
+            index.add(obj)
+
+    def _unindex(self, obj):
+        """Retire un objet de tous les index et de l'ordre de pagination."""
+        key = ordering_key(obj)
+        position = bisect_right(self._order, key) - 1
+        if position >= 0 and self._order[position] == key:
+            del self._order[position]
+        for index in self._indexes.values():
+            index.remove(obj)
+
+def _value_order(value, obj_id, descending):
+    """
+    Clé de tri des pages ordonnées par valeur (get_page_by_value).
+
+    Args:
+        value: Valeur numérique, ou None (en dernier).
+        obj_id: Identifiant de l'objet.
+        descending (bool): Valeurs décroissantes (identifiants croissants).
+
+    Returns:
+        tuple: Clé comparable.
+    """
+    if value is None:
+        return (True, 0, str(obj_id))
+    return (False, -value if descending else value, str(obj_id))
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """
+    Variante de InMemoryRepository utilisable depuis plusieurs threads.
+
+    Un verrou lecteurs-rédacteur protège la collection : les lectures
+    s'exécutent en parallèle, les écritures (et la mise à jour des index
+    et de l'ordre de pagination qui les accompagne) sont exclusives. Une
+    transaction garde le verrou en écriture de begin au commit ou au
+    rollback le plus externe : les autres threads ne voient jamais ses
+    écritures non validées.
+
+    Un thread qui tient plusieurs de ces verrous doit les avoir pris dans
+    un ordre global, sans quoi deux threads peuvent s'attendre
+    mutuellement. La façade garantit cet ordre : seules ses transactions
+    tiennent plusieurs verrous (dépôts dans un ordre fixe), aucune méthode
+    ne garde un verrou entre deux appels (iter_all le reprend par lot), et
+    ses propres verrous ne sont pris qu'à l'intérieur d'une transaction.
+    """
+    def __init__(self):
+        """
+        Initialise le dépôt et son verrou.
+        """
+        super().__init__()
+        self._lock = ReadWriteLock()
+
+    def add(self, obj):
+        """Ajoute un objet (verrou exclusif)."""
+        with self._lock.write():
+            super().add(obj)
+
+    def add_many(self, objs):
+        """Ajoute plusieurs objets en une seule prise du verrou exclusif."""
+        with self._lock.write():
+            super().add_many(objs)
+
+    def get(self, obj_id):
+        """Récupère un objet par son identifiant (verrou partagé)."""
+        with self._lock.read():
+            return super().get(obj_id)
+
+    def get_many(self, obj_ids):
+        """Récupère plusieurs objets par leurs identifiants (verrou partagé)."""
+        with self._lock.read():
+            return super().get_many(obj_ids)
+
+    def get_all(self, load=()):
+        """Récupère tous les objets (verrou partagé)."""
+        with self._lock.read():
+            return super().get_all(load)
+
+    def get_page(self, cursor=None, limit=None, filters=None, load=()):
+        """Récupère une page d'objets (verrou partagé, iter_all le prend par lot)."""
+        with self._lock.read():
+            return super().get_page(cursor, limit, filters, load)
+
+    def update(self, obj_id, data):
+        """Met à jour un objet (verrou exclusif)."""
+        with self._lock.write():
+            super().update(obj_id, data)
+
+    def delete(self, obj_id):
+        """Supprime un objet (verrou exclusif)."""
+        with self._lock.write():
+            return super().delete(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """Récupère un objet par un attribut (verrou partagé)."""
+        with self._lock.read():
+            return super().get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value, load=()):
+        """Récupère les objets ayant une valeur d'attribut (verrou partagé)."""
+        with self._lock.read():
+            return super().get_all_by_attribute(attr_name, attr_value, load)
+
+    def get_all_by_attribute_in(self, attr_name, attr_values, load=()):
+        """Récupère les objets dont l'attribut est dans attr_values (verrou partagé)."""
+        with self._lock.read():
+            return super().get_all_by_attribute_in(attr_name, attr_values, load)
+
+    def get_by_attributes(self, criteria):
+        """Récupère un objet par plusieurs attributs (verrou partagé)."""
+        with self._lock.read():
+            return super().get_by_attributes(criteria)
+
+    def get_all_by_ranges(self, ranges, contains=None, load=()):
+        """Récupère les objets dans des intervalles de valeurs (verrou partagé)."""
+        with self._lock.read():
+            return super().get_all_by_ranges(ranges, contains, load)
+
+    def get_page_by_value(self, attr_name, cursor=None, limit=None, descending=False,
+                          ranges=None, contains=None, load=()):
+        """Récupère une page ordonnée par valeur (verrou partagé)."""
+        with self._lock.read():
+            return super().get_page_by_value(attr_name, cursor, limit, descending, ranges, contains, load)
+
+    def create_index(self, attr_name, unique=False, kind='hash', **options):
+        """Déclare un index secondaire (verrou exclusif)."""
+        with self._lock.write():
+            return super().create_index(attr_name, unique, kind, **options)
+
+    def list_indexes(self):
+        """Liste les index secondaires (verrou partagé)."""
+        with self._lock.read():
+            return super().list_indexes()
+
+    def version(self):
+        """Version de la collection (verrou partagé)."""
+        with self._lock.read():
+            return super().version()
+
+    def begin(self):
+        """
+        Démarre (ou rejoint) une transaction.
+
+        Le verrou exclusif est pris à chaque niveau et n'est rendu qu'au
+        commit ou au rollback correspondant.
+        """
+        self._lock.acquire_write()
+        super().begin()
+
+    def commit(self):
+        """
+        Valide la transaction courante et rend le niveau de verrou pris par begin.
+
+        Sans transaction ouverte par ce thread, ne fait rien.
+        """
+        with self._lock.write():
+            if self._tx_depth == 0:
+                return
+            super().commit()
+            self._lock.release_write()
+
+    def rollback(self):
+        """
+        Annule la transaction (ou le point de sauvegarde) courante et rend
+        le niveau de verrou pris par le begin correspondant.
+
+        Sans transaction ouverte par ce thread, ne fait rien.
+        """
+        with self._lock.write():
+            if self._tx_depth == 0:
+                return
+            super().rollback()
+            self._lock.release_write()
+
+
 class SQLAlchemyRepository(Repository):
     """
     Implémentation de la classe Repository avec SQLAlchemy.
+
+    Les lectures de listes acceptent les relations à précharger (load) :
+    les relations many-to-one sont chargées par jointure (joinedload), les
+    collections par une requête IN pour tous les objets (selectinload). Le
+    nombre de requêtes ne dépend donc pas du nombre d'objets lus.
     """
     def __init__(self, model):
         """
         Initialise le dépôt avec SQLAlchemy.
         """
         self.model = model
+        self._declared_indexes = {}
 
     def add(self, obj):
         """
@@ -99,10 +802,30 @@ class SQLAlchemyRepository(Repository):
 
         Args:
             obj: L'objet à ajouter à la base de données.
+
+        Raises:
+            DuplicateEntryError: Si l'objet viole une contrainte unique.
         """
         from app import db
         db.session.add(obj)
-        db.session.commit()
+        self._save()
+
+    def add_many(self, objs):
+        """
+        Ajoute plusieurs objets en une seule validation.
+
+        Les INSERT sont regroupés par SQLAlchemy lors du flush
+        (executemany / insertmanyvalues).
+
+        Args:
+            objs (iterable): Objets à ajouter.
+
+        Raises:
+            DuplicateEntryError: Si un objet viole une contrainte unique.
+        """
+        from app import db
+        db.session.add_all(list(objs))
+        self._save()
 
     def get(self, obj_id):
         """
@@ -114,16 +837,143 @@ class SQLAlchemyRepository(Repository):
         Returns:
             Objet trouvé ou None si inexistant.
         """
-        return self.model.query.get(obj_id)
-    
-    def get_all(self):
+        from app import db
+        return db.session.get(self.model, obj_id)
+
+    def get_for_update(self, obj_id):
+        """
+        Récupère un objet en verrouillant sa ligne jusqu'à la fin de la
+        transaction (SELECT ... FOR UPDATE).
+
+        Les valeurs sont relues depuis la base même si l'objet est déjà
+        dans la session : une lecture-modification-écriture (ex: agrégats
+        de notes) ne perd pas l'écriture concurrente d'un autre processus.
+        SQLite ignore FOR UPDATE mais n'accepte qu'une transaction
+        d'écriture à la fois.
+
+        Args:
+            obj_id: Identifiant de l'objet.
+
+        Returns:
+            Objet trouvé ou None si inexistant.
+
+        Raises:
+            DuplicateEntryError: Si une écriture en attente viole une
+                contrainte unique.
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app import db
+        # Écritures en attente envoyées avant la relecture (populate_existing)
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            if not db.session.info.get('tx_units'):
+                db.session.rollback()
+            raise DuplicateEntryError(str(e.orig)) from e
+        return (self.model.query.filter(self.model.id == obj_id)
+                .with_for_update().populate_existing().first())
+
+    def attach(self, obj):
+        """
+        Rattache à la session courante un objet lu lors d'une requête précédente.
+
+        Utilisé par CachingRepository : l'objet est fusionné sans
+        requête SQL (load=False), il n'est donc pas comparé à la base et
+        peut ignorer une écriture d'un autre processus jusqu'à l'expiration
+        de son entrée.
+
+        Args:
+            obj: Objet conservé en cache.
+
+        Returns:
+            Instance attachée à la session courante.
+        """
+        from app import db
+        return db.session.merge(obj, load=False)
+
+    def get_many(self, obj_ids):
+        """
+        Récupère plusieurs objets par leurs identifiants en une requête.
+
+        Args:
+            obj_ids (iterable): Identifiants des objets.
+
+        Returns:
+            list: Objets trouvés, dans l'ordre des identifiants (sans doublon).
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return []
+        found = {obj.id: obj for obj in self.model.query.filter(self.model.id.in_(obj_ids)).all()}
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    def get_all(self, load=()):
         """
         Récupère tous les objets de la base de données.
 
+        Args:
+            load (iterable): Relations à précharger.
+
         Returns:
             list: Liste de tous les objets.
         """
-        return self.model.query.all()
+        return self._query(load).all()
+
+    def get_page(self, cursor=None, limit=None, filters=None, load=()):
+        """
+        Récupère une page d'objets ordonnés par (created_at, id).
+
+        La pagination se fait par clé : la page suivante commence
+        strictement après le dernier (created_at, id) renvoyé, ce qui
+        évite les OFFSET coûteux.
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'objets (None pour tout récupérer).
+            filters (dict): Valeurs d'attributs à respecter.
+            load (iterable): Relations à précharger.
+
+        Returns:
+            tuple: Liste des objets et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si le curseur ou une relation est invalide.
+        """
+        from sqlalchemy import and_, or_
+        query = self._query(load)
+        if filters:
+            query = query.filter(*[self._column(attr) == value for attr, value in filters.items()])
+        if cursor:
+            created_at, obj_id = decode_ordering_cursor(cursor)
+            query = query.filter(or_(
+                self.model.created_at > created_at,
+                and_(self.model.created_at == created_at, self.model.id > obj_id)
+            ))
+        query = query.order_by(self.model.created_at, self.model.id)
+        if limit is None:
+            return query.all(), None
+        items = query.limit(limit + 1).all()
+        if len(items) > limit:
+            return items[:limit], encode_ordering_cursor(items[limit - 1])
+        return items, None
+
+    def iter_all(self, batch_size=1000, load=()):
+        """
+        Parcourt tous les objets avec un curseur côté serveur.
+
+        Les lignes sont chargées par lots de batch_size (yield_per) au lieu
+        de matérialiser toute la table ; les relations demandées sont
+        préchargées lot par lot.
+
+        Args:
+            batch_size (int): Nombre de lignes chargées par lot.
+            load (iterable): Relations à précharger.
+
+        Yields:
+            Les objets, un par un.
+        """
+        query = self._query(load).order_by(self.model.created_at, self.model.id)
+        yield from query.yield_per(batch_size)
 
     def update(self, obj_id, data):
         """
@@ -132,13 +982,15 @@ class SQLAlchemyRepository(Repository):
         Args:
             obj_id: Identifiant de l'objet à mettre à jour.
             data (dict): Dictionnaire contenant les données à mettre à jour.
+
+        Raises:
+            DuplicateEntryError: Si la mise à jour viole une contrainte unique.
         """
-        from app import db
         obj = self.get(obj_id)
         if obj:
-            for key, value in data.items():
-                setattr(obj, key, value)
-            db.session.commit()
+            # update() rafraîchit updated_at (versions et ETags)
+            obj.update(data)
+            self._save()
 
     def delete(self, obj_id):
         """
@@ -154,7 +1006,7 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self._save()
             return True
         return False
 
@@ -169,4 +1021,384 @@ class SQLAlchemyRepository(Repository):
         Returns:
             Objet trouvé ou None si inexistant.
         """
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+        return self.model.query.filter(self._column(attr_name) == attr_value).first()
+
+    def get_all_by_attribute(self, attr_name, attr_value, load=()):
+        """
+        Récupère tous les objets ayant une valeur d'attribut donnée.
+
+        Args:
+            attr_name (str): Nom (ou chemin, ex: 'place.id') de l'attribut.
+            attr_value (any): Valeur recherchée.
+            load (iterable): Relations à précharger.
+
+        Returns:
+            list: Objets trouvés.
+        """
+        return self._query(load).filter(self._column(attr_name) == attr_value).all()
+
+    def get_all_by_attribute_in(self, attr_name, attr_values, load=()):
+        """
+        Récupère tous les objets dont l'attribut prend une des valeurs données.
+
+        Args:
+            attr_name (str): Nom (ou chemin) de l'attribut.
+            attr_values (iterable): Valeurs recherchées.
+            load (iterable): Relations à précharger.
+
+        Returns:
+            list: Objets trouvés (une seule requête IN).
+        """
+        attr_values = list(dict.fromkeys(attr_values))
+        if not attr_values:
+            return []
+        return self._query(load).filter(self._column(attr_name).in_(attr_values)).all()
+
+    def get_by_attributes(self, criteria):
+        """
+        Récupère un objet correspondant à plusieurs attributs à la fois.
+
+        Args:
+            criteria (dict): Valeurs recherchées par nom d'attribut
+                (ex: {'place.id': ..., 'user.id': ...}).
+
+        Returns:
+            Objet trouvé ou None si inexistant.
+        """
+        return self.model.query.filter(
+            *[self._column(attr) == value for attr, value in criteria.items()]
+        ).first()
+
+    def get_all_by_ranges(self, ranges, contains=None, load=()):
+        """
+        Récupère les objets dont les attributs sont compris dans des intervalles.
+
+        Les bornes sont traduites en comparaisons sur les colonnes, ce qui
+        permet d'utiliser leurs index (ex: préfiltre par boîte englobante
+        sur les colonnes latitude/longitude). Chaque valeur requise d'une
+        relation collection devient une sous-requête EXISTS.
+
+        Args:
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut ;
+                une borne None n'est pas appliquée.
+            contains (dict): Identifiants que doit contenir une relation
+                collection, par nom de relation (ex: {'amenities': [...]}).
+            load (iterable): Relations à précharger.
+
+        Returns:
+            list: Objets trouvés.
+        """
+        return self._query(load).filter(*self._range_conditions(ranges, contains)).all()
+
+    def get_page_by_value(self, attr_name, cursor=None, limit=None, descending=False,
+                          ranges=None, contains=None, load=()):
+        """
+        Récupère une page d'objets ordonnés par la valeur d'une colonne.
+
+        Le tri et la limite sont faits par la base (ORDER BY colonne, id
+        LIMIT n) et la page suivante reprend après la dernière (valeur, id)
+        renvoyée. Les lignes sans valeur viennent en dernier, par id, et
+        sont lues par une seconde requête seulement si la première ne
+        remplit pas la page.
+
+        Args:
+            attr_name (str): Nom de la colonne de tri (numérique).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'objets (None pour tout récupérer).
+            descending (bool): Valeurs décroissantes (id croissants).
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut.
+            contains (dict): Identifiants que doit contenir une relation
+                collection, par nom de relation.
+            load (iterable): Relations à précharger.
+
+        Returns:
+            tuple: Liste des objets et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si le curseur ou une relation est invalide.
+        """
+        from sqlalchemy import and_, or_
+        ranges = ranges or {}
+        column = self._column(attr_name)
+        conditions = self._range_conditions(ranges, contains)
+        value, obj_id = decode_value_cursor(cursor, nullable=True) if cursor else (None, None)
+        items = []
+        if not cursor or value is not None:
+            query = self._query(load).filter(column.isnot(None), *conditions)
+            if cursor:
+                query = query.filter(or_(
+                    column < value if descending else column > value,
+                    and_(column == value, self.model.id > obj_id)
+                ))
+            query = query.order_by(column.desc() if descending else column, self.model.id)
+            items = (query if limit is None else query.limit(limit + 1)).all()
+        # Les lignes sans valeur ne respectent aucune borne sur la colonne de tri
+        if (limit is None or len(items) <= limit) and attr_name not in ranges:
+            query = self._query(load).filter(column.is_(None), *conditions)
+            if cursor and value is None:
+                query = query.filter(self.model.id > obj_id)
+            query = query.order_by(self.model.id)
+            items += (query if limit is None else query.limit(limit + 1 - len(items))).all()
+        if limit is None or len(items) <= limit:
+            return items, None
+        last = items[limit - 1]
+        return items[:limit], encode_value_cursor(getattr(last, attr_name), last.id)
+
+    def _range_conditions(self, ranges, contains):
+        """
+        Traduit les critères de get_all_by_ranges en conditions SQL.
+
+        Args:
+            ranges (dict): Bornes incluses (min, max) par nom d'attribut.
+            contains (dict): Identifiants requis par nom de relation.
+
+        Returns:
+            list: Conditions à passer à filter().
+        """
+        conditions = []
+        for attr, values in (contains or {}).items():
+            relation = getattr(self.model, attr)
+            conditions.extend(relation.any(id=value) for value in dict.fromkeys(values))
+        for attr, (low, high) in ranges.items():
+            column = self._column(attr)
+            if low is not None:
+                conditions.append(column >= low)
+            if high is not None:
+                conditions.append(column <= high)
+        return conditions
+
+    def create_index(self, attr_name, unique=False, kind='hash', **options):
+        """
+        Déclare un index secondaire.
+
+        Les index sont portés par le schéma de la table : la déclaration
+        est seulement enregistrée pour être listée par list_indexes.
+
+        Args:
+            attr_name (str | tuple): Attribut ou tuple d'attributs indexés.
+            unique (bool): Si True, l'index est unique.
+            kind (str): Type d'index déclaré.
+            **options: Options propres au type d'index (ignorées en SQL).
+
+        Raises:
+            ValueError: Si le type d'index est inconnu.
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind '{kind}'")
+        attr_names = (attr_name,) if isinstance(attr_name, str) else tuple(attr_name)
+        name = index_name(attr_names, kind)
+        self._declared_indexes[name] = {
+            'name': name,
+            'kind': kind,
+            'attributes': list(attr_names),
+            'unique': unique
+        }
+
+    def version(self):
+        """
+        Version de la collection, dérivée du nombre de lignes et de la
+        dernière date de modification (une seule requête agrégée).
+
+        Returns:
+            str: Jeton de version.
+        """
+        from sqlalchemy import func
+        from app import db
+        count, last_update = db.session.query(
+            func.count(self.model.id), func.max(self.model.updated_at)
+        ).one()
+        return f"{count}:{last_update.isoformat() if last_update else ''}"
+
+    def list_indexes(self):
+        """
+        Liste les index déclarés et ceux définis sur la table.
+
+        Returns:
+            list: Description de chaque index.
+        """
+        indexes = list(self._declared_indexes.values())
+        table = getattr(self.model, '__table__', None)
+        if table is not None:
+            for index in table.indexes:
+                indexes.append({
+                    'name': index.name,
+                    'kind': 'table',
+                    'attributes': [column.name for column in index.columns],
+                    'unique': bool(index.unique)
+                })
+        return indexes
+
+    def _query(self, load=()):
+        """
+        Requête sur le modèle avec les relations à précharger.
+
+        Args:
+            load (iterable): Noms des relations à précharger.
+
+        Returns:
+            Query: Requête SQLAlchemy.
+
+        Raises:
+            ValueError: Si une relation est inconnue.
+        """
+        query = self.model.query
+        if not load:
+            return query
+        from sqlalchemy import inspect
+        from sqlalchemy.orm import joinedload, selectinload
+        relationships = inspect(self.model).relationships
+        options = []
+        for name in load:
+            if name not in relationships:
+                raise ValueError(f"Unknown relation '{name}'")
+            # Collection : une requête IN ; many-to-one : jointure
+            strategy = selectinload if relationships[name].uselist else joinedload
+            options.append(strategy(getattr(self.model, name)))
+        return query.options(*options)
+
+    def _column(self, attr_name):
+        """
+        Traduit un nom d'attribut en colonne filtrable.
+
+        Un chemin 'relation.id' est traduit en la colonne de clé étrangère
+        correspondante (ex: 'place.id' -> reviews.place_id), ce qui permet
+        d'utiliser l'index de cette colonne sans jointure.
+
+        Args:
+            attr_name (str): Nom ou chemin de l'attribut.
+
+        Returns:
+            Colonne SQLAlchemy.
+
+        Raises:
+            ValueError: Si le chemin ne correspond à aucune clé étrangère.
+        """
+        if '.' not in attr_name:
+            return getattr(self.model, attr_name)
+        from sqlalchemy import inspect
+        relation, _, target = attr_name.partition('.')
+        prop = inspect(self.model).relationships[relation]
+        for local, remote in prop.local_remote_pairs:
+            if remote.key == target:
+                return local
+        raise ValueError(f"Cannot filter on attribute '{attr_name}'")
+
+    def begin(self):
+        """
+        Démarre une unité de travail, ou un point de sauvegarde dans
+        l'unité en cours.
+
+        Tant qu'elle est ouverte, add, update et delete ne valident plus la
+        session : toutes les écritures sont envoyées en une fois par le
+        commit le plus externe. L'état est porté par la session : les
+        repositories SQLAlchemy ouverts au même niveau d'imbrication
+        partagent l'unité de ce niveau, et chaque niveau imbriqué est un
+        SAVEPOINT (session.begin_nested).
+        """
+        from app import db
+        info = db.session.info
+        depths = info.setdefault('tx_depths', {})
+        level = depths.get(id(self), 0) + 1
+        depths[id(self)] = level
+        units = info.setdefault('tx_units', {})
+        unit = units.get(level)
+        if unit is None:
+            savepoint = db.session.begin_nested() if level > 1 else None
+            unit = units[level] = {'savepoint': savepoint, 'members': 0, 'rolled_back': False}
+        unit['members'] += 1
+
+    def commit(self):
+        """
+        Termine le niveau d'unité de travail de ce repository. Le dernier
+        repository d'un niveau libère son point de sauvegarde, ou valide la
+        session s'il s'agit du plus externe.
+
+        Raises:
+            DuplicateEntryError: Si la base refuse l'écriture (le niveau est
+                alors annulé).
+        """
+        unit, level = self._leave()
+        if unit is None or unit['members'] or unit['rolled_back']:
+            return
+        if level == 1:
+            self._commit()
+        else:
+            self._release(unit['savepoint'])
+
+    def rollback(self):
+        """
+        Annule les écritures du niveau d'unité de travail de ce repository ;
+        les niveaux englobants restent ouverts.
+        """
+        from app import db
+        unit, level = self._leave()
+        if unit is None or unit['rolled_back']:
+            return
+        unit['rolled_back'] = True
+        if level == 1:
+            db.session.rollback()
+        else:
+            unit['savepoint'].rollback()
+
+    def _leave(self):
+        """
+        Sort du niveau d'unité de travail courant de ce repository.
+
+        Returns:
+            tuple: Unité du niveau (None hors unité de travail) et niveau.
+        """
+        from app import db
+        info = db.session.info
+        depths = info.get('tx_depths', {})
+        level = depths.get(id(self), 0)
+        if level == 0:
+            return None, 0
+        if level == 1:
+            del depths[id(self)]
+        else:
+            depths[id(self)] = level - 1
+        units = info['tx_units']
+        unit = units[level]
+        unit['members'] -= 1
+        if unit['members'] == 0:
+            del units[level]
+        return unit, level
+
+    def _save(self):
+        """
+        Valide la session, sauf si une unité de travail est en cours.
+        """
+        from app import db
+        if not db.session.info.get('tx_units'):
+            self._commit()
+
+    def _release(self, savepoint):
+        """
+        Libère un point de sauvegarde en traduisant les violations de
+        contrainte unique.
+
+        Raises:
+            DuplicateEntryError: Si la base refuse l'écriture.
+        """
+        from sqlalchemy.exc import IntegrityError
+        try:
+            savepoint.commit()
+        except IntegrityError as e:
+            # Le flush en échec désactive le point de sauvegarde sans le fermer
+            savepoint.rollback()
+            raise DuplicateEntryError(str(e.orig)) from e
+
+    def _commit(self):
+        """
+        Valide la session en traduisant les violations de contrainte unique.
+
+        Raises:
+            DuplicateEntryError: Si la base refuse l'écriture.
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app import db
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise DuplicateEntryError(str(e.orig)) from e
@@ -0,0 +1,380 @@
+"""
+Format binaire des instantanés du mode en mémoire durable.
+
+Le fichier est projeté en mémoire (mmap) : les objets ne sont construits
+qu'au premier accès, et les index peuvent être remplis sans les construire.
+
+Disposition (petit-boutiste) :
+    en-tête     MAGIC, lsn (uint64), longueur de la table des matières (uint32)
+    table       JSON : pour chaque collection, ses champs (nom, type), son
+                nombre d'enregistrements, leur position et leur taille
+    données     enregistrements de taille fixe, collection par collection,
+                dans l'ordre (created_at, id) : masque des valeurs nulles
+                (uint64) puis un emplacement par champ
+    tas         chaînes UTF-8 (textes, identifiants liés, JSON) désignées par
+                (position, longueur) depuis les enregistrements
+"""
+import json
+import mmap
+import struct
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+
+MAGIC = b'HBNBSNP1'
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+_HEADER = struct.Struct('<8sQI')
+_NULLS = struct.Struct('<Q')
+# Emplacement de chaque type de champ : chaîne 's', identifiant lié 'r',
+# liste d'identifiants liés 'c', JSON 'j', réel 'f', entier 'i',
+# booléen 'b' et date 't' (microsecondes depuis EPOCH)
+_SLOTS = {'s': 'QI', 'r': 'QI', 'c': 'QI', 'j': 'QI', 'f': 'd', 'i': 'q', 'b': '?', 't': 'q'}
+_HEAP_TYPES = frozenset('srcj')
+MAX_FIELDS = 64
+
+
+def _record_format(fields):
+    """Format struct d'un enregistrement (masque des nulls puis champs)."""
+    return '<Q' + ''.join(_SLOTS[code] for _, code in fields)
+
+
+def write_snapshot(file, lsn, collections):
+    """
+    Écrit un instantané binaire.
+
+    Args:
+        file: Fichier binaire ouvert en écriture.
+        lsn (int): Dernier numéro de séquence du journal couvert.
+        collections (list): Tuples (nom, champs, nombre, lignes) où champs
+            est la liste des (nom, type) et lignes un itérable de tuples de
+            valeurs dans l'ordre des champs.
+
+    Raises:
+        ValueError: Si une collection a trop de champs.
+    """
+    toc = {'collections': []}
+    offset = 0
+    for name, fields, count, _ in collections:
+        if len(fields) > MAX_FIELDS:
+            raise ValueError(f"Collection '{name}' has more than {MAX_FIELDS} fields")
+        size = struct.calcsize(_record_format(fields))
+        toc['collections'].append({'name': name, 'fields': [list(field) for field in fields],
+                                   'count': count, 'records': offset, 'record_size': size})
+        offset += count * size
+    toc['heap'] = offset
+    toc_bytes = json.dumps(toc, separators=(',', ':')).encode()
+    file.write(_HEADER.pack(MAGIC, lsn, len(toc_bytes)))
+    file.write(toc_bytes)
+
+    heap = bytearray()
+    for name, fields, count, rows in collections:
+        record = struct.Struct(_record_format(fields))
+        written = 0
+        for row in rows:
+            nulls, slots = 0, []
+            for position, ((_, code), value) in enumerate(zip(fields, row)):
+                if value is None:
+                    nulls |= 1 << position
+                    slots.extend((0, 0) if code in _HEAP_TYPES else (0,))
+                elif code in _HEAP_TYPES:
+                    data = (json.dumps(value, separators=(',', ':')) if code in 'cj' else value).encode()
+                    slots.extend((len(heap), len(data)))
+                    heap += data
+                elif code == 't':
+                    slots.append((value - EPOCH) // MICROSECOND)
+                else:
+                    slots.append(value)
+            file.write(record.pack(nulls, *slots))
+            written += 1
+        if written != count:
+            raise ValueError(f"Collection '{name}' announced {count} records, got {written}")
+    file.write(heap)
+
+
+class MappedSnapshot:
+    """
+    Instantané binaire projeté en mémoire.
+    """
+    def __init__(self, path):
+        """
+        Projette un instantané et lit sa table des matières.
+
+        Args:
+            path (str): Chemin de l'instantané.
+
+        Raises:
+            ValueError: Si le fichier n'est pas un instantané valide.
+        """
+        with open(path, 'rb') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise ValueError(f"Unreadable snapshot {path}: {e}") from e
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Unreadable snapshot {path}: truncated header")
+        magic, self.lsn, toc_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Unreadable snapshot {path}: bad magic number")
+        try:
+            toc = json.loads(self._map[_HEADER.size:_HEADER.size + toc_length])
+        except ValueError as e:
+            raise ValueError(f"Unreadable snapshot {path}: {e}") from e
+        base = _HEADER.size + toc_length
+        heap = base + toc['heap']
+        self.collections = {
+            entry['name']: MappedCollection(self._map, [tuple(field) for field in entry['fields']],
+                                            entry['count'], base + entry['records'],
+                                            entry['record_size'], heap)
+            for entry in toc['collections']
+        }
+
+
+class MappedCollection:
+    """
+    Enregistrements d'une collection dans un instantané projeté.
+    """
+    def __init__(self, buffer, fields, count, offset, record_size, heap):
+        """
+        Initialise l'accès aux enregistrements.
+
+        Args:
+            buffer (mmap): Instantané projeté.
+            fields (list): Champs (nom, type) des enregistrements.
+            count (int): Nombre d'enregistrements.
+            offset (int): Position du premier enregistrement.
+            record_size (int): Taille d'un enregistrement.
+            heap (int): Position du tas de chaînes.
+        """
+        self._buffer = buffer
+        self.fields = fields
+        self.count = count
+        self._offset = offset
+        self._record_size = record_size
+        self._heap = heap
+        self._record = struct.Struct(_record_format(fields))
+        self.positions = {name: position for position, (name, _) in enumerate(fields)}
+        # Emplacement de chaque champ : décalage dans l'enregistrement et format
+        self._slots = []
+        slot_offset = _NULLS.size
+        for _, code in fields:
+            slot = struct.Struct('<' + _SLOTS[code])
+            self._slots.append((slot_offset, slot, code))
+            slot_offset += slot.size
+
+    def value(self, position, field):
+        """
+        Lit un seul champ d'un enregistrement.
+
+        Args:
+            position (int): Rang de l'enregistrement.
+            field (int): Rang du champ.
+
+        Returns:
+            La valeur (identifiant pour un champ 'r', liste pour 'c').
+        """
+        start = self._offset + position * self._record_size
+        if _NULLS.unpack_from(self._buffer, start)[0] >> field & 1:
+            return None
+        slot_offset, slot, code = self._slots[field]
+        return self._convert(code, slot.unpack_from(self._buffer, start + slot_offset))
+
+    def row(self, position):
+        """
+        Lit toutes les valeurs d'un enregistrement.
+
+        Returns:
+            tuple: Valeurs dans l'ordre des champs.
+        """
+        raw = self._record.unpack_from(self._buffer, self._offset + position * self._record_size)
+        nulls, index, values = raw[0], 1, []
+        for field, (_, code) in enumerate(self.fields):
+            width = 2 if code in _HEAP_TYPES else 1
+            values.append(None if nulls >> field & 1 else self._convert(code, raw[index:index + width]))
+            index += width
+        return tuple(values)
+
+    def state(self, position):
+        """
+        État d'un enregistrement, au format attendu par ModelCodec.decode.
+
+        Returns:
+            dict: Valeurs par nom de champ.
+        """
+        return dict(zip((name for name, _ in self.fields), self.row(position)))
+
+    def ordering_keys(self):
+        """
+        Clés (created_at, id) des enregistrements, dans l'ordre du fichier.
+
+        Returns:
+            list: Clés de pagination, déjà triées.
+        """
+        id_field, date_field = self.positions['id'], self.positions.get('created_at')
+        keys = []
+        for position in range(self.count):
+            created_at = self.value(position, date_field) if date_field is not None else None
+            keys.append((created_at or datetime.min, self.value(position, id_field)))
+        return keys
+
+    def _convert(self, code, slot):
+        """Convertit le contenu d'un emplacement en valeur Python."""
+        if code in _HEAP_TYPES:
+            start = self._heap + slot[0]
+            text = str(self._buffer[start:start + slot[1]], 'utf-8')
+            return json.loads(text) if code in 'cj' else text
+        if code == 't':
+            return EPOCH + slot[0] * MICROSECOND
+        return slot[0]
+
+
+class Reference:
+    """Objet lié vu depuis un enregistrement : seul son identifiant est connu."""
+    __slots__ = ('id',)
+
+    def __init__(self, obj_id):
+        """Initialise la référence."""
+        self.id = obj_id
+
+
+class RecordView:
+    """
+    Vue en lecture d'un enregistrement non matérialisé.
+
+    Chaque attribut est lu à la demande dans l'instantané : les index
+    peuvent être remplis sans construire les objets. Un objet lié est vu
+    comme une Reference, une collection liée comme la liste de ses
+    identifiants.
+    """
+    __slots__ = ('_collection', '_position', '_values', 'id')
+
+    def __init__(self, collection, position, obj_id):
+        """
+        Initialise la vue.
+
+        Args:
+            collection (MappedCollection): Collection de l'enregistrement.
+            position (int): Rang de l'enregistrement.
+            obj_id (str): Identifiant de l'objet.
+        """
+        self._collection = collection
+        self._position = position
+        self._values = {}
+        self.id = obj_id
+
+    def __getattr__(self, name):
+        """Lit un champ de l'enregistrement (une seule fois par vue)."""
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        field = self._collection.positions.get(name)
+        if field is None:
+            raise AttributeError(name)
+        value = self._collection.value(self._position, field)
+        if value is not None and self._collection.fields[field][1] == 'r':
+            value = Reference(value)
+        self._values[name] = value
+        return value
+
+
+class LazyStorage(MutableMapping):
+    """
+    Stockage par identifiant d'un InMemoryRepository dont une partie des
+    objets est encore dans un instantané projeté.
+
+    Un objet est construit (ModelCodec.decode) au premier accès par
+    identifiant ou au premier parcours ; les objets liés sont résolus,
+    et donc construits, à ce moment. Les collections inverses (place.reviews)
+    ne contiennent que les objets déjà construits. Les constructions sont
+    sérialisées par un verrou partagé entre les collections d'un même
+    stockage : un objet peut être construit depuis la lecture d'une autre
+    collection.
+    """
+    def __init__(self, collection, codec, resolve, lock, keys):
+        """
+        Initialise le stockage avec tous les enregistrements de la collection.
+
+        Args:
+            collection (MappedCollection): Enregistrements non matérialisés.
+            codec (ModelCodec): Construction des objets.
+            resolve (callable): resolve(model, obj_id) renvoie l'objet lié.
+            lock (threading.RLock): Verrou des constructions.
+            keys (list): Clés (created_at, id) des enregistrements, dans
+                l'ordre du fichier (MappedCollection.ordering_keys).
+        """
+        self._collection = collection
+        self._codec = codec
+        self._resolve = resolve
+        self._lock = lock
+        self._positions = {obj_id: position for position, (_, obj_id) in enumerate(keys)}
+        # None tant que l'objet n'est pas construit (ordre d'insertion conservé)
+        self._entries = dict.fromkeys(self._positions)
+
+    @property
+    def pending(self):
+        """Nombre d'objets encore non construits."""
+        return len(self._positions)
+
+    def __getitem__(self, obj_id):
+        obj = self._entries[obj_id]
+        if obj is None:
+            obj = self._materialise(obj_id)
+        return obj
+
+    def __setitem__(self, obj_id, obj):
+        with self._lock:
+            self._positions.pop(obj_id, None)
+            self._entries[obj_id] = obj
+
+    def __delitem__(self, obj_id):
+        with self._lock:
+            self._positions.pop(obj_id, None)
+            del self._entries[obj_id]
+
+    def __contains__(self, obj_id):
+        return obj_id in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def views(self):
+        """
+        Parcourt les objets construits et des vues des autres, sans rien construire.
+
+        Yields:
+            L'objet ou sa RecordView.
+        """
+        for obj_id, obj in list(self._entries.items()):
+            position = self._positions.get(obj_id)
+            yield obj if position is None else RecordView(self._collection, position, obj_id)
+
+    def row(self, obj_id):
+        """
+        Valeurs d'un objet pour un nouvel instantané, sans le construire.
+
+        Returns:
+            tuple: Valeurs dans l'ordre des champs du codec.
+        """
+        with self._lock:
+            position = self._positions.get(obj_id)
+            if position is None:
+                return self._codec.row(self._entries[obj_id])
+            state = self._collection.state(position)
+        return tuple(state.get(name) for name, _ in self._codec.fields)
+
+    def _materialise(self, obj_id):
+        """Construit un objet de l'instantané et résout ses objets liés."""
+        with self._lock:
+            obj = self._entries[obj_id]
+            if obj is not None:
+                return obj
+            state = self._collection.state(self._positions.pop(obj_id))
+            obj = self._codec.decode(state, None)
+            # Enregistré avant la résolution : les cycles retrouvent l'objet
+            self._entries[obj_id] = obj
+            self._codec.link(obj, state, self._resolve)
+            return obj
@@ -13,8 +13,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 from app.persistence.test.test_repository import (
     TestRepositoryInterface,
     TestInMemoryRepository,
+    TestCachingRepository,
+    TestConcurrentInMemoryRepository,
     TestSQLAlchemyRepositoryStructure
 )
+from app.persistence.test.test_durable import TestDurableStore, TestMappedSnapshot
 
 
 def run_persistence_tests():
@@ -27,6 +30,10 @@ def run_persistence_tests():
     test_classes = [
         (TestRepositoryInterface, "Tests Interface Repository"),
         (TestInMemoryRepository, "Tests InMemoryRepository"),
+        (TestCachingRepository, "Tests CachingRepository"),
+        (TestConcurrentInMemoryRepository, "Tests ConcurrentInMemoryRepository"),
+        (TestDurableStore, "Tests DurableStore"),
+        (TestMappedSnapshot, "Tests instantané binaire"),
         (TestSQLAlchemyRepositoryStructure, "Tests Structure SQLAlchemyRepository")
     ]
     
@@ -0,0 +1,355 @@
+import json
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from app.persistence.durable import (DurableStore, ModelCodec, JOURNAL_FILE, SNAPSHOT_FILE,
+                                     open_durable_repositories)
+from app.persistence.repository import DuplicateEntryError
+from app.persistence.snapshot import MAGIC, LazyStorage, MappedSnapshot
+from app.services.facade import HBnBFacade
+from app.models.amenity import Amenity
+from app import create_app
+from config import TestingConfig
+
+
+class TestDurableStore(unittest.TestCase):
+    """Tests pour DurableStore et DurableInMemoryRepository"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def open_amenities(self, **options):
+        """Ouvre (ou rouvre) un stockage ne contenant que les amenities"""
+        store = DurableStore(self.directory, **options)
+        self.stores.append(store)
+        repo = store.repository('amenities', ModelCodec(Amenity))
+        repo.create_index('name', unique=True)
+        store.load()
+        return store, repo
+
+    def open_facade(self, **options):
+        """Ouvre (ou rouvre) les repositories durables et une façade"""
+        repositories = open_durable_repositories(self.directory, **options)
+        self.stores.append(repositories['user_repo'].store)
+        return HBnBFacade(repositories)
+
+    def journal_path(self):
+        """Chemin du journal d'écritures"""
+        return os.path.join(self.directory, JOURNAL_FILE)
+
+    def test_writes_survive_reopening(self):
+        """Test que les ajouts, mises à jour et suppressions sont relus"""
+        store, repo = self.open_amenities()
+        wifi, pool, sauna = Amenity('Wi-Fi'), Amenity('Pool'), Amenity('Sauna')
+        repo.add(wifi)
+        repo.add_many([pool, sauna])
+        repo.update(pool.id, {'name': 'Swimming pool'})
+        self.assertTrue(repo.delete(sauna.id))
+        store.close()
+
+        _, reopened = self.open_amenities()
+        self.assertEqual(sorted(amenity.name for amenity in reopened.get_all()), ['Swimming pool', 'Wi-Fi'])
+        restored = reopened.get(wifi.id)
+        self.assertEqual((restored.created_at, restored.updated_at), (wifi.created_at, wifi.updated_at))
+        self.assertEqual(reopened.get_by_attribute('name', 'Swimming pool').id, pool.id)
+        self.assertIsNone(reopened.get(sauna.id))
+
+    def test_failed_write_is_not_journaled(self):
+        """Test que les écritures refusées ne sont pas journalisées, contrairement aux précédentes"""
+        store, repo = self.open_amenities()
+        repo.add(Amenity('Wi-Fi'))
+        with self.assertRaises(DuplicateEntryError):
+            repo.add_many([Amenity('Pool'), Amenity('Wi-Fi')])
+        store.close()
+
+        _, reopened = self.open_amenities()
+        self.assertEqual(sorted(amenity.name for amenity in reopened.get_all()), ['Pool', 'Wi-Fi'])
+
+    def test_rolled_back_transaction_is_not_journaled(self):
+        """Test qu'une transaction n'est journalisée qu'à son commit"""
+        store, repo = self.open_amenities()
+        repo.begin()
+        repo.add(Amenity('Wi-Fi'))
+        repo.rollback()
+        repo.begin()
+        repo.add(Amenity('Pool'))
+        repo.begin()
+        repo.add(Amenity('Sauna'))
+        repo.commit()
+        with open(self.journal_path(), 'rb') as file:
+            self.assertEqual(file.read(), b'')
+        repo.commit()
+        store.close()
+
+        with open(self.journal_path(), 'rb') as file:
+            self.assertEqual(len(file.readlines()), 1)
+        _, reopened = self.open_amenities()
+        self.assertEqual(sorted(amenity.name for amenity in reopened.get_all()), ['Pool', 'Sauna'])
+
+    def test_torn_journal_tail_is_ignored(self):
+        """Test qu'une dernière ligne incomplète ou corrompue est ignorée puis écrasée"""
+        store, repo = self.open_amenities()
+        repo.add(Amenity('Wi-Fi'))
+        store.close()
+        with open(self.journal_path(), 'ab') as file:
+            file.write(b'0000abcd {"lsn":2,"collec')
+
+        store, repo = self.open_amenities()
+        self.assertEqual([amenity.name for amenity in repo.get_all()], ['Wi-Fi'])
+        repo.add(Amenity('Pool'))
+        store.close()
+
+        _, reopened = self.open_amenities()
+        self.assertEqual(sorted(amenity.name for amenity in reopened.get_all()), ['Pool', 'Wi-Fi'])
+
+    def test_snapshot_compacts_the_journal(self):
+        """Test que l'instantané remplace le journal et que la suite est rejouée"""
+        store, repo = self.open_amenities(snapshot_every=5)
+        amenities = [Amenity(f'Amenity {i}') for i in range(7)]
+        for amenity in amenities:
+            repo.add(amenity)
+        repo.update(amenities[0].id, {'name': 'Renamed'})
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+        with open(self.journal_path(), 'rb') as file:
+            self.assertEqual(len(file.readlines()), 3)
+        store.close()
+
+        _, reopened = self.open_amenities(snapshot_every=5)
+        self.assertEqual(len(reopened.get_all()), 7)
+        self.assertEqual(reopened.get(amenities[0].id).name, 'Renamed')
+
+    def test_concurrent_writers_share_flushes(self):
+        """Test de la validation groupée : des écrivains concurrents partagent les synchronisations"""
+        store, repo = self.open_amenities()
+        original_sync = store._sync_file
+
+        def slow_sync():
+            time.sleep(0.005)
+            original_sync()
+
+        store._sync_file = slow_sync
+        threads = [threading.Thread(target=lambda number=number: [
+            repo.add(Amenity(f'Amenity {number}-{i}')) for i in range(10)
+        ]) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(store.flushes, 80)
+        store.close()
+
+        _, reopened = self.open_amenities()
+        self.assertEqual(len(reopened.get_all()), 80)
+
+    def test_facade_relations_are_restored(self):
+        """Test que les relations entre collections sont reconstruites au démarrage"""
+        facade = self.open_facade(snapshot_every=4)
+        owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                    'email': 'owner@example.com', 'password': 'password123'})
+        reviewer = facade.create_user({'first_name': 'Reviewer', 'last_name': 'User',
+                                       'email': 'reviewer@example.com', 'password': 'password123'})
+        wifi = facade.create_amenity({'name': 'Wi-Fi'})
+        place = facade.create_place({'title': 'Loft', 'price': 120.0, 'latitude': 45.0,
+                                     'longitude': 5.0, 'owner_id': owner.id, 'amenities': [wifi.id]})
+        facade.create_review({'text': 'Great', 'rating': 4, 'place_id': place.id, 'user_id': reviewer.id})
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+        self.stores[-1].close()
+
+        facade = self.open_facade(snapshot_every=4)
+        restored = facade.get_place(place.id)
+        self.assertIs(restored.owner, facade.get_user(owner.id))
+        self.assertEqual([amenity.name for amenity in restored.amenities], ['Wi-Fi'])
+        self.assertEqual([review.text for review in restored.reviews], ['Great'])
+        self.assertEqual((restored.review_count, restored.average_rating), (1, 4.0))
+        self.assertTrue(facade.has_user_reviewed_place(place.id, reviewer.id))
+        self.assertTrue(facade.get_user_by_email('owner@example.com').verify_password('password123'))
+
+    def test_facade_transaction_is_one_record(self):
+        """Test qu'une transaction de la façade sur plusieurs collections est atomique dans le journal"""
+        facade = self.open_facade()
+        owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User',
+                                    'email': 'owner@example.com', 'password': 'password123'})
+        reviewer = facade.create_user({'first_name': 'Reviewer', 'last_name': 'User',
+                                       'email': 'reviewer@example.com', 'password': 'password123'})
+        place = facade.create_place({'title': 'Loft', 'price': 120.0, 'latitude': 45.0,
+                                     'longitude': 5.0, 'owner_id': owner.id})
+        with open(self.journal_path(), 'rb') as file:
+            before = file.read()
+        facade.create_review({'text': 'Great', 'rating': 4, 'place_id': place.id, 'user_id': reviewer.id})
+        self.stores[-1].close()
+
+        with open(self.journal_path(), 'rb') as file:
+            record = file.read()[len(before):]
+        self.assertEqual(record.count(b'\n'), 1)
+        self.assertIn(b'"places"', record)
+        self.assertIn(b'"reviews"', record)
+
+        # Arrêt brutal pendant l'écriture : aucune des deux écritures n'est relue
+        with open(self.journal_path(), 'wb') as file:
+            file.write(before + record[:len(record) // 2])
+        facade = self.open_facade()
+        self.assertEqual(facade.get_all_reviews(), [])
+        self.assertEqual(facade.get_place(place.id).review_count, 0)
+
+    def test_collection_records_are_replayed(self):
+        """Test que les enregistrements d'une seule collection (ancien format) sont rejoués"""
+        wifi = Amenity('Wi-Fi')
+        payload = json.dumps({'lsn': 1, 'collection': 'amenities',
+                              'ops': [['put', ModelCodec(Amenity).encode(wifi)]]},
+                             separators=(',', ':')).encode()
+        with open(self.journal_path(), 'wb') as file:
+            file.write(b'%08x %s\n' % (zlib.crc32(payload), payload))
+
+        store, repo = self.open_amenities()
+        self.assertEqual([amenity.id for amenity in repo.get_all()], [wifi.id])
+        repo.add(Amenity('Pool'))
+        store.close()
+
+        _, reopened = self.open_amenities()
+        self.assertEqual(sorted(amenity.name for amenity in reopened.get_all()), ['Pool', 'Wi-Fi'])
+
+    def test_application_uses_durable_store(self):
+        """Test que DURABLE_STORE_DIR sert l'API depuis les repositories durables"""
+        facade = self.open_facade()
+        facade.create_amenity({'name': 'Wi-Fi'})
+        self.stores[-1].close()
+
+        class DurableConfig(TestingConfig):
+            DURABLE_STORE_DIR = self.directory
+
+        app = create_app(config_class=DurableConfig)
+        self.stores.append(app.config['repositories']['user_repo'].store)
+        response = app.test_client().get('/api/v1/amenities/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([amenity['name'] for amenity in response.get_json()], ['Wi-Fi'])
+
+class TestMappedSnapshot(unittest.TestCase):
+    """Tests pour l'instantané binaire projeté en mémoire"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def open_facade(self):
+        """Ouvre (ou rouvre) les repositories durables, sans instantané automatique"""
+        repositories = open_durable_repositories(self.directory, snapshot_every=None)
+        store = repositories['user_repo'].store
+        self.stores.append(store)
+        return HBnBFacade(repositories), store
+
+    def populate(self):
+        """Crée un utilisateur, un lieu équipé et une review, puis écrit un instantané"""
+        facade, store = self.open_facade()
+        owner = facade.create_user({'first_name': 'Owner', 'last_name': 'User', 'is_admin': True,
+                                    'email': 'owner@example.com', 'password': 'password123'})
+        reviewer = facade.create_user({'first_name': 'Reviewer', 'last_name': 'User',
+                                       'email': 'reviewer@example.com', 'password': 'password123'})
+        wifi = facade.create_amenity({'name': 'Wi-Fi'})
+        empty = facade.create_place({'title': 'Empty', 'price': 80, 'latitude': 44.0,
+                                     'longitude': 4.0, 'owner_id': owner.id, 'amenities': []})
+        place = facade.create_place({'title': 'Loft', 'price': 120.5, 'latitude': 45.0,
+                                     'longitude': 5.0, 'owner_id': owner.id, 'amenities': [wifi.id]})
+        facade.create_review({'text': 'Great', 'rating': 4, 'place_id': place.id, 'user_id': reviewer.id})
+        store.snapshot()
+        rows = {name: {obj.id: repo.codec.row(obj) for obj in repo.get_all()}
+                for name, repo in store.repositories.items()}
+        store.close()
+        return rows, empty, place
+
+    def test_snapshot_file_layout(self):
+        """Test de l'en-tête et de la table des matières de l'instantané"""
+        self.populate()
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(len(MAGIC)), MAGIC)
+        snapshot = MappedSnapshot(path)
+        self.assertEqual({name: collection.count for name, collection in snapshot.collections.items()},
+                         {'users': 2, 'places': 2, 'reviews': 1, 'amenities': 1})
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, JOURNAL_FILE)), 0)
+
+    def test_invalid_snapshot_is_rejected(self):
+        """Test qu'un instantané illisible lève une ValueError"""
+        with open(os.path.join(self.directory, SNAPSHOT_FILE), 'wb') as file:
+            file.write(b'not a snapshot at all')
+        with self.assertRaises(ValueError):
+            open_durable_repositories(self.directory)
+
+    def test_objects_are_materialised_on_first_access(self):
+        """Test que les index sont remplis sans construire les objets, construits à la demande"""
+        _, empty, place = self.populate()
+        facade, store = self.open_facade()
+        users = store.repositories['users']._storage
+        places = store.repositories['places']._storage
+        self.assertIsInstance(users, LazyStorage)
+        self.assertEqual((users.pending, places.pending), (2, 2))
+
+        owner = facade.get_user_by_email('owner@example.com')
+        self.assertEqual((users.pending, places.pending), (1, 2))
+        found, _ = facade.search_places({'min_price': 100.0})
+        self.assertEqual([item.id for item in found], [place.id])
+        self.assertEqual(places.pending, 1)
+        # Les objets liés sont construits avec l'objet qui les référence
+        self.assertIs(found[0].owner, owner)
+        self.assertEqual([amenity.name for amenity in found[0].amenities], ['Wi-Fi'])
+        self.assertEqual([review.text for review in facade.get_reviews_by_place(place.id)], ['Great'])
+        self.assertEqual([item.id for item in facade.get_places_page(limit=10)[0]], [empty.id, place.id])
+        self.assertEqual(places.pending, 0)
+
+    def test_values_survive_successive_snapshots(self):
+        """Test que les valeurs typées sont identiques après deux instantanés sans construction"""
+        rows, _, place = self.populate()
+        _, store = self.open_facade()
+        store.snapshot()
+        self.assertEqual(store.repositories['places']._storage.pending, 2)
+        store.close()
+
+        facade, store = self.open_facade()
+        restored = {name: {obj.id: repo.codec.row(obj) for obj in repo.get_all()}
+                    for name, repo in store.repositories.items()}
+        self.assertEqual(restored, rows)
+        loft = facade.get_place(place.id)
+        self.assertEqual((loft.price, loft.average_rating, loft.rating_histogram), (120.5, 4.0, [0, 0, 0, 1, 0]))
+        self.assertTrue(facade.get_user_by_email('owner@example.com').is_admin)
+        self.assertTrue(facade.get_user_by_email('reviewer@example.com').verify_password('password123'))
+
+    def test_journal_tail_applies_on_top_of_snapshot(self):
+        """Test que les écritures postérieures à l'instantané sont rejouées sur les objets projetés"""
+        _, _, place = self.populate()
+        facade, store = self.open_facade()
+        facade.update_place(place.id, {'title': 'Renamed loft'})
+        review = facade.get_reviews_by_place(place.id)[0]
+        facade.delete_review(review.id)
+        store.close()
+
+        facade, store = self.open_facade()
+        loft = facade.get_place(place.id)
+        self.assertEqual((loft.title, loft.review_count), ('Renamed loft', 0))
+        self.assertIsNone(facade.get_review(review.id))
+        self.assertEqual(facade.get_reviews_by_place(place.id), [])
+        self.assertEqual(loft.reviews, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,16 @@
 import sys
 import os
+import threading
 import unittest
 from abc import ABC
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from app.persistence.repository import Repository, InMemoryRepository, SQLAlchemyRepository
+from app.persistence.repository import (Repository, InMemoryRepository, ConcurrentInMemoryRepository,
+                                        SQLAlchemyRepository, DuplicateEntryError)
+from app.persistence.locks import ReadWriteLock
+from app.persistence.pagination import ordering_key
+from app.persistence.cache import CachingRepository
 
 
 class TestRepositoryInterface(unittest.TestCase):
@@ -95,6 +100,20 @@ class TestInMemoryRepository(unittest.TestCase):
         result = self.repo.get("nonexistent")
         self.assertIsNone(result)
 
+    def test_get_many_objects(self):
+        """Test la récupération de plusieurs objets par identifiants"""
+        class TestObj:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+        obj1 = TestObj("id1")
+        obj2 = TestObj("id2")
+        self.repo.add(obj1)
+        self.repo.add(obj2)
+
+        self.assertEqual(self.repo.get_many(["id2", "missing", "id1", "id2"]), [obj2, obj1])
+        self.assertEqual(self.repo.get_many([]), [])
+
     def test_get_all_objects(self):
         """Test la récupération de tous les objets"""
         class TestObj:
@@ -162,11 +181,762 @@ class TestInMemoryRepository(unittest.TestCase):
         result = self.repo.get_by_attribute("email", "nonexistent@test.com")
         self.assertIsNone(result)
 
+    def test_get_by_attribute_with_index(self):
+        """Test la récupération par attribut via un index déclaré"""
+        class TestObj:
+            def __init__(self, obj_id, email):
+                self.id = obj_id
+                self.email = email
+
+        self.repo.add(TestObj("id1", "email1@test.com"))
+        self.repo.create_index("email", unique=True)
+        obj2 = TestObj("id2", "email2@test.com")
+        self.repo.add(obj2)
+
+        self.assertEqual(self.repo.get_by_attribute("email", "email2@test.com"), obj2)
+        self.assertEqual(self.repo.get_by_attribute("email", "email1@test.com").id, "id1")
+        self.assertIsNone(self.repo.get_by_attribute("email", "nonexistent@test.com"))
+
+    def test_unique_index_rejects_duplicates(self):
+        """Test qu'un index unique refuse les doublons à l'ajout et à la mise à jour"""
+        class TestObj:
+            def __init__(self, obj_id, email):
+                self.id = obj_id
+                self.email = email
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.create_index("email", unique=True)
+        self.repo.add(TestObj("id1", "email1@test.com"))
+        obj2 = TestObj("id2", "email2@test.com")
+        self.repo.add(obj2)
+
+        with self.assertRaises(ValueError):
+            self.repo.add(TestObj("id3", "email1@test.com"))
+        with self.assertRaises(ValueError):
+            self.repo.update("id2", {"email": "email1@test.com"})
+        self.assertEqual(obj2.email, "email2@test.com")
+        self.assertNotIn("id3", self.repo._storage)
+
+    def test_index_follows_update_and_delete(self):
+        """Test que l'index reste cohérent après mise à jour et suppression"""
+        class TestObj:
+            def __init__(self, obj_id, email):
+                self.id = obj_id
+                self.email = email
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.create_index("email", unique=True)
+        obj = TestObj("id1", "old@test.com")
+        self.repo.add(obj)
+
+        self.repo.update("id1", {"email": "new@test.com"})
+        self.assertIsNone(self.repo.get_by_attribute("email", "old@test.com"))
+        self.assertEqual(self.repo.get_by_attribute("email", "new@test.com"), obj)
+
+        self.repo.delete("id1")
+        self.assertIsNone(self.repo.get_by_attribute("email", "new@test.com"))
+        # L'email libéré peut être réutilisé
+        self.repo.add(TestObj("id2", "new@test.com"))
+
+    def test_index_on_nested_attribute(self):
+        """Test un index non unique sur un attribut imbriqué (place.id)"""
+        class Ref:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+        class TestObj:
+            def __init__(self, obj_id, place):
+                self.id = obj_id
+                self.place = place
+
+        place = Ref("place-1")
+        self.repo.create_index("place.id")
+        self.repo.add(TestObj("id1", place))
+        self.repo.add(TestObj("id2", place))
+
+        self.assertEqual(self.repo.get_by_attribute("place.id", "place-1").id, "id1")
+        self.assertIsNone(self.repo.get_by_attribute("place.id", "place-2"))
+
+    def test_get_all_by_attribute(self):
+        """Test la récupération de tous les objets ayant une valeur d'attribut"""
+        class TestObj:
+            def __init__(self, obj_id, city):
+                self.id = obj_id
+                self.city = city
+
+        self.repo.add(TestObj("id1", "Paris"))
+        self.repo.add(TestObj("id2", "Lyon"))
+        self.repo.add(TestObj("id3", "Paris"))
+
+        # Sans index : parcours complet
+        self.assertEqual([obj.id for obj in self.repo.get_all_by_attribute("city", "Paris")], ["id1", "id3"])
+        # Avec index : même résultat
+        self.repo.create_index("city")
+        self.assertEqual([obj.id for obj in self.repo.get_all_by_attribute("city", "Paris")], ["id1", "id3"])
+        self.repo.delete("id1")
+        self.assertEqual([obj.id for obj in self.repo.get_all_by_attribute("city", "Paris")], ["id3"])
+        self.assertEqual(self.repo.get_all_by_attribute("city", "Nice"), [])
+
+    def test_composite_unique_index(self):
+        """Test un index composite unique (place.id, user.id)"""
+        class Ref:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+        class TestObj:
+            def __init__(self, obj_id, place, user):
+                self.id = obj_id
+                self.place = place
+                self.user = user
+
+        place, user1, user2 = Ref("place-1"), Ref("user-1"), Ref("user-2")
+        self.repo.create_index(("place.id", "user.id"), unique=True)
+        obj1 = TestObj("id1", place, user1)
+        self.repo.add(obj1)
+        self.repo.add(TestObj("id2", place, user2))
+
+        with self.assertRaises(DuplicateEntryError):
+            self.repo.add(TestObj("id3", place, user1))
+
+        # L'ordre des critères n'a pas d'importance
+        self.assertEqual(self.repo.get_by_attributes({"user.id": "user-1", "place.id": "place-1"}), obj1)
+        self.assertIsNone(self.repo.get_by_attributes({"place.id": "place-2", "user.id": "user-1"}))
+
+    def test_get_by_attributes_without_index(self):
+        """Test la récupération par plusieurs attributs sans index"""
+        class TestObj:
+            def __init__(self, obj_id, city, name):
+                self.id = obj_id
+                self.city = city
+                self.name = name
+
+        self.repo.add(TestObj("id1", "Paris", "A"))
+        self.repo.add(TestObj("id2", "Paris", "B"))
+        self.assertEqual(self.repo.get_by_attributes({"city": "Paris", "name": "B"}).id, "id2")
+        self.assertIsNone(self.repo.get_by_attributes({"city": "Lyon", "name": "B"}))
+
+    def test_get_page(self):
+        """Test la pagination par curseur dans l'ordre de création"""
+        from datetime import datetime, timedelta
+
+        class TestObj:
+            def __init__(self, obj_id, created_at, city):
+                self.id = obj_id
+                self.created_at = created_at
+                self.city = city
+
+        start = datetime(2024, 1, 1)
+        # Ajout dans le désordre : l'ordre suit created_at puis id
+        for i in [3, 1, 4, 0, 2]:
+            self.repo.add(TestObj(f"id{i}", start + timedelta(minutes=i), "Paris" if i % 2 else "Lyon"))
+
+        items, cursor = self.repo.get_page(limit=2)
+        self.assertEqual([obj.id for obj in items], ["id0", "id1"])
+        items, cursor = self.repo.get_page(cursor, limit=2)
+        self.assertEqual([obj.id for obj in items], ["id2", "id3"])
+        items, cursor = self.repo.get_page(cursor, limit=2)
+        self.assertEqual([obj.id for obj in items], ["id4"])
+        self.assertIsNone(cursor)
+
+        # Une suppression n'empêche pas de reprendre au curseur
+        items, cursor = self.repo.get_page(limit=1)
+        self.repo.delete("id1")
+        items, cursor = self.repo.get_page(cursor, limit=2)
+        self.assertEqual([obj.id for obj in items], ["id2", "id3"])
+
+        # Pagination filtrée
+        items, cursor = self.repo.get_page(limit=1, filters={"city": "Lyon"})
+        self.assertEqual([obj.id for obj in items], ["id0"])
+        items, cursor = self.repo.get_page(cursor, limit=5, filters={"city": "Lyon"})
+        self.assertEqual([obj.id for obj in items], ["id2", "id4"])
+        self.assertIsNone(cursor)
+
+        # Sans limite : tous les objets
+        items, cursor = self.repo.get_page()
+        self.assertEqual(len(items), 4)
+        self.assertIsNone(cursor)
+
+    def test_iter_all(self):
+        """Test le parcours par lots de tous les objets"""
+        class TestObj:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+        for i in range(5):
+            self.repo.add(TestObj(f"id{i}"))
+
+        iterator = self.repo.iter_all(batch_size=2)
+        self.assertEqual(next(iterator).id, "id0")
+        self.assertEqual([obj.id for obj in iterator], ["id1", "id2", "id3", "id4"])
+        self.assertEqual(list(InMemoryRepository().iter_all()), [])
+
+    def test_get_page_invalid_cursor(self):
+        """Test qu'un curseur invalide lève une ValueError"""
+        with self.assertRaises(ValueError):
+            self.repo.get_page("not-a-cursor", limit=10)
+
+    def test_transaction_rollback(self):
+        """Test que rollback annule ajouts, mises à jour et suppressions"""
+        class TestObj:
+            def __init__(self, obj_id, email):
+                self.id = obj_id
+                self.email = email
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.create_index("email", unique=True)
+        kept = TestObj("id1", "kept@test.com")
+        removed = TestObj("id2", "removed@test.com")
+        self.repo.add(kept)
+        self.repo.add(removed)
+
+        self.repo.begin()
+        self.repo.add(TestObj("id3", "new@test.com"))
+        self.repo.update("id1", {"email": "changed@test.com"})
+        self.repo.delete("id2")
+        self.repo.rollback()
+
+        self.assertIsNone(self.repo.get("id3"))
+        self.assertEqual(kept.email, "kept@test.com")
+        self.assertEqual(self.repo.get_by_attribute("email", "kept@test.com"), kept)
+        self.assertIsNone(self.repo.get_by_attribute("email", "changed@test.com"))
+        self.assertEqual(self.repo.get("id2"), removed)
+        self.assertEqual([obj.id for obj in self.repo.get_page()[0]], ["id1", "id2"])
+
+    def test_version_changes_on_writes(self):
+        """Test que la version de la collection change à chaque écriture"""
+        class TestObj:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        versions = [self.repo.version()]
+        self.repo.add(TestObj("id1"))
+        versions.append(self.repo.version())
+        self.repo.get("id1")
+        self.assertEqual(self.repo.version(), versions[-1])
+        self.repo.update("id1", {"name": "changed"})
+        versions.append(self.repo.version())
+        self.repo.delete("id1")
+        versions.append(self.repo.version())
+        self.repo.begin()
+        self.repo.add(TestObj("id2"))
+        self.repo.rollback()
+        versions.append(self.repo.version())
+        self.assertEqual(len(set(versions)), 5)
+
+    def test_transaction_commit(self):
+        """Test que commit conserve les écritures et que l'imbrication rejoint la transaction"""
+        class TestObj:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+        self.repo.begin()
+        self.repo.begin()
+        self.repo.add(TestObj("id1"))
+        self.repo.commit()
+        self.repo.add(TestObj("id2"))
+        self.repo.commit()
+        self.assertEqual(len(self.repo.get_all()), 2)
+
+        # Plus de transaction ouverte : rollback est sans effet
+        self.repo.rollback()
+        self.assertEqual(len(self.repo.get_all()), 2)
+
+    def test_nested_rollback_keeps_outer_writes(self):
+        """Test qu'un rollback imbriqué n'annule que les écritures du point de sauvegarde"""
+        class TestObj:
+            def __init__(self, obj_id):
+                self.id = obj_id
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.begin()
+        self.repo.add(TestObj("id1"))
+        self.repo.begin()
+        self.repo.add(TestObj("id2"))
+        self.repo.update("id1", {"name": "changed"})
+        self.repo.rollback()
+        self.repo.add(TestObj("id3"))
+        self.repo.commit()
+
+        self.assertEqual([obj.id for obj in self.repo.get_page()[0]], ["id1", "id3"])
+        self.assertFalse(hasattr(self.repo.get("id1"), "name"))
+        self.assertEqual(self.repo._tx_depth, 0)
+
+    def test_list_indexes(self):
+        """Test la liste des index déclarés"""
+        self.assertEqual(self.repo.list_indexes(), [])
+        self.repo.create_index("email", unique=True)
+        self.repo.create_index("place.id")
+        self.repo.create_index("email", unique=True)
+
+        indexes = self.repo.list_indexes()
+        self.assertEqual(len(indexes), 2)
+        self.assertEqual(indexes[0]['name'], 'email')
+        self.assertTrue(indexes[0]['unique'])
+        self.assertEqual(indexes[1]['attributes'], ['place.id'])
+        self.assertFalse(indexes[1]['unique'])
+
+    def test_grid_index_ranges(self):
+        """Test la recherche par intervalles servie par un index spatial"""
+        class TestObj:
+            def __init__(self, obj_id, latitude, longitude):
+                self.id = obj_id
+                self.latitude = latitude
+                self.longitude = longitude
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.add(TestObj("paris", 48.8566, 2.3522))
+        self.repo.add(TestObj("lyon", 45.7640, 4.8357))
+        self.repo.create_index(("latitude", "longitude"), kind='grid', cell_size=1.0)
+        self.repo.add(TestObj("lille", 50.6292, 3.0573))
+        ranges = {'latitude': (48.0, 51.0), 'longitude': (2.0, 4.0)}
+
+        found = {obj.id for obj in self.repo.get_all_by_ranges(ranges)}
+        self.assertEqual(found, {"paris", "lille"})
+
+        self.repo.update("paris", {'latitude': 43.2965, 'longitude': 5.3698})
+        found = {obj.id for obj in self.repo.get_all_by_ranges(ranges)}
+        self.assertEqual(found, {"lille"})
+        self.assertEqual(self.repo.list_indexes()[0]['name'], 'latitude,longitude:grid')
+
+    def test_ranges_without_index(self):
+        """Test la recherche par intervalles sans index (parcours complet)"""
+        class TestObj:
+            def __init__(self, obj_id, price):
+                self.id = obj_id
+                self.price = price
+
+        for obj_id, price in (("a", 50), ("b", 100), ("c", None)):
+            self.repo.add(TestObj(obj_id, price))
+
+        self.assertEqual([obj.id for obj in self.repo.get_all_by_ranges({'price': (60, None)})], ["b"])
+        self.assertEqual(len(self.repo.get_all_by_ranges({'price': (None, None)})), 2)
+
+    def test_sorted_and_inverted_indexes(self):
+        """Test la recherche par intervalle et par éléments requis servie par les index"""
+        class TestObj:
+            def __init__(self, obj_id, price, tags):
+                self.id = obj_id
+                self.price = price
+                self.tags = tags
+
+            def update(self, data):
+                for key, value in data.items():
+                    setattr(self, key, value)
+
+        self.repo.create_index("price", kind='sorted')
+        self.repo.create_index("tags", kind='inverted')
+        self.repo.add(TestObj("a", 50, ["wifi"]))
+        self.repo.add(TestObj("b", 100, ["wifi", "pool"]))
+        self.repo.add(TestObj("c", 150, ["pool"]))
+        self.repo.add(TestObj("d", 100, []))
+
+        found = self.repo.get_all_by_ranges({'price': (60, 150)})
+        self.assertEqual(sorted(obj.id for obj in found), ["b", "c", "d"])
+        found = self.repo.get_all_by_ranges({'price': (None, 120)}, {'tags': ["wifi"]})
+        self.assertEqual(sorted(obj.id for obj in found), ["a", "b"])
+        found = self.repo.get_all_by_ranges({}, {'tags': ["wifi", "pool"]})
+        self.assertEqual([obj.id for obj in found], ["b"])
+        self.assertEqual(self.repo.get_all_by_ranges({}, {'tags': ["sauna"]}), [])
+
+        self.repo.update("b", {'price': 10, 'tags': ["sauna"]})
+        self.repo.delete("a")
+        self.assertEqual([obj.id for obj in self.repo.get_all_by_ranges({'price': (None, 60)})], ["b"])
+        self.assertEqual(self.repo.get_all_by_ranges({}, {'tags': ["wifi"]}), [])
+
+    def test_page_by_value(self):
+        """Test les pages ordonnées par valeur, avec et sans index trié"""
+        class TestObj:
+            def __init__(self, obj_id, price, tags):
+                self.id = obj_id
+                self.price = price
+                self.tags = tags
+
+        def read_pages(limit, **options):
+            ids, cursor = [], None
+            while True:
+                page, cursor = self.repo.get_page_by_value('price', cursor, limit, **options)
+                ids.extend(obj.id for obj in page)
+                if cursor is None:
+                    return ids
+
+        for obj_id, price, tags in (("a", 100, ["wifi"]), ("b", 50, []), ("c", None, ["wifi"]),
+                                    ("d", 100, ["wifi"]), ("e", 150, ["pool"]), ("f", None, [])):
+            self.repo.add(TestObj(obj_id, price, tags))
+        expected = [
+            ({}, ["b", "a", "d", "e", "c", "f"]),
+            ({'descending': True}, ["e", "a", "d", "b", "c", "f"]),
+            ({'ranges': {'price': (60, None)}}, ["a", "d", "e"]),
+            ({'contains': {'tags': ["wifi"]}}, ["a", "d", "c"]),
+        ]
+        for options, ids in expected:
+            self.assertEqual(read_pages(None, **options), ids)
+            self.assertEqual(read_pages(1, **options), ids)
+
+        # Mêmes pages servies par l'index trié et l'index inversé
+        self.repo.create_index("price", kind='sorted')
+        self.repo.create_index("tags", kind='inverted')
+        for options, ids in expected:
+            self.assertEqual(read_pages(1, **options), ids)
+            self.assertEqual(read_pages(4, **options), ids)
+        with self.assertRaises(ValueError):
+            self.repo.get_page_by_value('price', 'invalid', 1)
+
+    def test_invalid_index_kind(self):
+        """Test la déclaration d'un type d'index inconnu ou unique non supporté"""
+        with self.assertRaises(ValueError):
+            self.repo.create_index("price", kind='btree')
+        with self.assertRaises(ValueError):
+            self.repo.create_index(("latitude", "longitude"), unique=True, kind='grid')
+
+
+class CachedObj:
+    """Objet minimal pour les tests du cache"""
+    def __init__(self, obj_id, name=''):
+        self.id = obj_id
+        self.name = name
+
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+
+class CountingRepository(InMemoryRepository):
+    """InMemoryRepository qui compte les lectures par identifiant"""
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get(self, obj_id):
+        self.reads += 1
+        return super().get(obj_id)
+
+    def get_many(self, obj_ids):
+        obj_ids = list(obj_ids)
+        self.reads += len(obj_ids)
+        return super().get_many(obj_ids)
+
+
+class TestCachingRepository(unittest.TestCase):
+    """Tests pour CachingRepository"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.now = 0.0
+        self.backend = CountingRepository()
+        self.repo = CachingRepository(self.backend, max_size=2, ttl=10, clock=lambda: self.now)
+
+    def test_is_repository_instance(self):
+        """Test que CachingRepository est une instance de Repository"""
+        self.assertIsInstance(self.repo, Repository)
+
+    def test_repeated_get_hits_cache(self):
+        """Test que les lectures répétées ne touchent pas le repository décoré"""
+        self.repo.add(CachedObj("a"))
+        self.repo.get("a")
+        self.repo.get("a")
+        self.assertEqual(self.backend.reads, 1)
+        stats = self.repo.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_missing_object_not_cached(self):
+        """Test qu'un objet absent n'est pas mis en cache"""
+        self.assertIsNone(self.repo.get("a"))
+        self.repo.add(CachedObj("a"))
+        self.assertIsNotNone(self.repo.get("a"))
+
+    def test_entries_expire(self):
+        """Test l'expiration des entrées après le TTL"""
+        self.repo.add(CachedObj("a"))
+        self.repo.get("a")
+        self.now = 11
+        self.repo.get("a")
+        self.assertEqual(self.backend.reads, 2)
+
+    def test_lru_eviction(self):
+        """Test l'éviction de l'entrée la moins récemment utilisée"""
+        for obj_id in ("a", "b", "c"):
+            self.repo.add(CachedObj(obj_id))
+        self.repo.get("a")
+        self.repo.get("b")
+        self.repo.get("a")
+        self.repo.get("c")
+        self.assertEqual(self.repo.stats()['evictions'], 1)
+        reads = self.backend.reads
+        self.repo.get("a")
+        self.assertEqual(self.backend.reads, reads)
+        self.repo.get("b")
+        self.assertEqual(self.backend.reads, reads + 1)
+
+    def test_update_and_delete_invalidate(self):
+        """Test l'invalidation des entrées lors des écritures"""
+        self.repo.add(CachedObj("a"))
+        self.repo.get("a")
+        self.repo.update("a", {'name': 'new'})
+        self.assertEqual(self.repo.stats()['size'], 0)
+        self.assertEqual(self.repo.get("a").name, 'new')
+        self.repo.delete("a")
+        self.assertIsNone(self.repo.get("a"))
+
+    def test_get_many_reads_only_missing(self):
+        """Test que get_many ne lit que les objets absents du cache"""
+        self.repo.add(CachedObj("a"))
+        self.repo.add(CachedObj("b"))
+        self.repo.get("a")
+        result = self.repo.get_many(["b", "a", "x"])
+        self.assertEqual([obj.id for obj in result], ["b", "a"])
+        self.assertEqual(self.backend.reads, 3)
+
+    def test_rollback_clears_cache(self):
+        """Test qu'un rollback vide le cache"""
+        self.repo.begin()
+        self.repo.add(CachedObj("a"))
+        self.repo.get("a")
+        self.repo.rollback()
+        self.assertIsNone(self.repo.get("a"))
+
+    def test_delegates_indexes(self):
+        """Test que les index sont déclarés sur le repository décoré"""
+        self.repo.create_index('name', unique=True)
+        self.repo.add(CachedObj("a", "x"))
+        with self.assertRaises(DuplicateEntryError):
+            self.repo.add(CachedObj("b", "x"))
+        self.assertEqual(self.repo.get_by_attribute('name', 'x').id, "a")
+
+
+class StressObj:
+    """Objet minimal pour les tests de concurrence"""
+    def __init__(self, obj_id, group, email):
+        self.id = obj_id
+        self.group = group
+        self.email = email
+
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+
+class TestConcurrentInMemoryRepository(unittest.TestCase):
+    """Tests pour ConcurrentInMemoryRepository et ReadWriteLock"""
+
+    THREADS = 8
+    ROUNDS = 150
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.repo = ConcurrentInMemoryRepository()
+        self.repo.create_index('email', unique=True)
+        self.repo.create_index('group')
+        # Bascule fréquente entre threads : les opérations s'entrelacent vraiment
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, writers, readers=()):
+        """
+        Lance les écrivains et les lecteurs ensemble, arrête les lecteurs
+        lorsque les écrivains ont terminé et remonte la première exception.
+        """
+        errors = []
+        stop = threading.Event()
+        start = threading.Barrier(len(writers) + len(readers), timeout=10)
+
+        def guarded(target, repeat):
+            try:
+                start.wait()
+                target()
+                while repeat and not stop.is_set():
+                    target()
+            except BaseException as error:
+                errors.append(error)
+                stop.set()
+
+        writer_threads = [threading.Thread(target=guarded, args=(target, False)) for target in writers]
+        reader_threads = [threading.Thread(target=guarded, args=(target, True)) for target in readers]
+        for thread in writer_threads + reader_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join(timeout=60)
+        stop.set()
+        for thread in writer_threads + reader_threads:
+            thread.join(timeout=60)
+            self.assertFalse(thread.is_alive(), "thread blocked")
+        if errors:
+            raise errors[0]
+
+    def assert_consistent(self):
+        """Vérifie que l'ordre de pagination et les index reflètent le stockage"""
+        storage = self.repo._storage
+        self.assertEqual(self.repo._order, sorted(ordering_key(obj) for obj in storage.values()))
+        emails = self.repo._indexes['email']
+        groups = self.repo._indexes['group']
+        for obj in storage.values():
+            self.assertEqual(list(emails.lookup(obj.email)), [obj.id])
+            self.assertIn(obj.id, groups.lookup(obj.group))
+        for group in range(self.THREADS):
+            self.assertEqual(set(groups.lookup(group)),
+                             {obj.id for obj in storage.values() if obj.group == group})
+
+    def test_readers_share_the_lock(self):
+        """Test que plusieurs lecteurs tiennent le verrou en même temps"""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                barrier.wait()
+
+        self.run_threads([reader, reader, reader])
+
+    def test_writer_excludes_readers(self):
+        """Test qu'un rédacteur bloque les lectures jusqu'à sa libération"""
+        self.repo.add(StressObj('a', 0, 'a@example.com'))
+        read_done = threading.Event()
+
+        def reader():
+            self.repo.get('a')
+            read_done.set()
+
+        self.repo._lock.acquire_write()
+        thread = threading.Thread(target=reader)
+        thread.start()
+        self.assertFalse(read_done.wait(0.1))
+        self.repo._lock.release_write()
+        self.assertTrue(read_done.wait(5))
+        thread.join()
+
+    def test_lock_is_reentrant(self):
+        """Test que le verrou est réentrant et refuse le passage lecture -> écriture"""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    self.assertEqual(lock.write_depth, 2)
+        self.assertEqual(lock.write_depth, 0)
+        with lock.read():
+            with lock.read():
+                with self.assertRaises(RuntimeError):
+                    lock.acquire_write()
+        with self.assertRaises(RuntimeError):
+            lock.release_read()
+        with self.assertRaises(RuntimeError):
+            lock.release_write()
+
+    def test_concurrent_writes_and_reads_stay_consistent(self):
+        """Test d'écritures et de lectures simultanées depuis de nombreux threads"""
+        writes = [0] * self.THREADS
+
+        def writer(number):
+            def run():
+                for i in range(self.ROUNDS):
+                    obj_id = f'{number}-{i}'
+                    self.repo.add(StressObj(obj_id, number, f'{obj_id}@example.com'))
+                    writes[number] += 1
+                    try:
+                        # Adresse disputée par tous les threads : un seul l'obtient
+                        self.repo.update(obj_id, {'email': 'shared@example.com'})
+                        writes[number] += 1
+                    except DuplicateEntryError:
+                        pass
+                    if i % 3 == 0:
+                        self.assertTrue(self.repo.delete(obj_id))
+                        writes[number] += 1
+                    elif i % 3 == 1:
+                        self.repo.update(obj_id, {'group': (number + 1) % self.THREADS,
+                                                  'email': f'{obj_id}@example.org'})
+                        writes[number] += 1
+            return run
+
+        def reader():
+            for group in range(self.THREADS):
+                for obj in self.repo.get_all_by_attribute('group', group):
+                    self.assertEqual(obj.group, group)
+            items = list(self.repo.iter_all(batch_size=50))
+            self.assertEqual(len({obj.id for obj in items}), len(items))
+            shared = self.repo.get_all_by_attribute('email', 'shared@example.com')
+            self.assertLessEqual(len(shared), 1)
+
+        self.run_threads([writer(number) for number in range(self.THREADS)], [reader] * 4)
+
+        self.assert_consistent()
+        self.assertEqual(len(self.repo.get_all()), self.THREADS * (self.ROUNDS - (self.ROUNDS + 2) // 3))
+        self.assertEqual(self.repo.version(), sum(writes))
+
+    def test_transactions_are_isolated_and_atomic(self):
+        """Test que les transactions concurrentes ne laissent voir que les écritures validées"""
+
+        def transactional(number):
+            def run():
+                for i in range(self.ROUNDS // 3):
+                    obj_id = f'{number}-{i}'
+                    self.repo.begin()
+                    try:
+                        self.repo.add(StressObj(obj_id, number, f'{obj_id}@example.com'))
+                        self.repo.begin()
+                        self.repo.update(obj_id, {'email': f'{obj_id}@example.org'})
+                        self.repo.commit()
+                        if i % 2:
+                            raise ValueError("abandon")
+                    except ValueError:
+                        self.repo.rollback()
+                    else:
+                        self.repo.commit()
+            return run
+
+        def reader():
+            for obj in self.repo.get_all():
+                # Une transaction annulée ou en cours n'est jamais visible
+                self.assertEqual(int(obj.id.split('-')[1]) % 2, 0)
+                self.assertTrue(obj.email.endswith('.org'))
+
+        self.run_threads([transactional(number) for number in range(self.THREADS)], [reader] * 2)
+
+        self.assert_consistent()
+        committed = {f'{number}-{i}' for number in range(self.THREADS)
+                     for i in range(0, self.ROUNDS // 3, 2)}
+        self.assertEqual(set(self.repo._storage), committed)
+        self.assertEqual(self.repo._lock.write_depth, 0)
+        self.assertEqual(self.repo._tx_depth, 0)
+
+    def test_commit_without_transaction_does_not_release_lock(self):
+        """Test que commit et rollback hors transaction n'affectent pas le verrou"""
+        self.repo.commit()
+        self.repo.rollback()
+        self.repo.begin()
+        self.repo.commit()
+        self.repo.commit()
+        self.assertEqual(self.repo._lock.write_depth, 0)
+        self.repo.add(StressObj('a', 0, 'a@example.com'))
+        self.assertIsNotNone(self.repo.get('a'))
+
 
 class TestSQLAlchemyRepositoryStructure(unittest.TestCase):
     """Tests pour vérifier la structure de SQLAlchemyRepository"""
-    # Note: Ces tests vérifient uniquement la structure, pas le fonctionnement
-    # car les modèles ne sont pas encore mappés à SQLAlchemy
+    # Note: Ces tests vérifient uniquement la structure ; le fonctionnement
+    # avec les modèles mappés est couvert par TestSQLAlchemyFacade
 
     def test_sqlalchemy_repository_initialization(self):
         """Test l'initialisation de SQLAlchemyRepository"""
@@ -202,10 +972,35 @@ class TestSQLAlchemyRepositoryStructure(unittest.TestCase):
         # Vérifier que les méthodes existent et sont callable
         self.assertTrue(callable(repo.add))
         self.assertTrue(callable(repo.get))
+        self.assertTrue(callable(repo.get_many))
         self.assertTrue(callable(repo.get_all))
+        self.assertTrue(callable(repo.get_page))
+        self.assertTrue(callable(repo.iter_all))
         self.assertTrue(callable(repo.update))
         self.assertTrue(callable(repo.delete))
         self.assertTrue(callable(repo.get_by_attribute))
+        self.assertTrue(callable(repo.get_all_by_attribute))
+        self.assertTrue(callable(repo.get_by_attributes))
+        self.assertTrue(callable(repo.get_all_by_ranges))
+        self.assertTrue(callable(repo.create_index))
+        self.assertTrue(callable(repo.list_indexes))
+        self.assertTrue(callable(repo.begin))
+        self.assertTrue(callable(repo.commit))
+        self.assertTrue(callable(repo.rollback))
+
+    def test_sqlalchemy_repository_declared_indexes(self):
+        """Test que les index déclarés sont listés par SQLAlchemyRepository"""
+        class FakeModel:
+            query = None
+
+        repo = SQLAlchemyRepository(FakeModel)
+        repo.create_index('email', unique=True)
+        self.assertEqual(repo.list_indexes(), [{
+            'name': 'email',
+            'kind': 'hash',
+            'attributes': ['email'],
+            'unique': True
+        }])
 
 
 if __name__ == '__main__':
@@ -1,18 +1,34 @@
-from flask import current_app
+from flask import current_app, has_app_context
 from .facade import HBnBFacade
+from .instrumentation import timed_facade_call
 
 class LazyFacade:
     """
     Façade qui s'initialise paresseusement avec les repositories de l'application.
+
+    La façade est reconstruite lorsque l'application courante change ou
+    fournit d'autres repositories (ex: une nouvelle application de test) :
+    ses caches et son index de recherche sont propres à une base.
     """
     def __init__(self):
         self._facade = None
+        self._repositories = None
+        self._app = None
 
     def __getattr__(self, name):
-        if not self._facade:
-            repositories = current_app.config.get('repositories')
-            self._facade = HBnBFacade(repositories)
-        return getattr(self._facade, name)
+        if has_app_context():
+            app = current_app._get_current_object()
+            repositories = app.config.get('repositories')
+            if not self._facade or repositories is not self._repositories or app is not self._app:
+                self._facade = HBnBFacade(repositories, app.config.get('REPOSITORY_CACHE'),
+                                          instrumented=app.config.get('INSTRUMENTATION_ENABLED', False))
+                self._repositories = repositories
+                self._app = app
+        attr = getattr(self._facade, name)
+        # Avec l'instrumentation, les appels de l'API à la façade sont mesurés
+        if self._facade.instrumented and callable(attr):
+            return timed_facade_call(attr)
+        return attr
 
 facade = LazyFacade()
 
@@ -1,21 +1,58 @@
-from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository, DuplicateEntryError
+from app.persistence.cache import CachingRepository
+from app.persistence.pagination import encode_value_cursor, decode_value_cursor
+from app.services.geo import (MAX_DISTANCE_KM, validate_coordinates, haversine_km, radius_ranges,
+                              bbox_ranges, bbox_center, intersect_ranges)
+from app.services.search import InMemorySearchIndex, FTS5SearchIndex
+from app.services.instrumentation import InstrumentedRepository
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
 
 
+def _undecorated(repo, *decorators):
+    """Repository débarrassé des décorateurs donnés (cache, instrumentation)."""
+    while isinstance(repo, decorators):
+        repo = repo.repository
+    return repo
+
+
 class HBnBFacade:
     """
     Facade pour la gestion des opérations de l'application.
     """
-    def __init__(self, repositories=None):
+    # Types de documents de la recherche plein texte
+    SEARCH_TYPES = ('place', 'review')
+    # Tris disponibles pour la liste des lieux (agrégat, ordre décroissant)
+    PLACE_SORTS = {'rating': 'average_rating', 'reviews': 'review_count'}
+    # Relations lues par la sérialisation des listes, préchargées par les
+    # repositories SQL (évite une requête par objet)
+    PLACE_LOADS = ('owner', 'amenities')
+    REVIEW_LOADS = ('user', 'place')
+    # Dépôts pouvant être mis en cache : les utilisateurs (mot de passe,
+    # droits d'administration) doivent être relus à chaque requête
+    CACHEABLE_REPOSITORIES = ('place_repo', 'review_repo', 'amenity_repo')
+    # Rayon du premier anneau des recherches par distance paginées (km)
+    FIRST_RING_KM = 1.0
+
+    def __init__(self, repositories=None, cache_config=None, search_index=None, instrumented=False):
         """
         Initialise les dépôts en mémoire.
         
         Args:
             repositories (dict): Dépôts à utiliser (pour les tests)
             Si None, utilise SQLAlchemyRepository par défaut.
+            cache_config (dict): Options de CachingRepository par dépôt
+            (ex: {'amenity_repo': {'max_size': 1000, 'ttl': 300}}), parmi
+            CACHEABLE_REPOSITORIES.
+            search_index: Moteur de recherche plein texte (FTS5 sur
+            SQLite, index en mémoire sinon, si None).
+            instrumented (bool): Si True, les appels des dépôts sont
+            mesurés pour la requête en cours (InstrumentedRepository).
         """
         if repositories:
             self.user_repo = repositories.get('user_repo', SQLAlchemyRepository(User))
@@ -28,6 +65,211 @@ class HBnBFacade:
             self.review_repo = SQLAlchemyRepository(Review)
             self.amenity_repo = SQLAlchemyRepository(Amenity)
 
+        # Cache de lecture devant les dépôts configurés
+        for repo_name, options in (cache_config or {}).items():
+            if repo_name not in self.CACHEABLE_REPOSITORIES:
+                raise ValueError(f"Repository '{repo_name}' cannot be cached")
+            setattr(self, repo_name, CachingRepository(getattr(self, repo_name), **options))
+
+        # Mesure des appels (cache compris) pour l'instrumentation des requêtes
+        self.instrumented = instrumented
+        if instrumented:
+            for repo_name in ('user_repo', 'place_repo', 'review_repo', 'amenity_repo'):
+                setattr(self, repo_name, InstrumentedRepository(getattr(self, repo_name), repo_name))
+
+        # Déclaration des index secondaires utilisés par les recherches
+        self.user_repo.create_index('email', unique=True)
+        self.review_repo.create_index('place.id')
+        self.review_repo.create_index('user.id')
+        self.review_repo.create_index(('place.id', 'user.id'), unique=True)
+        self.place_repo.create_index(('latitude', 'longitude'), kind='grid', cell_size=0.5)
+        self.place_repo.create_index('price', kind='sorted')
+        for attr in self.PLACE_SORTS.values():
+            self.place_repo.create_index(attr, kind='sorted')
+        self.place_repo.create_index('amenities', kind='inverted')
+
+        # Recherche plein texte, remplie à la première utilisation
+        self.search_index = search_index or self._default_search_index()
+        self._search_ready = False
+        # Unité de travail en cours (par thread) et écritures différées
+        self._local = threading.local()
+        # Sérialise la mise à jour des agrégats de notes des lieux ; pris
+        # seulement dans une unité de travail, après les verrous des dépôts
+        self._ratings_lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe les écritures de plusieurs repositories en une unité de travail.
+
+        Les écritures sont validées une seule fois à la sortie du bloc, ou
+        toutes annulées si une exception est levée. Un bloc imbriqué est un
+        point de sauvegarde : s'il échoue, seules ses écritures (et ses
+        opérations différées) sont annulées, et le bloc englobant peut
+        rattraper l'erreur et continuer.
+
+        Exemple:
+            with facade.transaction():
+                facade.create_place(...)
+                facade.create_review(...)
+        """
+        repositories = list({id(repo): repo for repo in (
+            self.user_repo, self.place_repo, self.review_repo, self.amenity_repo
+        )}.values())
+        local = self._local
+        if not getattr(local, 'depth', 0):
+            local.pending = []
+        local.depth = getattr(local, 'depth', 0) + 1
+        mark = len(local.pending)
+        begun = []
+        try:
+            for repo in repositories:
+                repo.begin()
+                begun.append(repo)
+            yield self
+            # Validation dans l'ordre inverse des begin (points de sauvegarde imbriqués)
+            while begun:
+                begun.pop().commit()
+        except BaseException:
+            for repo in reversed(begun):
+                repo.rollback()
+            del local.pending[mark:]
+            raise
+        finally:
+            local.depth -= 1
+        if local.depth == 0:
+            pending, local.pending = local.pending, []
+            for operation in pending:
+                operation()
+
+    def _after_commit(self, operation):
+        """
+        Exécute une opération maintenant, ou après la validation de l'unité
+        de travail en cours (elle est abandonnée en cas d'annulation).
+
+        Args:
+            operation (callable): Opération sans argument.
+        """
+        if getattr(self._local, 'depth', 0):
+            self._local.pending.append(operation)
+        else:
+            operation()
+
+    def cache_stats(self):
+        """
+        Statistiques des caches de lecture configurés.
+
+        Returns:
+            dict: Compteurs de chaque dépôt mis en cache, par nom de dépôt.
+        """
+        return {
+            repo_name: _undecorated(repo, InstrumentedRepository).stats()
+            for repo_name, repo in (
+                ('user_repo', self.user_repo), ('place_repo', self.place_repo),
+                ('review_repo', self.review_repo), ('amenity_repo', self.amenity_repo)
+            )
+            if isinstance(_undecorated(repo, InstrumentedRepository), CachingRepository)
+        }
+
+    def collection_version(self, *names):
+        """
+        Versions des collections, modifiées par chaque écriture.
+
+        Args:
+            *names (str): Collections lues ('user', 'place', 'review', 'amenity').
+
+        Returns:
+            tuple: Version de chaque collection, dans l'ordre demandé.
+        """
+        return tuple(getattr(self, f'{name}_repo').version() for name in names)
+
+    def search(self, query, doc_types=None, cursor=None, limit=None):
+        """
+        Recherche plein texte dans les lieux (titre, description) et les
+        reviews (texte).
+
+        Args:
+            query (str): Texte recherché ; chaque mot est un préfixe.
+            doc_types (iterable): Types recherchés ('place', 'review'), tous si None.
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Liste de (type, objet, score) par pertinence décroissante,
+            et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si la requête, un type ou le curseur sont invalides.
+        """
+        if doc_types is not None:
+            doc_types = list(doc_types)
+            for doc_type in doc_types:
+                if doc_type not in self.SEARCH_TYPES:
+                    raise ValueError(f"Unknown search type '{doc_type}'")
+        self._ensure_search_index()
+        hits, next_cursor = self.search_index.search(query, doc_types, cursor, limit)
+        repos = {'place': self.place_repo, 'review': self.review_repo}
+        found = {}
+        for doc_type, repo in repos.items():
+            ids = [doc_id for hit_type, doc_id, _ in hits if hit_type == doc_type]
+            found.update({(doc_type, obj.id): obj for obj in repo.get_many(ids)})
+        results = [(doc_type, found[(doc_type, doc_id)], score)
+                   for doc_type, doc_id, score in hits if (doc_type, doc_id) in found]
+        return results, next_cursor
+
+    def rebuild_search_index(self):
+        """
+        Reconstruit l'index plein texte à partir des repositories.
+        """
+        self.search_index.clear()
+        for place in self.iter_places():
+            self._index_document(place)
+        for review in self.iter_reviews():
+            self._index_document(review)
+
+    def _default_search_index(self):
+        """
+        Choisit le moteur de recherche adapté aux repositories.
+
+        Returns:
+            FTS5SearchIndex avec SQLAlchemy sur SQLite, InMemorySearchIndex sinon.
+        """
+        place_repo = _undecorated(self.place_repo, InstrumentedRepository, CachingRepository)
+        if isinstance(place_repo, SQLAlchemyRepository):
+            from flask import has_app_context
+            from app import db
+            if has_app_context() and db.engine.dialect.name == 'sqlite':
+                return FTS5SearchIndex()
+        return InMemorySearchIndex()
+
+    def _ensure_search_index(self):
+        """Prépare l'index plein texte et le remplit lors de sa première utilisation."""
+        if self._search_ready:
+            return
+        self._search_ready = True
+        if self.search_index.prepare():
+            self.rebuild_search_index()
+
+    def _index_document(self, obj):
+        """Indexe un lieu ou une review dans la recherche plein texte."""
+        if isinstance(obj, Place):
+            self.search_index.index('place', obj.id, {'title': obj.title, 'body': obj.description})
+        elif isinstance(obj, Review):
+            self.search_index.index('review', obj.id, {'body': obj.text})
+
+    def _search_update(self, obj):
+        """Met à jour la recherche plein texte après la validation de l'écriture."""
+        def operation():
+            self._ensure_search_index()
+            self._index_document(obj)
+        self._after_commit(operation)
+
+    def _search_remove(self, doc_type, doc_id):
+        """Retire un document de la recherche plein texte après la validation."""
+        def operation():
+            self._ensure_search_index()
+            self.search_index.remove(doc_type, doc_id)
+        self._after_commit(operation)
 
     def create_user(self, user_data):
         """
@@ -38,7 +280,12 @@ class HBnBFacade:
         
         Returns:
             User: L'utilisateur créé.
+
+        Raises:
+            ValueError: Si l'email est déjà utilisé.
         """
+        if self.get_user_by_email(user_data.get('email')):
+            raise ValueError("Email already registered")
         user = User(**user_data)
         self.user_repo.add(user)
         return user
@@ -66,6 +313,31 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def get_users_page(self, cursor=None, limit=None):
+        """
+        Récupère une page d'utilisateurs.
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'utilisateurs.
+
+        Returns:
+            tuple: Liste des utilisateurs et curseur de la page suivante.
+        """
+        return self.user_repo.get_page(cursor, limit)
+
+    def iter_users(self, batch_size=1000):
+        """
+        Parcourt tous les utilisateurs sans les charger tous en mémoire.
+
+        Args:
+            batch_size (int): Nombre d'utilisateurs lus par lot.
+
+        Returns:
+            iterator: Les utilisateurs.
+        """
+        return self.user_repo.iter_all(batch_size)
+
     def get_user_by_email(self, email):
         """
         Récupère un utilisateur par son email.
@@ -135,6 +407,38 @@ class HBnBFacade:
             return None
         return self.amenity_repo.get(amenity_id)
     
+    def get_amenities(self, amenity_ids):
+        """
+        Récupère plusieurs équipements en un seul accès au repository.
+
+        Args:
+            amenity_ids (list): Identifiants des équipements.
+
+        Returns:
+            list: Équipements trouvés, dans l'ordre des identifiants.
+        """
+        return self.amenity_repo.get_many(amenity_ids)
+
+    def _resolve_amenities(self, amenity_ids):
+        """
+        Récupère les équipements demandés en vérifiant qu'ils existent tous.
+
+        Args:
+            amenity_ids (list): Identifiants des équipements.
+
+        Returns:
+            list: Équipements, dans l'ordre des identifiants.
+
+        Raises:
+            ValueError: Si un équipement n'existe pas.
+        """
+        amenities = self.get_amenities(amenity_ids)
+        found = {amenity.id for amenity in amenities}
+        for amenity_id in amenity_ids:
+            if amenity_id not in found:
+                raise ValueError(f"Amenity with id {amenity_id} not found")
+        return amenities
+
     def get_all_amenities(self):
         """
         Récupère tous les équipements.
@@ -144,6 +448,31 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, cursor=None, limit=None):
+        """
+        Récupère une page d'équipements.
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum d'équipements.
+
+        Returns:
+            tuple: Liste des équipements et curseur de la page suivante.
+        """
+        return self.amenity_repo.get_page(cursor, limit)
+
+    def iter_amenities(self, batch_size=1000):
+        """
+        Parcourt tous les équipements sans les charger tous en mémoire.
+
+        Args:
+            batch_size (int): Nombre d'équipements lus par lot.
+
+        Returns:
+            iterator: Les équipements.
+        """
+        return self.amenity_repo.iter_all(batch_size)
+
     def update_amenity(self, amenity_id, amenity_data):
         """
         Met à jour un équipement.
@@ -186,6 +515,33 @@ class HBnBFacade:
         if not owner:
             raise ValueError("Owner not found")
 
+        # Récupération des amenities si fournis 
+        amenities = []
+        if 'amenities' in place_data:
+            amenities = self._resolve_amenities(place_data['amenities'])
+
+        place = self._build_place(place_data, owner, amenities)
+
+        # Sauvegarde du lieu dans le repository
+        self.place_repo.add(place)
+        self._search_update(place)
+        return place
+
+    def _build_place(self, place_data, owner, amenities):
+        """
+        Valide les données d'un lieu et construit l'objet (sans le sauvegarder).
+
+        Args:
+            place_data (dict): Données du lieu.
+            owner (User): Propriétaire déjà résolu.
+            amenities (list): Équipements déjà résolus.
+
+        Returns:
+            Place: Le lieu construit.
+
+        Raises:
+            ValueError: Si les données sont invalides.
+        """
         # Validation des données numériques
         try:
             price = float(place_data['price'])
@@ -200,15 +556,6 @@ class HBnBFacade:
         except (ValueError, TypeError, KeyError):
             raise ValueError("Invalid numeric values")
 
-        # Récupération des amenities si fournis 
-        amenities = []
-        if 'amenities' in place_data:
-            for amenity_id in place_data['amenities']:
-                amenity = self.get_amenity(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity with id {amenity_id} not found")
-                amenities.append(amenity)
-
         # Création du lieu avec les données fournies
         place = Place(
             title=place_data['title'],
@@ -222,9 +569,6 @@ class HBnBFacade:
         # Ajout des amenities au lieu
         for amenity in amenities:
             place.add_amenity(amenity)
-
-        # Sauvegarde du lieu dans le repository
-        self.place_repo.add(place)
         return place
 
     def get_place(self, place_id):
@@ -241,6 +585,30 @@ class HBnBFacade:
             return None
         return self.place_repo.get(place_id)
 
+    def get_place_relations(self, places, include):
+        """
+        Charge en bloc les relations demandées d'une liste de lieux.
+
+        Les reviews sont lues en une seule requête pour tous les lieux ;
+        le propriétaire et les amenities sont des relations du lieu.
+
+        Args:
+            places (list): Lieux concernés.
+            include (iterable): Relations demandées ('owner', 'amenities', 'reviews').
+
+        Returns:
+            dict: 'reviews' (reviews par identifiant de lieu) si elles sont demandées.
+        """
+        relations = {}
+        if 'reviews' in include:
+            reviews = {}
+            place_ids = [place.id for place in places]
+            # Les lieux sont déjà chargés : seul l'auteur est préchargé
+            for review in self.review_repo.get_all_by_attribute_in('place.id', place_ids, load=('user',)):
+                reviews.setdefault(review.place.id, []).append(review)
+            relations['reviews'] = reviews
+        return relations
+
     def get_all_places(self):
         """
         Récupère tous les lieux.
@@ -249,6 +617,207 @@ class HBnBFacade:
             list: Liste des lieux.
         """
         return self.place_repo.get_all()
+
+    def get_places_page(self, cursor=None, limit=None, sort=None):
+        """
+        Récupère une page de lieux.
+
+        Avec un tri ('rating' ou 'reviews'), les lieux sont classés par
+        note moyenne ou nombre de reviews décroissants (les lieux sans note
+        en dernier), à partir des agrégats stockés sur chaque lieu : la
+        page est lue par ORDER BY ... LIMIT en SQL, par l'index trié en
+        mémoire. Le propriétaire et les amenities sont préchargés
+        (PLACE_LOADS).
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de lieux.
+            sort (str): Tri à appliquer, ordre de création si None.
+
+        Returns:
+            tuple: Liste des lieux et curseur de la page suivante.
+
+        Raises:
+            ValueError: Si le tri ou le curseur sont invalides.
+        """
+        if sort is None:
+            return self.place_repo.get_page(cursor, limit, load=self.PLACE_LOADS)
+        if sort not in self.PLACE_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(self.PLACE_SORTS)}")
+        return self.place_repo.get_page_by_value(self.PLACE_SORTS[sort], cursor, limit,
+                                                 descending=True, load=self.PLACE_LOADS)
+
+    def iter_places(self, batch_size=1000):
+        """
+        Parcourt tous les lieux sans les charger tous en mémoire.
+
+        Args:
+            batch_size (int): Nombre de lieux lus par lot.
+
+        Returns:
+            iterator: Les lieux.
+        """
+        return self.place_repo.iter_all(batch_size, load=self.PLACE_LOADS)
+
+    def search_places(self, filters=None, cursor=None, limit=None):
+        """
+        Recherche les lieux par prix et équipements, triés par prix croissant.
+
+        Le tri et la limite sont délégués au repository (ORDER BY price, id
+        LIMIT n en SQL, parcours de l'index trié des prix en mémoire) :
+        une page ne lit que ses lieux, et non toutes les correspondances.
+
+        Args:
+            filters (dict): Critères 'min_price', 'max_price' et 'amenities'
+                (identifiants d'équipements tous requis).
+            cursor (str): Curseur (prix, id) renvoyé par la page précédente.
+            limit (int): Nombre maximum de lieux.
+
+        Returns:
+            tuple: Liste des lieux et curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si les critères ou le curseur sont invalides.
+        """
+        ranges, contains = self._place_criteria(filters)
+        return self.place_repo.get_page_by_value('price', cursor, limit, ranges=ranges,
+                                                 contains=contains, load=self.PLACE_LOADS)
+
+    def search_places_nearby(self, latitude, longitude, radius_km, filters=None, cursor=None, limit=None):
+        """
+        Recherche les lieux situés à moins de radius_km d'un point.
+
+        Args:
+            latitude (float): Latitude du point.
+            longitude (float): Longitude du point.
+            radius_km (float): Rayon de recherche en kilomètres.
+            filters (dict): Critères de prix et d'équipements (voir search_places).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Liste de (lieu, distance en km) triée par distance, et
+            curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si les coordonnées, le rayon ou le curseur sont invalides.
+        """
+        validate_coordinates(latitude, longitude)
+        if radius_km <= 0:
+            raise ValueError("radius_km must be a positive number")
+        return self._places_by_distance(radius_ranges(latitude, longitude, radius_km),
+                                        latitude, longitude, radius_km, filters, cursor, limit)
+
+    def search_places_in_bbox(self, min_lon, min_lat, max_lon, max_lat,
+                              latitude=None, longitude=None, filters=None, cursor=None, limit=None):
+        """
+        Recherche les lieux situés dans une boîte englobante.
+
+        Les résultats sont triés par distance au point (latitude, longitude)
+        s'il est fourni, sinon au centre de la boîte. Une boîte dont
+        min_lon > max_lon traverse l'antiméridien.
+
+        Args:
+            min_lon, min_lat, max_lon, max_lat (float): Bornes de la boîte.
+            latitude (float): Latitude du point de référence.
+            longitude (float): Longitude du point de référence.
+            filters (dict): Critères de prix et d'équipements (voir search_places).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Liste de (lieu, distance en km) triée par distance, et
+            curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si la boîte, le point ou le curseur sont invalides.
+        """
+        validate_coordinates(min_lat, min_lon)
+        validate_coordinates(max_lat, max_lon)
+        ranges = bbox_ranges(min_lon, min_lat, max_lon, max_lat)
+        if latitude is None or longitude is None:
+            latitude, longitude = bbox_center(min_lon, min_lat, max_lon, max_lat)
+        validate_coordinates(latitude, longitude)
+        return self._places_by_distance(ranges, latitude, longitude, None, filters, cursor, limit)
+
+    def _place_criteria(self, filters):
+        """
+        Traduit les critères de recherche de lieux en critères de repository.
+
+        Args:
+            filters (dict): Critères 'min_price', 'max_price' et 'amenities'.
+
+        Returns:
+            tuple: Intervalles (ranges) et valeurs requises (contains).
+
+        Raises:
+            ValueError: Si les prix sont invalides ou un équipement inconnu.
+        """
+        filters = filters or {}
+        min_price, max_price = filters.get('min_price'), filters.get('max_price')
+        for price in (min_price, max_price):
+            if price is not None and price < 0:
+                raise ValueError("Prices must be positive numbers")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price must be lower than or equal to max_price")
+        ranges = {'price': (min_price, max_price)} if (min_price, max_price) != (None, None) else {}
+        amenity_ids = filters.get('amenities')
+        contains = {}
+        if amenity_ids:
+            contains['amenities'] = [amenity.id for amenity in self._resolve_amenities(amenity_ids)]
+        return ranges, contains
+
+    def _places_by_distance(self, boxes, latitude, longitude, radius_km, filters, cursor, limit):
+        """
+        Récupère les lieux des boîtes englobantes, triés par distance.
+
+        Les boîtes servent de préfiltre (index spatial du repository) ; la
+        distance exacte est ensuite calculée pour chaque candidat. Avec une
+        limite, la recherche procède par anneaux croissants à partir de la
+        distance du curseur : un anneau de rayon r fournit tous les lieux à
+        moins de r, et la recherche s'arrête dès qu'il contient plus de
+        limit résultats après le curseur. Une page lit ainsi les lieux
+        proches de sa position plutôt que toutes les correspondances.
+
+        Args:
+            boxes (list): Intervalles de coordonnées à interroger.
+            latitude, longitude (float): Point de référence.
+            radius_km (float): Distance maximale, ou None.
+            filters (dict): Critères de prix et d'équipements.
+            cursor (str): Curseur (distance, id) de la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Liste de (lieu, distance) et curseur de la page suivante.
+        """
+        criteria, contains = self._place_criteria(filters)
+        after = decode_value_cursor(cursor) if cursor else None
+        max_radius = MAX_DISTANCE_KM if radius_km is None else radius_km
+        ring = max_radius
+        if limit is not None:
+            ring = min(max_radius, max(self.FIRST_RING_KM, 2 * after[0] if after else 0.0))
+        while True:
+            # Le dernier anneau couvre toutes les boîtes : seul radius_km s'applique
+            max_distance = radius_km if ring >= max_radius else ring
+            results = {}
+            for ranges in intersect_ranges(boxes, radius_ranges(latitude, longitude, ring)):
+                for place in self.place_repo.get_all_by_ranges({**ranges, **criteria}, contains,
+                                                               load=self.PLACE_LOADS):
+                    distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+                    if max_distance is not None and distance > max_distance:
+                        continue
+                    if after and (distance, str(place.id)) <= after:
+                        continue
+                    results[place.id] = (place, distance)
+            if limit is None or len(results) > limit or ring >= max_radius:
+                break
+            ring = min(max_radius, ring * 4)
+        ordered = sorted(results.values(), key=lambda result: (result[1], str(result[0].id)))
+        if limit is None or len(ordered) <= limit:
+            return ordered, None
+        page = ordered[:limit]
+        last_place, last_distance = page[-1]
+        return page, encode_value_cursor(last_distance, str(last_place.id))
     
     def update_place(self, place_id, place_data):
         """
@@ -260,10 +829,18 @@ class HBnBFacade:
         
         Returns:
             Place: Le lieu mis à jour.
+
+        Raises:
+            ValueError: Si un attribut n'est pas modifiable ou est invalide.
         """
         place = self.get_place(place_id)
         if not place:
             return None
+
+        # Propriétaire, identifiant, dates et agrégats ne sont pas modifiables
+        rejected = sorted(set(place_data) - set(Place.EDITABLE_FIELDS))
+        if rejected:
+            raise ValueError(f"Cannot update field(s): {', '.join(rejected)}")
         
         # Validation des données numériques avant la mise à jour
         if 'price' in place_data:
@@ -276,23 +853,15 @@ class HBnBFacade:
             if not (-180.0 <= float(place_data['longitude']) <= 180.0):
                 raise ValueError("The longitude must be between -180.0 and 180.0")
         
-        # Mise à jour des amenities si fournis
-        if 'amenities' in place_data:
-            new_amenities = []
-            for amenity_id in place_data['amenities']:
-                amenity = self.get_amenity(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity with id {amenity_id} not found")
-                new_amenities.append(amenity_id)
-            place.amenities = new_amenities
-        
-        # Suppression des amenities de la donnée à mettre à jour
+        # Mise à jour des amenities si fournis : elles passent par le
+        # repository pour rester annulables dans une transaction
         update_data = place_data.copy()
         if 'amenities' in update_data:
-            del update_data['amenities']
-        
+            update_data['amenities'] = self._resolve_amenities(update_data['amenities'])
+
         # Mise à jour du lieu dans le repo
         self.place_repo.update(place_id, update_data)
+        self._search_update(place)
         return place
 
     def create_review(self, review_data):
@@ -318,6 +887,40 @@ class HBnBFacade:
         if not user:
             raise ValueError("User not found")
 
+        # Un utilisateur ne peut laisser qu'une review par lieu
+        if self.has_user_reviewed_place(place.id, user.id):
+            raise ValueError("You have already reviewed this place")
+
+        # Sauvegarde de la review dans le repository (l'index unique
+        # (place, user) protège contre deux créations concurrentes) ; elle
+        # est construite dans l'unité de travail, qui peut être un point de
+        # sauvegarde d'une transaction englobante
+        try:
+            with self.transaction():
+                review = self._build_review(review_data, place, user)
+                self.review_repo.add(review)
+                self._update_rating(place.id, added=review.rating)
+        except DuplicateEntryError:
+            raise ValueError("You have already reviewed this place")
+        self._search_update(review)
+        return review
+
+    
+    def _build_review(self, review_data, place, user):
+        """
+        Valide les données d'une review et construit l'objet (sans le sauvegarder).
+
+        Args:
+            review_data (dict): Données de la review.
+            place (Place): Lieu déjà résolu.
+            user (User): Auteur déjà résolu.
+
+        Returns:
+            Review: La review construite.
+
+        Raises:
+            ValueError: Si les données sont invalides.
+        """
         # Validation du rating
         try:
             rating = int(review_data['rating'])
@@ -327,17 +930,13 @@ class HBnBFacade:
             raise ValueError("Rating must be an integer between 1 and 5")
         
         # Création de la review
-        review = Review(
+        return Review(
             text=review_data['text'],
             rating=rating,
             place=place,
             user=user
         )
-        # Sauvegarde de la review dans le repository
-        self.review_repo.add(review)
-        return review
 
-    
     def get_review(self, review_id):
         """
         Récupère une review par son identifiant.
@@ -361,6 +960,32 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, cursor=None, limit=None):
+        """
+        Récupère une page de reviews, avec leur auteur et leur lieu
+        préchargés (REVIEW_LOADS).
+
+        Args:
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de reviews.
+
+        Returns:
+            tuple: Liste des reviews et curseur de la page suivante.
+        """
+        return self.review_repo.get_page(cursor, limit, load=self.REVIEW_LOADS)
+
+    def iter_reviews(self, batch_size=1000):
+        """
+        Parcourt toutes les reviews sans les charger toutes en mémoire.
+
+        Args:
+            batch_size (int): Nombre de reviews lues par lot.
+
+        Returns:
+            iterator: Les reviews.
+        """
+        return self.review_repo.iter_all(batch_size, load=self.REVIEW_LOADS)
+
     def get_reviews_by_place(self, place_id):
         """
         Récupère toutes les reviews d'un lieu.
@@ -375,8 +1000,61 @@ class HBnBFacade:
         if not place:
             raise ValueError("Place not found")
 
-        return [review for review in self.review_repo.get_all()
-                if review.place.id == place_id]
+        return self.review_repo.get_all_by_attribute('place.id', place_id)
+
+    def get_reviews_page_by_place(self, place_id, cursor=None, limit=None):
+        """
+        Récupère une page des reviews d'un lieu.
+
+        Args:
+            place_id (str): Identifiant du lieu.
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de reviews.
+
+        Returns:
+            tuple: Liste des reviews et curseur de la page suivante.
+
+        Raises:
+            ValueError: Si le lieu n'existe pas.
+        """
+        place = self.get_place(place_id)
+        if not place:
+            raise ValueError("Place not found")
+
+        return self.review_repo.get_page(cursor, limit, filters={'place.id': place_id},
+                                         load=self.REVIEW_LOADS)
+
+    def has_user_reviewed_place(self, place_id, user_id):
+        """
+        Indique si un utilisateur a déjà laissé une review sur un lieu.
+
+        Args:
+            place_id (str): Identifiant du lieu.
+            user_id (str): Identifiant de l'utilisateur.
+
+        Returns:
+            bool: True si une review existe déjà.
+        """
+        return self.review_repo.get_by_attributes({
+            'place.id': place_id,
+            'user.id': user_id
+        }) is not None
+
+    def get_reviews_by_user(self, user_id):
+        """
+        Récupère toutes les reviews écrites par un utilisateur.
+
+        Args:
+            user_id (str): Identifiant de l'utilisateur.
+
+        Returns:
+            list: Liste des reviews.
+        """
+        user = self.get_user(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        return self.review_repo.get_all_by_attribute('user.id', user_id)
     
     def update_review(self, review_id, review_data):
         """
@@ -395,13 +1073,21 @@ class HBnBFacade:
             return None
         
         # Validation de la note
+        review_data = dict(review_data)
+        old_rating = review.rating
         if 'rating' in review_data:
             rating = int(review_data['rating'])
             if not (1 <= rating <= 5):
                 raise ValueError("Rating must be between 1 and 5")
+            review_data['rating'] = rating
         
-        # Mise à jour de la review dans le repository
-        self.review_repo.update(review_id, review_data)
+        # Mise à jour de la review et des agrégats du lieu dans une même
+        # unité de travail
+        with self.transaction():
+            self.review_repo.update(review_id, review_data)
+            if review_data.get('rating', old_rating) != old_rating:
+                self._update_rating(review.place.id, added=review_data['rating'], removed=old_rating)
+        self._search_update(review)
         return review
     
     def delete_review(self, review_id):
@@ -419,5 +1105,323 @@ class HBnBFacade:
         if not review:
             return False
         
-        # Suppression de la review dans le repository
-        return self.review_repo.delete(review_id)
+        # Suppression de la review et mise à jour des agrégats du lieu ; la
+        # review ne quitte place.reviews qu'une fois la suppression validée
+        place = review.place
+        with self.transaction():
+            deleted = self.review_repo.delete(review_id)
+            if deleted:
+                self._update_rating(place.id, removed=review.rating)
+                self._after_commit(lambda: place.remove_review(review))
+        if deleted:
+            self._search_remove('review', review_id)
+        return deleted
+
+    def _update_rating(self, place_id, added=None, removed=None):
+        """
+        Met à jour les agrégats de notes d'un lieu (nombre de reviews,
+        note moyenne, histogramme) sans relire ses reviews.
+
+        Appelée dans une unité de travail déjà ouverte : le verrou des
+        agrégats est toujours pris après celle-ci (voir
+        rebuild_place_ratings), et la ligne du lieu est verrouillée en SQL
+        jusqu'à la validation, ce qui sérialise aussi les processus.
+
+        Args:
+            place_id (str): Identifiant du lieu.
+            added (int): Note ajoutée, ou None.
+            removed (int): Note retirée, ou None.
+
+        Raises:
+            RuntimeError: Si aucune unité de travail n'est ouverte (le
+                verrou serait pris avant ceux des dépôts).
+        """
+        if not getattr(self._local, 'depth', 0):
+            raise RuntimeError("Rating aggregates must be updated inside a transaction")
+        with self._ratings_lock:
+            place = self.place_repo.get_for_update(place_id)
+            if place:
+                self.place_repo.update(place_id, place.rating_summary(added, removed))
+
+    def rebuild_place_ratings(self):
+        """
+        Recalcule les agrégats de notes de tous les lieux à partir des
+        reviews (reprise de données existantes).
+
+        Les verrous sont pris dans le même ordre que lors d'une écriture de
+        review (unité de travail, puis verrou des agrégats), et les lieux
+        sont verrouillés avant la lecture des reviews : une review ajoutée
+        pendant le recalcul est comptée après lui, jamais perdue.
+        """
+        with self.transaction(), self._ratings_lock:
+            place_ids = [place.id for place in self.iter_places()]
+            for place_id in place_ids:
+                self.place_repo.get_for_update(place_id)
+            histograms = {}
+            for review in self.iter_reviews():
+                histogram = histograms.setdefault(review.place.id, [0] * 5)
+                histogram[review.rating - 1] += 1
+            for place_id in place_ids:
+                summary = Place.summarize_ratings(histograms.get(place_id, [0] * 5))
+                self.place_repo.update(place_id, summary)
+
+    def bulk_create_users(self, items, batch_size=500):
+        """
+        Crée des utilisateurs en masse.
+
+        Args:
+            items (iterable): Données des utilisateurs (dict).
+            batch_size (int): Nombre d'éléments validés et insérés ensemble.
+
+        Returns:
+            dict: 'created' (liste de (position, objet)) et 'errors'
+                (liste de {'index', 'error'}).
+        """
+        return self._bulk_create(items, batch_size, self.user_repo, self._build_users_batch)
+
+    def bulk_create_amenities(self, items, batch_size=500):
+        """
+        Crée des équipements en masse.
+
+        Args:
+            items (iterable): Données des équipements (dict).
+            batch_size (int): Nombre d'éléments validés et insérés ensemble.
+
+        Returns:
+            dict: 'created' (liste de (position, objet)) et 'errors'
+                (liste de {'index', 'error'}).
+        """
+        return self._bulk_create(items, batch_size, self.amenity_repo, self._build_amenities_batch)
+
+    def bulk_create_places(self, items, batch_size=500):
+        """
+        Crée des lieux en masse.
+
+        Les propriétaires et équipements référencés sont résolus en une
+        requête par lot.
+
+        Args:
+            items (iterable): Données des lieux (dict avec owner_id).
+            batch_size (int): Nombre d'éléments validés et insérés ensemble.
+
+        Returns:
+            dict: 'created' (liste de (position, objet)) et 'errors'
+                (liste de {'index', 'error'}).
+        """
+        return self._bulk_create(items, batch_size, self.place_repo, self._build_places_batch)
+
+    def bulk_create_reviews(self, items, batch_size=500):
+        """
+        Crée des reviews en masse.
+
+        Les lieux et auteurs référencés sont résolus en une requête par lot.
+
+        Args:
+            items (iterable): Données des reviews (dict avec place_id et user_id).
+            batch_size (int): Nombre d'éléments validés et insérés ensemble.
+
+        Returns:
+            dict: 'created' (liste de (position, objet)) et 'errors'
+                (liste de {'index', 'error'}).
+        """
+        return self._bulk_create(items, batch_size, self.review_repo, self._build_reviews_batch)
+
+    def _bulk_create(self, items, batch_size, repo, build_batch):
+        """
+        Valide et insère des éléments par lots, sans interrompre l'import
+        en cas d'élément invalide.
+
+        Chaque lot est validé par build_batch puis inséré avec add_many dans
+        une transaction. Si l'insertion d'un lot échoue malgré la
+        validation (écriture concurrente), ses éléments sont réinsérés un
+        par un pour isoler les fautifs.
+
+        Args:
+            items (iterable): Éléments à créer (liste ou flux).
+            batch_size (int): Taille des lots.
+            repo (Repository): Repository cible.
+            build_batch (callable): Construit les objets d'un lot à partir
+                de [(position, données)] et renvoie (objets, erreurs).
+
+        Returns:
+            dict: 'created' et 'errors'.
+        """
+        result = {'created': [], 'errors': []}
+        iterator = enumerate(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return result
+            built, errors = build_batch(batch)
+            result['errors'].extend(errors)
+            try:
+                with self.transaction():
+                    repo.add_many([obj for _, obj in built])
+                    for _, obj in built:
+                        self._record_created(obj)
+                result['created'].extend(built)
+            except DuplicateEntryError:
+                for position, obj in built:
+                    try:
+                        with self.transaction():
+                            repo.add(obj)
+                            self._record_created(obj)
+                        result['created'].append((position, obj))
+                    except DuplicateEntryError as e:
+                        result['errors'].append({'index': position, 'error': str(e)})
+            result['errors'].sort(key=lambda error: error['index'])
+
+    def _record_created(self, obj):
+        """
+        Propage la création d'un objet importé : recherche plein texte et,
+        pour une review, agrégats de notes du lieu.
+        """
+        if isinstance(obj, Review):
+            self._update_rating(obj.place.id, added=obj.rating)
+        self._search_update(obj)
+
+    def _build_users_batch(self, batch):
+        """
+        Construit les utilisateurs d'un lot.
+
+        Les emails déjà enregistrés sont recherchés en une requête. Un
+        élément peut fournir password_hash (empreinte bcrypt) à la place de
+        password : il est alors importé sans hachage.
+
+        Args:
+            batch (list): Liste de (position, données).
+
+        Returns:
+            tuple: Liste de (position, User) et liste d'erreurs.
+        """
+        built, errors = [], []
+        emails = [data.get('email') for _, data in batch if isinstance(data, dict)]
+        taken = {user.email for user in self.user_repo.get_all_by_attribute_in('email', emails)}
+        for position, data in batch:
+            try:
+                self._check_bulk_item(data)
+                if data.get('email') in taken:
+                    raise ValueError("Email already registered")
+                # Empreinte fournie (import de comptes existants) : pas de hachage
+                user = User.from_password_hash(**data) if 'password_hash' in data else User(**data)
+                taken.add(user.email)
+                built.append((position, user))
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append({'index': position, 'error': self._bulk_error(e)})
+        return built, errors
+
+    def _build_amenities_batch(self, batch):
+        """
+        Construit les équipements d'un lot.
+
+        Args:
+            batch (list): Liste de (position, données).
+
+        Returns:
+            tuple: Liste de (position, Amenity) et liste d'erreurs.
+        """
+        built, errors = [], []
+        for position, data in batch:
+            try:
+                self._check_bulk_item(data)
+                built.append((position, Amenity(**data)))
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append({'index': position, 'error': self._bulk_error(e)})
+        return built, errors
+
+    def _build_places_batch(self, batch):
+        """
+        Construit les lieux d'un lot.
+
+        Args:
+            batch (list): Liste de (position, données).
+
+        Returns:
+            tuple: Liste de (position, Place) et liste d'erreurs.
+        """
+        items = [data for _, data in batch if isinstance(data, dict)]
+        owners = {user.id: user for user in self.user_repo.get_many(
+            data.get('owner_id') for data in items)}
+        amenities = {amenity.id: amenity for amenity in self.amenity_repo.get_many(
+            amenity_id for data in items for amenity_id in data.get('amenities') or [])}
+
+        built, errors = [], []
+        for position, data in batch:
+            try:
+                self._check_bulk_item(data)
+                owner = owners.get(data.get('owner_id'))
+                if not owner:
+                    raise ValueError("Owner not found")
+                place_amenities = []
+                for amenity_id in data.get('amenities') or []:
+                    if amenity_id not in amenities:
+                        raise ValueError(f"Amenity with id {amenity_id} not found")
+                    place_amenities.append(amenities[amenity_id])
+                built.append((position, self._build_place(data, owner, place_amenities)))
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append({'index': position, 'error': self._bulk_error(e)})
+        return built, errors
+
+    def _build_reviews_batch(self, batch):
+        """
+        Construit les reviews d'un lot.
+
+        Args:
+            batch (list): Liste de (position, données).
+
+        Returns:
+            tuple: Liste de (position, Review) et liste d'erreurs.
+        """
+        items = [data for _, data in batch if isinstance(data, dict)]
+        places = {place.id: place for place in self.place_repo.get_many(
+            data.get('place_id') for data in items)}
+        users = {user.id: user for user in self.user_repo.get_many(
+            data.get('user_id') for data in items)}
+        # Reviews existantes des lieux du lot, lues en une requête avant de
+        # construire les nouvelles
+        seen = {(review.place.id, review.user.id)
+                for review in self.review_repo.get_all_by_attribute_in('place.id', places, load=('user',))}
+
+        built, errors = [], []
+        for position, data in batch:
+            try:
+                self._check_bulk_item(data)
+                place = places.get(data.get('place_id'))
+                if not place:
+                    raise ValueError("Place not found")
+                user = users.get(data.get('user_id'))
+                if not user:
+                    raise ValueError("User not found")
+                if (place.id, user.id) in seen:
+                    raise ValueError("You have already reviewed this place")
+                built.append((position, self._build_review(data, place, user)))
+                seen.add((place.id, user.id))
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append({'index': position, 'error': self._bulk_error(e)})
+        return built, errors
+
+    @staticmethod
+    def _check_bulk_item(data):
+        """
+        Vérifie qu'un élément d'import est un objet JSON.
+
+        Raises:
+            ValueError: Si l'élément n'est pas un dictionnaire.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Item must be a JSON object")
+
+    @staticmethod
+    def _bulk_error(error):
+        """
+        Formate l'erreur d'un élément d'import.
+
+        Args:
+            error (Exception): Erreur levée pendant la validation.
+
+        Returns:
+            str: Message d'erreur.
+        """
+        if isinstance(error, KeyError):
+            return f"Missing field {error}"
+        return str(error)
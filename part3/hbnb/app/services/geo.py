@@ -0,0 +1,134 @@
+"""
+Calculs géographiques utilisés par la recherche de lieux.
+"""
+import math
+
+# Rayon moyen de la Terre, en kilomètres
+EARTH_RADIUS_KM = 6371.0088
+# Distance maximale entre deux points (demi-circonférence), en kilomètres
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def validate_coordinates(latitude, longitude):
+    """
+    Vérifie qu'un point a des coordonnées valides.
+
+    Args:
+        latitude (float): Latitude en degrés.
+        longitude (float): Longitude en degrés.
+
+    Raises:
+        ValueError: Si une coordonnée est hors limites.
+    """
+    if not -90.0 <= latitude <= 90.0:
+        raise ValueError("The latitude must be between -90.0 and 90.0")
+    if not -180.0 <= longitude <= 180.0:
+        raise ValueError("The longitude must be between -180.0 and 180.0.")
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Distance orthodromique entre deux points.
+
+    Args:
+        lat1, lon1 (float): Coordonnées du premier point, en degrés.
+        lat2, lon2 (float): Coordonnées du second point, en degrés.
+
+    Returns:
+        float: Distance en kilomètres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_ranges(latitude, longitude, radius_km):
+    """
+    Boîtes englobantes d'un cercle, exprimées en intervalles de coordonnées.
+
+    La boîte est découpée en deux lorsqu'elle traverse l'antiméridien, et
+    couvre toutes les longitudes lorsqu'elle atteint un pôle.
+
+    Args:
+        latitude (float): Latitude du centre.
+        longitude (float): Longitude du centre.
+        radius_km (float): Rayon en kilomètres.
+
+    Returns:
+        list: Intervalles {'latitude': (min, max), 'longitude': (min, max)}.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return [{'latitude': (max(min_lat, -90.0), min(max_lat, 90.0)), 'longitude': (-180.0, 180.0)}]
+    # Écart de longitude maximal atteint à la latitude du point tangent
+    d_lon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM)
+                                       / math.cos(math.radians(latitude)))))
+    return bbox_ranges(longitude - d_lon, min_lat, longitude + d_lon, max_lat)
+
+
+def bbox_ranges(min_lon, min_lat, max_lon, max_lat):
+    """
+    Intervalles de coordonnées d'une boîte englobante.
+
+    Une boîte dont min_lon > max_lon (ou dont les longitudes sortent de
+    [-180, 180]) traverse l'antiméridien et est découpée en deux.
+
+    Args:
+        min_lon, min_lat, max_lon, max_lat (float): Bornes de la boîte.
+
+    Returns:
+        list: Intervalles {'latitude': (min, max), 'longitude': (min, max)}.
+
+    Raises:
+        ValueError: Si les latitudes sont invalides.
+    """
+    if not -90.0 <= min_lat <= max_lat <= 90.0:
+        raise ValueError("bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+    if max_lon - min_lon >= 360.0:
+        return [{'latitude': (min_lat, max_lat), 'longitude': (-180.0, 180.0)}]
+    min_lon = (min_lon + 180.0) % 360.0 - 180.0
+    max_lon = (max_lon + 180.0) % 360.0 - 180.0
+    if min_lon <= max_lon:
+        return [{'latitude': (min_lat, max_lat), 'longitude': (min_lon, max_lon)}]
+    return [
+        {'latitude': (min_lat, max_lat), 'longitude': (min_lon, 180.0)},
+        {'latitude': (min_lat, max_lat), 'longitude': (-180.0, max_lon)}
+    ]
+
+
+def intersect_ranges(boxes, others):
+    """
+    Intersection de deux listes de boîtes englobantes.
+
+    Args:
+        boxes (list): Intervalles {'latitude': (min, max), 'longitude': (min, max)}.
+        others (list): Intervalles de même forme.
+
+    Returns:
+        list: Intersections non vides de chaque boîte avec chaque autre.
+    """
+    intersections = []
+    for box in boxes:
+        for other in others:
+            bounds = {attr: (max(box[attr][0], other[attr][0]), min(box[attr][1], other[attr][1]))
+                      for attr in ('latitude', 'longitude')}
+            if all(low <= high for low, high in bounds.values()):
+                intersections.append(bounds)
+    return intersections
+
+
+def bbox_center(min_lon, min_lat, max_lon, max_lat):
+    """
+    Centre d'une boîte englobante (en tenant compte de l'antiméridien).
+
+    Returns:
+        tuple: Latitude et longitude du centre.
+    """
+    if min_lon > max_lon:
+        max_lon += 360.0
+    center_lon = ((min_lon + max_lon) / 2 + 180.0) % 360.0 - 180.0
+    return (min_lat + max_lat) / 2, center_lon
+
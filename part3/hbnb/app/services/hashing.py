@@ -0,0 +1,212 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt as _bcrypt
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Erreur levée lorsque la file d'attente du hachage est pleine."""
+
+
+def _hash(password, rounds):
+    """Hache un mot de passe (exécuté dans un processus du pool)."""
+    return _bcrypt.hashpw(password, _bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password_hash, password):
+    """Vérifie un mot de passe (exécuté dans un processus du pool)."""
+    return _bcrypt.checkpw(password, password_hash)
+
+
+class PasswordHasher:
+    """
+    Hachage et vérification bcrypt, éventuellement déportés dans un pool de processus.
+
+    Avec workers > 0, le calcul bcrypt s'exécute dans un ProcessPoolExecutor :
+    le thread de la requête attend le résultat sans occuper le CPU ni le GIL.
+    Le nombre d'opérations en attente est borné par max_pending ; au-delà,
+    l'appel attend au plus queue_timeout secondes puis lève PasswordHasherBusy.
+    Avec workers = 0, le calcul est fait dans le thread appelant.
+    Les écouteurs enregistrés par add_listener reçoivent la durée de chaque
+    opération, dans le thread appelant (instrumentation des requêtes).
+    """
+    def __init__(self, rounds=12, workers=0, max_pending=None, queue_timeout=5.0):
+        """
+        Initialise le hacheur.
+
+        Args:
+            rounds (int): Facteur de coût bcrypt (log2 du nombre d'itérations).
+            workers (int): Nombre de processus du pool (0 pour un calcul local).
+            max_pending (int): Opérations simultanées maximum (4 x workers par défaut).
+            queue_timeout (float): Attente maximum d'une place dans la file, en secondes.
+        """
+        self._pool = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.configure(rounds, workers, max_pending, queue_timeout)
+
+    def init_app(self, app):
+        """
+        Configure le hacheur à partir de la configuration de l'application.
+
+        Args:
+            app (Flask): Application Flask.
+        """
+        self.configure(
+            app.config.get('BCRYPT_LOG_ROUNDS', 12),
+            app.config.get('PASSWORD_HASH_WORKERS', 0),
+            app.config.get('PASSWORD_HASH_MAX_PENDING'),
+            app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0)
+        )
+
+    def configure(self, rounds, workers=0, max_pending=None, queue_timeout=5.0):
+        """
+        Applique une configuration et réinitialise les métriques.
+
+        Args:
+            rounds (int): Facteur de coût bcrypt.
+            workers (int): Nombre de processus du pool.
+            max_pending (int): Opérations simultanées maximum.
+            queue_timeout (float): Attente maximum d'une place dans la file.
+
+        Raises:
+            ValueError: Si le facteur de coût est hors de l'intervalle 4-31.
+        """
+        if not 4 <= rounds <= 31:
+            raise ValueError("BCRYPT_LOG_ROUNDS must be between 4 and 31")
+        with self._lock:
+            if self._pool and workers != self.workers:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            self.rounds = rounds
+            self.workers = workers
+            self.max_pending = max_pending or max(4 * workers, 1)
+            self.queue_timeout = queue_timeout
+            self._slots = threading.BoundedSemaphore(self.max_pending)
+            self._metrics = {
+                'hash': {'count': 0, 'total_time': 0.0, 'max_time': 0.0},
+                'verify': {'count': 0, 'total_time': 0.0, 'max_time': 0.0},
+                'pending': 0,
+                'max_pending_seen': 0,
+                'rejected': 0
+            }
+
+    def hash(self, password):
+        """
+        Hache un mot de passe.
+
+        Args:
+            password (str): Mot de passe en clair.
+
+        Returns:
+            str: Empreinte bcrypt.
+
+        Raises:
+            PasswordHasherBusy: Si la file d'attente est pleine.
+        """
+        return self._run('hash', _hash, password.encode('utf-8'), self.rounds)
+
+    def verify(self, password_hash, password):
+        """
+        Vérifie un mot de passe contre une empreinte bcrypt.
+
+        Args:
+            password_hash (str): Empreinte stockée.
+            password (str): Mot de passe en clair.
+
+        Returns:
+            bool: True si le mot de passe correspond.
+
+        Raises:
+            PasswordHasherBusy: Si la file d'attente est pleine.
+        """
+        if not password_hash or not password:
+            return False
+        return self._run('verify', _check, password_hash.encode('utf-8'), password.encode('utf-8'))
+
+    def stats(self):
+        """
+        Métriques du hacheur.
+
+        Returns:
+            dict: Nombre d'opérations et latences (en secondes) par type,
+            profondeur actuelle et maximale de la file, rejets.
+        """
+        with self._lock:
+            stats = {
+                'rounds': self.rounds,
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._metrics['pending'],
+                'max_pending_seen': self._metrics['max_pending_seen'],
+                'rejected': self._metrics['rejected']
+            }
+            for operation in ('hash', 'verify'):
+                metrics = self._metrics[operation]
+                stats[operation] = {
+                    'count': metrics['count'],
+                    'avg_time': metrics['total_time'] / metrics['count'] if metrics['count'] else 0.0,
+                    'max_time': metrics['max_time']
+                }
+            return stats
+
+    def add_listener(self, listener):
+        """
+        Enregistre un écouteur appelé après chaque opération.
+
+        Args:
+            listener (callable): Appelé avec le type d'opération ('hash' ou
+                'verify') et sa durée en secondes, attente de la file comprise.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def shutdown(self):
+        """Arrête le pool de processus s'il a été démarré."""
+        with self._lock:
+            if self._pool:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _run(self, operation, func, *args):
+        """Exécute une opération bcrypt en respectant la borne de la file."""
+        # Références locales : une reconfiguration concurrente remplace la file
+        slots, metrics = self._slots, self._metrics
+        if not slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                metrics['rejected'] += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        with self._lock:
+            metrics['pending'] += 1
+            metrics['max_pending_seen'] = max(metrics['max_pending_seen'], metrics['pending'])
+        start = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            if pool:
+                return pool.submit(func, *args).result()
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                metrics['pending'] -= 1
+                timing = metrics[operation]
+                timing['count'] += 1
+                timing['total_time'] += elapsed
+                timing['max_time'] = max(timing['max_time'], elapsed)
+                listeners = list(self._listeners)
+            slots.release()
+            for listener in listeners:
+                listener(operation, elapsed)
+
+    def _get_pool(self):
+        """Démarre le pool de processus à la première utilisation."""
+        if not self.workers:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn : pas de fork d'un processus serveur multi-thread
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
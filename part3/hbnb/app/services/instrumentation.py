@@ -0,0 +1,321 @@
+import abc
+import json
+import logging
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from app.persistence.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetrics:
+    """
+    Mesures d'une requête : appels de la façade, appels des repositories,
+    requêtes SQL et hachages de mots de passe (nombre et durée).
+    """
+    def __init__(self, clock=time.perf_counter):
+        """
+        Démarre les mesures.
+
+        Args:
+            clock (callable): Horloge en secondes (remplaçable pour les tests).
+        """
+        self.clock = clock
+        self.started = clock()
+        self.facade_calls = 0
+        self.facade_time = 0.0
+        self.repository_calls = {}
+        self.repository_time = 0.0
+        self.sql_statements = 0
+        self.sql_time = 0.0
+        self.password_hash_calls = 0
+        self.password_hash_time = 0.0
+
+    def record_facade(self, duration):
+        """Enregistre un appel de la façade."""
+        self.facade_calls += 1
+        self.facade_time += duration
+
+    def record_repository(self, method, duration):
+        """Enregistre un appel de repository ('place_repo.get_page'...)."""
+        self.repository_calls[method] = self.repository_calls.get(method, 0) + 1
+        self.repository_time += duration
+
+    def record_sql(self, duration):
+        """Enregistre une requête SQL."""
+        self.sql_statements += 1
+        self.sql_time += duration
+
+    def record_password_hash(self, duration):
+        """Enregistre un hachage ou une vérification de mot de passe."""
+        self.password_hash_calls += 1
+        self.password_hash_time += duration
+
+    def summary(self):
+        """
+        Résumé des mesures, durées en millisecondes.
+
+        La sérialisation couvre tout ce qui est fait hors de la façade
+        (construction des représentations, JSON, compression) ; la
+        persistance est comprise dans la façade, et le SQL dans la
+        persistance (ou dans la sérialisation pour un chargement différé).
+        Les hachages de mots de passe sont compris dans la façade (création,
+        mise à jour) ou hors façade (vérification à la connexion).
+
+        Returns:
+            dict: Durées et compteurs de la requête.
+        """
+        total = self.clock() - self.started
+        return {
+            'total_ms': round(total * 1000, 3),
+            'facade_ms': round(self.facade_time * 1000, 3),
+            'facade_calls': self.facade_calls,
+            'serialization_ms': round(max(total - self.facade_time, 0.0) * 1000, 3),
+            'repository_ms': round(self.repository_time * 1000, 3),
+            'repository_calls': sum(self.repository_calls.values()),
+            'repository_methods': dict(sorted(self.repository_calls.items())),
+            'sql_ms': round(self.sql_time * 1000, 3),
+            'sql_statements': self.sql_statements,
+            'password_hash_ms': round(self.password_hash_time * 1000, 3),
+            'password_hash_calls': self.password_hash_calls
+        }
+
+
+def current_metrics():
+    """
+    Mesures de la requête en cours.
+
+    Returns:
+        RequestMetrics: Mesures, ou None hors d'une requête instrumentée.
+    """
+    if not has_app_context():
+        return None
+    return g.get('_request_metrics')
+
+
+def timed_facade_call(method):
+    """
+    Mesure les appels d'une méthode de la façade pendant une requête.
+
+    Args:
+        method (callable): Méthode liée de la façade.
+
+    Returns:
+        callable: Méthode mesurée.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        metrics = current_metrics()
+        if metrics is None:
+            return method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.record_facade(time.perf_counter() - start)
+    return wrapper
+
+
+class InstrumentedRepository(Repository):
+    """
+    Décorateur de Repository comptant et chronométrant ses appels pour la
+    requête en cours.
+
+    Chaque méthode de l'interface Repository est déléguée au repository
+    décoré ; hors d'une requête instrumentée, aucun coût n'est ajouté
+    au-delà de la délégation. Pour iter_all, seule la création de
+    l'itérateur est mesurée (les lectures apparaissent dans le SQL).
+    """
+    def __init__(self, repository, name):
+        """
+        Initialise le décorateur.
+
+        Args:
+            repository (Repository): Repository décoré.
+            name (str): Nom du repository dans les mesures ('place_repo'...).
+        """
+        self.repository = repository
+        self.name = name
+
+    def __getattr__(self, name):
+        """Donne accès aux attributs propres au repository décoré."""
+        return getattr(self.repository, name)
+
+
+def _measured(method_name):
+    """Méthode de InstrumentedRepository déléguant et mesurant method_name."""
+    def method(self, *args, **kwargs):
+        metrics = current_metrics()
+        if metrics is None:
+            return getattr(self.repository, method_name)(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return getattr(self.repository, method_name)(*args, **kwargs)
+        finally:
+            metrics.record_repository(f"{self.name}.{method_name}", time.perf_counter() - start)
+    method.__name__ = method_name
+    method.__doc__ = f"Appelle {method_name} sur le repository décoré (mesuré)."
+    return method
+
+
+for _method_name in sorted(Repository.__abstractmethods__):
+    setattr(InstrumentedRepository, _method_name, _measured(_method_name))
+abc.update_abstractmethods(InstrumentedRepository)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Début d'une requête SQL (écouteur SQLAlchemy).
+
+    L'heure de début est portée par le contexte d'exécution, propre à la
+    requête : une requête en erreur (sans after_cursor_execute) ne laisse
+    rien sur la connexion du pool.
+    """
+    if context is not None and current_metrics() is not None:
+        context._instrumentation_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Fin d'une requête SQL (écouteur SQLAlchemy)."""
+    metrics = current_metrics()
+    start = getattr(context, '_instrumentation_start', None)
+    if metrics is not None and start is not None:
+        metrics.record_sql(time.perf_counter() - start)
+
+
+def _after_password_hash(operation, duration):
+    """Fin d'un hachage ou d'une vérification de mot de passe (écouteur du hacheur)."""
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.record_password_hash(duration)
+
+
+def password_hasher_summary(stats):
+    """
+    Métriques du hacheur de mots de passe pour le journal, durées en millisecondes.
+
+    Args:
+        stats (dict): Métriques produites par PasswordHasher.stats.
+
+    Returns:
+        dict: File d'attente (actuelle, maximum observé, rejets) et
+        latences moyennes et maximales depuis le démarrage.
+    """
+    summary = {
+        'pending': stats['pending'],
+        'max_pending_seen': stats['max_pending_seen'],
+        'rejected': stats['rejected']
+    }
+    for operation in ('hash', 'verify'):
+        summary[f'{operation}_avg_ms'] = round(stats[operation]['avg_time'] * 1000, 3)
+        summary[f'{operation}_max_ms'] = round(stats[operation]['max_time'] * 1000, 3)
+    return summary
+
+
+class RequestInstrumentation:
+    """
+    Instrumentation optionnelle des requêtes.
+
+    Activée par INSTRUMENTATION_ENABLED, elle mesure pour chaque requête
+    les appels de la façade, des repositories, les requêtes SQL et les
+    hachages de mots de passe, puis les expose dans un en-tête
+    Server-Timing et dans une ligne de journal JSON (logger
+    app.services.instrumentation) : INFO, ou WARNING au-delà de
+    INSTRUMENTATION_SLOW_REQUEST_MS. Les deux indiquent aussi la file
+    d'attente du hacheur ; le journal ajoute ses latences depuis le
+    démarrage. Les réponses en streaming
+    (exports) ne mesurent que la préparation de la réponse.
+    """
+    def __init__(self):
+        """Initialise l'instrumentation (écouteurs SQL non installés)."""
+        self._sql_listening = False
+
+    def init_app(self, app):
+        """
+        Enregistre les hooks de mesure si l'instrumentation est activée.
+
+        Args:
+            app (Flask): Application (INSTRUMENTATION_*).
+        """
+        if not app.config.get('INSTRUMENTATION_ENABLED', False):
+            return
+        app.before_request(self.start)
+        app.after_request(self.finish)
+        app.teardown_request(self.discard)
+        if not self._sql_listening:
+            from sqlalchemy import event
+            from sqlalchemy.engine import Engine
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            self._sql_listening = True
+        from app import password_hasher
+        password_hasher.add_listener(_after_password_hash)
+
+    @staticmethod
+    def start():
+        """Démarre les mesures de la requête (hook before_request)."""
+        g._request_metrics = RequestMetrics()
+
+    def finish(self, response):
+        """
+        Ajoute l'en-tête Server-Timing et journalise la requête (hook after_request).
+
+        Args:
+            response (Response): Réponse produite.
+
+        Returns:
+            Response: Réponse complétée.
+        """
+        metrics = g.pop('_request_metrics', None)
+        if metrics is None:
+            return response
+        from app import password_hasher
+        summary = metrics.summary()
+        hasher = password_hasher_summary(password_hasher.stats())
+        if current_app.config.get('INSTRUMENTATION_SERVER_TIMING', True):
+            response.headers['Server-Timing'] = self.server_timing(summary, hasher['pending'])
+        slow = summary['total_ms'] >= current_app.config.get('INSTRUMENTATION_SLOW_REQUEST_MS', 500)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'slow': slow,
+            **summary,
+            'password_hasher': hasher
+        }
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record))
+        return response
+
+    @staticmethod
+    def discard(error=None):
+        """Abandonne les mesures d'une requête interrompue (hook teardown_request)."""
+        g.pop('_request_metrics', None)
+
+    @staticmethod
+    def server_timing(summary, hash_pending=0):
+        """
+        Valeur de l'en-tête Server-Timing.
+
+        Args:
+            summary (dict): Résumé produit par RequestMetrics.summary.
+            hash_pending (int): Opérations en attente dans le hacheur.
+
+        Returns:
+            str: Métriques facade, repo, db, hash, hash-queue (sans durée),
+            serialize et total.
+        """
+        metrics = [
+            ('facade', summary['facade_ms'], f"{summary['facade_calls']} calls"),
+            ('repo', summary['repository_ms'], f"{summary['repository_calls']} calls"),
+            ('db', summary['sql_ms'], f"{summary['sql_statements']} queries"),
+            ('hash', summary['password_hash_ms'], f"{summary['password_hash_calls']} calls"),
+            ('hash-queue', None, f"{hash_pending} pending"),
+            ('serialize', summary['serialization_ms'], None),
+            ('total', summary['total_ms'], None)
+        ]
+        return ', '.join(
+            name + (f';dur={duration}' if duration is not None else '') + (f';desc="{desc}"' if desc else '')
+            for name, duration, desc in metrics
+        )
@@ -0,0 +1,393 @@
+"""
+Recherche plein texte sur les lieux et les reviews.
+
+Deux moteurs partagent la même interface (prepare, index, remove, clear,
+search) :
+- InMemorySearchIndex : index inversé en Python, utilisé avec
+  InMemoryRepository (et avec les bases autres que SQLite) ;
+- FTS5SearchIndex : table virtuelle SQLite FTS5, utilisée avec
+  SQLAlchemyRepository sur SQLite.
+"""
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from app.persistence.pagination import encode_cursor, decode_cursor
+
+# Poids des champs indexés dans le score
+FIELD_WEIGHTS = {'title': 2.0, 'body': 1.0}
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Découpe un texte en mots normalisés (minuscules, sans accents).
+
+    Args:
+        text (str): Texte à découper.
+
+    Returns:
+        list: Mots du texte.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+
+def query_tokens(query):
+    """
+    Mots d'une requête de recherche.
+
+    Raises:
+        ValueError: Si la requête ne contient aucun mot.
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        raise ValueError("Query must contain at least one word")
+    return tokens
+
+
+def encode_search_cursor(score, doc_type, doc_id):
+    """Encode la clé (score, type, id) d'un résultat en curseur."""
+    return encode_cursor(score, doc_type, doc_id)
+
+
+def decode_search_cursor(cursor):
+    """
+    Décode un curseur (score, type, id).
+
+    Returns:
+        tuple: Score, type et identifiant.
+
+    Raises:
+        ValueError: Si le curseur est invalide.
+    """
+    score, doc_type, doc_id = decode_cursor(cursor, 3)
+    if not isinstance(score, (int, float)) or isinstance(score, bool):
+        raise ValueError("Invalid cursor")
+    return float(score), str(doc_type), str(doc_id)
+
+
+def _page(hits, cursor, limit):
+    """
+    Découpe des résultats triés par (-score, type, id) en page.
+
+    Args:
+        hits (list): Résultats (type, id, score) triés.
+        cursor (str): Curseur du dernier résultat de la page précédente.
+        limit (int): Nombre maximum de résultats.
+
+    Returns:
+        tuple: Résultats de la page et curseur de la page suivante.
+    """
+    if cursor:
+        score, doc_type, doc_id = decode_search_cursor(cursor)
+        after = (-score, doc_type, doc_id)
+        hits = [hit for hit in hits if (-hit[2], hit[0], hit[1]) > after]
+    if limit is None or len(hits) <= limit:
+        return hits, None
+    page = hits[:limit]
+    doc_type, doc_id, score = page[-1]
+    return page, encode_search_cursor(score, doc_type, doc_id)
+
+
+class InMemorySearchIndex:
+    """
+    Index inversé en mémoire, classé par BM25.
+
+    Chaque mot de la requête correspond aux termes qui commencent par lui
+    (recherche par préfixe sur la liste triée des termes) ; un document
+    doit correspondre à tous les mots de la requête.
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, weights=None):
+        """
+        Initialise l'index.
+
+        Args:
+            weights (dict): Poids de chaque champ (FIELD_WEIGHTS par défaut).
+        """
+        self.weights = weights or FIELD_WEIGHTS
+        self._lock = threading.RLock()
+        self.clear()
+
+    def prepare(self):
+        """
+        Prépare l'index avant sa première utilisation.
+
+        Returns:
+            bool: True : l'index démarre vide et doit être rempli.
+        """
+        return True
+
+    def clear(self):
+        """Vide l'index."""
+        with self._lock:
+            self._postings = {}
+            self._terms = []
+            self._documents = {}
+            self._total_length = 0.0
+
+    def index(self, doc_type, doc_id, fields):
+        """
+        Indexe (ou réindexe) un document.
+
+        Args:
+            doc_type (str): Type du document ('place', 'review').
+            doc_id (str): Identifiant du document.
+            fields (dict): Texte de chaque champ ('title', 'body').
+        """
+        frequencies = {}
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for token in tokenize(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        key = (doc_type, doc_id)
+        with self._lock:
+            self._remove(key)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                postings[key] = frequency
+            length = sum(frequencies.values())
+            self._documents[key] = (tuple(frequencies), length)
+            self._total_length += length
+
+    def remove(self, doc_type, doc_id):
+        """Retire un document de l'index."""
+        with self._lock:
+            self._remove((doc_type, doc_id))
+
+    def search(self, query, doc_types=None, cursor=None, limit=None):
+        """
+        Recherche les documents correspondant à tous les mots de la requête.
+
+        Args:
+            query (str): Texte recherché.
+            doc_types (iterable): Types de documents acceptés (tous si None).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Résultats (type, id, score) par score décroissant, et
+            curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si la requête ou le curseur sont invalides.
+        """
+        tokens = query_tokens(query)
+        with self._lock:
+            count = len(self._documents)
+            if not count:
+                return [], None
+            average = self._total_length / count or 1.0
+            scores = None
+            for token in tokens:
+                token_scores = {}
+                for term in self._prefixed(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, frequency in postings.items():
+                        length = self._documents[key][1]
+                        score = idf * frequency * (self.K1 + 1) / (
+                            frequency + self.K1 * (1 - self.B + self.B * length / average))
+                        token_scores[key] = max(token_scores.get(key, 0.0), score)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {key: scores[key] + score for key, score in token_scores.items()
+                              if key in scores}
+                if not scores:
+                    return [], None
+        if doc_types is not None:
+            doc_types = set(doc_types)
+            scores = {key: score for key, score in scores.items() if key[0] in doc_types}
+        hits = sorted(((doc_type, doc_id, score) for (doc_type, doc_id), score in scores.items()),
+                      key=lambda hit: (-hit[2], hit[0], hit[1]))
+        return _page(hits, cursor, limit)
+
+    def _prefixed(self, prefix):
+        """Termes de l'index commençant par prefix."""
+        position = bisect_left(self._terms, prefix)
+        while position < len(self._terms) and self._terms[position].startswith(prefix):
+            yield self._terms[position]
+            position += 1
+
+    def _remove(self, key):
+        """Retire un document (verrou déjà acquis)."""
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        terms, length = document
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+
+class FTS5SearchIndex:
+    """
+    Index plein texte reposant sur une table virtuelle SQLite FTS5.
+
+    Les écritures passent par la session SQLAlchemy ; le classement
+    utilise la fonction bm25() de FTS5 avec les poids de FIELD_WEIGHTS.
+    La table DOCUMENTS associe chaque (type, id) au rowid FTS5, ce qui
+    évite de parcourir la table virtuelle pour remplacer un document.
+    """
+    TABLE = 'search_index'
+    DOCUMENTS = 'search_documents'
+
+    def __init__(self, weights=None):
+        """
+        Initialise l'index.
+
+        Args:
+            weights (dict): Poids de chaque champ (FIELD_WEIGHTS par défaut).
+        """
+        self.weights = weights or FIELD_WEIGHTS
+
+    def prepare(self):
+        """
+        Crée la table FTS5 si elle n'existe pas.
+
+        Returns:
+            bool: True si la table vient d'être créée et doit être remplie.
+        """
+        from sqlalchemy import text
+        from app import db
+        exists = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': self.TABLE}
+        ).first()
+        if exists:
+            return False
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {self.DOCUMENTS} ("
+            "id INTEGER PRIMARY KEY, doc_type TEXT NOT NULL, doc_id TEXT NOT NULL, "
+            "UNIQUE (doc_type, doc_id))"
+        ))
+        db.session.execute(text(
+            f"CREATE VIRTUAL TABLE {self.TABLE} USING fts5("
+            "doc_type UNINDEXED, doc_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+        self._save()
+        return True
+
+    def clear(self):
+        """Vide l'index."""
+        from sqlalchemy import text
+        from app import db
+        db.session.execute(text(f"DELETE FROM {self.TABLE}"))
+        db.session.execute(text(f"DELETE FROM {self.DOCUMENTS}"))
+        self._save()
+
+    def index(self, doc_type, doc_id, fields):
+        """
+        Indexe (ou réindexe) un document.
+
+        Args:
+            doc_type (str): Type du document ('place', 'review').
+            doc_id (str): Identifiant du document.
+            fields (dict): Texte de chaque champ ('title', 'body').
+        """
+        from sqlalchemy import text
+        from app import db
+        key = {'doc_type': doc_type, 'doc_id': doc_id}
+        db.session.execute(text(f"INSERT OR IGNORE INTO {self.DOCUMENTS} (doc_type, doc_id) "
+                                "VALUES (:doc_type, :doc_id)"), key)
+        rowid = db.session.execute(text(f"SELECT id FROM {self.DOCUMENTS} "
+                                        "WHERE doc_type = :doc_type AND doc_id = :doc_id"), key).scalar()
+        db.session.execute(text(f"DELETE FROM {self.TABLE} WHERE rowid = :rowid"), {'rowid': rowid})
+        db.session.execute(
+            text(f"INSERT INTO {self.TABLE} (rowid, doc_type, doc_id, title, body) "
+                 "VALUES (:rowid, :doc_type, :doc_id, :title, :body)"),
+            {**key, 'rowid': rowid, 'title': fields.get('title') or '', 'body': fields.get('body') or ''}
+        )
+        self._save()
+
+    def remove(self, doc_type, doc_id):
+        """Retire un document de l'index."""
+        from sqlalchemy import text
+        from app import db
+        key = {'doc_type': doc_type, 'doc_id': doc_id}
+        rowid = db.session.execute(text(f"SELECT id FROM {self.DOCUMENTS} "
+                                        "WHERE doc_type = :doc_type AND doc_id = :doc_id"), key).scalar()
+        if rowid is not None:
+            db.session.execute(text(f"DELETE FROM {self.TABLE} WHERE rowid = :rowid"), {'rowid': rowid})
+            db.session.execute(text(f"DELETE FROM {self.DOCUMENTS} WHERE id = :rowid"), {'rowid': rowid})
+            self._save()
+
+    def search(self, query, doc_types=None, cursor=None, limit=None):
+        """
+        Recherche les documents correspondant à tous les mots de la requête.
+
+        Chaque mot est recherché comme préfixe ("mot"*). La pagination se
+        fait par clé sur (rang bm25, type, id).
+
+        Args:
+            query (str): Texte recherché.
+            doc_types (iterable): Types de documents acceptés (tous si None).
+            cursor (str): Curseur renvoyé par la page précédente.
+            limit (int): Nombre maximum de résultats.
+
+        Returns:
+            tuple: Résultats (type, id, score) par score décroissant, et
+            curseur de la page suivante (ou None).
+
+        Raises:
+            ValueError: Si la requête ou le curseur sont invalides.
+        """
+        from sqlalchemy import text, bindparam
+        from app import db
+        params = {
+            'match': ' '.join(f'"{token}"*' for token in query_tokens(query)),
+            'title_weight': self.weights.get('title', 1.0),
+            'body_weight': self.weights.get('body', 1.0)
+        }
+        conditions = []
+        if doc_types is not None:
+            conditions.append("doc_type IN :doc_types")
+            params['doc_types'] = list(doc_types)
+        if cursor:
+            score, doc_type, doc_id = decode_search_cursor(cursor)
+            conditions.append("(rank, doc_type, doc_id) > (:rank, :doc_type, :doc_id)")
+            params.update({'rank': -score, 'doc_type': doc_type, 'doc_id': doc_id})
+        sql = (
+            "SELECT doc_type, doc_id, rank FROM ("
+            f"SELECT doc_type, doc_id, bm25({self.TABLE}, 0, 0, :title_weight, :body_weight) AS rank "
+            f"FROM {self.TABLE} WHERE {self.TABLE} MATCH :match)"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY rank, doc_type, doc_id"
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params['limit'] = limit + 1
+        statement = text(sql)
+        if doc_types is not None:
+            statement = statement.bindparams(bindparam('doc_types', expanding=True))
+        rows = db.session.execute(statement, params).all()
+        hits = [(doc_type, doc_id, -rank) for doc_type, doc_id, rank in rows]
+        if limit is None or len(hits) <= limit:
+            return hits, None
+        page = hits[:limit]
+        doc_type, doc_id, score = page[-1]
+        return page, encode_search_cursor(score, doc_type, doc_id)
+
+    def _save(self):
+        """Valide la session, sauf si une unité de travail est en cours."""
+        from app import db
+        if not db.session.info.get('tx_units'):
+            db.session.commit()
@@ -10,8 +10,11 @@ import os
 # Ajout du chemin du projet à sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from test_facade import TestHBnBFacade
+from test_facade import TestHBnBFacade, TestSQLAlchemyFacade
 from test_amenities_facade import TestAmenitiesFacade
+from test_hashing import TestPasswordHasher
+from test_geo import TestGeo
+from test_search import TestInMemorySearchIndex, TestFTS5SearchIndex
 
 
 def run_services_tests():
@@ -24,7 +27,12 @@ def run_services_tests():
     # Classes de tests disponibles
     test_classes = [
         TestHBnBFacade,
-        TestAmenitiesFacade
+        TestSQLAlchemyFacade,
+        TestAmenitiesFacade,
+        TestPasswordHasher,
+        TestGeo,
+        TestInMemorySearchIndex,
+        TestFTS5SearchIndex
     ]
     
     # Créer une suite avec tous les tests
@@ -52,8 +60,13 @@ def run_specific_test(test_name):
     test_classes = {
         'facade': TestHBnBFacade,
         'hbnb_facade': TestHBnBFacade,
+        'sqlalchemy_facade': TestSQLAlchemyFacade,
         'amenities_facade': TestAmenitiesFacade,
-        'amenities': TestAmenitiesFacade
+        'amenities': TestAmenitiesFacade,
+        'hashing': TestPasswordHasher,
+        'geo': TestGeo,
+        'search': TestInMemorySearchIndex,
+        'fts5': TestFTS5SearchIndex
     }
     
     if test_name.lower() not in test_classes:
@@ -131,6 +131,43 @@ class TestAmenitiesFacade(unittest.TestCase):
         
         self.assertEqual(str(context.exception), "The name of the equipment is required and must be less than 50 characters.")
 
+    def test_get_amenities_bulk(self):
+        """Test récupération de plusieurs amenities en un seul accès"""
+        wifi = self.facade.create_amenity({'name': 'Wi-Fi'})
+        pool = self.facade.create_amenity({'name': 'Pool'})
+
+        calls = []
+        get_many = self.facade.amenity_repo.get_many
+        self.facade.amenity_repo.get_many = lambda ids: calls.append(ids) or get_many(ids)
+        self.facade.amenity_repo.get = lambda obj_id: self.fail("get() ne doit pas être appelé")
+
+        amenities = self.facade.get_amenities([pool.id, 'unknown-id', wifi.id, pool.id])
+
+        self.assertEqual(amenities, [pool, wifi])
+        self.assertEqual(len(calls), 1)
+
+    def test_create_place_with_unknown_amenity(self):
+        """Test création de lieu avec une amenity inexistante (validation groupée)"""
+        owner = self.facade.create_user({
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': 'john.doe@example.com',
+            'password': 'password123'
+        })
+        wifi = self.facade.create_amenity({'name': 'Wi-Fi'})
+
+        with self.assertRaises(ValueError) as context:
+            self.facade.create_place({
+                'title': 'Test Place',
+                'price': 100.0,
+                'latitude': 48.8566,
+                'longitude': 2.3522,
+                'owner_id': owner.id,
+                'amenities': [wifi.id, 'unknown-id']
+            })
+
+        self.assertEqual(str(context.exception), "Amenity with id unknown-id not found")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,8 @@
 import sys
 import os
+import threading
 import unittest
+from unittest import mock
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
@@ -8,7 +10,8 @@ from app.services.facade import HBnBFacade
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import InMemoryRepository, ConcurrentInMemoryRepository
+from app import create_app, db
 
 
 class TestHBnBFacade(unittest.TestCase):
@@ -16,7 +19,7 @@ class TestHBnBFacade(unittest.TestCase):
 
     def setUp(self):
         """Configuration avant chaque test"""
-        # Utiliser InMemoryRepository pour les tests jusqu'à ce que les modèles soient mappés à SQLAlchemy
+        # InMemoryRepository ici ; le backend SQLAlchemy est couvert par TestSQLAlchemyFacade
         repositories = {
             'user_repo': InMemoryRepository(),
             'place_repo': InMemoryRepository(),
@@ -130,6 +133,265 @@ class TestHBnBFacade(unittest.TestCase):
         updated_user = self.facade.update_user('nonexistent-id', update_data)
         self.assertIsNone(updated_user)
 
+    def test_transaction_rolls_back_all_repositories(self):
+        """Test qu'une erreur dans une transaction annule les écritures de tous les repositories"""
+        with self.assertRaises(ValueError):
+            with self.facade.transaction():
+                owner = self.facade.create_user({
+                    'first_name': 'John',
+                    'last_name': 'Doe',
+                    'email': 'john.doe@example.com',
+                    'password': 'password123'
+                })
+                self.facade.create_place({
+                    'title': 'Test Place',
+                    'price': 100.0,
+                    'latitude': 48.8566,
+                    'longitude': 2.3522,
+                    'owner_id': owner.id
+                })
+                self.facade.create_amenity({'name': ''})
+
+        self.assertEqual(self.facade.get_all_users(), [])
+        self.assertEqual(self.facade.get_all_places(), [])
+
+    def test_transaction_commits_all_repositories(self):
+        """Test qu'une transaction réussie conserve les écritures"""
+        with self.facade.transaction():
+            owner = self.facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'email': 'john.doe@example.com',
+                'password': 'password123'
+            })
+            self.facade.create_amenity({'name': 'Wi-Fi'})
+
+        self.assertEqual(self.facade.get_user_by_email('john.doe@example.com'), owner)
+        self.assertEqual(len(self.facade.get_all_amenities()), 1)
+
+    def test_user_repository_cannot_be_cached(self):
+        """Test que le cache de lecture est refusé pour les utilisateurs"""
+        repositories = {'user_repo': InMemoryRepository(), 'amenity_repo': InMemoryRepository()}
+        with self.assertRaises(ValueError):
+            HBnBFacade(repositories, {'user_repo': {'ttl': 60}})
+        facade = HBnBFacade(repositories, {'amenity_repo': {'ttl': 60}})
+        self.assertEqual(list(facade.cache_stats()), ['amenity_repo'])
+
+    def test_nested_transaction_failure_keeps_outer_work(self):
+        """Test qu'un bloc imbriqué en échec n'annule que ses propres écritures"""
+        with self.facade.transaction():
+            owner = self.facade.create_user({
+                'first_name': 'John', 'last_name': 'Doe',
+                'email': 'john.doe@example.com', 'password': 'password123'
+            })
+            with self.assertRaises(ValueError):
+                with self.facade.transaction():
+                    self.facade.create_amenity({'name': 'Pool'})
+                    self.facade.create_amenity({'name': ''})
+            self.facade.create_amenity({'name': 'Wi-Fi'})
+
+        self.assertEqual(self.facade.get_user_by_email('john.doe@example.com'), owner)
+        self.assertEqual([amenity.name for amenity in self.facade.get_all_amenities()], ['Wi-Fi'])
+        # Les écritures suivantes sont de nouveau validées une par une
+        self.facade.create_amenity({'name': 'Sauna'})
+        self.assertEqual(len(self.facade.get_all_amenities()), 2)
+
+    def test_search_nearby_pages_follow_distance(self):
+        """Test que les pages d'une recherche par distance suivent l'ordre complet"""
+        owner = self.facade.create_user({
+            'first_name': 'John', 'last_name': 'Doe',
+            'email': 'john.doe@example.com', 'password': 'password123'
+        })
+        # Du même bâtiment à l'autre hémisphère : plusieurs anneaux sont nécessaires
+        for index, (latitude, longitude) in enumerate([(48.8566, 2.3522), (48.86, 2.35), (48.9, 2.4),
+                                                       (45.764, 4.8357), (40.7128, -74.006),
+                                                       (-33.8688, 151.2093), (48.87, 2.36)]):
+            self.facade.create_place({
+                'title': f'Place {index}', 'price': 100.0, 'latitude': latitude,
+                'longitude': longitude, 'owner_id': owner.id, 'amenities': []
+            })
+        everything, cursor = self.facade.search_places_in_bbox(-180, -90, 180, 90, 48.8566, 2.3522)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(everything), 7)
+
+        for limit in (1, 2, 3):
+            pages, cursor = [], None
+            while True:
+                page, cursor = self.facade.search_places_in_bbox(-180, -90, 180, 90, 48.8566, 2.3522,
+                                                                 cursor=cursor, limit=limit)
+                pages.extend(page)
+                if cursor is None:
+                    break
+            self.assertEqual(pages, everything)
+        page, cursor = self.facade.search_places_nearby(48.8566, 2.3522, 500, limit=4)
+        self.assertEqual(page, everything[:4])
+        page, cursor = self.facade.search_places_nearby(48.8566, 2.3522, 500, cursor=cursor, limit=4)
+        self.assertEqual((page, cursor), (everything[4:5], None))
+
+    def test_rebuild_ratings_concurrent_with_review(self):
+        """Test qu'un recalcul des agrégats lancé pendant la création d'une
+        review (dépôts partagés entre threads) ne provoque pas d'interblocage"""
+        facade = HBnBFacade({
+            'user_repo': ConcurrentInMemoryRepository(),
+            'place_repo': ConcurrentInMemoryRepository(),
+            'review_repo': ConcurrentInMemoryRepository(),
+            'amenity_repo': ConcurrentInMemoryRepository()
+        })
+        owner = facade.create_user({'first_name': 'John', 'last_name': 'Doe',
+                                    'email': 'john.doe@example.com', 'password': 'password123'})
+        place = facade.create_place({'title': 'Loft', 'price': 100.0, 'latitude': 45.0,
+                                     'longitude': 5.0, 'owner_id': owner.id, 'amenities': []})
+        review_added, rebuild_started = threading.Event(), threading.Event()
+        add_review = facade.review_repo.add
+
+        def add_then_wait(review):
+            # La review est écrite, les agrégats pas encore : le recalcul démarre
+            add_review(review)
+            review_added.set()
+            rebuild_started.wait(5)
+            threading.Event().wait(0.1)
+
+        def rebuild():
+            review_added.wait(5)
+            rebuild_started.set()
+            facade.rebuild_place_ratings()
+
+        rebuilder = threading.Thread(target=rebuild, daemon=True)
+        rebuilder.start()
+        writer = threading.Thread(target=facade.create_review, daemon=True, args=({
+            'text': 'Great', 'rating': 4, 'place_id': place.id, 'user_id': owner.id
+        },))
+        with mock.patch.object(facade.review_repo, 'add', side_effect=add_then_wait):
+            writer.start()
+            writer.join(5)
+        rebuilder.join(5)
+
+        self.assertFalse(writer.is_alive() or rebuilder.is_alive())
+        self.assertEqual((place.review_count, place.average_rating), (1, 4.0))
+        with self.assertRaises(RuntimeError):
+            facade._update_rating(place.id, added=5)
+
+    def test_bulk_create_users(self):
+        """Test import en masse d'utilisateurs avec erreurs par élément"""
+        self.facade.create_user({
+            'first_name': 'Existing', 'last_name': 'User',
+            'email': 'existing@example.com', 'password': 'password123'
+        })
+        result = self.facade.bulk_create_users([
+            {'first_name': 'A', 'last_name': 'User', 'email': 'a@example.com', 'password': 'pwd'},
+            {'first_name': 'B', 'last_name': 'User', 'email': 'existing@example.com', 'password': 'pwd'},
+            {'first_name': 'C', 'last_name': 'User', 'email': 'a@example.com', 'password': 'pwd'},
+            'not an object',
+            {'first_name': 'D', 'last_name': 'User', 'email': 'invalid', 'password': 'pwd'},
+            {'first_name': 'E', 'last_name': 'User', 'email': 'e@example.com', 'password': 'pwd'}
+        ], batch_size=2)
+
+        self.assertEqual([position for position, _ in result['created']], [0, 5])
+        self.assertEqual([error['index'] for error in result['errors']], [1, 2, 3, 4])
+        self.assertEqual(result['errors'][0]['error'], "Email already registered")
+        self.assertEqual(result['errors'][2]['error'], "Item must be a JSON object")
+        self.assertEqual(len(self.facade.get_all_users()), 3)
+
+    def test_bulk_create_users_with_password_hashes(self):
+        """Test import en masse d'utilisateurs dont l'empreinte bcrypt est fournie"""
+        existing = self.facade.create_user({
+            'first_name': 'Existing', 'last_name': 'User',
+            'email': 'existing@example.com', 'password': 'password123'
+        })
+        with mock.patch.object(User, 'hash_password', side_effect=AssertionError("rehashed")):
+            result = self.facade.bulk_create_users([
+                {'first_name': 'A', 'last_name': 'User', 'email': 'a@example.com',
+                 'password_hash': existing.password},
+                {'first_name': 'B', 'last_name': 'User', 'email': 'b@example.com',
+                 'password_hash': 'not-a-hash'},
+                {'first_name': 'C', 'last_name': 'User', 'email': 'c@example.com',
+                 'password_hash': existing.password, 'password': 'password123'}
+            ])
+
+        self.assertEqual([position for position, _ in result['created']], [0])
+        self.assertEqual([error['index'] for error in result['errors']], [1, 2])
+        self.assertEqual(result['errors'][0]['error'], "password_hash must be a valid bcrypt hash")
+        self.assertTrue(self.facade.get_user_by_email('a@example.com').verify_password('password123'))
+
+    def test_bulk_create_places_and_reviews(self):
+        """Test import en masse de lieux et de reviews avec résolution groupée des références"""
+        owner = self.facade.create_user({
+            'first_name': 'Owner', 'last_name': 'User',
+            'email': 'owner@example.com', 'password': 'password123'
+        })
+        reviewer = self.facade.create_user({
+            'first_name': 'Reviewer', 'last_name': 'User',
+            'email': 'reviewer@example.com', 'password': 'password123'
+        })
+        wifi = self.facade.create_amenity({'name': 'Wi-Fi'})
+        place_data = {'title': 'Place', 'price': 80.0, 'latitude': 45.0, 'longitude': 5.0}
+
+        places = self.facade.bulk_create_places([
+            dict(place_data, owner_id=owner.id, amenities=[wifi.id]),
+            dict(place_data, owner_id='unknown'),
+            dict(place_data, owner_id=owner.id, amenities=['unknown']),
+            dict(place_data, owner_id=owner.id, price=-1)
+        ])
+        self.assertEqual(len(places['created']), 1)
+        self.assertEqual([error['error'] for error in places['errors']], [
+            "Owner not found", "Amenity with id unknown not found", "Invalid numeric values"
+        ])
+        place = places['created'][0][1]
+        self.assertEqual(place.amenities, [wifi])
+
+        reviews = self.facade.bulk_create_reviews([
+            {'text': 'Great', 'rating': 5, 'place_id': place.id, 'user_id': reviewer.id},
+            {'text': 'Again', 'rating': 4, 'place_id': place.id, 'user_id': reviewer.id},
+            {'text': 'Missing rating', 'place_id': place.id, 'user_id': owner.id}
+        ])
+        self.assertEqual(len(reviews['created']), 1)
+        self.assertEqual(reviews['errors'], [
+            {'index': 1, 'error': "You have already reviewed this place"},
+            {'index': 2, 'error': "Missing field 'rating'"}
+        ])
+        self.assertEqual(len(self.facade.get_reviews_by_place(place.id)), 1)
+        self.assertEqual(place.review_count, 1)
+        self.assertEqual(place.average_rating, 5.0)
+
+    def test_rating_aggregates_follow_transactions(self):
+        """Test que les agrégats de notes sont annulés avec la transaction et reconstructibles"""
+        owner = self.facade.create_user({
+            'first_name': 'Owner', 'last_name': 'User',
+            'email': 'owner@example.com', 'password': 'password123'
+        })
+        reviewer = self.facade.create_user({
+            'first_name': 'Reviewer', 'last_name': 'User',
+            'email': 'reviewer@example.com', 'password': 'password123'
+        })
+        place = self.facade.create_place({'title': 'Place', 'price': 80.0, 'latitude': 45.0,
+                                          'longitude': 5.0, 'owner_id': owner.id})
+        review_data = {'text': 'Great', 'rating': 5, 'place_id': place.id, 'user_id': reviewer.id}
+
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.create_review(review_data)
+                raise RuntimeError("rollback")
+        self.assertEqual(place.review_count, 0)
+        self.assertEqual(place.rating_histogram, [0] * 5)
+
+        self.facade.create_review(review_data)
+        self.facade.place_repo.update(place.id, {'review_count': 0, 'average_rating': None,
+                                                 'rating_histogram': [0] * 5})
+        self.facade.rebuild_place_ratings()
+        self.assertEqual(place.review_count, 1)
+        self.assertEqual(place.rating_histogram, [0, 0, 0, 0, 1])
+
+    def test_create_user_duplicate_email(self):
+        """Test création d'utilisateur avec un email déjà utilisé"""
+        user_data = {'first_name': 'User1', 'last_name': 'Test1', 'email': 'user1@test.com', 'password': 'password123'}
+        self.facade.create_user(user_data)
+
+        with self.assertRaises(ValueError) as context:
+            self.facade.create_user(dict(user_data, first_name='Other'))
+
+        self.assertEqual(str(context.exception), "Email already registered")
+        self.assertEqual(len(self.facade.get_all_users()), 1)
+
     def test_update_user_duplicate_email(self):
         """Test mise à jour avec email déjà utilisé"""
         # Créer deux utilisateurs
@@ -268,10 +530,17 @@ class TestHBnBFacade(unittest.TestCase):
             'owner_id': user.id
         })
 
-        # Créer plusieurs reviews
+        other_user = self.facade.create_user({
+            'first_name': 'Other',
+            'last_name': 'User',
+            'email': 'other@example.com',
+            'password': 'password123'
+        })
+
+        # Créer plusieurs reviews (une par utilisateur)
         reviews_data = [
             {'text': 'Review 1', 'rating': 4, 'user_id': user.id, 'place_id': place.id},
-            {'text': 'Review 2', 'rating': 5, 'user_id': user.id, 'place_id': place.id}
+            {'text': 'Review 2', 'rating': 5, 'user_id': other_user.id, 'place_id': place.id}
         ]
         
         for review_data in reviews_data:
@@ -301,10 +570,17 @@ class TestHBnBFacade(unittest.TestCase):
             'owner_id': user.id
         })
 
-        # Créer des reviews pour le lieu
+        other_user = self.facade.create_user({
+            'first_name': 'Other',
+            'last_name': 'User',
+            'email': 'other@example.com',
+            'password': 'password123'
+        })
+
+        # Créer des reviews pour le lieu (une par utilisateur)
         reviews_data = [
             {'text': 'Review 1', 'rating': 4, 'user_id': user.id, 'place_id': place.id},
-            {'text': 'Review 2', 'rating': 5, 'user_id': user.id, 'place_id': place.id}
+            {'text': 'Review 2', 'rating': 5, 'user_id': other_user.id, 'place_id': place.id}
         ]
         
         for review_data in reviews_data:
@@ -315,6 +591,75 @@ class TestHBnBFacade(unittest.TestCase):
         self.assertEqual(len(place_reviews), 2)
         self.assertTrue(all(review.place.id == place.id for review in place_reviews))
 
+    def test_create_review_twice_for_same_place(self):
+        """Test qu'un utilisateur ne peut laisser qu'une review par lieu"""
+        owner = self.facade.create_user({
+            'first_name': 'Owner',
+            'last_name': 'User',
+            'email': 'owner@example.com',
+            'password': 'password123'
+        })
+        reviewer = self.facade.create_user({
+            'first_name': 'Reviewer',
+            'last_name': 'User',
+            'email': 'reviewer@example.com',
+            'password': 'password123'
+        })
+        place = self.facade.create_place({
+            'title': 'Test Place',
+            'description': 'Description',
+            'price': 100.0,
+            'latitude': 48.8566,
+            'longitude': 2.3522,
+            'owner_id': owner.id
+        })
+        review_data = {'text': 'Great', 'rating': 5, 'user_id': reviewer.id, 'place_id': place.id}
+
+        self.assertFalse(self.facade.has_user_reviewed_place(place.id, reviewer.id))
+        self.facade.create_review(review_data)
+        self.assertTrue(self.facade.has_user_reviewed_place(place.id, reviewer.id))
+        self.assertFalse(self.facade.has_user_reviewed_place(place.id, owner.id))
+
+        with self.assertRaises(ValueError) as context:
+            self.facade.create_review(review_data)
+        self.assertEqual(str(context.exception), "You have already reviewed this place")
+        self.assertEqual(len(self.facade.get_reviews_by_place(place.id)), 1)
+
+    def test_get_reviews_by_user(self):
+        """Test récupération des reviews d'un utilisateur via l'index"""
+        owner = self.facade.create_user({
+            'first_name': 'Owner',
+            'last_name': 'User',
+            'email': 'owner@example.com',
+            'password': 'password123'
+        })
+        reviewer = self.facade.create_user({
+            'first_name': 'Reviewer',
+            'last_name': 'User',
+            'email': 'reviewer@example.com',
+            'password': 'password123'
+        })
+        place = self.facade.create_place({
+            'title': 'Test Place',
+            'description': 'Description',
+            'price': 100.0,
+            'latitude': 48.8566,
+            'longitude': 2.3522,
+            'owner_id': owner.id
+        })
+        review = self.facade.create_review({
+            'text': 'Great', 'rating': 5, 'user_id': reviewer.id, 'place_id': place.id
+        })
+
+        self.assertEqual(self.facade.get_reviews_by_user(reviewer.id), [review])
+        self.assertEqual(self.facade.get_reviews_by_user(owner.id), [])
+        index_names = [index['name'] for index in self.facade.review_repo.list_indexes()]
+        self.assertIn('place.id', index_names)
+        self.assertIn('user.id', index_names)
+
+        with self.assertRaises(ValueError):
+            self.facade.get_reviews_by_user('nonexistent-id')
+
     def test_update_review(self):
         """Test mise à jour d'une review"""
         # Créer les données nécessaires
@@ -384,6 +729,29 @@ class TestHBnBFacade(unittest.TestCase):
         # Vérifier que la review n'existe plus
         deleted_review = self.facade.get_review(created_review.id)
         self.assertIsNone(deleted_review)
+        self.assertEqual(place.reviews, [])
+
+    def test_rolled_back_delete_keeps_place_review(self):
+        """Test qu'une suppression de review annulée la laisse dans place.reviews"""
+        user = self.facade.create_user({
+            'first_name': 'Test', 'last_name': 'User',
+            'email': 'test@example.com', 'password': 'password123'
+        })
+        place = self.facade.create_place({
+            'title': 'Test Place', 'price': 100.0, 'latitude': 48.8566,
+            'longitude': 2.3522, 'owner_id': user.id
+        })
+        review = self.facade.create_review({'text': 'Kept', 'rating': 4,
+                                            'user_id': user.id, 'place_id': place.id})
+
+        with self.assertRaises(ValueError):
+            with self.facade.transaction():
+                self.facade.delete_review(review.id)
+                self.facade.create_amenity({'name': ''})
+
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(self.facade.get_review(review.id), review)
+        self.assertEqual(place.review_count, 1)
 
     def test_update_review_invalid_rating(self):
         """Test mise à jour d'une review avec une note invalide"""
@@ -419,5 +787,220 @@ class TestHBnBFacade(unittest.TestCase):
             self.facade.update_review(created_review.id, update_data)
 
 
+class TestSQLAlchemyFacade(unittest.TestCase):
+    """Tests de la facade servie par les modèles SQLAlchemy (SQLite en mémoire)"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.app = create_app(config_class="config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.facade = HBnBFacade()
+        self.owner = self.facade.create_user({
+            'first_name': 'Owner', 'last_name': 'User',
+            'email': 'owner@example.com', 'password': 'password123'
+        })
+        self.reviewer = self.facade.create_user({
+            'first_name': 'Reviewer', 'last_name': 'User',
+            'email': 'reviewer@example.com', 'password': 'password123'
+        })
+        self.wifi = self.facade.create_amenity({'name': 'Wi-Fi'})
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+
+    def _create_place(self, title, price, amenities=()):
+        """Crée un lieu appartenant au propriétaire de test"""
+        return self.facade.create_place({
+            'title': title, 'price': price, 'latitude': 45.0, 'longitude': 5.0,
+            'owner_id': self.owner.id, 'amenities': list(amenities)
+        })
+
+    def test_schema_indexes_and_foreign_keys(self):
+        """Test que les clés étrangères et les index sont définis sur les tables"""
+        tables = db.metadata.tables
+        self.assertEqual({fk.target_fullname for fk in tables['places'].foreign_keys}, {'users.id'})
+        self.assertEqual({fk.target_fullname for fk in tables['reviews'].foreign_keys},
+                         {'places.id', 'users.id'})
+        self.assertEqual({fk.target_fullname for fk in tables['place_amenity'].foreign_keys},
+                         {'places.id', 'amenities.id'})
+        indexed = {(index.table.name, tuple(column.name for column in index.columns))
+                   for table in tables.values() for index in table.indexes}
+        for expected in [('users', ('email',)), ('reviews', ('place_id',)), ('reviews', ('user_id',)),
+                         ('places', ('owner_id',)), ('places', ('price',)), ('places', ('review_count',))]:
+            self.assertIn(expected, indexed)
+
+    def test_place_relations_are_persisted(self):
+        """Test que le propriétaire, les amenities et les reviews sont relus depuis la base"""
+        place = self._create_place('Loft', 120.0, [self.wifi.id])
+        self.facade.create_review({'text': 'Great', 'rating': 4,
+                                   'place_id': place.id, 'user_id': self.reviewer.id})
+        place_id, reviewer_id = place.id, self.reviewer.id
+        db.session.expunge_all()
+
+        place = self.facade.get_place(place_id)
+        self.assertEqual(place.owner.email, 'owner@example.com')
+        self.assertEqual([amenity.name for amenity in place.amenities], ['Wi-Fi'])
+        self.assertEqual([review.text for review in place.reviews], ['Great'])
+        self.assertEqual((place.review_count, place.average_rating), (1, 4.0))
+        self.assertEqual(self.facade.get_user_by_email('reviewer@example.com').id, reviewer_id)
+        self.assertTrue(self.facade.has_user_reviewed_place(place_id, reviewer_id))
+
+    def test_indexed_queries(self):
+        """Test des recherches par prix et amenities et de la pagination en SQL"""
+        cheap = self._create_place('Cheap', 50.0)
+        equipped = self._create_place('Equipped', 90.0, [self.wifi.id])
+        self._create_place('Expensive', 300.0, [self.wifi.id])
+
+        places, _ = self.facade.search_places({'max_price': 100.0})
+        self.assertEqual([place.id for place in places], [cheap.id, equipped.id])
+        places, _ = self.facade.search_places({'amenities': [self.wifi.id], 'max_price': 100.0})
+        self.assertEqual([place.id for place in places], [equipped.id])
+
+        first, cursor = self.facade.get_places_page(limit=2)
+        second, cursor_end = self.facade.get_places_page(cursor, limit=2)
+        self.assertEqual(len(first) + len(second), 3)
+        self.assertIsNone(cursor_end)
+
+    def test_search_pages_are_limited_in_sql(self):
+        """Test que les pages de recherche par prix sont triées et limitées par la base"""
+        from sqlalchemy import event
+        places = [self._create_place(f'Place {index}', price, [self.wifi.id] if index % 2 else [])
+                  for index, price in enumerate([90.0, 50.0, 90.0, 300.0, 70.0, 120.0])]
+        expected = sorted(places, key=lambda place: (place.price, place.id))
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            first, cursor = self.facade.search_places({'max_price': 200.0}, limit=2)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(first, expected[:2])
+        self.assertTrue(any('ORDER BY places.price, places.id' in statement and 'LIMIT' in statement
+                            for statement in statements))
+
+        pages = first
+        while cursor:
+            page, cursor = self.facade.search_places({'max_price': 200.0}, cursor, limit=2)
+            pages += page
+        self.assertEqual(pages, expected[:5])
+        wifi_places, cursor = self.facade.search_places({'amenities': [self.wifi.id]}, limit=5)
+        self.assertEqual(wifi_places, [place for place in expected if place.amenities])
+        self.assertIsNone(cursor)
+
+    def test_sorted_places_pages_are_limited_in_sql(self):
+        """Test que les pages triées par note sont lues par ORDER BY ... LIMIT"""
+        from sqlalchemy import event
+        places = [self._create_place(f'Place {index}', 100.0) for index in range(4)]
+        for place, rating in zip(places, (3, 5, None, 3)):
+            if rating:
+                self.facade.create_review({'text': 'Nice', 'rating': rating,
+                                           'place_id': place.id, 'user_id': self.reviewer.id})
+        expected = [places[1]] + sorted([places[0], places[3]], key=lambda place: place.id) + [places[2]]
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            pages, cursor = self.facade.get_places_page(limit=1, sort='rating')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertTrue(any('ORDER BY places.average_rating DESC, places.id' in statement
+                            and 'LIMIT' in statement for statement in statements))
+        while cursor:
+            page, cursor = self.facade.get_places_page(cursor, limit=1, sort='rating')
+            pages += page
+        self.assertEqual(pages, expected)
+        self.assertEqual(self.facade.get_places_page(sort='rating'), (expected, None))
+
+    def test_rating_update_rereads_the_place_row(self):
+        """Test que la mise à jour des agrégats part de la ligne en base, et
+        non d'une copie en session périmée (écriture d'un autre processus)"""
+        from sqlalchemy import text
+        place = self._create_place('Loft', 120.0)
+        self.facade.create_review({'text': 'Great', 'rating': 5,
+                                   'place_id': place.id, 'user_id': self.reviewer.id})
+        guest = self.facade.create_user({
+            'first_name': 'Guest', 'last_name': 'User',
+            'email': 'guest@example.com', 'password': 'password123'
+        })
+        # Copie chargée en session, puis modifiée en base sans passer par l'ORM
+        self.assertEqual(place.rating_histogram, [0, 0, 0, 0, 1])
+        db.session.execute(text("UPDATE places SET review_count = 3, "
+                                "rating_histogram = '[0, 0, 0, 0, 3]' WHERE id = :id"), {'id': place.id})
+
+        self.facade.create_review({'text': 'Bad', 'rating': 1, 'place_id': place.id, 'user_id': guest.id})
+        place = self.facade.get_place(place.id)
+        self.assertEqual(place.rating_histogram, [1, 0, 0, 0, 3])
+        self.assertEqual((place.review_count, place.average_rating), (4, 4.0))
+
+    def test_update_place_amenities(self):
+        """Test du remplacement des amenities d'un lieu"""
+        pool_id = self.facade.create_amenity({'name': 'Pool'}).id
+        place = self._create_place('Loft', 120.0, [self.wifi.id])
+        place_id, updated_at = place.id, place.updated_at
+
+        self.facade.update_place(place_id, {'amenities': [pool_id]})
+        db.session.expunge_all()
+        place = self.facade.get_place(place_id)
+        self.assertEqual([amenity.id for amenity in place.amenities], [pool_id])
+        self.assertGreater(place.updated_at, updated_at)
+
+    def test_nested_transaction_failure_keeps_outer_work(self):
+        """Test qu'une review refusée par la base dans une transaction englobante
+        n'annule que son point de sauvegarde"""
+        place = self._create_place('Loft', 120.0)
+        review_data = {'text': 'Great', 'rating': 5, 'place_id': place.id, 'user_id': self.reviewer.id}
+        self.facade.create_review(review_data)
+
+        with self.facade.transaction():
+            guest = self.facade.create_user({
+                'first_name': 'Guest', 'last_name': 'User',
+                'email': 'guest@example.com', 'password': 'password123'
+            })
+            # Vérification préalable contournée : la contrainte unique refuse l'INSERT
+            with mock.patch.object(self.facade, 'has_user_reviewed_place', return_value=False):
+                with self.assertRaises(ValueError):
+                    self.facade.create_review({**review_data, 'rating': 1})
+            self.facade.create_amenity({'name': 'Pool'})
+        guest_id, place_id = guest.id, place.id
+        db.session.expunge_all()
+
+        self.assertIsNotNone(self.facade.get_user(guest_id))
+        self.assertEqual(len(self.facade.get_all_amenities()), 2)
+        place = self.facade.get_place(place_id)
+        self.assertEqual((place.review_count, place.average_rating), (1, 5.0))
+        self.assertEqual(len(self.facade.get_reviews_by_place(place_id)), 1)
+
+    def test_deleted_review_leaves_place_reviews(self):
+        """Test que la review supprimée n'est plus listée par place.reviews"""
+        place = self._create_place('Loft', 120.0)
+        review = self.facade.create_review({'text': 'Great', 'rating': 5,
+                                            'place_id': place.id, 'user_id': self.reviewer.id})
+        self.assertEqual(place.reviews, [review])
+
+        self.facade.delete_review(review.id)
+        self.assertEqual(self.facade.get_place(place.id).reviews, [])
+        self.assertEqual(place.review_count, 0)
+
+    def test_duplicate_review_is_rejected(self):
+        """Test que la contrainte unique (lieu, utilisateur) des reviews est respectée"""
+        place = self._create_place('Loft', 120.0)
+        review_data = {'text': 'Great', 'rating': 5, 'place_id': place.id, 'user_id': self.reviewer.id}
+        self.facade.create_review(review_data)
+
+        with self.assertRaises(ValueError):
+            self.facade.create_review(review_data)
+        self.assertEqual(len(self.facade.get_reviews_by_place(place.id)), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
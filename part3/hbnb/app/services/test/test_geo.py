@@ -0,0 +1,67 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from app.services.geo import haversine_km, radius_ranges, bbox_ranges, bbox_center, intersect_ranges
+from app.persistence.pagination import encode_cursor, encode_value_cursor, decode_value_cursor, decode_sort_cursor
+
+
+class TestGeo(unittest.TestCase):
+    """Tests pour les calculs géographiques"""
+
+    def test_haversine(self):
+        """Test la distance entre Paris et Lyon (environ 392 km)"""
+        distance = haversine_km(48.8566, 2.3522, 45.7640, 4.8357)
+        self.assertAlmostEqual(distance, 392, delta=2)
+        self.assertEqual(haversine_km(10, 20, 10, 20), 0)
+
+    def test_radius_ranges_contain_circle(self):
+        """Test que la boîte englobante contient les points du cercle"""
+        ranges = radius_ranges(48.8566, 2.3522, 100)
+        self.assertEqual(len(ranges), 1)
+        min_lat, max_lat = ranges[0]['latitude']
+        min_lon, max_lon = ranges[0]['longitude']
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522, max_lat, 2.3522), 100, delta=0.01)
+        self.assertLessEqual(haversine_km(48.8566, 2.3522, 48.8566, max_lon), 100.01)
+        self.assertLess(min_lat, 48.8566)
+        self.assertLess(min_lon, 2.3522)
+
+    def test_radius_ranges_antimeridian_and_pole(self):
+        """Test le découpage à l'antiméridien et la couverture d'un pôle"""
+        ranges = radius_ranges(0, 179.9, 50)
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(ranges[0]['longitude'][1], 180.0)
+        self.assertEqual(ranges[1]['longitude'][0], -180.0)
+
+        ranges = radius_ranges(89.9, 0, 50)
+        self.assertEqual(ranges, [{'latitude': (ranges[0]['latitude'][0], 90.0), 'longitude': (-180.0, 180.0)}])
+
+    def test_bbox(self):
+        """Test les boîtes englobantes et leur centre"""
+        self.assertEqual(len(bbox_ranges(170, -20, -170, -10)), 2)
+        self.assertEqual(bbox_center(170, -20, -170, -10), (-15.0, -180.0))
+        with self.assertRaises(ValueError):
+            bbox_ranges(0, 10, 1, 5)
+
+    def test_intersect_ranges(self):
+        """Test l'intersection de boîtes englobantes"""
+        boxes = bbox_ranges(170, -20, -170, -10)
+        self.assertEqual(intersect_ranges(boxes, [{'latitude': (-15, 0), 'longitude': (175, 180)}]),
+                         [{'latitude': (-15, -10), 'longitude': (175, 180.0)}])
+        self.assertEqual(intersect_ranges(boxes, bbox_ranges(0, -20, 10, -10)), [])
+
+    def test_distance_cursor(self):
+        """Test l'encodage et le décodage d'un curseur (distance, id)"""
+        cursor = encode_value_cursor(1.2345, "abc")
+        self.assertEqual(decode_value_cursor(cursor), (1.2345, "abc"))
+        with self.assertRaises(ValueError):
+            decode_value_cursor(encode_cursor("far", "abc"))
+        with self.assertRaises(ValueError):
+            decode_value_cursor(encode_cursor(None, "abc"))
+        self.assertEqual(decode_sort_cursor(encode_cursor(None, "abc")), (None, "abc"))
+
+
+if __name__ == '__main__':
+    unittest.main()
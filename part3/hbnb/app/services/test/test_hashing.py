@@ -0,0 +1,84 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from app.services.hashing import PasswordHasher, PasswordHasherBusy
+from config import DevelopmentConfig, ProductionConfig
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Tests pour PasswordHasher"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.hasher = PasswordHasher(rounds=4)
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        self.hasher.shutdown()
+
+    def test_hash_and_verify(self):
+        """Test le hachage puis la vérification d'un mot de passe"""
+        password_hash = self.hasher.hash('secret')
+        self.assertTrue(password_hash.startswith('$2b$04$'))
+        self.assertTrue(self.hasher.verify(password_hash, 'secret'))
+        self.assertFalse(self.hasher.verify(password_hash, 'wrong'))
+
+    def test_verify_empty_values(self):
+        """Test la vérification sans empreinte ou sans mot de passe"""
+        self.assertFalse(self.hasher.verify(None, 'secret'))
+        self.assertFalse(self.hasher.verify(self.hasher.hash('secret'), ''))
+
+    def test_invalid_rounds(self):
+        """Test le refus d'un facteur de coût invalide"""
+        with self.assertRaises(ValueError):
+            PasswordHasher(rounds=3)
+
+    def test_metrics(self):
+        """Test les métriques de latence et de file d'attente"""
+        password_hash = self.hasher.hash('secret')
+        self.hasher.verify(password_hash, 'secret')
+        stats = self.hasher.stats()
+        self.assertEqual(stats['hash']['count'], 1)
+        self.assertEqual(stats['verify']['count'], 1)
+        self.assertGreater(stats['hash']['max_time'], 0)
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(stats['max_pending_seen'], 1)
+
+    def test_listeners_receive_durations(self):
+        """Test que les écouteurs reçoivent chaque opération et sa durée"""
+        calls = []
+        listener = lambda operation, duration: calls.append((operation, duration))
+        self.hasher.add_listener(listener)
+        self.hasher.add_listener(listener)
+        self.hasher.verify(self.hasher.hash('secret'), 'secret')
+        self.assertEqual([operation for operation, _ in calls], ['hash', 'verify'])
+        self.assertTrue(all(duration > 0 for _, duration in calls))
+
+    def test_full_queue_is_rejected(self):
+        """Test le rejet lorsque la file d'attente est pleine"""
+        self.hasher.configure(4, max_pending=1, queue_timeout=0)
+        self.hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            self.hasher.hash('secret')
+        self.assertEqual(self.hasher.stats()['rejected'], 1)
+
+    def test_process_pool(self):
+        """Test le hachage dans un pool de processus"""
+        self.hasher.configure(4, workers=1)
+        password_hash = self.hasher.hash('secret')
+        self.assertTrue(self.hasher.verify(password_hash, 'secret'))
+        self.assertEqual(self.hasher.stats()['workers'], 1)
+
+    def test_pool_disabled_by_default(self):
+        """Test que le pool de processus n'est démarré que sur demande de l'environnement"""
+        if 'PASSWORD_HASH_WORKERS' in os.environ:
+            self.skipTest("PASSWORD_HASH_WORKERS is set")
+        self.assertEqual(DevelopmentConfig.PASSWORD_HASH_WORKERS, 0)
+        self.assertEqual(ProductionConfig.PASSWORD_HASH_WORKERS, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
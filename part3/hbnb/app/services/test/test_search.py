@@ -0,0 +1,103 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from app import create_app
+from app.services.search import InMemorySearchIndex, FTS5SearchIndex, tokenize
+
+
+class SearchIndexTests:
+    """Tests communs aux moteurs de recherche plein texte"""
+
+    def fill(self):
+        """Indexe quelques documents"""
+        self.index.index('place', 'p1', {'title': 'Cozy apartment', 'body': 'Close to the beach'})
+        self.index.index('place', 'p2', {'title': 'Beach house', 'body': 'Right on the beach, with a pool'})
+        self.index.index('place', 'p3', {'title': 'Mountain chalet', 'body': 'Skiing and fondue'})
+        self.index.index('review', 'r1', {'body': 'Great apartment, very cozy'})
+
+    def ids(self, hits):
+        return [doc_id for _, doc_id, _ in hits]
+
+    def test_ranked_prefix_search(self):
+        """Test la recherche par préfixe classée par pertinence"""
+        self.fill()
+        hits, _ = self.index.search('beach')
+        self.assertEqual(self.ids(hits), ['p2', 'p1'])
+        hits, _ = self.index.search('apart')
+        self.assertEqual(set(self.ids(hits)), {'p1', 'r1'})
+
+    def test_all_words_required(self):
+        """Test qu'un document doit contenir tous les mots de la requête"""
+        self.fill()
+        hits, _ = self.index.search('cozy beach')
+        self.assertEqual(self.ids(hits), ['p1'])
+        hits, _ = self.index.search('cozy mountain')
+        self.assertEqual(hits, [])
+
+    def test_type_filter(self):
+        """Test le filtre par type de document"""
+        self.fill()
+        hits, _ = self.index.search('cozy', ['review'])
+        self.assertEqual(self.ids(hits), ['r1'])
+
+    def test_reindex_and_remove(self):
+        """Test la mise à jour et la suppression de documents"""
+        self.fill()
+        self.index.index('place', 'p3', {'title': 'Beach chalet', 'body': ''})
+        self.index.remove('place', 'p2')
+        hits, _ = self.index.search('beach')
+        self.assertEqual(set(self.ids(hits)), {'p1', 'p3'})
+        hits, _ = self.index.search('fondue')
+        self.assertEqual(hits, [])
+
+    def test_pagination(self):
+        """Test la pagination par curseur des résultats"""
+        self.fill()
+        first, cursor = self.index.search('beach', limit=1)
+        second, last_cursor = self.index.search('beach', cursor=cursor, limit=1)
+        self.assertEqual(self.ids(first + second), ['p2', 'p1'])
+        self.assertIsNone(last_cursor)
+
+    def test_invalid_query(self):
+        """Test une requête sans mot"""
+        with self.assertRaises(ValueError):
+            self.index.search('  !! ')
+
+
+class TestInMemorySearchIndex(SearchIndexTests, unittest.TestCase):
+    """Tests pour InMemorySearchIndex"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.index = InMemorySearchIndex()
+
+    def test_tokenize(self):
+        """Test la normalisation des mots (casse et accents)"""
+        self.assertEqual(tokenize("Gîte au Bord de l'Eau"), ['gite', 'au', 'bord', 'de', 'l', 'eau'])
+
+
+class TestFTS5SearchIndex(SearchIndexTests, unittest.TestCase):
+    """Tests pour FTS5SearchIndex (SQLite en mémoire)"""
+
+    def setUp(self):
+        """Configuration avant chaque test"""
+        self.app = create_app(config_class="config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.index = FTS5SearchIndex()
+        self.assertTrue(self.index.prepare())
+        self.assertFalse(self.index.prepare())
+
+    def tearDown(self):
+        """Nettoyage après chaque test"""
+        from app import db
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+
+
+if __name__ == '__main__':
+    unittest.main()
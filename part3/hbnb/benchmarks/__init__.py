@@ -0,0 +1,4 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de l'API et des repositories HBNB
+"""
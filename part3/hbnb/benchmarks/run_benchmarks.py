@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de l'API et des repositories HBnB
+
+Chaque backend (InMemoryRepository, SQLAlchemyRepository sur un fichier
+SQLite) est rempli avec un jeu de données de taille configurable, puis
+chaque scénario est mesuré hors ligne via le client de test Flask :
+débit, latences p50/p99/moyenne et erreurs. Les résultats sont écrits en
+JSON et peuvent être comparés à ceux d'un autre commit :
+
+    python3 benchmarks/run_benchmarks.py --output results.json
+    python3 benchmarks/run_benchmarks.py --compare results.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Ajout du chemin du projet à sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from config import TestingConfig  # noqa: E402
+from app import create_app, db, password_hasher  # noqa: E402
+from app.services import facade  # noqa: E402
+from app.persistence.repository import InMemoryRepository  # noqa: E402
+
+BACKENDS = ('memory', 'sqlite')
+# Taille du jeu de données par défaut
+DEFAULT_DATASET = {'users': 200, 'amenities': 20, 'places': 500, 'reviews': 2000}
+PASSWORD = 'benchmark-password'
+PAGE_SIZE = 50
+
+
+class BenchmarkConfig(TestingConfig):
+    """
+    Configuration des benchmarks : hachage rapide et sans pool de processus,
+    pour que les mesures portent sur l'application plutôt que sur bcrypt.
+    """
+    TESTING = False
+    SECRET_KEY = 'benchmark-secret-key-long-enough-for-hs256'
+    COMPRESSION_ENABLED = False
+
+
+def percentile(samples, fraction):
+    """
+    Percentile par rang le plus proche.
+
+    Args:
+        samples (list): Mesures triées.
+        fraction (float): Rang entre 0 et 1 (0.5 pour la médiane).
+
+    Returns:
+        float: Valeur du percentile, ou None sans mesure.
+    """
+    if not samples:
+        return None
+    rank = max(1, round(fraction * len(samples) + 0.5 - 1e-9))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(durations, errors, elapsed):
+    """
+    Résume les mesures d'un scénario.
+
+    Args:
+        durations (list): Durée de chaque opération, en secondes.
+        errors (int): Nombre d'opérations en erreur.
+        elapsed (float): Durée totale du scénario, en secondes.
+
+    Returns:
+        dict: Débit (opérations par seconde) et latences en millisecondes.
+    """
+    samples = sorted(durations)
+    to_ms = lambda value: None if value is None else round(value * 1000, 4)  # noqa: E731
+    return {
+        'operations': len(samples),
+        'errors': errors,
+        'throughput_ops': round(len(samples) / elapsed, 2) if elapsed else None,
+        'p50_ms': to_ms(percentile(samples, 0.50)),
+        'p99_ms': to_ms(percentile(samples, 0.99)),
+        'mean_ms': to_ms(sum(samples) / len(samples)) if samples else None,
+        'max_ms': to_ms(samples[-1]) if samples else None
+    }
+
+
+def measure(operation, iterations, warmup=0):
+    """
+    Mesure une opération répétée.
+
+    Args:
+        operation (callable): Fonction prenant le numéro d'itération et
+            renvoyant True en cas de succès.
+        iterations (int): Nombre d'opérations mesurées.
+        warmup (int): Nombre d'opérations préalables non mesurées.
+
+    Returns:
+        dict: Résumé produit par summarize.
+    """
+    for index in range(warmup):
+        operation(index)
+    durations, errors = [], 0
+    started = time.perf_counter()
+    for index in range(warmup, warmup + iterations):
+        start = time.perf_counter()
+        ok = operation(index)
+        durations.append(time.perf_counter() - start)
+        if not ok:
+            errors += 1
+    return summarize(durations, errors, time.perf_counter() - started)
+
+
+def seed(dataset):
+    """
+    Remplit les repositories de l'application courante via les imports en masse.
+
+    Chaque lieu appartient à un utilisateur et reçoit des reviews
+    d'autres utilisateurs (au plus une par utilisateur et par lieu).
+
+    Args:
+        dataset (dict): Nombre de 'users', 'amenities', 'places' et 'reviews'.
+
+    Returns:
+        dict: Identifiants créés ('users' en (id, email), 'amenities',
+        'places', 'owners' des lieux) et paires (lieu, utilisateur) ayant
+        une review.
+    """
+    if dataset['users'] < 2:
+        raise ValueError("At least 2 users are required")
+    # Une seule empreinte pour tous les comptes : le remplissage ne hache qu'une fois
+    password_hash = password_hasher.hash(PASSWORD)
+    users = facade.bulk_create_users([
+        {'first_name': 'User', 'last_name': str(index),
+         'email': f'user{index}@bench.example', 'password_hash': password_hash}
+        for index in range(dataset['users'])
+    ])['created']
+    user_ids = [(user.id, user.email) for _, user in users]
+    amenity_ids = [amenity.id for _, amenity in facade.bulk_create_amenities([
+        {'name': f'Amenity {index}'} for index in range(dataset['amenities'])
+    ])['created']]
+
+    places = []
+    for index in range(dataset['places']):
+        places.append({
+            'title': f'Place {index}', 'description': f'Benchmark place number {index}',
+            'price': 20.0 + index % 300, 'latitude': -60.0 + index % 120, 'longitude': -150.0 + index % 300,
+            'owner_id': user_ids[index % len(user_ids)][0],
+            'amenities': [amenity_ids[(index + offset) % len(amenity_ids)]
+                          for offset in range(min(3, len(amenity_ids)))]
+        })
+    place_ids = [place.id for _, place in facade.bulk_create_places(places)['created']]
+    owners = {place_id: places[index]['owner_id'] for index, place_id in enumerate(place_ids)}
+
+    # Les reviews d'un lieu viennent des utilisateurs suivant son propriétaire
+    reviews, reviewed = [], set()
+    per_place = min(len(user_ids) - 1, -(-dataset['reviews'] // max(len(place_ids), 1)))
+    for offset in range(1, per_place + 1):
+        for index, place_id in enumerate(place_ids):
+            if len(reviews) >= dataset['reviews']:
+                break
+            user_id = user_ids[(index + offset) % len(user_ids)][0]
+            reviews.append({'text': f'Review {len(reviews)}', 'rating': 1 + len(reviews) % 5,
+                            'place_id': place_id, 'user_id': user_id})
+            reviewed.add((place_id, user_id))
+    facade.bulk_create_reviews(reviews)
+    return {'users': user_ids, 'amenities': amenity_ids, 'places': place_ids,
+            'owners': owners, 'reviewed': reviewed}
+
+
+def review_candidates(data):
+    """
+    Paires (lieu, utilisateur) pouvant encore recevoir une review.
+
+    Yields:
+        tuple: Identifiants du lieu et de l'utilisateur.
+    """
+    for user_id, _ in reversed(data['users']):
+        for place_id in data['places']:
+            if data['owners'][place_id] != user_id and (place_id, user_id) not in data['reviewed']:
+                yield place_id, user_id
+
+
+def api_scenarios(client, data):
+    """
+    Scénarios HTTP mesurés.
+
+    Args:
+        client (FlaskClient): Client de test de l'application.
+        data (dict): Identifiants renvoyés par seed.
+
+    Returns:
+        list: (nom, opération) ; chaque opération prend le numéro d'itération.
+    """
+    users, places = data['users'], data['places']
+    candidates = review_candidates(data)
+    tokens = {}
+
+    def token(user_id):
+        """Jeton JWT d'un utilisateur (créé sans passer par bcrypt)."""
+        if user_id not in tokens:
+            tokens[user_id] = create_access_token(identity=user_id, additional_claims={'is_admin': False})
+        return tokens[user_id]
+
+    def login(index):
+        email = users[index % len(users)][1]
+        return client.post('/api/v1/auth/login', json={'email': email, 'password': PASSWORD}).status_code == 200
+
+    def get(url):
+        return lambda index: client.get(url(index)).status_code == 200
+
+    def create_review(index):
+        place_id, user_id = next(candidates)
+        response = client.post('/api/v1/reviews/', json={'text': 'Benchmark review', 'rating': 4,
+                                                          'place_id': place_id},
+                               headers={'Authorization': f'Bearer {token(user_id)}'})
+        return response.status_code == 201
+
+    return [
+        ('api.login', login),
+        ('api.place_detail', get(lambda index: f'/api/v1/places/{places[index % len(places)]}')),
+        ('api.reviews_by_place',
+         get(lambda index: f'/api/v1/reviews/places/{places[index % len(places)]}/reviews')),
+        ('api.list_places', get(lambda index: f'/api/v1/places/?limit={PAGE_SIZE}')),
+        ('api.list_places_with_relations',
+         get(lambda index: f'/api/v1/places/?limit={PAGE_SIZE}&include=owner,amenities,reviews')),
+        ('api.list_reviews', get(lambda index: f'/api/v1/reviews/?limit={PAGE_SIZE}')),
+        ('api.list_users', get(lambda index: f'/api/v1/users/?limit={PAGE_SIZE}')),
+        ('api.list_amenities', get(lambda index: f'/api/v1/amenities/?limit={PAGE_SIZE}')),
+        ('api.create_review', create_review)
+    ]
+
+
+def repository_scenarios(data):
+    """
+    Micro-benchmarks des repositories, via les dépôts de la façade.
+
+    Args:
+        data (dict): Identifiants renvoyés par seed.
+
+    Returns:
+        list: (nom, opération) ; chaque opération prend le numéro d'itération.
+    """
+    users, places = data['users'], data['places']
+
+    def run(call):
+        def operation(index):
+            call(index)
+            return True
+        return operation
+
+    return [
+        ('repo.place_get', run(lambda index: facade.place_repo.get(places[index % len(places)]))),
+        ('repo.user_by_email',
+         run(lambda index: facade.user_repo.get_by_attribute('email', users[index % len(users)][1]))),
+        ('repo.reviews_by_place',
+         run(lambda index: facade.review_repo.get_all_by_attribute('place.id', places[index % len(places)]))),
+        ('repo.place_page', run(lambda index: facade.place_repo.get_page(limit=PAGE_SIZE))),
+        ('repo.places_by_price',
+         run(lambda index: facade.place_repo.get_all_by_ranges({'price': (100.0, 110.0)})))
+    ]
+
+
+def run_backend(backend, dataset, iterations, warmup, workdir):
+    """
+    Mesure tous les scénarios sur un backend.
+
+    Args:
+        backend (str): 'memory' ou 'sqlite'.
+        dataset (dict): Taille du jeu de données.
+        iterations (int): Opérations mesurées par scénario.
+        warmup (int): Opérations de chauffe par scénario.
+        workdir (str): Répertoire du fichier SQLite.
+
+    Returns:
+        dict: Résumé de chaque scénario, par nom, et durée du remplissage.
+    """
+    if backend == 'memory':
+        repositories = {name: InMemoryRepository()
+                        for name in ('user_repo', 'place_repo', 'review_repo', 'amenity_repo')}
+        app = create_app(repositories, BenchmarkConfig)
+    elif backend == 'sqlite':
+        path = os.path.join(workdir, 'benchmark.db')
+        if os.path.exists(path):
+            os.remove(path)
+        config_class = type('SQLiteBenchmarkConfig', (BenchmarkConfig,),
+                            {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+        app = create_app(config_class=config_class)
+    else:
+        raise ValueError(f"Unknown backend '{backend}'")
+
+    results = {}
+    with app.app_context():
+        started = time.perf_counter()
+        data = seed(dataset)
+        results['seed'] = {'duration_s': round(time.perf_counter() - started, 3)}
+        client = app.test_client()
+        for name, operation in repository_scenarios(data) + api_scenarios(client, data):
+            results[name] = measure(operation, iterations, warmup)
+            # Les objets lus ne s'accumulent pas d'un scénario à l'autre
+            db.session.remove()
+        db.session.remove()
+        db.engine.dispose()
+    return results
+
+
+def compare(current, baseline, max_regression):
+    """
+    Compare deux fichiers de résultats.
+
+    Args:
+        current (dict): Résultats du commit courant.
+        baseline (dict): Résultats de référence.
+        max_regression (float): Hausse relative de la p50 tolérée (0.2 = 20 %).
+
+    Returns:
+        tuple: Lignes de comparaison (dict) et noms des scénarios en régression.
+    """
+    rows, regressions = [], []
+    for backend, scenarios in current['results'].items():
+        for name, summary in scenarios.items():
+            reference = baseline.get('results', {}).get(backend, {}).get(name)
+            if not reference or 'p50_ms' not in summary or not reference.get('p50_ms'):
+                continue
+            change = (summary['p50_ms'] - reference['p50_ms']) / reference['p50_ms']
+            row = {'scenario': f'{backend}/{name}', 'baseline_p50_ms': reference['p50_ms'],
+                   'p50_ms': summary['p50_ms'], 'change': round(change, 4)}
+            rows.append(row)
+            if change > max_regression:
+                regressions.append(row['scenario'])
+    return rows, regressions
+
+
+def git_commit():
+    """Commit courant, ou None hors d'un dépôt git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    """Lit les options de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Benchmarks de l'API et des repositories HBnB")
+    parser.add_argument('--backend', choices=BACKENDS + ('all',), default='all')
+    for name, default in DEFAULT_DATASET.items():
+        parser.add_argument(f'--{name}', type=int, default=default, help=f'Nombre de {name} créés')
+    parser.add_argument('--iterations', type=int, default=200, help='Opérations mesurées par scénario')
+    parser.add_argument('--warmup', type=int, default=20, help='Opérations de chauffe par scénario')
+    parser.add_argument('--output', help='Fichier JSON des résultats')
+    parser.add_argument('--compare', help='Fichier JSON de référence à comparer')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Hausse relative de la p50 tolérée lors de la comparaison')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Lance les benchmarks, écrit et compare les résultats.
+
+    Returns:
+        int: 0, ou 1 si un scénario régresse au-delà du seuil.
+    """
+    args = parse_args(argv)
+    dataset = {name: getattr(args, name) for name in DEFAULT_DATASET}
+    backends = BACKENDS if args.backend == 'all' else (args.backend,)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dataset': dataset,
+            'iterations': args.iterations,
+            'warmup': args.warmup
+        },
+        'results': {}
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in backends:
+            print(f"⏱  Backend {backend}...")
+            report['results'][backend] = run_backend(backend, dataset, args.iterations, args.warmup, workdir)
+            for name, summary in report['results'][backend].items():
+                if 'p50_ms' in summary:
+                    print(f"   {name:<32} {summary['throughput_ops']:>10} ops/s  "
+                          f"p50 {summary['p50_ms']:>9} ms  p99 {summary['p99_ms']:>9} ms  "
+                          f"erreurs {summary['errors']}")
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"📄 Résultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows, regressions = compare(report, baseline, args.max_regression)
+        for row in rows:
+            print(f"   {row['scenario']:<40} {row['baseline_p50_ms']:>9} -> {row['p50_ms']:>9} ms "
+                  f"({row['change']:+.1%})")
+        if regressions:
+            print(f"❌ Régressions au-delà de {args.max_regression:.0%}: {', '.join(regressions)}")
+            return 1
+        print("✅ Aucune régression")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
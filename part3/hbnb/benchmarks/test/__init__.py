@@ -0,0 +1,4 @@
+#!/usr/bin/env python3
+"""
+Module de tests pour les benchmarks HBNB
+"""
@@ -0,0 +1,66 @@
+import sys
+import os
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from benchmarks.run_benchmarks import percentile, summarize, compare, main
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests de la suite de benchmarks"""
+
+    def test_percentile(self):
+        """Test du percentile par rang le plus proche"""
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.5), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summarize(self):
+        """Test du résumé d'un scénario"""
+        summary = summarize([0.002, 0.001, 0.003, 0.004], 1, 0.5)
+        self.assertEqual(summary['operations'], 4)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['throughput_ops'], 8.0)
+        self.assertEqual(summary['p50_ms'], 2.0)
+        self.assertEqual(summary['p99_ms'], 4.0)
+        self.assertEqual(summary['mean_ms'], 2.5)
+
+    def test_compare_detects_regressions(self):
+        """Test de la comparaison avec des résultats de référence"""
+        baseline = {'results': {'memory': {'api.login': {'p50_ms': 1.0}, 'api.list_places': {'p50_ms': 2.0}}}}
+        current = {'results': {'memory': {'api.login': {'p50_ms': 1.5}, 'api.list_places': {'p50_ms': 2.1},
+                                          'api.create_review': {'p50_ms': 1.0}, 'seed': {'duration_s': 1}}}}
+        rows, regressions = compare(current, baseline, 0.2)
+        self.assertEqual([row['scenario'] for row in rows], ['memory/api.login', 'memory/api.list_places'])
+        self.assertEqual(rows[0]['change'], 0.5)
+        self.assertEqual(regressions, ['memory/api.login'])
+
+    def test_run_writes_comparable_results(self):
+        """Test d'une exécution réduite sur les deux backends"""
+        with tempfile.TemporaryDirectory() as workdir:
+            output = os.path.join(workdir, 'results.json')
+            args = ['--users', '4', '--amenities', '2', '--places', '4', '--reviews', '6',
+                    '--iterations', '3', '--warmup', '1', '--output', output]
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(args), 0)
+                self.assertEqual(main(args + ['--compare', output, '--max-regression', '1000']), 0)
+            with open(output) as results_file:
+                report = json.load(results_file)
+
+        self.assertEqual(report['meta']['dataset'], {'users': 4, 'amenities': 2, 'places': 4, 'reviews': 6})
+        self.assertEqual(set(report['results']), {'memory', 'sqlite'})
+        for scenarios in report['results'].values():
+            for name in ('api.login', 'api.place_detail', 'api.reviews_by_place', 'api.list_places',
+                         'api.create_review', 'repo.place_get'):
+                self.assertEqual(scenarios[name]['operations'], 3)
+                self.assertEqual(scenarios[name]['errors'], 0, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
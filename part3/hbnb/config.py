@@ -8,6 +8,71 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
 
+    # Facteur de coût bcrypt (log2 du nombre d'itérations)
+    BCRYPT_LOG_ROUNDS = 12
+
+    # Hachage des mots de passe dans un pool de processus (0 : dans le thread
+    # de la requête). Désactivé par défaut : les processus sont lancés en
+    # 'spawn' et réimportent le module principal ; lancé par run.py, chacun
+    # recréerait l'application (create_app, db.create_all). À activer par la
+    # variable d'environnement sous un serveur WSGI (gunicorn...) dont le
+    # module principal ne construit pas l'application.
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    # Opérations en attente maximum (4 x workers si None) et attente d'une place, en secondes
+    PASSWORD_HASH_MAX_PENDING = None
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5.0
+
+    # Pagination des endpoints de liste
+    PAGINATION_DEFAULT_LIMIT = 100
+    PAGINATION_MAX_LIMIT = 1000
+
+    # Taille des lots des imports en masse (POST /api/v1/<ressource>/bulk)
+    BULK_BATCH_SIZE = 500
+
+    # Nombre d'objets lus par lot lors des exports NDJSON (GET .../export)
+    EXPORT_BATCH_SIZE = 1000
+
+    # Cache de lecture par dépôt, désactivé par défaut : chaque processus a
+    # son propre cache, qui peut servir un objet modifié par un autre worker
+    # jusqu'à l'expiration de l'entrée. À activer par dépôt (sauf user_repo),
+    # ex: {'amenity_repo': {'max_size': 1000, 'ttl': 300}}
+    REPOSITORY_CACHE = {}
+
+    # Bibliothèque JSON des réponses ('orjson', 'ujson', 'json'), la plus rapide installée si None
+    JSON_BACKEND = None
+
+    # Compression des réponses selon Accept-Encoding (brotli s'il est installé,
+    # gzip, deflate) au-delà de COMPRESSION_MIN_SIZE octets
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 4
+    COMPRESSION_MIMETYPES = ('application/json', 'application/x-ndjson')
+
+    # Instrumentation des requêtes (en-tête Server-Timing et journal JSON) :
+    # appels de la façade et des repositories, requêtes SQL ; les requêtes
+    # plus longues que INSTRUMENTATION_SLOW_REQUEST_MS sont journalisées en WARNING
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    INSTRUMENTATION_SERVER_TIMING = True
+    INSTRUMENTATION_SLOW_REQUEST_MS = 500
+
+    # Mode en mémoire durable : répertoire du journal d'écritures et des
+    # instantanés (les modèles sont servis par SQLAlchemy si None), et nombre
+    # d'enregistrements journalisés entre deux instantanés
+    DURABLE_STORE_DIR = os.getenv('DURABLE_STORE_DIR')
+    DURABLE_SNAPSHOT_EVERY = 10000
+
+    # Politique Cache-Control des GET par namespace (les réponses portent un
+    # ETag : 'no-cache' impose une revalidation, servie en 304 si inchangée)
+    CACHE_CONTROL_DEFAULT = 'no-cache'
+    CACHE_CONTROL = {
+        'places': 'public, max-age=60',
+        'amenities': 'public, max-age=300',
+        'reviews': 'public, max-age=60',
+        'search': 'public, max-age=30',
+        'users': 'private, no-cache'
+    }
+
 
 class DevelopmentConfig(Config):
     """
@@ -17,7 +82,29 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+
+class ProductionConfig(Config):
+    """
+    Configuration de production.
+    """
+    BCRYPT_LOG_ROUNDS = 13
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
+class TestingConfig(Config):
+    """
+    Configuration des tests : hachage rapide, sans pool de processus.
+    """
+    TESTING = True
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
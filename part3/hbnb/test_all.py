@@ -24,6 +24,12 @@ from app.api.v1.test.test_amenities_endpoints import TestAmenitiesEndpoints
 from app.api.v1.test.test_places_endpoints import TestPlacesEndpoints
 from app.api.v1.test.test_reviews_endpoints import TestReviewsEndpoints
 from app.api.v1.test.test_auth_endpoints import TestAuthEndpoints
+from app.api.v1.test.test_search_endpoints import TestSearchEndpoints
+from app.api.v1.test.test_conditional_requests import TestConditionalRequests
+from app.api.v1.test.test_encoding import TestResponseEncoding
+from app.api.v1.test.test_fieldsets import TestFieldsets
+from app.api.v1.test.test_query_counts import TestListQueryCounts
+from app.api.v1.test.test_instrumentation import TestInstrumentation
 from app.services.test.test_facade import TestHBnBFacade
 from app.services.test.test_amenities_facade import TestAmenitiesFacade
 from app.persistence.test.test_repository import (
@@ -70,7 +76,13 @@ def discover_all_tests():
             (TestAmenitiesEndpoints, "Tests Amenities Endpoints (API)"),
             (TestPlacesEndpoints, "Tests Places Endpoints (API)"),
             (TestReviewsEndpoints, "Tests Reviews Endpoints (API)"),
-            (TestAuthEndpoints, "Tests Auth Endpoints (API)")
+            (TestAuthEndpoints, "Tests Auth Endpoints (API)"),
+            (TestSearchEndpoints, "Tests Search Endpoints (API)"),
+            (TestConditionalRequests, "Tests Conditional Requests (API)"),
+            (TestResponseEncoding, "Tests Response Encoding (API)"),
+            (TestFieldsets, "Tests Fieldsets (API)"),
+            (TestListQueryCounts, "Tests List Query Counts (API)"),
+            (TestInstrumentation, "Tests Instrumentation (API)")
         ],
         'Services': [
             (TestHBnBFacade, "Tests HBnB Facade (Services)"),
@@ -210,6 +222,12 @@ def run_specific_test(test_class_name):
         'reviews_endpoints': TestReviewsEndpoints,
         'places_endpoints': TestPlacesEndpoints,
         'auth_endpoints': TestAuthEndpoints,
+        'search_endpoints': TestSearchEndpoints,
+        'conditional_requests': TestConditionalRequests,
+        'response_encoding': TestResponseEncoding,
+        'fieldsets': TestFieldsets,
+        'list_query_counts': TestListQueryCounts,
+        'instrumentation': TestInstrumentation,
         'facade': TestHBnBFacade,
         'amenities_facade': TestAmenitiesFacade,
         'repository_interface': TestRepositoryInterface,
@@ -241,7 +259,7 @@ def print_usage():
     print("  python test_all.py --class user       # Lance les tests d'une classe")
     print("  python test_all.py --help             # Affiche cette aide")
     print("\nModules disponibles: models, api, services, persistence")
-    print("Classes disponibles: user, amenity, place, review, users_endpoints, amenities_endpoints, places_endpoints, reviews_endpoints, auth_endpoints, facade, amenities_facade")
+    print("Classes disponibles: user, amenity, place, review, users_endpoints, amenities_endpoints, places_endpoints, reviews_endpoints, auth_endpoints, search_endpoints, conditional_requests, response_encoding, fieldsets, list_query_counts, instrumentation, facade, amenities_facade")
 
 
 if __name__ == "__main__":